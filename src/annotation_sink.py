@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+필드 주석(bbox + 텍스트) 내보내기
+
+기능:
+- 렌더러가 실제로 그린 텍스트의 bbox(정렬·x 시프트 반영), 필드명, 문자열을 이미지별로 수집
+- COCO 스타일 JSON 샤드(annotations_JU-00001.json ...)로 묶어서 기록 (이미지당 파일 1개 X)
+- 회전(L/R/180)된 이미지에 맞게 bbox 좌표 변환
+
+bbox 규칙:
+- 내부 표현은 [x1, y1, x2, y2] (끝 좌표 미포함), COCO 출력은 [x, y, w, h]
+- 회전 각도는 RotationProcessor 규칙을 따름 (90 = 시계 방향 "L", -90 = 반시계 방향 "R")
+"""
+
+import glob
+import json
+import os
+from typing import Dict, List, Optional
+
+ANNOTATION_PREFIX = "annotations"
+ROTATION_ANNOTATION_PREFIX = "rotation_annotations"
+
+
+def rotate_bbox(bbox: List[int], angle: int, width: int, height: int) -> List[int]:
+    """회전 전 이미지(width × height)의 bbox를 회전 후 좌표로 변환합니다.
+
+    Args:
+        bbox: [x1, y1, x2, y2]
+        angle: 0, 90(시계 방향), -90(반시계 방향), 180
+        width, height: 회전 전 이미지 크기
+    """
+    x1, y1, x2, y2 = bbox
+    if angle == 0:
+        return [x1, y1, x2, y2]
+    if angle == 90:
+        return [height - y2, x1, height - y1, x2]
+    if angle == -90:
+        return [y1, width - x2, y2, width - x1]
+    if angle == 180:
+        return [width - x2, height - y2, width - x1, height - y1]
+    raise ValueError(f"지원하지 않는 회전 각도입니다: {angle}")
+
+
+def rotate_entry(entry: Dict, angle: int, filename: str) -> Dict:
+    """이미지 주석 하나를 회전된 파일 기준으로 변환합니다."""
+    width, height = entry["width"], entry["height"]
+    if angle in (90, -90):
+        new_size = (height, width)
+    else:
+        new_size = (width, height)
+
+    return {
+        "file_name": filename,
+        "width": new_size[0],
+        "height": new_size[1],
+        "fields": [
+            {**field, "bbox": rotate_bbox(field["bbox"], angle, width, height)}
+            for field in entry["fields"]
+        ],
+    }
+
+
+class AnnotationSink:
+    """이미지별 필드 주석을 모아 COCO 스타일 JSON 샤드로 기록하는 싱크"""
+
+    def __init__(self, output_dir: str, prefix: str = ANNOTATION_PREFIX, shard_size: int = 1000,
+                 append: bool = False):
+        """
+        Args:
+            output_dir: 샤드를 저장할 디렉토리
+            prefix: 샤드 파일명 접두사 ({prefix}-00001.json)
+            shard_size: 샤드 하나에 담을 최대 이미지 수
+            append: True면 이전 샤드를 남기고 그 다음 번호부터 기록 (False면 이전 샤드 삭제)
+        """
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.shard_size = shard_size
+        self.images_written = 0
+        self.shards: List[str] = []
+        self._buffer: List[Dict] = []
+        self._first_number = 1
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        old_shards = glob.glob(os.path.join(output_dir, f"{prefix}-*.json"))
+        if append:
+            # 이전 샤드 뒤 번호부터 (읽을 때는 나중 샤드가 우선)
+            numbers = [_shard_number(path, prefix) for path in old_shards]
+            self._first_number = max([n for n in numbers if n is not None], default=0) + 1
+        else:
+            # 같은 접두사의 이전 샤드는 새 실행에서 덮어씀
+            for old in old_shards:
+                os.remove(old)
+
+    def add(self, filename: str, image_shape, annotations: List[Dict]):
+        """렌더링된 이미지 하나의 주석을 추가합니다.
+
+        Args:
+            filename: 저장된 이미지 파일명
+            image_shape: 이미지 shape (height, width[, channels])
+            annotations: 템플릿의 annotations 목록 ({"field", "text", "bbox"})
+        """
+        height, width = image_shape[:2]
+        self.add_entry({
+            "file_name": filename,
+            "width": int(width),
+            "height": int(height),
+            "fields": [dict(a) for a in annotations],
+        })
+
+    def add_entry(self, entry: Dict):
+        """이미 정리된 이미지 주석(file_name, width, height, fields)을 추가합니다."""
+        self._buffer.append(entry)
+        if len(self._buffer) >= self.shard_size:
+            self.flush()
+
+    def flush(self):
+        """버퍼의 주석을 샤드 파일 하나로 기록합니다."""
+        if not self._buffer:
+            return
+
+        shard_path = os.path.join(self.output_dir, f"{self.prefix}-{self._first_number + len(self.shards):05d}.json")
+        with open(shard_path, "w", encoding="utf-8") as f:
+            json.dump(_to_coco(self._buffer), f, ensure_ascii=False, separators=(",", ":"))
+
+        self.shards.append(shard_path)
+        self.images_written += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        """남은 주석을 기록합니다."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _shard_number(path: str, prefix: str) -> Optional[int]:
+    """샤드 파일명의 번호 ({prefix}-00012.json → 12, 형식이 다르면 None)"""
+    number = os.path.basename(path)[len(prefix) + 1:-len(".json")]
+    return int(number) if number.isdigit() else None
+
+
+def _to_coco(entries: List[Dict]) -> Dict:
+    """이미지 주석 목록을 COCO 스타일 dict로 변환합니다. (카테고리 = 필드명)"""
+    categories: Dict[str, int] = {}
+    images = []
+    annotations = []
+
+    for image_id, entry in enumerate(entries, start=1):
+        images.append({
+            "id": image_id,
+            "file_name": entry["file_name"],
+            "width": entry["width"],
+            "height": entry["height"],
+        })
+        for field in entry["fields"]:
+            category_id = categories.setdefault(field["field"], len(categories) + 1)
+            x1, y1, x2, y2 = field["bbox"]
+            annotations.append({
+                "id": len(annotations) + 1,
+                "image_id": image_id,
+                "category_id": category_id,
+                "bbox": [x1, y1, x2 - x1, y2 - y1],
+                "area": (x2 - x1) * (y2 - y1),
+                "iscrowd": 0,
+                "text": field["text"],
+            })
+
+    return {
+        "images": images,
+        "annotations": annotations,
+        "categories": [{"id": cid, "name": name} for name, cid in categories.items()],
+    }
+
+
+def read_annotation_shard(path: str) -> List[Dict]:
+    """샤드 하나를 이미지 주석 목록(file_name, width, height, fields)으로 읽습니다."""
+    with open(path, "r", encoding="utf-8") as f:
+        coco = json.load(f)
+
+    names = {c["id"]: c["name"] for c in coco["categories"]}
+    entries = {
+        img["id"]: {"file_name": img["file_name"], "width": img["width"], "height": img["height"], "fields": []}
+        for img in coco["images"]
+    }
+    for ann in coco["annotations"]:
+        x, y, w, h = ann["bbox"]
+        entries[ann["image_id"]]["fields"].append({
+            "field": names[ann["category_id"]],
+            "text": ann["text"],
+            "bbox": [x, y, x + w, y + h],
+        })
+    return list(entries.values())
+
+
+def load_annotation_index(directory: str, prefix: str = ANNOTATION_PREFIX) -> Optional[Dict[str, Dict]]:
+    """디렉토리의 주석 샤드를 파일명 기준 dict로 읽습니다. (샤드가 없으면 None)
+
+    GA/JU 생성기는 같은 디렉토리에 문서 종류별 접두사(annotations_GA, annotations_JU)로 기록하므로
+    prefix로 시작하는 샤드를 모두 읽고, 같은 파일명은 나중 샤드가 우선합니다.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, f"{prefix}*-*.json")), key=os.path.getmtime)
+    if not paths:
+        return None
+
+    index = {}
+    for path in paths:
+        for entry in read_annotation_shard(path):
+            index[entry["file_name"]] = entry
+    return index
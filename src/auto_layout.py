@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+자동 레이아웃 추출기 (GUI 없이 일괄 처리)
+
+기능:
+- assets/templates/GA의 모든 템플릿에서 표 격자선·셀을 검출 (table_grid, 프로세스 풀 병렬, --detect로 방식 선택)
+- GA만 지원: JU는 세대원 한 행 안에 괘선 없이 글자 줄로 나뉜 필드(NAME 위 JUMIN, NAME과 겹치는 NAME_CN 등)라
+  셀 검출로는 행 단위 셀(템플릿당 약 22개)만 나와 56개 필드 중 1개만 맞음 → 후보가 참조 복사본이 되므로 기록하지 않음
+- 템플릿 변형이 가져야 할 필드는 템플릿 자신에서 정함: GA childN은 자녀 N명까지(자녀가 없으면 배우자 없음,
+  data_factory와 같은 규칙), 그 외에는 필드 정의 전체 (참조 레이아웃의 필드 목록을 그대로 복사하지 않음)
+- 같은 문서 종류의 기존 레이아웃(configs/*_layout.yaml) 중 필요한 필드를 가장 많이 가진 것, 그 중 검출 셀과
+  가장 잘 맞는 것을 참조로 골라 필드마다 IoU가 가장 큰 셀로 박스를 제안 (맞는 셀이 없으면 참조 박스 유지)
+- 참조에 없는 번호 그룹 필드(CHILD3_*)는 앞 두 번호의 행 간격으로 박스를 추정한 뒤 셀에 맞춤
+- 참조 레이아웃이 없으면 필드 정의 순서대로 셀(읽기 순서)을 배정
+- 필드 정의(configs/field_definitions/*.yaml) 순서로 정렬한 후보 *_layout.yaml을 출력 디렉토리에 기록
+  (기존 레이아웃은 덮어쓰지 않음, 자기 자신의 레이아웃이 있으면 필드 목록 차이와
+  셀에 맞춘 필드의 일치도(IoU)를 출력 - 셀에 맞춘 필드가 없으면 "셀 일치 없음")
+
+사용:
+    python src/auto_layout.py
+    python src/auto_layout.py --workers 4 --output configs/auto_layouts
+    python src/auto_layout.py --templates assets/templates/GA/GA_template3_child0.jpg
+"""
+
+import argparse
+import glob
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from lazy_import import lazy_module
+from layout_variants import read_layouts, template_family
+from table_grid import DETECT_METHODS, detect_grid, iou
+from template_cache import TEMPLATE_ROOT, default_template_paths
+
+cv2 = lazy_module("cv2")
+yaml = lazy_module("yaml")
+
+FIELD_DEFINITIONS_DIR = "configs/field_definitions"
+LAYOUT_DIR = "configs"
+DEFAULT_OUTPUT_DIR = "configs/auto_layouts"
+
+# 필드 박스를 셀로 바꿀 최소 IoU
+MATCH_IOU = 0.5
+# 기존 레이아웃 일치도를 낼 최소 셀 일치 비율 (이보다 적으면 후보 대부분이 참조 박스 복사본)
+MIN_CELL_RATIO = 0.5
+
+# 셀 검출로 필드 박스를 정할 수 있는 문서 종류 (JU는 행 안의 글자 줄 단위 필드라 제외)
+CELL_LAYOUT_DOC_TYPES = ("GA",)
+
+# 템플릿명의 자녀 수 (GA_template1_child2 → 2)
+CHILD_VARIANT = re.compile(r"_child(\d+)$")
+# 번호 그룹 필드 (CHILD3_NAME → CHILD, 3, NAME / MEMBER2_NAME_CN → MEMBER, 2, NAME_CN)
+GROUP_FIELD = re.compile(r"^([A-Z]+)(\d+)_(\w+)$")
+
+
+def load_field_definitions(directory: str = FIELD_DEFINITIONS_DIR) -> Dict[str, Dict]:
+    """템플릿 폴더(GA, JU) → 필드 정의 (doc_type, fields)"""
+    definitions = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.yaml"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+        folder = config.get('template_folder')
+        if folder:
+            definitions[folder] = config
+    return definitions
+
+
+def load_reference_layouts(doc_type: str, layout_dir: str = LAYOUT_DIR) -> Dict[str, Dict[str, List[int]]]:
+    """같은 문서 종류의 기존 레이아웃 (템플릿명 → 상속을 푼 field_boxes)"""
+    return {name: layout['field_boxes'] for name, layout in read_layouts(layout_dir).items()
+            if name.startswith(f"{doc_type}_") and layout.get('field_boxes')}
+
+
+def expected_fields(template_name: str, field_order: List[str]) -> List[str]:
+    """템플릿 변형이 가져야 할 필드 (정의 순서)
+
+    GA childN: CHILD1~N만, 자녀가 없으면 SPOUSE도 없음 (data_factory가 채우는 필드와 같은 규칙)
+    그 외(JU 등 템플릿명에 인원 수가 없는 경우): 필드 정의 전체
+    """
+    match = CHILD_VARIANT.search(template_name)
+    if not match:
+        return list(field_order)
+    children = int(match.group(1))
+
+    def belongs(name: str) -> bool:
+        group = GROUP_FIELD.match(name)
+        if group and group.group(1) == "CHILD":
+            return int(group.group(2)) <= children
+        return children > 0 or not name.startswith("SPOUSE_")
+
+    return [name for name in field_order if belongs(name)]
+
+
+def extrapolate_box(name: str, boxes: Dict[str, List[int]]) -> Optional[List[int]]:
+    """번호 그룹 필드 박스를 앞 두 번호 박스의 간격으로 추정 (CHILD3 = CHILD2 + (CHILD2 - CHILD1), 없으면 None)"""
+    match = GROUP_FIELD.match(name)
+    if not match:
+        return None
+    prefix, number, suffix = match.group(1), int(match.group(2)), match.group(3)
+    prev1 = boxes.get(f"{prefix}{number - 1}_{suffix}")
+    prev2 = boxes.get(f"{prefix}{number - 2}_{suffix}")
+    if prev1 is None or prev2 is None:
+        return None
+    return [a + (a - b) for a, b in zip(prev1, prev2)]
+
+
+def order_fields(field_boxes: Dict[str, List[int]], field_order: List[str]) -> Dict[str, List[int]]:
+    """필드 정의 순서대로 정렬 (정의에 없는 필드는 뒤에 원래 순서대로)"""
+    ordered = {name: field_boxes[name] for name in field_order if name in field_boxes}
+    ordered.update({name: box for name, box in field_boxes.items() if name not in ordered})
+    return ordered
+
+
+def best_cell(box: List[int], cells: List[List[int]]) -> Tuple[Optional[List[int]], float]:
+    """box와 IoU가 가장 큰 셀과 그 IoU"""
+    best, best_iou = None, 0.0
+    for cell in cells:
+        score = iou(box, cell)
+        if score > best_iou:
+            best, best_iou = cell, score
+    return best, best_iou
+
+
+def choose_reference(cells: List[List[int]], references: Dict[str, Dict[str, List[int]]],
+                     expected: Optional[List[str]] = None) -> Optional[str]:
+    """참조 레이아웃 이름 (expected가 있으면 그 필드를 가장 많이 가진 것 중) 검출 셀과 평균 최대 IoU가 가장 큰 것"""
+    if expected:
+        coverage = {name: len(set(expected) & set(field_boxes)) for name, field_boxes in references.items()}
+        most = max(coverage.values(), default=0)
+        references = {name: field_boxes for name, field_boxes in references.items() if coverage[name] == most}
+    best_name, best_score = None, -1.0
+    for name, field_boxes in references.items():
+        score = float(np.mean([best_cell(box, cells)[1] for box in field_boxes.values()]))
+        if score > best_score:
+            best_name, best_score = name, score
+    return best_name
+
+
+def propose_field_boxes(cells: List[List[int]], field_order: List[str],
+                        reference: Optional[Dict[str, List[int]]] = None,
+                        min_iou: float = MATCH_IOU) -> Tuple[Dict[str, List[int]], Dict]:
+    """검출 셀로 field_boxes 후보를 만듭니다.
+
+    field_order의 필드 + 참조에만 있는 필드(정의 밖의 필드)를 제안합니다.
+    참조에 없는 필드는 번호 그룹 간격으로 추정하고, 추정도 안 되면 missing에 남깁니다.
+
+    Returns:
+        (field_boxes, 정보 {"method", "matched", "cell_fields", "unmatched", "estimated", "missing"})
+    """
+    if reference:
+        boxes, cell_fields, unmatched, estimated, missing = {}, [], [], [], []
+        sources = dict(reference)
+        names = list(field_order) + [name for name in reference if name not in field_order]
+        for name in names:
+            ref_box = sources.get(name)
+            if ref_box is None:
+                ref_box = extrapolate_box(name, sources)
+                if ref_box is None:
+                    missing.append(name)
+                    continue
+                sources[name] = ref_box
+                estimated.append(name)
+            cell, score = best_cell(ref_box, cells)
+            if cell is not None and score >= min_iou:
+                boxes[name] = list(cell)
+                cell_fields.append(name)
+            else:
+                boxes[name] = list(ref_box)
+                unmatched.append(name)
+        return boxes, {"method": "reference", "matched": len(cell_fields), "cell_fields": cell_fields,
+                       "unmatched": unmatched, "estimated": estimated, "missing": missing}
+
+    # 참조가 없으면 정의 순서대로 셀 배정
+    boxes = {name: list(cell) for name, cell in zip(field_order, cells)}
+    return boxes, {"method": "reading_order", "matched": len(boxes), "cell_fields": list(boxes),
+                   "unmatched": field_order[len(boxes):], "estimated": [], "missing": []}
+
+
+def compare_layout(own_layout: Dict[str, List[int]], field_boxes: Dict[str, List[int]],
+                   cell_fields: List[str]) -> Dict:
+    """기존 레이아웃과 후보 비교 → {"agreement", "compared", "missing", "extra"}
+
+    일치도는 셀에 맞춘 필드만으로 계산 (참조에서 복사한 박스는 참조끼리의 일치일 뿐이므로 제외,
+    셀에 맞춘 필드가 MIN_CELL_RATIO 미만이면 None)
+    """
+    compared = [name for name in cell_fields if name in own_layout]
+    scores = [iou(own_layout[name], field_boxes[name]) for name in compared]
+    enough = scores and len(cell_fields) >= MIN_CELL_RATIO * len(field_boxes)
+    return {
+        "agreement": float(np.mean(scores)) if enough else None,
+        "compared": len(compared),
+        "missing": [name for name in own_layout if name not in field_boxes],
+        "extra": [name for name in field_boxes if name not in own_layout],
+    }
+
+
+def process_template(image_path: str, definition: Dict, references: Dict[str, Dict[str, List[int]]],
+                     output_dir: str, detect_method: str = "profile") -> Dict:
+    """템플릿 하나의 격자를 검출하고 후보 레이아웃을 기록합니다. (워커에서 실행)"""
+    start = time.perf_counter()
+    img = cv2.imread(image_path)
+    if img is None:
+        raise ValueError(f"이미지를 로드할 수 없습니다: {image_path}")
+
+    template_name = os.path.splitext(os.path.basename(image_path))[0]
+    grid = detect_grid(img, detect_method)
+    cells = grid["cells"]
+
+    # 자기 자신의 레이아웃은 참조에서 제외 (새 템플릿 온보딩과 같은 조건)
+    own_layout = references.get(template_name)
+    candidates = {name: boxes for name, boxes in references.items() if name != template_name}
+    # 같은 계열의 다른 변형이 있으면 그 중에서만 고름 (없으면 같은 문서 종류 전체)
+    family = {name: boxes for name, boxes in candidates.items() if template_family(name) == template_family(template_name)}
+    candidates = family or candidates
+    defined = definition.get('fields', [])
+    field_order = expected_fields(template_name, defined)
+    reference_name = choose_reference(cells, candidates, field_order) if candidates else None
+
+    # 참조에서는 이 변형에 없어야 할 필드(다른 자녀 수의 CHILD*, SPOUSE)를 빼고 정의 밖의 필드만 추가로 가져옴
+    reference = candidates.get(reference_name)
+    if reference:
+        reference = {name: box for name, box in reference.items() if name in field_order or name not in defined}
+    field_boxes, info = propose_field_boxes(cells, field_order, reference)
+
+    comparison = compare_layout(own_layout, field_boxes, info["cell_fields"]) if own_layout else None
+
+    layout = {
+        'field_boxes': field_boxes,
+        'meta': {
+            'source_image': os.path.basename(image_path),
+            'extraction_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'doc_type': definition.get('doc_type', 'UNKNOWN'),
+            'field_count': len(field_boxes),
+            'auto_layout': {
+                'method': info["method"],
+                'detect': detect_method,
+                'reference': reference_name,
+                'lines': len(grid["lines"]),
+                'cells': len(cells),
+                'matched': info["matched"],
+                'unmatched': info["unmatched"],
+                'estimated': info["estimated"],
+                'missing': info["missing"],
+            },
+        },
+    }
+
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, f"{template_name}_layout.yaml")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        yaml.dump(layout, f, allow_unicode=True, sort_keys=False, indent=4)
+
+    return {
+        "template": template_name,
+        "output": output_path,
+        "method": info["method"],
+        "reference": reference_name,
+        "lines": len(grid["lines"]),
+        "cells": len(cells),
+        "fields": len(field_boxes),
+        "matched": info["matched"],
+        "estimated": len(info["estimated"]),
+        "missing": info["missing"],
+        "agreement": comparison and comparison["agreement"],
+        "comparison": comparison,
+        "sec": time.perf_counter() - start,
+    }
+
+
+def run_batch(template_paths: List[str], output_dir: str = DEFAULT_OUTPUT_DIR, workers: int = None,
+              definitions_dir: str = FIELD_DEFINITIONS_DIR, layout_dir: str = LAYOUT_DIR,
+              detect_method: str = "profile") -> List[Dict]:
+    """템플릿 목록을 병렬로 처리하고 결과 목록을 돌려줍니다. (템플릿명 순, CELL_LAYOUT_DOC_TYPES 밖의 템플릿은 건너뜀)"""
+    definitions = load_field_definitions(definitions_dir)
+    references = {doc_type: load_reference_layouts(doc_type, layout_dir) for doc_type in definitions}
+
+    jobs = []
+    for path in template_paths:
+        doc_type = os.path.basename(os.path.dirname(path))
+        if doc_type not in definitions:
+            print(f"⚠️ 필드 정의가 없는 템플릿 건너뜀: {path}")
+            continue
+        if doc_type not in CELL_LAYOUT_DOC_TYPES:
+            print(f"⚠️ 셀 검출로 필드를 나눌 수 없는 문서 종류 건너뜀 ({doc_type}): {path}")
+            continue
+        jobs.append((path, definitions[doc_type], references.get(doc_type, {}), output_dir, detect_method))
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(process_template, *job): job[0] for job in jobs}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ 처리 실패 ({futures[future]}): {e}")
+                continue
+            print(f"  ✓ {result['template']}: 선 {result['lines']}개, 셀 {result['cells']}개 → "
+                  f"필드 {result['matched']}/{result['fields']} 셀 일치 ({result['method']}, "
+                  f"참조 {result['reference']}){_comparison_text(result)} [{result['sec'] * 1000:.0f}ms]")
+            if result["missing"]:
+                print(f"    ⚠️ 박스를 정하지 못한 필드 {len(result['missing'])}개: {', '.join(result['missing'][:6])}")
+            results.append(result)
+
+    return sorted(results, key=lambda r: r["template"])
+
+
+def _comparison_text(result: Dict) -> str:
+    """기존 레이아웃 비교 요약 (없으면 빈 문자열)"""
+    comparison = result["comparison"]
+    if comparison is None:
+        return ""
+    if comparison["agreement"] is None:
+        label = "셀 일치 거의 없음" if result["matched"] else "셀 일치 없음"
+        text = f" | {label} ({result['matched']}/{result['fields']}, 참조 박스 복사 - 일치도 생략)"
+    else:
+        text = f" | 기존 레이아웃 IoU {comparison['agreement']:.2f} (셀 일치 {comparison['compared']}개 기준)"
+    if comparison["missing"] or comparison["extra"]:
+        text += f" | 필드 차이 -{len(comparison['missing'])}/+{len(comparison['extra'])}"
+    return text
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="표 격자 검출 기반 자동 레이아웃 추출기")
+    parser.add_argument("--templates", nargs="*", default=None, help="처리할 템플릿 이미지 (기본: assets/templates 전체)")
+    parser.add_argument("--doc-types", nargs="*", default=list(CELL_LAYOUT_DOC_TYPES), choices=CELL_LAYOUT_DOC_TYPES,
+                        help="문서 종류 (GA만 지원)")
+    parser.add_argument("--output", "-o", default=DEFAULT_OUTPUT_DIR, help="후보 레이아웃 출력 디렉토리")
+    parser.add_argument("--workers", "-w", type=int, default=None, help="병렬 워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--detect", default="profile", choices=DETECT_METHODS,
+                        help="격자선 검출 방식 (profile: 투영 프로파일, hough: 기존 HoughLinesP)")
+
+    args = parser.parse_args()
+
+    template_paths = args.templates or default_template_paths(TEMPLATE_ROOT, args.doc_types)
+    if not template_paths:
+        print("❌ 처리할 템플릿이 없습니다.")
+        return
+
+    print("=== 자동 레이아웃 추출기 ===")
+    print(f"템플릿: {len(template_paths)}개 | 출력 디렉토리: {args.output}")
+
+    start = time.time()
+    results = run_batch(template_paths, args.output, args.workers, detect_method=args.detect)
+
+    print(f"\n=== 완료: {len(results)}/{len(template_paths)}개, {time.time() - start:.1f}초 ===")
+    agreements = [r["agreement"] for r in results if r["agreement"] is not None]
+    if agreements:
+        print(f"📊 기존 레이아웃과 평균 IoU (셀 일치 필드 기준): {np.mean(agreements):.2f}")
+    copied = [r["template"] for r in results if r["comparison"] and r["agreement"] is None]
+    if copied:
+        print(f"⚠️ 셀 일치 없음 {len(copied)}개 (참조 박스 복사, 수동 확인 필요): {', '.join(copied)}")
+    print(f"📁 저장 위치: {args.output}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,23 +10,54 @@
 
 import os
 import sys
-import random
-import cv2
+import argparse
 from typing import List, Dict, Tuple
 
 # 모듈 경로 추가
 sys.path.append('src')
 
 from templates_juga import create_template
-from data_factory import create_record
+from data_factory import create_document_record, DATA_MODES
+from realistic_data import set_reference_date
+from image_codec import ImageCodec, CODEC_PRESETS, DEFAULT_PRESET
+from manifest_writer import ManifestWriter, GENERATION_MANIFEST
+from annotation_sink import AnnotationSink, ANNOTATION_PREFIX
+from rng_context import DOC_TYPE_STREAM, RNGContext
+from render_buffers import default_pool
+from dirty_region import DirtyRegionRenderer, summarize_traffic, traffic_text
 
 class JUBatchGenerator:
     """주민등록등본 대량 생성기"""
     
-    def __init__(self, output_dir: str = "outputs/dataset"):
+    def __init__(self, output_dir: str = "outputs/dataset", color_mode: str = "BGR",
+                 codec: ImageCodec = None, data_mode: str = "random", seed: int = None, reference_date: str = None,
+                 dirty_region: bool = True):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         
+        # 렌더링 색상 모드 (BGR 또는 GRAY 단일 채널)
+        self.color_mode = color_mode
+        
+        # 출력 코덱 (기본: training 프리셋 = 기존 JPEG 설정)
+        self.codec = codec or ImageCodec()
+        
+        # 데이터 생성 방식 (random / realistic) - member_configs 항목에 "data_mode"가 있으면 그 값 우선
+        self.data_mode = data_mode
+        
+        # 나이·날짜 기준일 (고정 기본값, 매니페스트 reference_date 컬럼으로 재현)
+        self.reference_date = set_reference_date(reference_date).isoformat()
+        
+        # JU 스트림 난수 컨텍스트 (GA 생성기와 분리) - 문서마다 자식 컨텍스트(child(문서 순번))를 써서 문서 하나만 다시 만들 수 있음
+        self.rng = RNGContext(seed).child(DOC_TYPE_STREAM["JU"])
+        self._doc_index = 0
+        
+        # 페이지·크롭 버퍼 풀 (문서마다 새 페이지를 할당하지 않음)
+        self.buffers = default_pool()
+        
+        # 영역 단위 렌더링 (템플릿·공개 방식마다 렌더러 하나, 직전 문서 영역만 복원) - 렌더러별 복원 통계
+        self.dirty_region = dirty_region
+        self.traffic: List[Dict[str, int]] = []
+        
         # 템플릿 설정
         self.regions = [1, 2, 3]  # 등본1, 등본2, 등본3
         self.barcodes = ["TY00", "TY01", "TY10", "TY11"]
@@ -58,7 +89,14 @@ class JUBatchGenerator:
             "JU-3": {"CLOSE": 1, "OPEN": 1},  # 등본3
         }
         
+        # 생성과 동시에 매니페스트에 이어 쓰기 - GA/JU 공용, 같은 파일명은 마지막 행 우선 (실제 템플릿명·세대원 수·공개 여부)
+        self.manifest = ManifestWriter(os.path.join(self.output_dir, GENERATION_MANIFEST), append=True)
+        
+        # 필드 주석(실제 그린 텍스트 bbox + 문자열)을 COCO 스타일 샤드로 묶어서 기록
+        self.annotations = AnnotationSink(self.output_dir, prefix=f"{ANNOTATION_PREFIX}_JU")
+        
         print("=== JU 대량 생성 시작 ===")
+        print(f"🎲 시드: {self.rng.seed_label} | 기준일: {self.reference_date}")
         print(f"목표: {len(self.regions)} 등본 × {len(self.barcodes)} 바코드 × 10장 × 2주민번호방식 = {len(self.regions) * len(self.barcodes) * 10 * 2}장")
         
         for region in self.regions:
@@ -85,6 +123,11 @@ class JUBatchGenerator:
             open_count = file_counter[doc_kind]["OPEN"] - 1
             total_count = close_count + open_count
             print(f"  {doc_kind}: CLOSE({close_count}) + OPEN({open_count}) = {total_count}장")
+        
+        self.manifest.close()
+        self.annotations.close()
+        print(f"📋 생성 매니페스트: {self.manifest.path} ({self.manifest.rows_written}행)")
+        print(f"🏷️ 필드 주석: {self.annotations.images_written}장 ({len(self.annotations.shards)}개 샤드)")
             
         self._print_final_stats(stats)
         return stats
@@ -99,41 +142,63 @@ class JUBatchGenerator:
             jumin_disclosure = jumin_config["jumin_disclosure"]
             jumin_name = jumin_config["name"]
             
+            # 템플릿 생성 (템플릿·공개 방식마다 한 번) + 영역 단위 렌더러 (재사용 페이지 버퍼를 작업 버퍼로 사용)
+            template = create_template("JU", template_name, mask_jumin=(jumin_disclosure=="CLOSE"), color_mode=self.color_mode)
+            renderer = DirtyRegionRenderer(template, self.buffers.page_for(template)) if self.dirty_region else None
+            
             # 세대원 수별로 생성
             for member_config in self.member_configs:
                 members_count = member_config["members_count"]
                 count = member_config["count"]
+                data_mode = member_config.get("data_mode", self.data_mode)
+                
+                # 세대원 수 제한 (템플릿은 그대로, 줄어든 세대원 행은 렌더러가 다음 문서 전에 복원)
+                template.limit_members(members_count)
                 
                 for i in range(count):
-                    # 템플릿 생성 (세대원 수 제한)
-                    template = create_template("JU", template_name, max_members=members_count, mask_jumin=(jumin_disclosure=="CLOSE"))
-                    
-                    # 데이터 생성 (주민번호 공개 설정 포함)
-                    data = create_record("JU", {
+                    # 데이터 생성 (주민번호 공개 설정 포함) - DocumentRecord를 템플릿에 바로 전달
+                    doc_rng = self.rng.child(self._doc_index)
+                    self._doc_index += 1
+                    data = create_document_record("JU", {
                         "members_count": members_count,
-                        "jumin_disclosure": jumin_disclosure
-                    })
+                        "jumin_disclosure": jumin_disclosure,
+                        "data_mode": data_mode
+                    }, rng=doc_rng)
                     
                     # 디버깅: 주민번호 확인
-                    jumin_sample = data.get("MEMBER1_JUMIN", "N/A")
+                    member1 = data.person("MEMBER1")
+                    jumin_sample = member1.jumin if member1 else "N/A"
                     print(f"      🔍 {jumin_name} | {members_count}명 | 주민번호샘플: {jumin_sample}")
                     
-                    # 이미지 생성
-                    img = template.render(data)
+                    # 이미지 생성 (워커별 재사용 페이지 버퍼에 렌더링 - 바로 저장하므로 복사 불필요)
+                    if renderer is not None:
+                        img = renderer.render(data)
+                    else:
+                        img = template.render_into(self.buffers.page_for(template), data)
                     
                     # 새로운 파일명 규칙: JU-{문서종류}-{주민번호공개여부}-0-{순차번호5자리}
                     sequential_number = file_counter[doc_kind][jumin_name]
-                    filename = f"{doc_kind}-{jumin_name}-0-{sequential_number:05d}.jpg"
+                    filename = f"{doc_kind}-{jumin_name}-0-{sequential_number:05d}{self.codec.extension}"
                     
                     # 파일 저장 (0도만)
                     filepath = os.path.join(self.output_dir, filename)
-                    cv2.imwrite(filepath, img)
+                    self.codec.write(filepath, img)
+                    self.manifest.write_row({
+                        "filename": filename, "doc_type": "JU", "doc_kind": doc_kind.split("-")[1],
+                        "disclosure": jumin_name, "angle": "0", "sequence": f"{sequential_number:05d}",
+                        "template_name": template_name, "members_count": members_count,
+                        "seed": doc_rng.seed_label, "reference_date": self.reference_date,
+                    })
+                    self.annotations.add(filename, img.shape, template.annotations)
                     
                     # 카운터 증가
                     file_counter[doc_kind][jumin_name] += 1
                     generated_count += 1
                     
                     print(f"        생성: {filename}")
+            
+            if renderer is not None:
+                self.traffic.append(renderer.stats)
         
         return generated_count
     
@@ -148,10 +213,29 @@ class JUBatchGenerator:
         
         print(f"\n📁 저장 위치: {self.output_dir}/")
         print(f"📋 총 학습용 이미지: {stats['total']}장 (회전 전)")
+        print(f"💾 {self.codec.format_summary()}")
+        if self.traffic:
+            print(f"🧩 {traffic_text(summarize_traffic(self.traffic))}")
 
 def main():
     """메인 실행 함수"""
-    generator = JUBatchGenerator()
+    parser = argparse.ArgumentParser(description="주민등록등본(JU) 대량 생성기")
+    parser.add_argument("--output", "-o", default="outputs/dataset", help="출력 디렉토리")
+    parser.add_argument("--grayscale", action="store_true", help="단일 채널 흑백(GRAY) 모드로 렌더링")
+    parser.add_argument("--codec", default=DEFAULT_PRESET, choices=list(CODEC_PRESETS), help="출력 코덱 프리셋")
+    parser.add_argument("--data-mode", default="random", choices=DATA_MODES,
+                        help="데이터 생성 방식 (realistic: 유효한 날짜·주민번호)")
+    parser.add_argument("--seed", type=int, default=None, help="루트 난수 시드 (생략 시 OS 엔트로피, 매니페스트 seed 컬럼으로 재현)")
+    parser.add_argument("--reference-date", default=None,
+                        help="나이·날짜 기준일 YYYY-MM-DD (기본: realistic_data.DEFAULT_REFERENCE_DATE)")
+    parser.add_argument("--full-page", action="store_true",
+                        help="영역 단위 렌더링 대신 문서마다 페이지 전체를 복사해서 렌더링")
+    args = parser.parse_args()
+    
+    generator = JUBatchGenerator(args.output, color_mode="GRAY" if args.grayscale else "BGR",
+                                 codec=ImageCodec(args.codec), data_mode=args.data_mode,
+                                 seed=args.seed, reference_date=args.reference_date,
+                                 dirty_region=not args.full_page)
     generator.generate_all_ju_documents()
 
 if __name__ == "__main__":
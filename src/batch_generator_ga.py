@@ -1,17 +1,50 @@
 import sys
 import os
+import argparse
 sys.path.append('src')
 
-from data_factory import create_record
+from data_factory import create_document_record, DATA_MODES
+from realistic_data import set_reference_date
 from templates_juga import create_template
-import cv2
+from image_codec import ImageCodec, CODEC_PRESETS, DEFAULT_PRESET
+from manifest_writer import ManifestWriter, GENERATION_MANIFEST
+from annotation_sink import AnnotationSink, ANNOTATION_PREFIX
+from rng_context import DOC_TYPE_STREAM, RNGContext
+from render_buffers import default_pool
+from dirty_region import DirtyRegionRenderer, summarize_traffic, traffic_text
 
-def generate_ga_batch():
-    """가족관계증명서(GA) 배치 생성 - 새로운 파일명 규칙 적용"""
+def generate_ga_batch(output_dir: str = "outputs/dataset", color_mode: str = "BGR", codec: ImageCodec = None,
+                      data_mode: str = "random", seed: int = None, reference_date: str = None,
+                      dirty_region: bool = True):
+    """가족관계증명서(GA) 배치 생성 - 새로운 파일명 규칙 적용
+    
+    Args:
+        output_dir: 출력 디렉토리
+        color_mode: "BGR"(기본) 또는 "GRAY"(단일 채널 흑백 렌더링)
+        codec: 출력 코덱 (기본: training 프리셋)
+        data_mode: "random"(기본) 또는 "realistic"(유효한 날짜·주민번호, 관계별 나이)
+        seed: 루트 난수 시드 (None이면 OS 엔트로피) - 문서마다 child(문서 순번) 컨텍스트 사용
+        reference_date: 나이·날짜 기준일 "YYYY-MM-DD" (None이면 고정 기본값, 매니페스트에 기록)
+        dirty_region: True면 템플릿·공개 방식마다 영역 단위 렌더러 하나로 직전 문서 영역만 복원
+            (False면 문서마다 페이지 전체 복사)
+    """
     print("=== 가족관계증명서(GA) 배치 생성 시작 ===")
     
+    # GA 스트림 난수 컨텍스트 (JU 생성기와 분리) - 문서마다 child(문서 순번)
+    rng = RNGContext(seed).child(DOC_TYPE_STREAM["GA"])
+    reference_date = set_reference_date(reference_date).isoformat()
+    print(f"🎲 시드: {rng.seed_label} | 기준일: {reference_date}")
+    buffers = default_pool()
+    
+    codec = codec or ImageCodec()
+    
+    # 생성과 동시에 매니페스트에 이어 쓰기 - GA/JU 공용, 같은 파일명은 마지막 행 우선 (실제 템플릿명·자녀 수·공개 여부)
+    manifest = ManifestWriter(os.path.join(output_dir, GENERATION_MANIFEST), append=True)
+    
+    # 필드 주석(실제 그린 텍스트 bbox + 문자열)을 COCO 스타일 샤드로 묶어서 기록
+    annotations = AnnotationSink(output_dir, prefix=f"{ANNOTATION_PREFIX}_GA")
+    
     # 출력 디렉토리 생성
-    output_dir = "outputs/dataset"
     os.makedirs(output_dir, exist_ok=True)
     
     # 주민번호 공개 방식 설정 (OPEN/CLOSE)
@@ -41,6 +74,7 @@ def generate_ga_batch():
     ]
     
     total_generated = 0
+    traffic = []
     
     for template_name, children_count, doc_kind in templates:
         print(f"\n--- 템플릿: {template_name} ({doc_kind}, 자녀 {children_count}명) ---")
@@ -51,37 +85,61 @@ def generate_ga_batch():
             
             print(f"  주민번호 설정: {jumin_name}")
             
+            # 템플릿 생성 (템플릿·공개 방식마다 한 번) + 영역 단위 렌더러 (재사용 페이지 버퍼를 작업 버퍼로 사용)
+            template = create_template("GA", template_name, mask_jumin=(jumin_disclosure=="CLOSE"), color_mode=color_mode)
+            renderer = DirtyRegionRenderer(template, buffers.page_for(template)) if dirty_region else None
+            
             # 각 템플릿당 10장씩 생성
             for i in range(10):
-                # 데이터 생성
-                record = create_record("GA", options={
+                # 데이터 생성 (DocumentRecord를 템플릿에 바로 전달)
+                doc_rng = rng.child(total_generated)
+                record = create_document_record("GA", options={
                     "children_count": children_count, 
-                    "jumin_disclosure": jumin_disclosure
-                })
-                
-                # 템플릿 생성
-                template = create_template("GA", template_name, mask_jumin=(jumin_disclosure=="CLOSE"))
+                    "jumin_disclosure": jumin_disclosure,
+                    "data_mode": data_mode
+                }, rng=doc_rng)
                 
-                # 이미지 렌더링
-                result_img = template.render(record)
+                # 이미지 렌더링 (재사용 페이지 버퍼 - 바로 저장하므로 복사 불필요)
+                if renderer is not None:
+                    result_img = renderer.render(record)
+                else:
+                    result_img = template.render_into(buffers.page_for(template), record)
                 
                 # 새로운 파일명 규칙: GA-{문서종류}-{주민번호공개여부}-0-{순차번호5자리}
                 sequential_number = file_counter[doc_kind][jumin_name]
-                filename = f"{doc_kind}-{jumin_name}-0-{sequential_number:05d}.jpg"
+                filename = f"{doc_kind}-{jumin_name}-0-{sequential_number:05d}{codec.extension}"
                 
                 # 파일 저장 (0도만)
                 filepath = os.path.join(output_dir, filename)
-                cv2.imwrite(filepath, result_img)
+                codec.write(filepath, result_img)
+                manifest.write_row({
+                    "filename": filename, "doc_type": "GA", "doc_kind": doc_kind.split("-")[1],
+                    "disclosure": jumin_name, "angle": "0", "sequence": f"{sequential_number:05d}",
+                    "template_name": template_name, "children_count": children_count,
+                    "seed": doc_rng.seed_label, "reference_date": reference_date,
+                })
+                annotations.add(filename, result_img.shape, template.annotations)
                 
                 # 카운터 증가
                 file_counter[doc_kind][jumin_name] += 1
                 total_generated += 1
                 
                 print(f"    생성: {filename}")
+            
+            if renderer is not None:
+                traffic.append(renderer.stats)
+    
+    manifest.close()
+    annotations.close()
     
     print(f"\n=== 가족관계증명서(GA) 배치 생성 완료 ===")
     print(f"총 생성된 이미지: {total_generated}장")
     print(f"예상 이미지: 160장 (8템플릿 × 10장 × 2주민번호방식)")
+    print(f"💾 {codec.format_summary()}")
+    print(f"📋 생성 매니페스트: {manifest.path} ({manifest.rows_written}행)")
+    print(f"🏷️ 필드 주석: {annotations.images_written}장 ({len(annotations.shards)}개 샤드)")
+    if traffic:
+        print(f"🧩 {traffic_text(summarize_traffic(traffic))}")
     
     # 최종 카운터 상태 출력
     print(f"\n📊 최종 파일 카운터 상태:")
@@ -92,4 +150,19 @@ def generate_ga_batch():
         print(f"  {doc_kind}: CLOSE({close_count}) + OPEN({open_count}) = {total_count}장")
 
 if __name__ == "__main__":
-    generate_ga_batch() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="가족관계증명서(GA) 배치 생성기")
+    parser.add_argument("--output", "-o", default="outputs/dataset", help="출력 디렉토리")
+    parser.add_argument("--grayscale", action="store_true", help="단일 채널 흑백(GRAY) 모드로 렌더링")
+    parser.add_argument("--codec", default=DEFAULT_PRESET, choices=list(CODEC_PRESETS), help="출력 코덱 프리셋")
+    parser.add_argument("--data-mode", default="random", choices=DATA_MODES,
+                        help="데이터 생성 방식 (realistic: 유효한 날짜·주민번호)")
+    parser.add_argument("--seed", type=int, default=None, help="루트 난수 시드 (생략 시 OS 엔트로피, 매니페스트 seed 컬럼으로 재현)")
+    parser.add_argument("--reference-date", default=None,
+                        help="나이·날짜 기준일 YYYY-MM-DD (기본: realistic_data.DEFAULT_REFERENCE_DATE)")
+    parser.add_argument("--full-page", action="store_true",
+                        help="영역 단위 렌더링 대신 문서마다 페이지 전체를 복사해서 렌더링")
+    args = parser.parse_args()
+    
+    generate_ga_batch(args.output, color_mode="GRAY" if args.grayscale else "BGR", codec=ImageCodec(args.codec),
+                      data_mode=args.data_mode, seed=args.seed, reference_date=args.reference_date,
+                      dirty_region=not args.full_page)
@@ -1,114 +1,137 @@
-import random
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from faker import Faker
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import realistic_data
+from rng_context import RNGContext, resolve
 
-# 한국어 데이터를 생성하기 위한 Faker 인스턴스 초기화
-fake = Faker("ko_KR")
+# 모든 생성 함수는 rng(RNGContext)를 받음 - 생략하면 프로세스 기본 컨텍스트(재현 불가)
+# 한국어 주소용 Faker는 rng_context가 스레드별로 하나만 만들어 컨텍스트 시드로 다시 시드함
+
+# 데이터 생성 방식
+# - random   : 형식만 맞춘 완전 무작위 값 (기존 방식, 기본값)
+# - realistic: 존재하는 날짜, 관계별 나이에 맞는 생년월일, 생년월일·성별·검증 자리가 맞는 주민번호
+DATA_MODES = ("random", "realistic")
+
+# --- 이름 생성용 테이블 (모듈 로드 시 한 번만 생성) ---
+
+# 성씨에 쓰이는 음절들 (1글자)
+SURNAME_SYLLABLES = (
+    "강", "갑", "갈", "감", "갓", "갖", "개", "객", "갠", "갤", "거", "건", "걸", "검", "겁", "게", "겨", "격", "견", "결",
+    "경", "계", "고", "곡", "곤", "골", "곰", "곱", "공", "곶", "과", "관", "광", "괘", "괴", "교", "구", "국", "군", "굴",
+    "굿", "궁", "권", "귀", "규", "근", "글", "금", "급", "기", "긴", "길", "김", "까", "깅", "나", "낙", "난", "날", "남",
+    "납", "낭", "내", "냉", "너", "널", "네", "녕", "노", "녹", "논", "놀", "농", "뇌", "누", "눈", "눌", "능", "다", "단",
+    "달", "담", "답", "당", "대", "댁", "더", "덕", "도", "독", "돈", "동", "두", "둔", "득", "등", "라", "락", "란", "람",
+    "랑", "래", "량", "려", "력", "련", "렬", "렴", "렵", "령", "례", "로", "록", "론", "롱", "료", "루", "류", "륙", "륜",
+    "률", "륭", "르", "름", "릉", "리", "린", "림", "립", "링", "마", "막", "만", "말", "맘", "망", "매", "맥", "맹", "머",
+    "먹", "멀", "멈", "멍", "메", "멘", "멸", "명", "모", "목", "몰", "몸", "몽", "뫼", "무", "묵", "문", "물", "뭄", "미",
+    "민", "밀", "밈", "밍", "바", "박", "반", "발", "밤", "밥", "방", "배", "백", "뱀", "버", "번", "벌", "범", "법", "벽",
+    "변", "별", "병", "보", "복", "본", "볼", "봄", "봉", "부", "북", "분", "불", "붐", "붕", "브", "블", "비", "빈", "빌",
+    "빔", "빙", "빚", "빛", "사", "삭", "산", "살", "삼", "삽", "상", "새", "색", "생", "서", "석", "선", "설", "섬", "섭",
+    "성", "세", "센", "셜", "소", "속", "손", "솔", "솜", "송", "쇄", "수", "숙", "순", "술", "숨", "숭", "스", "슬", "습",
+    "승", "시", "신", "실", "심", "십", "싱", "쌍", "쏘", "쓰", "씨", "아", "악", "안", "알", "암", "압", "앙", "애", "액",
+    "앵", "야", "약", "얀", "양", "어", "억", "언", "얼", "엄", "업", "에", "여", "역", "연", "열", "염", "엽", "영", "예",
+    "오", "옥", "온", "올", "옴", "옹", "와", "완", "왈", "왕", "외", "요", "욕", "용", "우", "욱", "운", "울", "움", "웅",
+    "원", "월", "위", "유", "육", "윤", "율", "융", "으", "은", "을", "음", "응", "의", "이", "익", "인", "일", "임", "입",
+    "잉", "자", "작", "잔", "잠", "잡", "장", "재", "쟁", "저", "적", "전", "절", "점", "정", "제", "조", "족", "존", "종",
+    "주", "죽", "준", "줄", "중", "즐", "즉", "즉", "증", "지", "직", "진", "질", "짐", "집", "징", "차", "착", "찬", "찰",
+    "참", "창", "채", "책", "처", "척", "천", "철", "첨", "청", "체", "초", "촉", "총", "최", "추", "축", "춘", "출", "충",
+    "취", "측", "층", "치", "친", "칠", "침", "칭", "카", "칸", "칼", "캄", "캅", "캉", "커", "컨", "컬", "컴", "컵", "케",
+    "켄", "코", "콘", "콜", "콤", "콩", "쾌", "크", "큰", "클", "큼", "키", "킨", "킬", "킴", "킹", "타", "탁", "탄", "탈",
+    "탐", "탑", "탕", "태", "택", "탱", "터", "턱", "턴", "털", "텀", "텝", "테", "텐", "토", "톤", "톨", "톰", "통", "퇴",
+    "투", "툰", "툴", "툼", "트", "틀", "틈", "티", "틴", "틸", "팀", "팅", "파", "팍", "팎", "판", "팔", "팜", "팝", "팡",
+    "패", "팩", "팬", "퍼", "펀", "펄", "펌", "펍", "페", "펜", "편", "펼", "평", "폐", "포", "폭", "폰", "폴", "폼", "퐁",
+    "표", "푸", "푹", "푼", "풀", "품", "풍", "프", "플", "픔", "피", "핀", "필", "핌", "핑", "하", "학", "한", "할", "함",
+    "합", "항", "해", "핵", "행", "향", "허", "헌", "헐", "험", "헙", "헝", "혀", "혁", "현", "혈", "혐", "협", "형", "혜",
+    "호", "혹", "혼", "홀", "홈", "홉", "홍", "화", "확", "환", "활", "황", "홰", "횃", "회", "획", "횡", "효", "후", "훅",
+    "훈", "훌", "훔", "훨", "휘", "휜", "휠", "휩", "휭", "흄", "흉", "흐", "흑", "흔", "흘", "흠", "흡", "흥", "희", "흰",
+    "히", "힌", "힐", "힘"
+)
+
+# 이름에 쓰이는 음절들 (자주 쓰이는 것들)
+NAME_SYLLABLES = (
+    "가", "간", "갈", "감", "강", "개", "건", "걸", "검", "게", "겨", "격", "견", "결", "경", "계", "고", "곡", "곤", "골",
+    "공", "과", "관", "광", "교", "구", "국", "군", "굴", "궁", "권", "규", "근", "글", "금", "기", "긴", "길", "김", "나",
+    "낙", "난", "날", "남", "낭", "내", "냉", "너", "널", "네", "노", "녹", "논", "농", "누", "눈", "능", "다", "단", "달",
+    "담", "당", "대", "더", "덕", "도", "독", "돈", "동", "두", "둔", "득", "등", "라", "락", "란", "람", "랑", "래", "량",
+    "려", "력", "련", "렬", "령", "례", "로", "록", "론", "료", "루", "류", "륜", "률", "르", "름", "리", "린", "림", "립",
+    "마", "막", "만", "말", "망", "매", "맥", "머", "먹", "멀", "멍", "메", "명", "모", "목", "몰", "몸", "무", "묵", "문",
+    "물", "미", "민", "밀", "밍", "바", "박", "반", "발", "밤", "방", "배", "백", "버", "번", "벌", "범", "법", "변", "별",
+    "병", "보", "복", "본", "볼", "봄", "봉", "부", "북", "분", "불", "붕", "비", "빈", "빌", "빛", "사", "삭", "산", "살",
+    "삼", "상", "새", "색", "생", "서", "석", "선", "설", "섬", "성", "세", "소", "속", "손", "솔", "송", "수", "숙", "순",
+    "술", "숨", "승", "시", "신", "실", "심", "싱", "아", "악", "안", "알", "암", "앙", "애", "야", "약", "양", "어", "억",
+    "언", "얼", "엄", "에", "여", "역", "연", "열", "염", "영", "예", "오", "옥", "온", "올", "옴", "용", "우", "욱", "운",
+    "울", "움", "원", "월", "위", "유", "육", "윤", "율", "융", "은", "을", "음", "응", "의", "이", "익", "인", "일", "임",
+    "입", "자", "작", "잔", "장", "재", "저", "적", "전", "절", "점", "정", "제", "조", "족", "종", "주", "죽", "준", "줄",
+    "중", "즉", "증", "지", "직", "진", "질", "짐", "집", "차", "착", "찬", "참", "창", "채", "처", "천", "철", "청", "체",
+    "초", "총", "최", "추", "축", "춘", "출", "충", "취", "치", "친", "칠", "침", "카", "칸", "컬", "케", "코", "큰", "클",
+    "키", "킨", "킬", "타", "탁", "탄", "탈", "탐", "탕", "태", "택", "터", "턴", "테", "토", "톤", "통", "투", "툰", "트",
+    "티", "틴", "파", "판", "팔", "팜", "팡", "패", "퍼", "펀", "펄", "페", "편", "평", "포", "폭", "폰", "표", "푸", "풀",
+    "품", "풍", "프", "피", "핀", "필", "하", "학", "한", "할", "함", "합", "항", "해", "행", "향", "허", "헌", "현", "혈",
+    "형", "혜", "호", "혹", "혼", "홀", "홈", "홍", "화", "확", "환", "활", "황", "회", "효", "후", "훈", "훌", "휘", "흰",
+    "희", "히", "힘"
+)
+
+# 이름 한자 후보
+HANJA_CHARS = "明俊瑞娟智宇道潤夏恩秀斌美英愛善良德仁義禮智信忠孝慈愛和平喜樂福慧賢淑雅純淸潔"
+
+# 성씨 → 한자 매핑 (복성 포함)
+HANJA_SURNAMES = {
+    '김': '金', '이': '李', '박': '朴', '최': '崔', '정': '鄭', '강': '姜', '조': '趙', '윤': '尹', '장': '張',
+    '서': '徐', '지': '池', '한': '韓', '안': '安', '양': '梁', '손': '孫', '배': '裵', '고': '高', '문': '文',
+    '송': '宋', '임': '林', '전': '全', '오': '吳', '백': '白', '남': '南', '심': '沈', '노': '盧', '하': '河',
+    '곽': '郭', '성': '成', '차': '車', '주': '周', '위': '韋', '구': '具', '신': '申', '국': '國', '태': '太',
+    '공': '孔', '마': '馬', '반': '潘', '민': '閔', '엄': '嚴', '유': '柳', '홍': '洪', '허': '許',
+    '남궁': '南宮', '사공': '司空', '제갈': '諸葛', '독고': '獨孤', '황보': '皇甫', '선우': '鮮于'
+}
+
+DEFAULT_HANJA_SURNAME = '金'
+
+# 배치 샘플링용 코드포인트 배열 (정수 인덱스 → 문자)
+_SURNAME_CODES = np.array([ord(c) for c in SURNAME_SYLLABLES], dtype=np.uint32)
+_NAME_CODES = np.array([ord(c) for c in NAME_SYLLABLES], dtype=np.uint32)
+_HANJA_CODES = np.array([ord(c) for c in HANJA_CHARS], dtype=np.uint32)
+# 성씨 음절 인덱스 → 성씨 한자 코드포인트 (생성 음절은 모두 1글자 성씨)
+_SURNAME_HANJA_CODES = np.array([ord(HANJA_SURNAMES.get(c, DEFAULT_HANJA_SURNAME)) for c in SURNAME_SYLLABLES],
+                                dtype=np.uint32)
 
 # --- 기본 데이터 생성 함수 ---
 
-def generate_name():
+def generate_name(rng: RNGContext = None):
     """ 한국어 이름 음절들로 자연스러운 가짜 이름을 생성합니다. """
-    
-    # 성씨에 쓰이는 음절들 (1글자)
-    surname_syllables = [
-        "강", "갑", "갈", "감", "갓", "갖", "개", "객", "갠", "갤", "거", "건", "걸", "검", "겁", "게", "겨", "격", "견", "결",
-        "경", "계", "고", "곡", "곤", "골", "곰", "곱", "공", "곶", "과", "관", "광", "괘", "괴", "교", "구", "국", "군", "굴",
-        "굿", "궁", "권", "귀", "규", "근", "글", "금", "급", "기", "긴", "길", "김", "까", "깅", "나", "낙", "난", "날", "남",
-        "납", "낭", "내", "냉", "너", "널", "네", "녕", "노", "녹", "논", "놀", "농", "뇌", "누", "눈", "눌", "능", "다", "단",
-        "달", "담", "답", "당", "대", "댁", "더", "덕", "도", "독", "돈", "동", "두", "둔", "득", "등", "라", "락", "란", "람",
-        "랑", "래", "량", "려", "력", "련", "렬", "렴", "렵", "령", "례", "로", "록", "론", "롱", "료", "루", "류", "륙", "륜",
-        "률", "륭", "르", "름", "릉", "리", "린", "림", "립", "링", "마", "막", "만", "말", "맘", "망", "매", "맥", "맹", "머",
-        "먹", "멀", "멈", "멍", "메", "멘", "멸", "명", "모", "목", "몰", "몸", "몽", "뫼", "무", "묵", "문", "물", "뭄", "미",
-        "민", "밀", "밈", "밍", "바", "박", "반", "발", "밤", "밥", "방", "배", "백", "뱀", "버", "번", "벌", "범", "법", "벽",
-        "변", "별", "병", "보", "복", "본", "볼", "봄", "봉", "부", "북", "분", "불", "붐", "붕", "브", "블", "비", "빈", "빌",
-        "빔", "빙", "빚", "빛", "사", "삭", "산", "살", "삼", "삽", "상", "새", "색", "생", "서", "석", "선", "설", "섬", "섭",
-        "성", "세", "센", "셜", "소", "속", "손", "솔", "솜", "송", "쇄", "수", "숙", "순", "술", "숨", "숭", "스", "슬", "습",
-        "승", "시", "신", "실", "심", "십", "싱", "쌍", "쏘", "쓰", "씨", "아", "악", "안", "알", "암", "압", "앙", "애", "액",
-        "앵", "야", "약", "얀", "양", "어", "억", "언", "얼", "엄", "업", "에", "여", "역", "연", "열", "염", "엽", "영", "예",
-        "오", "옥", "온", "올", "옴", "옹", "와", "완", "왈", "왕", "외", "요", "욕", "용", "우", "욱", "운", "울", "움", "웅",
-        "원", "월", "위", "유", "육", "윤", "율", "융", "으", "은", "을", "음", "응", "의", "이", "익", "인", "일", "임", "입",
-        "잉", "자", "작", "잔", "잠", "잡", "장", "재", "쟁", "저", "적", "전", "절", "점", "정", "제", "조", "족", "존", "종",
-        "주", "죽", "준", "줄", "중", "즐", "즉", "즉", "증", "지", "직", "진", "질", "짐", "집", "징", "차", "착", "찬", "찰",
-        "참", "창", "채", "책", "처", "척", "천", "철", "첨", "청", "체", "초", "촉", "총", "최", "추", "축", "춘", "출", "충",
-        "취", "측", "층", "치", "친", "칠", "침", "칭", "카", "칸", "칼", "캄", "캅", "캉", "커", "컨", "컬", "컴", "컵", "케",
-        "켄", "코", "콘", "콜", "콤", "콩", "쾌", "크", "큰", "클", "큼", "키", "킨", "킬", "킴", "킹", "타", "탁", "탄", "탈",
-        "탐", "탑", "탕", "태", "택", "탱", "터", "턱", "턴", "털", "텀", "텝", "테", "텐", "토", "톤", "톨", "톰", "통", "퇴",
-        "투", "툰", "툴", "툼", "트", "틀", "틈", "티", "틴", "틸", "팀", "팅", "파", "팍", "팎", "판", "팔", "팜", "팝", "팡",
-        "패", "팩", "팬", "퍼", "펀", "펄", "펌", "펍", "페", "펜", "편", "펼", "평", "폐", "포", "폭", "폰", "폴", "폼", "퐁",
-        "표", "푸", "푹", "푼", "풀", "품", "풍", "프", "플", "픔", "피", "핀", "필", "핌", "핑", "하", "학", "한", "할", "함",
-        "합", "항", "해", "핵", "행", "향", "허", "헌", "헐", "험", "헙", "헝", "혀", "혁", "현", "혈", "혐", "협", "형", "혜",
-        "호", "혹", "혼", "홀", "홈", "홉", "홍", "화", "확", "환", "활", "황", "홰", "횃", "회", "획", "횡", "효", "후", "훅",
-        "훈", "훌", "훔", "훨", "휘", "휜", "휠", "휩", "휭", "흄", "흉", "흐", "흑", "흔", "흘", "흠", "흡", "흥", "희", "흰",
-        "히", "힌", "힐", "힘"
-    ]
-    
-    # 이름에 쓰이는 음절들 (자주 쓰이는 것들)
-    name_syllables = [
-        "가", "간", "갈", "감", "강", "개", "건", "걸", "검", "게", "겨", "격", "견", "결", "경", "계", "고", "곡", "곤", "골",
-        "공", "과", "관", "광", "교", "구", "국", "군", "굴", "궁", "권", "규", "근", "글", "금", "기", "긴", "길", "김", "나",
-        "낙", "난", "날", "남", "낭", "내", "냉", "너", "널", "네", "노", "녹", "논", "농", "누", "눈", "능", "다", "단", "달",
-        "담", "당", "대", "더", "덕", "도", "독", "돈", "동", "두", "둔", "득", "등", "라", "락", "란", "람", "랑", "래", "량",
-        "려", "력", "련", "렬", "령", "례", "로", "록", "론", "료", "루", "류", "륜", "률", "르", "름", "리", "린", "림", "립",
-        "마", "막", "만", "말", "망", "매", "맥", "머", "먹", "멀", "멍", "메", "명", "모", "목", "몰", "몸", "무", "묵", "문",
-        "물", "미", "민", "밀", "밍", "바", "박", "반", "발", "밤", "방", "배", "백", "버", "번", "벌", "범", "법", "변", "별",
-        "병", "보", "복", "본", "볼", "봄", "봉", "부", "북", "분", "불", "붕", "비", "빈", "빌", "빛", "사", "삭", "산", "살",
-        "삼", "상", "새", "색", "생", "서", "석", "선", "설", "섬", "성", "세", "소", "속", "손", "솔", "송", "수", "숙", "순",
-        "술", "숨", "승", "시", "신", "실", "심", "싱", "아", "악", "안", "알", "암", "앙", "애", "야", "약", "양", "어", "억",
-        "언", "얼", "엄", "에", "여", "역", "연", "열", "염", "영", "예", "오", "옥", "온", "올", "옴", "용", "우", "욱", "운",
-        "울", "움", "원", "월", "위", "유", "육", "윤", "율", "융", "은", "을", "음", "응", "의", "이", "익", "인", "일", "임",
-        "입", "자", "작", "잔", "장", "재", "저", "적", "전", "절", "점", "정", "제", "조", "족", "종", "주", "죽", "준", "줄",
-        "중", "즉", "증", "지", "직", "진", "질", "짐", "집", "차", "착", "찬", "참", "창", "채", "처", "천", "철", "청", "체",
-        "초", "총", "최", "추", "축", "춘", "출", "충", "취", "치", "친", "칠", "침", "카", "칸", "컬", "케", "코", "큰", "클",
-        "키", "킨", "킬", "타", "탁", "탄", "탈", "탐", "탕", "태", "택", "터", "턴", "테", "토", "톤", "통", "투", "툰", "트",
-        "티", "틴", "파", "판", "팔", "팜", "팡", "패", "퍼", "펀", "펄", "페", "편", "평", "포", "폭", "폰", "표", "푸", "풀",
-        "품", "풍", "프", "피", "핀", "필", "하", "학", "한", "할", "함", "합", "항", "해", "행", "향", "허", "헌", "현", "혈",
-        "형", "혜", "호", "혹", "혼", "홀", "홈", "홍", "화", "확", "환", "활", "황", "회", "효", "후", "훈", "훌", "휘", "흰",
-        "희", "히", "힘"
-    ]
-    
+    rng = resolve(rng)
     # 성씨 (1글자)
-    surname = random.choice(surname_syllables)
+    surname = rng.choice(SURNAME_SYLLABLES)
     
     # 이름 (2글자)
-    name_part = random.choice(name_syllables) + random.choice(name_syllables)
+    name_part = rng.choice(NAME_SYLLABLES) + rng.choice(NAME_SYLLABLES)
     
     return f"{surname}{name_part}"
 
-def generate_hanja_name(name):
+def _split_surname(name):
+    """ 이름을 (성, 이름)으로 나눕니다. (복성 처리) """
+    if len(name) >= 2 and name[:2] in HANJA_SURNAMES:
+        return name[:2], name[2:]
+    return name[0], name[1:]
+
+def generate_hanja_name(name, rng: RNGContext = None):
     """
     주어진 한글 이름에 대해 랜덤 한자 이름을 생성합니다.
     모든 이름에 한자가 나오도록 보장합니다.
     """
-    # 더 많은 한자 문자 추가
-    hanja_chars = "明俊瑞娟智宇道潤夏恩秀斌美英愛善良德仁義禮智信忠孝慈愛和平喜樂福慧賢淑雅純淸潔"
-    
-    # 성씨에 대한 한자 매핑 (더 많은 성씨 추가)
-    surname_map = {
-        '김': '金', '이': '李', '박': '朴', '최': '崔', '정': '鄭', '강': '姜', '조': '趙', '윤': '尹', '장': '張',
-        '서': '徐', '지': '池', '한': '韓', '안': '安', '양': '梁', '손': '孫', '배': '裵', '고': '高', '문': '文',
-        '송': '宋', '임': '林', '전': '全', '오': '吳', '백': '白', '남': '南', '심': '沈', '노': '盧', '하': '河',
-        '곽': '郭', '성': '成', '차': '車', '주': '周', '위': '韋', '구': '具', '신': '申', '국': '國', '태': '太',
-        '공': '孔', '마': '馬', '반': '潘', '민': '閔', '엄': '嚴', '유': '柳', '홍': '洪', '신': '申', '허': '許',
-        '남궁': '南宮', '사공': '司空', '제갈': '諸葛', '독고': '獨孤', '황보': '皇甫', '선우': '鮮于'
-    }
-    
+    rng = resolve(rng)
     # 복성 처리
-    if len(name) >= 2 and name[:2] in surname_map:
-        surname = name[:2]
-        given_name = name[2:]
-    else:
-        surname = name[0]
-        given_name = name[1:]
+    surname, given_name = _split_surname(name)
     
     # 성씨 한자 (매핑이 없으면 기본 한자 사용)
-    hanja_surname = surname_map.get(surname, '金')  # 기본값으로 '金' 사용
+    hanja_surname = HANJA_SURNAMES.get(surname, DEFAULT_HANJA_SURNAME)
     
     # 이름 한자 (최소 1글자 보장)
     if len(given_name) == 0:
         given_name = "철"  # 기본 이름
     
-    hanja_given_name = "".join(random.choices(hanja_chars, k=len(given_name)))
+    hanja_given_name = "".join(rng.choices(HANJA_CHARS, k=len(given_name)))
     
     result = f"{hanja_surname}{hanja_given_name}"
     
@@ -118,49 +141,120 @@ def generate_hanja_name(name):
     
     return result
 
-def generate_address():
+def _codes_to_strings(codes):
+    """ (N, K) 코드포인트 배열을 길이 K 문자열 N개로 변환합니다. (문자열 객체는 tolist에서만 생성) """
+    codes = np.ascontiguousarray(codes, dtype=np.uint32)
+    return codes.view(f'<U{codes.shape[1]}').ravel().tolist()
+
+def _numpy_generator(rng):
+    """ RNGContext / numpy Generator / None을 배치 샘플링용 numpy Generator로 맞춥니다. """
+    if isinstance(rng, np.random.Generator):
+        return rng
+    return resolve(rng).generator
+
+def generate_names(n, rng=None):
+    """ 이름 N개를 한 번에 생성합니다. (성 1글자 + 이름 2글자, 정수 인덱스 배열로 샘플링)
+    
+    Args:
+        n: 생성할 이름 수
+        rng: RNGContext 또는 numpy Generator (기본: 프로세스 기본 컨텍스트)
+    """
+    return generate_names_with_hanja(n, rng)[0]
+
+def generate_names_with_hanja(n, rng=None):
+    """ 이름 N개와 대응하는 한자 이름 N개를 한 번에 생성합니다.
+    
+    성씨 음절 인덱스로 성씨 한자를 바로 찾으므로 문자열 파싱 없이 벡터화됩니다.
+    
+    Returns:
+        (이름 목록, 한자 이름 목록)
+    """
+    rng = _numpy_generator(rng)
+    surname_idx = rng.integers(0, len(_SURNAME_CODES), n)
+    given_idx = rng.integers(0, len(_NAME_CODES), (n, 2))
+    hanja_idx = rng.integers(0, len(_HANJA_CODES), (n, 2))
+    
+    names = np.empty((n, 3), dtype=np.uint32)
+    names[:, 0] = _SURNAME_CODES[surname_idx]
+    names[:, 1:] = _NAME_CODES[given_idx]
+    
+    hanja = np.empty((n, 3), dtype=np.uint32)
+    hanja[:, 0] = _SURNAME_HANJA_CODES[surname_idx]
+    hanja[:, 1:] = _HANJA_CODES[hanja_idx]
+    
+    return _codes_to_strings(names), _codes_to_strings(hanja)
+
+def generate_hanja_names(names, rng=None):
+    """ 임의의 한글 이름 목록에 대한 한자 이름을 한 번에 생성합니다. (복성 처리 포함)
+    
+    이름 부분 한자는 전체 글자 수만큼 한 번에 샘플링한 뒤 이름별로 나눕니다.
+    """
+    rng = _numpy_generator(rng)
+    parts = [_split_surname(name) for name in names]
+    lengths = np.array([max(len(given), 1) for _, given in parts], dtype=np.int64)
+    
+    picks = rng.integers(0, len(HANJA_CHARS), int(lengths.sum()))
+    given_chars = _codes_to_strings(_HANJA_CODES[picks].reshape(-1, 1))
+    
+    result = []
+    offset = 0
+    for (surname, _), length in zip(parts, lengths):
+        hanja_surname = HANJA_SURNAMES.get(surname, DEFAULT_HANJA_SURNAME)
+        result.append(hanja_surname + "".join(given_chars[offset:offset + length]))
+        offset += length
+    return result
+
+def generate_address(rng: RNGContext = None):
     """ 랜덤 한국 주소를 생성합니다. """
-    return fake.address()
+    return resolve(rng).faker().address()
 
-def generate_date(start_date, end_date):
+def generate_date(start_date, end_date, rng: RNGContext = None):
     """ 완전히 무작위 숫자로 가짜 날짜를 생성합니다. (YYYY.MM.DD 형식) """
+    rng = resolve(rng)
     # 완전 임의 숫자 (형식만 맞춤)
-    part1 = random.randint(1000, 9999)  # 4자리
-    part2 = random.randint(10, 99)      # 2자리  
-    part3 = random.randint(10, 99)      # 2자리
+    part1 = rng.randint(1000, 9999)  # 4자리
+    part2 = rng.randint(10, 99)      # 2자리  
+    part3 = rng.randint(10, 99)      # 2자리
     
     return f"{part1}.{part2}.{part3}"
 
-def generate_jumin(birthdate_str, gender, jumin_disclosure="CLOSE"):
+def generate_jumin(birthdate_str, gender, jumin_disclosure="CLOSE", rng: RNGContext = None):
     """ 완전히 무작위 숫자로 가짜 주민등록번호를 생성합니다. 
     
     Args:
         birthdate_str: 생년월일 (사용하지 않음, 완전 무작위)
         gender: 성별 (사용하지 않음, 완전 무작위)
         jumin_disclosure: "OPEN"이면 전체 공개, "CLOSE"이면 뒷자리 마스킹
+        rng: 난수 컨텍스트
     """
+    rng = resolve(rng)
     # 완전 임의의 6자리 숫자 (아무 의미 없음)
-    fake_digits = f"{random.randint(100000, 999999):06d}"
+    fake_digits = f"{rng.randint(100000, 999999):06d}"
     
     # 임의의 성별 코드 (1-9, 더 다양하게)
-    gender_digit = random.randint(1, 9)
+    gender_digit = rng.randint(1, 9)
     
     if jumin_disclosure == "CLOSE":
         # 뒷자리 미공개: 123456-1******
         return f"{fake_digits}-{gender_digit}******"
     else:
         # 전체 공개: 123456-1234567
-        fake_suffix = f"{random.randint(100000, 999999):06d}"
+        fake_suffix = f"{rng.randint(100000, 999999):06d}"
         return f"{fake_digits}-{gender_digit}{fake_suffix}"
 
-def generate_household_data():
+def generate_household_data(data_mode="random", since_day=0, rng: RNGContext = None):
     """
     세대구성 사유 및 일자를 생성합니다.
+    (realistic 모드에서는 since_day(날짜 테이블 인덱스) 이후의 실제 날짜)
     """
-    # 세대구성 일자는 랜덤 날짜로 생성 (YYYY-MM-DD 형식)
-    household_date = generate_date(None, None)  # 무작위 날짜
-    if '.' in household_date:  # YYYY.MM.DD 형식인 경우
-        household_date = household_date.replace('.', '-')  # YYYY-MM-DD 형식으로 변경
+    rng = resolve(rng)
+    if data_mode == "realistic":
+        household_date = realistic_data.date_tables()["dash"][realistic_data.sample_day_between(since_day, rng=rng)]
+    else:
+        # 세대구성 일자는 랜덤 날짜로 생성 (YYYY-MM-DD 형식)
+        household_date = generate_date(None, None, rng)  # 무작위 날짜
+        if '.' in household_date:  # YYYY.MM.DD 형식인 경우
+            household_date = household_date.replace('.', '-')  # YYYY-MM-DD 형식으로 변경
     
     # 세대구성 사유 생성 (가중치 적용)
     household_reasons = [
@@ -168,126 +262,323 @@ def generate_household_data():
         "이혼", "입양", "이전세대주전출", "세대주변경", "기타", "사망"
     ]
     weights = [30, 20, 15, 12, 8, 5, 3, 3, 2, 1, 1]  # 총 100%
-    household_reason = random.choices(household_reasons, weights=weights)[0]
+    household_reason = rng.choices(household_reasons, weights=weights)[0]
     
     return {
         "HOUSEHOLD_REASON": household_reason,
         "HOUSEHOLD_DATE": household_date
     }
 
+# --- 레코드 자료형 ---
+
+# Person 속성 ↔ 평탄화 키 접미사 (기존 create_person dict 키 순서와 동일)
+PERSON_FIELDS = (
+    ("relation", "RELATION"),
+    ("name", "NAME"),
+    ("name_cn", "NAME_CN"),
+    ("birth", "BIRTH"),
+    ("event_date", "EVENT_DATE"),
+    ("jumin", "JUMIN"),
+    ("gender", "GENDER"),
+    ("origin", "ORIGIN"),
+    ("report_date", "REPORT_DATE"),
+    ("status", "STATUS"),
+    ("change_reason", "CHANGE_REASON"),
+    ("number", "NUMBER"),
+)
+
+@lru_cache(maxsize=None)
+def person_field_keys(prefix: str) -> Tuple[Tuple[str, str], ...]:
+    """접두사별 (속성명, 평탄화 키) 목록 - 예: ("name", "MEMBER3_NAME") (한 번만 만들어 재사용)"""
+    return tuple((attr, f"{prefix}_{suffix}") for attr, suffix in PERSON_FIELDS)
+
+@dataclass(slots=True)
+class Person:
+    """한 사람의 데이터 (dict 대신 __slots__ 객체 → 대량 배치 메모리 절약)"""
+    relation: str
+    name: str
+    name_cn: str
+    birth: str
+    event_date: str
+    jumin: str
+    gender: str
+    origin: str
+    report_date: str
+    status: str
+    change_reason: str
+    number: Optional[str] = None  # 주민등록등본 세대원 번호 (없으면 평탄화에서 제외)
+
+    def to_dict(self) -> Dict[str, str]:
+        """기존 create_person 형식의 dict (RELATION, NAME, ...)"""
+        return {suffix: value for (attr, suffix) in PERSON_FIELDS
+                if (value := getattr(self, attr)) is not None}
+
+@dataclass(slots=True)
+class DocumentRecord:
+    """문서 한 장의 데이터 레코드 (템플릿이 직접 렌더링 가능)
+    
+    fields: 문서 단위 필드 (BASE_ADDRESS, APPLICANT, ISSUER_TOP, ...)
+    persons: (접두사, Person) 목록 - 접두사는 MAIN, PARENT1, SPOUSE, CHILD1, MEMBER1, ...
+    """
+    doc_type: str
+    fields: Dict[str, str] = field(default_factory=dict)
+    persons: List[Tuple[str, Person]] = field(default_factory=list)
+
+    def person(self, prefix: str) -> Optional[Person]:
+        """접두사로 사람을 찾습니다. (없으면 None)"""
+        for person_prefix, person in self.persons:
+            if person_prefix == prefix:
+                return person
+        return None
+
+    def iter_items(self) -> Iterator[Tuple[str, str]]:
+        """(평탄화 키, 값)을 기존 create_record dict와 같은 순서로 순회합니다.
+        
+        순서: 본인(MAIN) → 문서 필드 → 가족/세대원
+        """
+        for prefix, person in self.persons:
+            if prefix == "MAIN":
+                yield from _person_items(prefix, person)
+        yield from self.fields.items()
+        for prefix, person in self.persons:
+            if prefix != "MAIN":
+                yield from _person_items(prefix, person)
+
+    def to_flat_dict(self) -> Dict[str, str]:
+        """기존 평탄화 dict (MAIN_NAME, MEMBER3_JUMIN, ...)"""
+        return dict(self.iter_items())
+
+def _person_items(prefix: str, person: Person) -> Iterator[Tuple[str, str]]:
+    """사람 한 명의 (평탄화 키, 값) 순회 (None 값은 제외)"""
+    for attr, key in person_field_keys(prefix):
+        value = getattr(person, attr)
+        if value is not None:
+            yield key, value
+
 # --- 핵심 함수: 데이터 레코드 생성 ---
 
-def create_person(relationship, min_age=0, max_age=80, jumin_disclosure="CLOSE"):
-    """ 한 사람에 대한 데이터 묶음을 생성합니다. 
+def generate_person(relationship, min_age=0, max_age=80, jumin_disclosure="CLOSE", data_mode="random",
+                    rng: RNGContext = None, name=None, name_cn=None) -> Person:
+    """ 한 사람에 대한 데이터를 Person으로 생성합니다. 
     
     Args:
         relationship: 관계 (본인, 부, 모, 자녀 등)
-        min_age: 최소 연령 (사용하지 않음)
-        max_age: 최대 연령 (사용하지 않음)
+        min_age: 최소 연령 (realistic 모드에서만 사용)
+        max_age: 최대 연령 (realistic 모드에서만 사용)
         jumin_disclosure: "OPEN"이면 주민번호 전체 공개, "CLOSE"이면 뒷자리 마스킹
+        data_mode: "random"(형식만 맞춘 무작위) 또는 "realistic"(유효한 날짜·주민번호)
+        rng: 난수 컨텍스트 (같은 시드 → 같은 사람)
+        name, name_cn: 미리 만든 이름·한자 이름 (generate_names_with_hanja 배치, 생략하면 새로 생성)
     """
-    name = generate_name()
-    gender = random.choice(["남", "여"])
-    birthdate = generate_date(None, None)  # 무작위 날짜
-    
-    person_data = {
-        "RELATION": relationship,
-        "NAME": name,
-        "NAME_CN": generate_hanja_name(name),
-        "BIRTH": birthdate,
-        "EVENT_DATE": random.choices(
+    rng = resolve(rng)
+    if name is None:
+        name = generate_name(rng)
+        name_cn = generate_hanja_name(name, rng)
+    elif name_cn is None:
+        name_cn = generate_hanja_name(name, rng)
+    if data_mode == "realistic":
+        return _generate_realistic_person(relationship, min_age, max_age, jumin_disclosure, rng, name, name_cn)
+    
+    gender = rng.choice(["남", "여"])
+    birthdate = generate_date(None, None, rng)  # 무작위 날짜
+    
+    return Person(
+        relation=relationship,
+        name=name,
+        name_cn=name_cn,
+        birth=birthdate,
+        event_date=rng.choices(
             ["", "-------", "1212-23-23"],  # 빈칸, 대시, 날짜
             weights=[5, 42.5, 42.5]  # 가중치
         )[0], # 주민등록등본용 발생일
-        "JUMIN": generate_jumin(birthdate, gender, jumin_disclosure=jumin_disclosure),
-        "GENDER": gender,
-        "ORIGIN": random.choice(["김해", "전주", "경주", "밀양", "안동"]), # 본관 예시
-        "REPORT_DATE": generate_date(None, None),  # 무작위 날짜
-        "STATUS": "거주자",
-        "CHANGE_REASON": random.choices(
+        jumin=generate_jumin(birthdate, gender, jumin_disclosure=jumin_disclosure, rng=rng),
+        gender=gender,
+        origin=rng.choice(["김해", "전주", "경주", "밀양", "안동"]), # 본관 예시
+        report_date=generate_date(None, None, rng),  # 무작위 날짜
+        status="거주자",
+        change_reason=rng.choices(
             ["", "전입", "전출", "출생등록", "분가", "세대합가", "혼인", "이혼", "기타"],
             weights=[30, 35, 14, 7, 5.6, 3.5, 2.8, 1.4, 0.7]  # 30% 공란, 전입이 35% 확률로 가장 많이
         )[0]
-    }
-    
+    )
+
+def _generate_realistic_person(relationship, min_age, max_age, jumin_disclosure, rng: RNGContext,
+                               name, name_cn) -> Person:
+    """ realistic 모드: 나이 범위 안의 실제 생년월일과 그에 맞는 주민번호·발생일·신고일 """
+    return _generate_realistic_people([relationship], [(min_age, max_age)], jumin_disclosure, rng,
+                                      [(name, name_cn)])[0]
+
+def _generate_realistic_people(relationships, age_ranges, jumin_disclosure, rng: RNGContext, names) -> List[Person]:
+    """ realistic 모드 여러 명을 한 번에 생성 (성별·생년월일·주민번호·발생일·신고일은 numpy 배치)
+
+    Args:
+        relationships: 관계 목록
+        age_ranges: 사람별 (최소 나이, 최대 나이)
+        names: 사람별 (이름, 한자 이름)
+    """
+    min_ages, max_ages = zip(*age_ranges)
+    people = realistic_data.generate_realistic_people(
+        len(relationships), list(min_ages), list(max_ages), rng, jumin_disclosure,
+        genders=[realistic_data.RELATION_GENDERS.get(rel) for rel in relationships])
+    
+    persons = []
+    for i, (relationship, (name, name_cn)) in enumerate(zip(relationships, names)):
+        # 발생일은 기존과 같은 비율로 빈칸/대시/날짜 (날짜는 출생 이후)
+        event_date = rng.choices(["", "-------", None], weights=[5, 42.5, 42.5])[0]
+        persons.append(Person(
+            relation=relationship,
+            name=name,
+            name_cn=name_cn,
+            birth=people["birth"][i],
+            event_date=people["event"][i] if event_date is None else event_date,
+            jumin=people["jumin"][i],
+            gender=people["gender"][i],
+            origin=rng.choice(["김해", "전주", "경주", "밀양", "안동"]),
+            report_date=people["report"][i],  # 발생일 이후 신고
+            status="거주자",
+            change_reason=rng.choices(
+                ["", "전입", "전출", "출생등록", "분가", "세대합가", "혼인", "이혼", "기타"],
+                weights=[30, 35, 14, 7, 5.6, 3.5, 2.8, 1.4, 0.7]
+            )[0]
+        ))
+    return persons
+
+def _generate_family(family, main_age, jumin_disclosure, data_mode, names, rng: RNGContext):
+    """ [(접두어, 관계, 기본 나이 범위)] → [(접두어, Person)] (realistic 모드는 가족 전체를 한 번의 배치로 생성) """
+    if not family:
+        return []
+    relationships = [rel for _, rel, _ in family]
+    age_ranges = [_age_range(rel, main_age, data_mode, default_ages) for _, rel, default_ages in family]
+    if data_mode == "realistic":
+        persons = _generate_realistic_people(relationships, age_ranges, jumin_disclosure, rng, names)
+    else:
+        persons = [generate_person(rel, min_age=min_age, max_age=max_age, jumin_disclosure=jumin_disclosure,
+                                   data_mode=data_mode, rng=rng, name=name, name_cn=name_cn)
+                   for rel, (min_age, max_age), (name, name_cn) in zip(relationships, age_ranges, names)]
+    return [(prefix, person) for (prefix, _, _), person in zip(family, persons)]
+
+def create_person(relationship, min_age=0, max_age=80, jumin_disclosure="CLOSE", data_mode="random",
+                  rng: RNGContext = None):
+    """ 한 사람에 대한 데이터 묶음을 dict로 생성합니다. (기존 호환용, generate_person 참고) """
     # 주민등록등본용 번호는 나중에 추가
-    return person_data
+    return generate_person(relationship, min_age, max_age, jumin_disclosure, data_mode, rng).to_dict()
+
+def _age_range(relationship, main_age, data_mode, default):
+    """ realistic 모드에서는 본인 나이 기준 관계별 나이 범위, random 모드에서는 기존 인자 그대로 """
+    if data_mode == "realistic":
+        return realistic_data.relative_age_range(relationship, main_age)
+    return default
 
-def create_record(doc_type="GA", options=None):
+def create_record(doc_type="GA", options=None, rng: RNGContext = None):
     """
-    한 장의 문서(가족관계증명서 또는 주민등록등본)를 채울 전체 데이터 레코드를 생성합니다.
+    한 장의 문서(가족관계증명서 또는 주민등록등본)를 채울 전체 데이터 레코드를 평탄화 dict로 생성합니다.
+    (템플릿에는 create_document_record의 DocumentRecord를 바로 넘기는 편이 빠릅니다)
+    """
+    return create_document_record(doc_type, options, rng).to_flat_dict()
+
+def create_document_record(doc_type="GA", options=None, rng: RNGContext = None) -> DocumentRecord:
+    """
+    한 장의 문서(가족관계증명서 또는 주민등록등본)를 채울 전체 데이터 레코드를 DocumentRecord로 생성합니다.
+    
+    rng에 문서별 자식 컨텍스트(RNGContext.child)를 넘기면 같은 시드 라벨로 같은 레코드가 다시 만들어집니다.
     """
     if options is None:
         options = {}
+    rng = resolve(rng)
 
     # 주민번호 공개 설정 (기본값: 뒷자리 마스킹)
     jumin_disclosure = options.get("jumin_disclosure", "CLOSE")
+    
+    # 데이터 생성 방식 (기본값: random)
+    data_mode = options.get("data_mode", "random")
+    if data_mode not in DATA_MODES:
+        raise ValueError(f"지원하지 않는 데이터 모드입니다: {data_mode} (지원: {DATA_MODES})")
+
+    # 사람 수를 먼저 정하고 문서의 모든 이름·한자 이름을 한 번에 생성 (정수 인덱스 배치 샘플링)
+    if doc_type == "GA":
+        children_count = options.get("children_count", rng.randint(0, 3))
+        people_count = 3 + (1 if children_count > 0 else 0) + children_count  # 본인·부·모 (+ 배우자) + 자녀
+    elif doc_type == "JU":
+        members_count = options.get("members_count", rng.randint(1, 5))
+        people_count = max(members_count, 1)
+    else:
+        people_count = 1
+    names, names_cn = generate_names_with_hanja(people_count, rng)
+    name_iter = zip(names, names_cn)
 
     # --- 본인(MAIN) 정보 생성 ---
-    main_person = create_person(relationship="본인", min_age=25, max_age=55, jumin_disclosure=jumin_disclosure)
+    name, name_cn = next(name_iter)
+    main_person = generate_person(relationship="본인", min_age=25, max_age=55, jumin_disclosure=jumin_disclosure,
+                                  data_mode=data_mode, rng=rng, name=name, name_cn=name_cn)
+    main_age = realistic_data.age_from_birth(main_person.birth) if data_mode == "realistic" else None
     
-    # 최종적으로 반환될 데이터 딕셔너리
-    record = {}
+    # 최종적으로 반환될 레코드 (문서 필드 + 사람 목록)
+    doc = DocumentRecord(doc_type)
+    record = doc.fields
     
     if doc_type == "GA":
-        record.update({f"MAIN_{key}": value for key, value in main_person.items()})
-        record["BASE_ADDRESS"] = generate_address()
+        doc.persons.append(("MAIN", main_person))
+        record["BASE_ADDRESS"] = generate_address(rng)
     elif doc_type == "JU":
-        record["MAIN_NAME"] = main_person["NAME"]
-        record["MAIN_NAME_CN"] = main_person["NAME_CN"]
-        record["MAIN_BIRTH"] = main_person["BIRTH"]  # 신청인 생년월일 추가
-        record["MAIN_ADDRESS"] = generate_address()
-        record["MAIN_EVENT_DATE"] = generate_date(None, None)  # 무작위 날짜
+        record["MAIN_NAME"] = main_person.name
+        record["MAIN_NAME_CN"] = main_person.name_cn
+        record["MAIN_BIRTH"] = main_person.birth  # 신청인 생년월일 추가
+        record["MAIN_ADDRESS"] = generate_address(rng)
+        if data_mode == "realistic":
+            # 성인이 된 이후의 실제 날짜
+            adult_day = realistic_data.years_after(realistic_data.parse_day(main_person.birth), realistic_data.ADULT_AGE)
+            record["MAIN_EVENT_DATE"] = realistic_data.date_tables()["dot"][realistic_data.sample_day_between(adult_day, rng=rng)]
+        else:
+            adult_day = 0
+            record["MAIN_EVENT_DATE"] = generate_date(None, None, rng)  # 무작위 날짜
         record["MAIN_REPORT_DATE"] = record["MAIN_EVENT_DATE"]
         
         # 세대구성 사유 및 일자 추가
-        household_data = generate_household_data()
+        household_data = generate_household_data(data_mode, since_day=adult_day, rng=rng)
         record.update(household_data)
 
-    record["APPLICANT"] = main_person["NAME"]
-    record["APPLICANT_BIRTH"] = main_person["BIRTH"]
+    record["APPLICANT"] = main_person.name
+    record["APPLICANT_BIRTH"] = main_person.birth
     
     # 발급기관 정보 (상단, 하단 동일)
     cities = ["서울특별시", "부산광역시", "대구광역시", "인천광역시", "광주광역시", "대전광역시", "울산광역시"]
     districts = ["강남구", "강서구", "서초구", "송파구", "영등포구", "마포구", "종로구", "중구", "용산구", "성동구"]
-    issuer_name = f"{random.choice(cities)} {random.choice(districts)}청장"
+    issuer_name = f"{rng.choice(cities)} {rng.choice(districts)}청장"
     record["ISSUER_TOP"] = issuer_name
     record["ISSUER_BOTTOM"] = issuer_name
 
     # --- 문서 종류별 가족/세대원 정보 생성 ---
     if doc_type == "GA":
-        children_count = options.get("children_count", random.randint(0, 3))
-        
-        main_birth_year = int(main_person["BIRTH"][:4])
-        record.update({f"PARENT1_{k}": v for k, v in create_person("부", min_age=main_birth_year - 1960, max_age=main_birth_year - 1930, jumin_disclosure=jumin_disclosure).items()})
-        record.update({f"PARENT2_{k}": v for k, v in create_person("모", min_age=main_birth_year - 1965, max_age=main_birth_year - 1935, jumin_disclosure=jumin_disclosure).items()})
+        main_birth_year = int(main_person.birth[:4])
+        family = [("PARENT1", "부", (main_birth_year - 1960, main_birth_year - 1930)),
+                  ("PARENT2", "모", (main_birth_year - 1965, main_birth_year - 1935))]
 
         # 자녀가 있으면 배우자도 생성
         if children_count > 0:
-            record.update({f"SPOUSE_{k}": v for k, v in create_person("배우자", min_age=25, max_age=55, jumin_disclosure=jumin_disclosure).items()})
+            family.append(("SPOUSE", "배우자", (25, 55)))
 
-        for i in range(children_count):
-            record.update({f"CHILD{i+1}_{k}": v for k, v in create_person("자녀", min_age=0, max_age=24, jumin_disclosure=jumin_disclosure).items()})
+        family += [(f"CHILD{i+1}", "자녀", (0, 24)) for i in range(children_count)]
+        
+        doc.persons += _generate_family(family, main_age, jumin_disclosure, data_mode, list(name_iter), rng)
 
     elif doc_type == "JU":
-        members_count = options.get("members_count", random.randint(1, 5))
-        
         # 첫번째 멤버는 항상 본인(세대주)
-        main_person['NUMBER'] = '1'
-        main_person['RELATION'] = '본인'
-        record.update({f"MEMBER1_{k}": v for k, v in main_person.items()})
+        main_person.number = '1'
+        main_person.relation = '본인'
+        doc.persons.append(("MEMBER1", main_person))
 
         # 나머지 세대원 생성
         relationships = ["배우자", "자녀", "부", "모"]
-        random.shuffle(relationships)
+        rng.shuffle(relationships)
         
-        for i in range(2, members_count + 1):
-            rel = relationships.pop(0) if relationships else "동거인"
-            member = create_person(rel, min_age=0, max_age=80, jumin_disclosure=jumin_disclosure)
-            member['NUMBER'] = str(i)
-            record.update({f"MEMBER{i}_{k}": v for k, v in member.items()})
-    
-    return record
+        family = [(f"MEMBER{i}", relationships.pop(0) if relationships else "동거인", (0, 80))
+                  for i in range(2, members_count + 1)]
+        for i, (prefix, member) in enumerate(_generate_family(family, main_age, jumin_disclosure, data_mode,
+                                                               list(name_iter), rng), start=2):
+            member.number = str(i)
+            doc.persons.append((prefix, member))
+    
+    return doc
 
 # --- 테스트용 실행 블록 ---
 if __name__ == '__main__':
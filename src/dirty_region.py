@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+영역 단위(dirty region) 렌더링
+
+기능:
+- 템플릿마다 작업 버퍼 하나를 계속 유지하고, 문서 사이에 바뀌는 필드 영역만 다시 그림
+- 새 문서를 그리기 전에 직전 문서가 그린 영역만 원본 템플릿에서 복원 (페이지 전체 복사 없음)
+- 텍스트 그리기·블러는 템플릿의 영역 단위 경로(_draw_glyphs)를 그대로 사용 → render와 픽셀 동일
+- 문서당 복원 바이트 수를 집계하여 페이지 전체 복사 대비 메모리 트래픽 확인
+- 배치 생성기(batch_generator, batch_generator_ga)는 템플릿·공개 방식(JU는 세대원 수까지)마다 렌더러 하나를 사용
+  (--full-page로 기존 문서마다 페이지 전체 복사 경로)
+
+사용:
+    renderer = DirtyRegionRenderer(create_template("JU", "JU_template1_TY11"))
+    for record in records:
+        img = renderer.render(record)   # 다음 render 전까지만 유효 (보관하려면 복사)
+        codec.write(path, img)
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+Rect = Tuple[int, int, int, int]
+
+
+class DirtyRegionRenderer:
+    """템플릿 하나에 대한 영역 단위 렌더러 (워커마다 하나씩 사용)"""
+
+    def __init__(self, template, buffer: np.ndarray = None):
+        """
+        Args:
+            template: templates_juga의 템플릿 객체
+            buffer: 작업 버퍼 (템플릿과 같은 shape·dtype, 없으면 새로 만듦)
+        """
+        self.template = template
+        self.buffer = buffer if buffer is not None else np.empty_like(template.template_img)
+        self.dirty_rects: List[Rect] = []
+        self.stats = {"documents": 0, "restored_bytes": 0, "page_bytes": int(template.template_img.nbytes)}
+        self.reset()
+
+    def reset(self):
+        """작업 버퍼 전체를 원본 템플릿으로 되돌립니다."""
+        np.copyto(self.buffer, self.template.template_img)
+        self.dirty_rects = []
+
+    def _restore(self) -> int:
+        """직전 문서가 그린 영역을 원본 템플릿에서 복원하고 복원한 바이트 수를 돌려줍니다."""
+        pristine = self.template.template_img
+        restored = 0
+        for x1, y1, x2, y2 in self.dirty_rects:
+            region = self.buffer[y1:y2, x1:x2]
+            region[...] = pristine[y1:y2, x1:x2]
+            restored += region.nbytes
+        return restored
+
+    def render(self, data) -> np.ndarray:
+        """직전 영역만 복원한 뒤 새 문서를 작업 버퍼에 그립니다. (평탄화 dict 또는 DocumentRecord)
+
+        반환값은 작업 버퍼 자체이므로 다음 render 호출 전까지만 유효합니다.
+        """
+        template = self.template
+        if template.template_img.shape != self.buffer.shape:
+            raise ValueError(f"작업 버퍼 형식이 템플릿과 다릅니다: {self.buffer.shape} / {template.template_img.shape}")
+
+        restored = self._restore()
+        drawn: List[Rect] = []
+        template._render_target, template._dirty_rects = self.buffer, drawn
+        try:
+            result = template.render(data)
+        finally:
+            # 중간에 실패해도 실제로 그린 영역은 다음 복원 대상으로 남김
+            template._render_target, template._dirty_rects = None, None
+            self.dirty_rects = drawn
+
+        self.stats["documents"] += 1
+        self.stats["restored_bytes"] += restored
+        return result
+
+    def traffic_summary(self) -> Dict[str, float]:
+        """문서당 평균 복원 바이트와 페이지 전체 복사 대비 비율"""
+        return summarize_traffic([self.stats])
+
+
+def summarize_traffic(stats_list: Iterable[Dict[str, int]]) -> Dict[str, float]:
+    """렌더러 여러 개의 stats를 합친 문서당 평균 복원 바이트와 페이지 전체 복사 대비 비율
+
+    렌더러를 만들 때의 초기 전체 복사(reset)는 렌더러 수(renderers)로 따로 보고합니다.
+    """
+    stats_list = list(stats_list)
+    documents = sum(stats["documents"] for stats in stats_list)
+    restored = sum(stats["restored_bytes"] for stats in stats_list)
+    # 문서 수로 가중한 평균 페이지 크기 (템플릿마다 크기가 다름)
+    if documents:
+        page = sum(stats["page_bytes"] * stats["documents"] for stats in stats_list) / documents
+    else:
+        page = max((stats["page_bytes"] for stats in stats_list), default=0)
+    avg = restored / documents if documents else 0.0
+    return {
+        "renderers": len(stats_list),
+        "documents": documents,
+        "avg_restored_kb": avg / 1024,
+        "page_kb": page / 1024,
+        "ratio": avg / page if page else 0.0,
+    }
+
+
+def traffic_text(summary: Dict[str, float]) -> str:
+    """트래픽 요약 한 줄 (생성기 출력용)"""
+    return (f"영역 단위 렌더링: 문서당 복원 {summary['avg_restored_kb']:.0f}KB / 페이지 {summary['page_kb']:.0f}KB "
+            f"({summary['ratio']:.1%}), 렌더러 {summary['renderers']}개 초기화")
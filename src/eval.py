@@ -4,26 +4,27 @@
 eval.py   (작성: 2025-08-01 16:08:32 KST)
 -----------------------------------------
 best_b0.pt 가중치를 로드해 dataset/test 으로 성능 측정
+(--grayscale : 1채널 흑백으로 학습한 가중치 평가)
 """
 import torch, timm, argparse, pathlib, seaborn as sns, matplotlib.pyplot as plt
 from torchvision import datasets, transforms
 from sklearn.metrics import classification_report, confusion_matrix
+from train import build_transforms, gray_loader
 
 parser = argparse.ArgumentParser()
 parser.add_argument("--data_dir", type=str, default="dataset/test")
 parser.add_argument("--ckpt",     type=str, default="best_b0.pt")
+parser.add_argument("--grayscale", action="store_true", help="1채널 흑백 입력으로 평가")
 args = parser.parse_args()
 
-tf = transforms.Compose([
-    transforms.Resize((224,224)),
-    transforms.ToTensor(),
-    transforms.Normalize([0.5]*3, [0.5]*3)
-])
-ds  = datasets.ImageFolder(args.data_dir, transform=tf)
+_, tf = build_transforms(args.grayscale)
+loader_kw = {"loader": gray_loader} if args.grayscale else {}
+ds  = datasets.ImageFolder(args.data_dir, transform=tf, **loader_kw)
 loader = torch.utils.data.DataLoader(ds, batch_size=64, shuffle=False,
                                      num_workers=4, pin_memory=True)
 
-model = timm.create_model("efficientnet_b0", num_classes=8)
+model = timm.create_model("efficientnet_b0", num_classes=8,
+                          in_chans=1 if args.grayscale else 3)
 model.classifier = torch.nn.Sequential(
     torch.nn.Dropout(0.3),
     torch.nn.Linear(model.classifier.in_features, 8)
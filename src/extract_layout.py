@@ -6,6 +6,12 @@ from datetime import datetime
 import tkinter as tk
 from tkinter import filedialog
 
+from layout_overlay import FieldBoxes, LayerCompositor, draw_field_box
+from spatial_index import LayoutIndex
+from table_grid import detect_lines
+from layout_autosave import LayoutAutosaver, dump_layout, layout_document
+from layout_variants import EXTENDS_KEY, layout_path, read_layout, variant_document
+
 # --- 설정 파일 경로 ---
 # 이제 이 스크립트는 수정할 필요가 없습니다.
 FIELD_DEFINITIONS_DIR = "configs/field_definitions"
@@ -21,13 +27,15 @@ class LayoutExtractor:
         self.config = config
         self.image_path = image_path
         self.load_yaml_path = load_yaml_path
+        # 불러온 레이아웃이 상속하는 기준 템플릿명 (저장할 때도 차이만 기록)
+        self.layout_base = None
         
         self.window_name = "KDOCS_SYNTH Layout Extractor - [Hover + DEL] to Delete Fields"
         self.original_img = cv2.imread(self.image_path)
         if self.original_img is None:
             raise FileNotFoundError(f"Image not found at {self.image_path}")
 
-        self.layouts = {"field_boxes": {}}
+        self.layouts = {"field_boxes": FieldBoxes()}
         self.points = []
         self.current_box = None # [수정됨] 드래그 중인 박스를 저장
         self.guide_xy = None
@@ -60,7 +68,10 @@ class LayoutExtractor:
         
         # 자동 저장 설정
         self.auto_save = True
-        self.current_autosave_file = None  # 현재 자동저장 파일
+        # 백그라운드 저장 스레드 (편집 저널 + 스냅샷, configs/.autosave/)
+        self.autosaver = LayoutAutosaver(self.image_path, self.config.get('fields', []),
+                                         self.config.get('doc_type', 'UNKNOWN'),
+                                         autosave_dir=os.path.join(CONFIG_DIR, ".autosave"))
         
         # 시각적 피드백 시스템
         self.feedback_message = ""
@@ -89,6 +100,12 @@ class LayoutExtractor:
         # 샘플 이미지 로드
         self.sample_img = self._load_sample_image()
 
+        # 화면 합성: 이미지 + 박스·이름표는 캐시, 이벤트가 있을 때만 다시 그림
+        self.compositor = LayerCompositor(self.original_img, self.sample_img)
+        self.needs_redraw = True
+        # hover·삭제·스냅 조회용 공간 인덱스 (field_boxes가 바뀔 때만 증분 갱신)
+        self.index = LayoutIndex()
+
         # 복사/붙여넣기 변수 추가
         self.copied_box = None  # (width, height) 형태로 저장
 
@@ -96,6 +113,9 @@ class LayoutExtractor:
         """ 메인 루프를 실행하여 프로그램을 시작합니다. """
         self._setup_window()
         self._load_initial_data()
+        self._recover_autosave()
+        if self.auto_save:
+            self.autosaver.start(self.layouts["field_boxes"])
 
         quit_flag = False
         try:
@@ -103,17 +123,22 @@ class LayoutExtractor:
                 # [수정됨] UI 업데이트 타이머 로직 추가
                 if self.feedback_timer > 0:
                     self.feedback_timer -= 1
+                    if self.feedback_timer == 0:
+                        self.needs_redraw = True # 피드백 메시지 지우기
                 if self.exit_confirmation and self.exit_confirmation_timer > 0:
                     self.exit_confirmation_timer -= 1
                     if self.exit_confirmation_timer == 0:
                         self.exit_confirmation = False
                         self._show_feedback("Exit Cancelled", (100, 255, 100))
 
-                display_img = self._draw_ui()
-                cv2.imshow(self.window_name, display_img)
+                # 마우스/키보드 이벤트나 타이머 변화가 있을 때만 다시 그림 (창은 마지막 프레임 유지)
+                if self.needs_redraw:
+                    self.needs_redraw = False
+                    cv2.imshow(self.window_name, self._draw_ui())
                 key = cv2.waitKey(20) & 0xFF
 
                 if key == 255: continue # 키 입력이 없으면 루프 계속
+                self.needs_redraw = True
 
                 # 종료 확인 상태 처리
                 if self.exit_confirmation:
@@ -156,17 +181,27 @@ class LayoutExtractor:
             traceback.print_exc() # [추가됨] 디버깅을 위한 상세 에러 로그
             quit_flag = True
         finally:
-            # Ctrl+Q로 종료한 경우 저장하지 않음
-            if not hasattr(self, 'exit_without_save') or not self.exit_without_save:
-            # 정상 종료 시 최종 저장
-            self._save_layouts()
-            if self.current_autosave_file and os.path.exists(os.path.join(CONFIG_DIR, self.current_autosave_file)):
-                print(f"\n[i] Work also saved in autosave file: {self.current_autosave_file}")
-                print(f"[i] You can load this file next time if needed.")
-            else:
-                print("\n[i] Exited without saving.")
+            self._finish_session()
             cv2.destroyAllWindows()
 
+    def _finish_session(self):
+        """ 종료 처리: 남은 편집을 저널에 기록하고, 정상 종료면 최종 저장 후 자동 저장 파일 정리 """
+        # 남은 편집을 저널에 기록하고 저장 스레드 종료
+        self.autosaver.close()
+        # Ctrl+Q로 종료한 경우 저장하지 않음 - 자동 저장은 지우지 않고 다음 시작 때 복원 여부를 물음
+        # (디스크에 남은 유일한 작업 사본이므로 실수로 누른 Ctrl+Q에도 되살릴 수 있게)
+        if getattr(self, 'exit_without_save', False):
+            print("\n[i] Exited without saving.")
+            if self.autosaver.has_recovery():
+                print(f"[i] Unsaved edits kept in autosave: {self.autosaver.snapshot_path} "
+                      "(you will be asked to restore or discard them on next start)")
+            return
+        # 정상 종료 시 최종 저장 (성공하면 자동 저장 저널은 더 이상 필요 없음)
+        if self._save_layouts():
+            self.autosaver.discard()
+        else:
+            print(f"\n[i] Work kept in autosave: {self.autosaver.snapshot_path} (restored on next start)")
+
 
     def _load_sample_image(self):
         """ 작업 중인 문서 종류에 맞는 샘플 이미지를 찾아서 로드합니다. """
@@ -208,6 +243,7 @@ class LayoutExtractor:
 
     def _mouse_callback(self, event, x, y, flags, param):
         self.mouse_pos = (x, y) # 항상 마우스 위치 업데이트
+        self.needs_redraw = True
 
         if self.mode not in ["DRAW", "MODIFY"]:
             # 편집/리네임 모드에서 클릭 처리
@@ -226,6 +262,10 @@ class LayoutExtractor:
                     self._show_feedback(f"Renaming '{field}'...", (255, 255, 0))
             return
 
+        # 드래그 중이 아니면 스냅 조회도 하지 않음
+        if event in (cv2.EVENT_LBUTTONDOWN, cv2.EVENT_LBUTTONUP) or self.drawing:
+            x, y = self._snap_to_grid(x, y) if self.snap_enabled else (x, y)
+
         # 드래그 시작
         if event == cv2.EVENT_LBUTTONDOWN:
             self.drawing = True
@@ -245,31 +285,20 @@ class LayoutExtractor:
                 self._on_box_drawn() # 박스 그리기 완료 처리
 
     def _snap_to_grid(self, x, y):
-        # 스냅 로직 (가장 가까운 선 또는 점에 붙임)
-        snap_x, snap_y = x, y
-        min_dist_x, min_dist_y = self.snap_distance, self.snap_distance
-
-        # 기존 박스의 모서리에 스냅
-        for p in self.layouts["field_boxes"].values():
-            for px in [p[0], p[2]]:
-                if abs(x - px) < min_dist_x:
-                    min_dist_x = abs(x - px)
-                    snap_x = px
-            for py in [p[1], p[3]]:
-                if abs(y - py) < min_dist_y:
-                    min_dist_y = abs(y - py)
-                    snap_y = py
-        
-        return snap_x, snap_y
+        # 스냅 로직 (가장 가까운 박스 모서리, 격자 표시 중이면 격자선에도 붙임)
+        self.index.sync(self.layouts["field_boxes"])
+        return self.index.snap(x, y, self.snap_distance, use_lines=self.show_grid)
 
     def _load_initial_data(self):
         if self.load_yaml_path and os.path.exists(self.load_yaml_path):
             try:
                 with open(self.load_yaml_path, 'r', encoding='utf-8') as f:
-                    loaded_data = yaml.safe_load(f)
-                    if 'field_boxes' in loaded_data:
-                        self.layouts['field_boxes'] = loaded_data['field_boxes']
-                        print(f"\n[i] Successfully loaded {len(self.layouts['field_boxes'])} fields from '{self.load_yaml_path}'")
+                    self.layout_base = (yaml.safe_load(f) or {}).get(EXTENDS_KEY)
+                loaded_data = read_layout(self.load_yaml_path)  # 변형 레이아웃은 기준 박스까지 합쳐서 편집
+                if 'field_boxes' in loaded_data:
+                    self.layouts['field_boxes'] = FieldBoxes(loaded_data['field_boxes'])
+                    inherited = f" (extends {self.layout_base})" if self.layout_base else ""
+                    print(f"\n[i] Successfully loaded {len(self.layouts['field_boxes'])} fields from '{self.load_yaml_path}'{inherited}")
             except Exception as e:
                 print(f"\n[!] Warning: Could not load or parse YAML file: {e}")
     
@@ -284,11 +313,8 @@ class LayoutExtractor:
         return status_map.get(self.mode, "MODE: UNKNOWN")
 
     def _draw_ui(self):
-        if self.show_sample and self.sample_img is not None:
-            display_img = cv2.addWeighted(self.original_img, 0.5, self.sample_img, 0.5, 0)
-        else:
-            display_img = self.original_img.copy()
-
+        # 정적 레이어(이미지 + 모든 박스·이름표)는 캐시, 아래는 프레임마다 그리는 동적 레이어
+        display_img = self.compositor.frame(self.layouts["field_boxes"], self.show_sample, self.hide_field_names)
         h, w, _ = display_img.shape
 
         if self.show_crosshair:
@@ -299,8 +325,13 @@ class LayoutExtractor:
             if self.crosshair_enhanced:
                 cv2.circle(display_img, self.mouse_pos, 5, color, 2)
 
-        for name, p in self.layouts["field_boxes"].items():
-            is_hovered = p[0] <= self.mouse_pos[0] <= p[2] and p[1] <= self.mouse_pos[1] <= p[3]
+        # 강조할 박스(수정 중·hover)만 기본 스타일 위에 다시 그림
+        self.index.sync(self.layouts["field_boxes"])
+        hovered = self.index.hovered_all(*self.mouse_pos)
+        modified = [self.field_being_modified] if self.field_being_modified in self.layouts["field_boxes"] else []
+        for name in hovered + [n for n in modified if n not in hovered]:
+            p = self.layouts["field_boxes"][name]
+            is_hovered = name in hovered
             
             if name == self.field_being_modified:
                 box_color, text_color, thickness = (0, 255, 255), (0, 255, 255), 4
@@ -309,15 +340,9 @@ class LayoutExtractor:
             elif is_hovered:
                 box_color, text_color, thickness = (255, 100, 255), (255, 255, 255), 3
             else:
-                box_color, text_color, thickness = (0, 255, 0), (0, 255, 0), 2
+                continue
             
-            cv2.rectangle(display_img, (p[0], p[1]), (p[2], p[3]), box_color, thickness)
-            
-            # 필드 이름 숨김 기능
-            if not self.hide_field_names:
-                text_size = cv2.getTextSize(name, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
-                cv2.rectangle(display_img, (p[0], p[1] - 25), (p[0] + text_size[0] + 4, p[1] - 5), (0, 0, 0), -1)
-                cv2.putText(display_img, name, (p[0] + 2, p[1] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, text_color, 2)
+            draw_field_box(display_img, name, p, box_color, text_color, thickness, not self.hide_field_names)
             
             if is_hovered:
                 hint_text = f"[DEL] to delete '{name}'"
@@ -604,47 +629,22 @@ class LayoutExtractor:
         self._show_feedback(f"Field Names: {'HIDDEN' if self.hide_field_names else 'SHOWN'}", (255, 150, 255))
 
     def _detect_table_grid(self):
-        """이미지에서 테이블 격자선을 자동으로 검출합니다."""
+        """이미지에서 테이블 격자선을 자동으로 검출합니다. (투영 프로파일, 병합·중복 제거된 선)"""
         print("\n[i] Detecting table grid lines...")
-        
-        gray = cv2.cvtColor(self.original_img, cv2.COLOR_BGR2GRAY)
-        # 조명 변화에 더 강한 적응형 스레시홀드 사용
-        thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 11, 2)
-        
-        # --- 수평선 검출 ---
-        horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (40, 1))
-        detect_horizontal = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, horizontal_kernel, iterations=2)
-        h_lines = cv2.HoughLinesP(detect_horizontal, 1, np.pi/180, 50, minLineLength=50, maxLineGap=10)
-        
-        # --- 수직선 검출 ---
-        vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 40))
-        detect_vertical = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, vertical_kernel, iterations=2)
-        v_lines = cv2.HoughLinesP(detect_vertical, 1, np.pi/180, 50, minLineLength=50, maxLineGap=10)
-        
-        self.detected_grid = []
-        if h_lines is not None:
-            for line in h_lines:
-                x1, y1, x2, y2 = line[0]
-                self.detected_grid.append(('horizontal', y1, x1, x2))
-        if v_lines is not None:
-            for line in v_lines:
-                x1, y1, x2, y2 = line[0]
-                self.detected_grid.append(('vertical', x1, y1, y2))
-        
+        self.detected_grid = detect_lines(self.original_img)
         self.show_grid = bool(self.detected_grid)
+        self.index.set_grid_lines(self.detected_grid)
         
         if self.detected_grid:
-            h_count = len(h_lines) if h_lines is not None else 0
-            v_count = len(v_lines) if v_lines is not None else 0
+            h_count = sum(1 for line in self.detected_grid if line[0] == 'horizontal')
+            v_count = len(self.detected_grid) - h_count
             print(f"[i] Detected {h_count} horizontal + {v_count} vertical lines. Grid overlay activated.")
         else:
             print("[!] No clear grid lines detected.")
 
     def _get_hovered_field(self):
-        for name, p in self.layouts["field_boxes"].items():
-            if p[0] <= self.mouse_pos[0] <= p[2] and p[1] <= self.mouse_pos[1] <= p[3]:
-                return name
-        return None
+        self.index.sync(self.layouts["field_boxes"])
+        return self.index.hovered(*self.mouse_pos)
 
     def _handle_field_list_navigation(self, key):
         used_fields = set(self.layouts['field_boxes'].keys())
@@ -694,50 +694,36 @@ class LayoutExtractor:
         self.feedback_color = color
         self.feedback_timer = duration
     
-    def _auto_save(self):
-        if not self.layouts["field_boxes"] or not self.auto_save: return
+    def _recover_autosave(self):
+        """이전 세션이 저장 없이 끝났으면(비정상 종료·Ctrl+Q) 스냅샷 + 저널 재생으로 복구할지 묻습니다."""
         try:
-            image_filename = os.path.basename(self.image_path)
-            base_name = os.path.splitext(image_filename)[0]
-            
-            if self.current_autosave_file is None:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                self.current_autosave_file = f"{base_name}_autosave_{timestamp}.yaml"
-            
-            auto_save_path = os.path.join(CONFIG_DIR, self.current_autosave_file)
-            
-            # 필드 정의 파일의 순서대로 정렬
-            sorted_field_boxes = {}
-            if 'fields' in self.config:
-                for field_name in self.config['fields']:
-                    if field_name in self.layouts["field_boxes"]:
-                        sorted_field_boxes[field_name] = self.layouts["field_boxes"][field_name]
-            
-            # 정의되지 않은 필드들도 추가
-            for field_name, coords in self.layouts["field_boxes"].items():
-                if field_name not in sorted_field_boxes:
-                    sorted_field_boxes[field_name] = coords
-            
-            save_layouts = {'field_boxes': sorted_field_boxes}
-            save_layouts['meta'] = {
-                'source_image': image_filename,
-                'extraction_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'doc_type': self.config.get('doc_type', 'UNKNOWN'),
-                'auto_save': True,
-                'field_count': len(self.layouts["field_boxes"])
-            }
-            
-            with open(auto_save_path, 'w', encoding='utf-8') as f:
-                yaml.dump(save_layouts, f, allow_unicode=True, sort_keys=False, indent=4)
-            
-            print(f"[AUTO-SAVE] {len(self.layouts['field_boxes'])} fields -> {self.current_autosave_file}")
+            recovered = self.autosaver.recover()
         except Exception as e:
-            print(f"[AUTO-SAVE ERROR] {e}")
+            print(f"\n[!] Warning: Could not recover autosave: {e}")
+            return
+        if recovered is not None and recovered != dict(self.layouts['field_boxes']):
+            try:
+                answer = input(f"\n[RECOVERY] Unsaved edits found ({len(recovered)} fields, "
+                               f"{self.autosaver.snapshot_path}). Restore? (y/n): ").strip().lower()
+            except EOFError:
+                answer = 'y'  # 입력을 받을 수 없으면 작업을 잃지 않는 쪽으로
+            if answer == 'n':
+                self.autosaver.discard()
+                print("[RECOVERY] Discarded unsaved edits.")
+                return
+            self.layouts['field_boxes'] = FieldBoxes(recovered)
+            print(f"\n[RECOVERY] Restored {len(recovered)} fields from unsaved session ({self.autosaver.snapshot_path})")
+            self._show_feedback(f"Recovered {len(recovered)} fields", (100, 255, 255), 120)
+
+    def _auto_save(self):
+        # 바뀐 필드만 저장 스레드 큐에 넣고 바로 반환 (디스크 I/O는 백그라운드에서)
+        if self.auto_save:
+            self.autosaver.sync(self.layouts["field_boxes"])
 
     def _save_layouts(self):
         if not self.layouts["field_boxes"]:
             print("\nNo layout data was created. Nothing to save.")
-            return
+            return True
 
         try:
             image_filename = os.path.basename(self.image_path)
@@ -745,33 +731,20 @@ class LayoutExtractor:
             output_filename = f"{base_name}_layout.yaml"
             output_path = os.path.join(CONFIG_DIR, output_filename)
 
-            # 필드 정의 파일의 순서대로 정렬
-            sorted_field_boxes = {}
-            if 'fields' in self.config:
-                for field_name in self.config['fields']:
-                    if field_name in self.layouts["field_boxes"]:
-                        sorted_field_boxes[field_name] = self.layouts["field_boxes"][field_name]
-            
-            # 정의되지 않은 필드들도 추가
-            for field_name, coords in self.layouts["field_boxes"].items():
-                if field_name not in sorted_field_boxes:
-                    sorted_field_boxes[field_name] = coords
-
-            self.layouts['meta'] = {
-                'source_image': image_filename,
-                'extraction_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'doc_type': self.config.get('doc_type', 'UNKNOWN'),
-                'field_count': len(self.layouts["field_boxes"])
-            }
-            
-            # 정렬된 필드 박스로 저장
-            save_data = {'field_boxes': sorted_field_boxes, 'meta': self.layouts['meta']}
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                yaml.dump(save_data, f, allow_unicode=True, sort_keys=False, indent=4)
+            # 필드 정의 파일의 순서대로 정렬하여 원자적으로 저장
+            save_data = layout_document(self.layouts["field_boxes"], self.config.get('fields', []),
+                                        image_filename, self.config.get('doc_type', 'UNKNOWN'))
+            self.layouts['meta'] = save_data['meta']
+            if self.layout_base:
+                # 변형 레이아웃은 기준과 다른 박스만 저장
+                base_boxes = read_layout(layout_path(self.layout_base, CONFIG_DIR))['field_boxes']
+                save_data = variant_document(self.layout_base, base_boxes, save_data)
+            dump_layout(output_path, save_data)
             print(f"\nLayout data successfully saved to '{output_path}' (sorted by field definition order)")
+            return True
         except Exception as e:
             print(f"\n[!] Error saving layouts: {e}")
+            return False
     
     def _save_annotated_image_file(self):
         if not self.layouts["field_boxes"]:
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+병렬 파일 복사/이동 엔진 (데이터셋 분할용)
+
+기능:
+- (원본, 대상) 작업 목록을 스레드 풀로 병렬 처리 (파일 I/O 대기 중에는 GIL을 놓으므로 스레드로 충분)
+- 대상 디렉토리는 작업 전에 한 번씩만 생성 (파일마다 mkdir 하지 않음)
+- 복사: 커널 내 복사 os.copy_file_range → os.sendfile → 버퍼 복사 순으로 사용 가능한 방법 선택,
+  임시 파일(.part)에 기록 후 메타데이터(mtime 등)를 복사하고 원자적으로 교체
+- 이동: 같은 파일 시스템이면 os.rename, 다른 파일 시스템이면 복사 후 원본 삭제
+- 이어 하기: 대상이 이미 있고 크기·mtime이 원본과 같으면 건너뜀 (이동은 원본이 없고 대상만 있으면 완료로 봄)
+  → 중단된 분할을 같은 명령으로 다시 실행하면 남은 파일만 처리
+- 진행률·처리량(개/초, MB/초) 주기적 출력, dry-run(실제 기록 없이 처리할 파일 수·용량만 집계)
+
+사용:
+    engine = TransferEngine(threads=8)
+    stats = engine.run([(src, dst), ...], move=False)   # {"copied", "moved", "skipped", "failed", "bytes", ...}
+"""
+
+import errno
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# 한 번의 커널 복사 호출에서 넘기는 최대 바이트 수
+CHUNK_SIZE = 8 * 1024 * 1024
+# 이어 하기 판정 시 mtime 허용 오차 (초) - mtime 해상도가 낮은 파일 시스템(FAT 등) 고려
+MTIME_TOLERANCE = 2.0
+PART_SUFFIX = ".part"
+
+# 결과 종류 (작업마다 하나)
+COPIED, MOVED, SKIPPED, PLANNED, FAILED = "copied", "moved", "skipped", "planned", "failed"
+
+
+def _kernel_copy(src_fd: int, dst_fd: int, size: int) -> bool:
+    """copy_file_range/sendfile로 커널 안에서 복사합니다. (지원하지 않으면 False, 아무것도 쓰지 않음)"""
+    for name in ("copy_file_range", "sendfile"):
+        copy = getattr(os, name, None)
+        if copy is None:
+            continue
+        offset = 0
+        try:
+            while offset < size:
+                if name == "copy_file_range":
+                    sent = copy(src_fd, dst_fd, min(CHUNK_SIZE, size - offset), offset, offset)
+                else:
+                    sent = copy(dst_fd, src_fd, offset, min(CHUNK_SIZE, size - offset))
+                if sent == 0:
+                    break
+                offset += sent
+        except OSError as e:
+            # 파일 시스템·플랫폼 미지원은 처음 호출에서만 나오므로 다음 방법으로 넘어감
+            if offset == 0 and e.errno in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                                           errno.ENOTSOCK, errno.EBADF):
+                continue
+            raise
+        if offset == size:
+            return True
+        if offset:
+            raise OSError(errno.EIO, f"복사가 중간에 끝났습니다 ({offset}/{size} 바이트)")
+    return False
+
+
+def copy_file(src: str, dst: str) -> int:
+    """src를 dst로 복사하고(메타데이터 포함, shutil.copy2와 동일) 복사한 바이트 수를 돌려줍니다."""
+    part = dst + PART_SUFFIX
+    with open(src, "rb") as fsrc, open(part, "wb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        if size and not _kernel_copy(fsrc.fileno(), fdst.fileno(), size):
+            shutil.copyfileobj(fsrc, fdst, CHUNK_SIZE)
+    shutil.copystat(src, part)
+    os.replace(part, dst)
+    return size
+
+
+def move_file(src: str, dst: str) -> int:
+    """src를 dst로 이동합니다. (같은 파일 시스템이면 rename, 아니면 복사 후 원본 삭제)"""
+    size = os.stat(src).st_size
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        copy_file(src, dst)
+        os.remove(src)
+    return size
+
+
+def is_transferred(src: str, dst: str, move: bool = False) -> bool:
+    """이미 처리된 작업인지 확인합니다. (대상의 크기·mtime이 원본과 같거나, 이동 후 원본이 없는 경우)"""
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return False
+    try:
+        src_stat = os.stat(src)
+    except FileNotFoundError:
+        return move  # 이전 실행에서 이미 이동됨
+    return (src_stat.st_size == dst_stat.st_size
+            and abs(src_stat.st_mtime - dst_stat.st_mtime) <= MTIME_TOLERANCE)
+
+
+class _Progress:
+    """여러 스레드에서 갱신하는 진행률·처리량 집계 (interval초마다 한 줄 출력)"""
+
+    def __init__(self, total: int, interval: float, label: str):
+        self.total = total
+        self.interval = interval
+        self.label = label
+        self.done = 0
+        self.bytes = 0
+        self.start = time.time()
+        self._last_report = self.start
+        self._lock = threading.Lock()
+
+    def update(self, size: int):
+        with self._lock:
+            self.done += 1
+            self.bytes += size
+            now = time.time()
+            if self.interval and now - self._last_report >= self.interval and self.done < self.total:
+                self._last_report = now
+                print(f"  {self.label} {self.done}/{self.total} ({self.done / self.total:.0%}) "
+                      f"{self.rate_text(now - self.start)}")
+
+    def rate_text(self, elapsed: float) -> str:
+        elapsed = max(elapsed, 1e-9)
+        return f"{self.done / elapsed:.1f}개/초, {self.bytes / elapsed / 2 ** 20:.1f}MB/초"
+
+
+class TransferEngine:
+    """(원본, 대상) 작업 목록을 스레드 풀로 복사/이동하는 엔진"""
+
+    def __init__(self, threads: int = None, dry_run: bool = False, progress_interval: float = 2.0):
+        """
+        Args:
+            threads: 스레드 수 (기본: CPU 수 × 4, 최대 32 - 디스크·네트워크 대기 시간을 겹치기 위함)
+            dry_run: True면 아무것도 기록하지 않고 처리할 작업만 집계
+            progress_interval: 진행률 출력 간격 (초, 0이면 출력하지 않음)
+        """
+        self.threads = threads or min(32, (os.cpu_count() or 1) * 4)
+        self.dry_run = dry_run
+        self.progress_interval = progress_interval
+
+    def prepare_dirs(self, jobs: Sequence[Tuple[str, str]]) -> int:
+        """대상 디렉토리를 한 번씩만 만듭니다. (만든 디렉토리 수, dry-run이면 0)"""
+        dirs = {os.path.dirname(dst) for _, dst in jobs} - {""}
+        if self.dry_run:
+            return 0
+        for directory in sorted(dirs):
+            os.makedirs(directory, exist_ok=True)
+        return len(dirs)
+
+    def _transfer(self, job: Tuple[str, str], move: bool) -> Tuple[str, int]:
+        """작업 하나 처리 → (결과 종류, 바이트 수)"""
+        src, dst = job
+        if is_transferred(src, dst, move):
+            if move and os.path.exists(src) and not self.dry_run:
+                os.remove(src)  # 복사는 끝났지만 원본 삭제 전에 중단된 경우
+            return SKIPPED, 0
+        if self.dry_run:
+            return PLANNED, os.path.getsize(src)
+        if move:
+            return MOVED, move_file(src, dst)
+        return COPIED, copy_file(src, dst)
+
+    def run(self, jobs: Iterable[Tuple[str, str]], move: bool = False) -> Dict:
+        """작업 목록을 실행합니다.
+
+        Returns:
+            {"copied"|"moved"|"skipped"|"planned": 개수, "failed": [(원본, 오류)], "bytes", "sec", "dirs",
+             "duplicates": 대상이 겹쳐 제외한 작업 수}
+        """
+        # 같은 대상에 여러 원본이 오면 마지막 작업만 (순차 복사의 덮어쓰기 결과와 같고, 스레드 간 경합 방지)
+        requested = list(jobs)
+        targets = {str(dst): str(src) for src, dst in requested}
+        jobs = [(src, dst) for dst, src in targets.items()]
+        stats = {COPIED: 0, MOVED: 0, SKIPPED: 0, PLANNED: 0, FAILED: [], "bytes": 0, "sec": 0.0, "dirs": 0,
+                 "duplicates": len(requested) - len(jobs)}
+        if not jobs:
+            return stats
+        if stats["duplicates"]:
+            print(f"⚠️  대상이 겹치는 작업 {stats['duplicates']}개는 마지막 원본만 처리합니다.")
+
+        label = "(dry-run) " if self.dry_run else ""
+        label += "이동" if move else "복사"
+        stats["dirs"] = self.prepare_dirs(jobs)
+        progress = _Progress(len(jobs), self.progress_interval, label)
+
+        def work(job):
+            try:
+                kind, size = self._transfer(job, move)
+            except OSError as e:
+                kind, size = FAILED, 0
+                stats[FAILED].append((job[0], str(e)))
+            progress.update(size)
+            return kind
+
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            for kind in pool.map(work, jobs):
+                if kind != FAILED:
+                    stats[kind] += 1
+
+        stats["bytes"] = progress.bytes
+        stats["sec"] = time.time() - progress.start
+        done = stats[PLANNED] if self.dry_run else stats[MOVED if move else COPIED]
+        print(f"{label}: {done}/{len(jobs)}개 ({stats['bytes'] / 2 ** 20:.1f}MB), 건너뜀 {stats[SKIPPED]}개, "
+              f"실패 {len(stats[FAILED])}개 | {progress.rate_text(stats['sec'])}, 스레드 {self.threads}")
+        for src, error in stats[FAILED][:5]:
+            print(f"  ❌ {src}: {error}")
+        return stats
+
+
+def split_jobs(split_files: Dict[str, Dict[str, List]], dst_root: str) -> List[Tuple[str, str]]:
+    """{분할: {클래스: 파일 목록}} → [(원본, {dst_root}/{분할}/{클래스}/{파일명})]"""
+    return [(str(path), os.path.join(dst_root, split_name, class_name, os.path.basename(str(path))))
+            for split_name, class_files in split_files.items()
+            for class_name, files in class_files.items()
+            for path in files]
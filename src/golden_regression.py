@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+렌더링 골든 이미지 회귀 검사
+
+기능:
+- assets/templates의 모든 템플릿 × 주민번호 공개(OPEN/CLOSE) × (JU) 세대원 수 1~5 조합을
+  고정 시드 레코드로 렌더링 (케이스마다 시드 = 케이스 ID의 CRC32 → 템플릿이 늘어도 기존 케이스 레코드 유지)
+- 골든은 "잉크 레이어"만 저장: 템플릿 원본과 달라진 픽셀(렌더러가 그린 글자)의 흑백 값, 나머지는 흰색,
+  SCALE 배 축소 PNG (tests/goldens/, 케이스당 약 16KB)
+- 비교: 픽셀 차이(PIXEL_TOL 초과 픽셀이 잉크 픽셀의 MAX_DIFF_RATIO 이하) + 지각 해시(pHash 해밍 거리 PHASH_TOL 이하)
+- 실패하면 골든 | 현재 | 차이(빨강) 이미지를 outputs/golden_diff/에 기록
+- 렌더링 폰트는 저장소에 포함된 tests/golden_font.ttf로 고정 (--font, 배포되지 않는 assets/fonts 대신
+  → 어느 환경에서나 OpenCV 대체 글꼴이 아니라 Pillow FreeType 경로로 렌더링)
+  나눔고딕(NanumGothic 3.021, SIL OFL 1.1)에서 골든 레코드가 실제로 그리는 글자(한글·한자·숫자·기호)만
+  남긴 Unicode cmap 서브셋 (가족명 KdocsGolden, 힌팅 제거) → 골든이 글자 모양까지 고정
+  레코드 생성 규칙이 바뀌어 새 글자가 생기면 --build-font로 서브셋을 다시 만든 뒤 --update
+- 폰트 지문(폰트 파일 해시, Pillow·FreeType·OpenCV 버전)을 골든과 함께 저장하여
+  환경이 다르면 렌더러 회귀가 아니라 환경 차이임을 알림
+- 케이스를 프로세스 풀로 병렬 처리
+
+사용:
+    python src/golden_regression.py                   # 전체 조합 비교 (실패 시 종료 코드 1)
+    python src/golden_regression.py --update          # 골든 다시 생성 (렌더링을 의도적으로 바꾼 경우)
+    python src/golden_regression.py --templates assets/templates/JU/JU_template1_TY00.jpg -w 4
+    python src/golden_regression.py --font "assets/fonts/KoPubWorld Batang Medium.ttf" --golden-dir outputs/goldens_kopub --update
+    python src/golden_regression.py --build-font NanumGothic.ttf --update   # 골든 폰트 서브셋 재생성 (fontTools 필요)
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from lazy_import import lazy_module
+from template_cache import TEMPLATE_DOC_TYPES, TEMPLATE_ROOT, default_template_paths
+
+cv2 = lazy_module("cv2")
+
+GOLDEN_DIR = "tests/goldens"
+DIFF_DIR = "outputs/golden_diff"
+INDEX_FILE = "index.json"
+
+GOLDEN_SEED = 20250101
+DISCLOSURES = ("CLOSE", "OPEN")
+JU_MEMBER_COUNTS = (1, 2, 3, 4, 5)
+
+# 골든 축소 배율 (INTER_AREA - 1px 밀림도 글자 가장자리 값 차이로 남음)
+SCALE = 0.5
+# 이 값보다 큰 밝기 차이만 다른 픽셀로 셈 (안티앨리어싱 미세 차이 허용)
+PIXEL_TOL = 48
+# 다른 픽셀 수 / 잉크 픽셀 수 허용 비율
+MAX_DIFF_RATIO = 0.005
+# pHash 해밍 거리 허용치 (64비트 중)
+PHASH_TOL = 4
+
+# 골든 렌더링 폰트 (저장소에 포함 - 워커에서 templates_juga의 KDOCS_FONT로 지정)
+GOLDEN_FONT = "tests/golden_font.ttf"
+# 서브셋 폰트 이름 (원본 폰트 이름과 구분)
+GOLDEN_FONT_FAMILY = "KdocsGolden"
+
+
+def golden_cases(template_paths: List[str]) -> List[Dict]:
+    """템플릿 이미지 경로 → 케이스 목록 {"id", "doc_type", "template", "disclosure", "count"}
+
+    GA는 템플릿명의 자녀 수(childN), JU는 세대원 수 1~5를 모두 사용합니다.
+    """
+    cases = []
+    for path in template_paths:
+        template_name = os.path.splitext(os.path.basename(path))[0]
+        doc_type = template_name.split('_', 1)[0]
+        if doc_type == "GA":
+            counts = [int(template_name.rsplit("child", 1)[1])]
+        elif doc_type == "JU":
+            counts = list(JU_MEMBER_COUNTS)
+        else:
+            continue
+        for disclosure in DISCLOSURES:
+            for count in counts:
+                cases.append({"id": f"{template_name}-{disclosure}-{count}", "doc_type": doc_type,
+                              "template": template_name, "disclosure": disclosure, "count": count})
+    return cases
+
+
+def case_record(case: Dict):
+    """케이스의 고정 시드 레코드 (DocumentRecord)"""
+    from data_factory import create_document_record
+    from rng_context import RNGContext
+
+    rng = RNGContext(GOLDEN_SEED).child(zlib.crc32(case["id"].encode("utf-8")))
+    key = "children_count" if case["doc_type"] == "GA" else "members_count"
+    return create_document_record(case["doc_type"], {key: case["count"], "jumin_disclosure": case["disclosure"]}, rng=rng)
+
+
+def render_case(case: Dict, font: str = GOLDEN_FONT) -> Dict:
+    """케이스를 font로 렌더링하고 {"page", "template_img", "annotations"}를 돌려줍니다. (렌더러 로그는 숨김)"""
+    from templates_juga import FONT_ENV, create_template
+
+    os.environ[FONT_ENV] = font
+    with contextlib.redirect_stdout(io.StringIO()):
+        template = create_template(case["doc_type"], case["template"], max_members=case["count"],
+                                   mask_jumin=(case["disclosure"] == "CLOSE"))
+        page = template.render(case_record(case))
+    return {"page": page, "template_img": template.template_img, "annotations": template.annotations}
+
+
+def _case_text_job(job) -> str:
+    """케이스 렌더링에서 실제로 그린 텍스트 (워커에서 실행)"""
+    case, font = job
+    return "".join(annotation["text"] for annotation in render_case(case, font)["annotations"])
+
+
+def golden_text(template_paths: List[str] = None, font: str = GOLDEN_FONT, workers: int = None) -> str:
+    """골든 케이스 전체가 그리는 글자 (중복 없이 코드 순)"""
+    cases = golden_cases(template_paths or default_template_paths(TEMPLATE_ROOT, TEMPLATE_DOC_TYPES))
+    jobs = [(case, font) for case in cases]
+    if workers == 1:
+        texts = [_case_text_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            texts = list(pool.map(_case_text_job, jobs))
+    return "".join(sorted(set("".join(texts)) - set("\n")))
+
+
+def build_golden_font(source: str, output: str = GOLDEN_FONT, template_paths: List[str] = None,
+                      workers: int = None) -> Dict:
+    """골든 케이스가 그리는 글자만 source 폰트(Unicode cmap)에서 잘라 output에 기록합니다. (fontTools 필요)
+
+    같은 원본·같은 글자면 같은 파일이 나오도록 수정 시각을 다시 계산하지 않습니다.
+
+    Returns:
+        {"chars", "missing", "glyphs", "bytes"}
+    """
+    try:
+        from fontTools import subset
+    except ImportError as e:
+        raise ImportError("골든 폰트 서브셋 생성에는 fontTools가 필요합니다: pip install fonttools") from e
+
+    text = golden_text(template_paths, source, workers)
+    options = subset.Options()
+    options.hinting = False
+    options.drop_tables += ["TSI0", "TSI1", "TSI2", "TSI3", "TSI5"]  # VTT 힌팅 원본 (힌팅 제거 시 불필요)
+    options.name_IDs = [0, 1, 2, 3, 4, 5, 6, 13, 14, 16, 17]
+    font = subset.load_font(source, options)
+    font.recalcTimestamp = False
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+
+    names = font["name"]
+    for name_id, value in ((1, GOLDEN_FONT_FAMILY), (3, f"{GOLDEN_FONT_FAMILY}-Regular"),
+                           (4, GOLDEN_FONT_FAMILY), (6, f"{GOLDEN_FONT_FAMILY}-Regular"), (16, GOLDEN_FONT_FAMILY)):
+        names.removeNames(nameID=name_id)
+        names.setName(value, name_id, 3, 1, 0x409)
+    names.setName(f"Subset of {os.path.basename(source)}", 13, 3, 1, 0x409)
+
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    font.save(output)
+    cmap = font.getBestCmap()
+    return {"chars": len(text), "missing": [c for c in text if ord(c) not in cmap and not c.isspace()],
+            "glyphs": len(font.getGlyphOrder()), "bytes": os.path.getsize(output)}
+
+
+def ink_layer(page: np.ndarray, template_img: np.ndarray, scale: float = SCALE) -> np.ndarray:
+    """렌더러가 바꾼 픽셀만 남긴 흑백 레이어 (나머지 255), scale 배 축소"""
+    changed = page != template_img
+    if changed.ndim == 3:
+        changed = changed.any(axis=2)
+    gray = cv2.cvtColor(page, cv2.COLOR_BGR2GRAY) if page.ndim == 3 else page
+    layer = np.where(changed, gray, 255).astype(np.uint8)
+    if scale != 1.0:
+        layer = cv2.resize(layer, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return layer
+
+
+def phash(img: np.ndarray) -> str:
+    """지각 해시 (32×32 DCT 저주파 8×8 계수의 중앙값 비교, 16자리 hex)"""
+    small = cv2.resize(img, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:8, :8].ravel()
+    bits = low > np.median(low[1:])
+    return f"{int(''.join('1' if b else '0' for b in bits), 2):016x}"
+
+
+def hamming(a: str, b: str) -> int:
+    """두 hex 해시의 해밍 거리"""
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def font_fingerprint(font: str = GOLDEN_FONT) -> Dict:
+    """렌더링 환경 지문 (폰트 파일 SHA-1, Pillow·FreeType·OpenCV 버전)"""
+    import PIL
+    from PIL import features
+
+    fonts = {}
+    if os.path.exists(font):
+        with open(font, "rb") as f:
+            fonts[os.path.basename(font)] = hashlib.sha1(f.read()).hexdigest()
+    else:
+        fonts[os.path.basename(font)] = None  # 없으면 OpenCV 기본 폰트로 그림
+    return {"fonts": fonts, "pillow": PIL.__version__, "freetype": features.version("freetype2"),
+            "opencv": cv2.__version__}
+
+
+def compare_layers(golden: np.ndarray, current: np.ndarray) -> Dict:
+    """두 잉크 레이어의 픽셀 차이 {"diff_pixels", "ink_pixels", "ratio", "max_delta"}"""
+    delta = cv2.absdiff(golden, current)
+    diff_pixels = int(np.count_nonzero(delta > PIXEL_TOL))
+    ink_pixels = int(np.count_nonzero(np.minimum(golden, current) < 255 - PIXEL_TOL))
+    return {"diff_pixels": diff_pixels, "ink_pixels": ink_pixels,
+            "ratio": diff_pixels / max(ink_pixels, 1), "max_delta": int(delta.max())}
+
+
+def diff_image(golden: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """골든 | 현재 | 차이(현재 위에 PIXEL_TOL 초과 픽셀을 빨강) 가로 배치"""
+    overlay = cv2.cvtColor(current, cv2.COLOR_GRAY2BGR)
+    overlay[cv2.absdiff(golden, current) > PIXEL_TOL] = (0, 0, 255)
+    return np.hstack([cv2.cvtColor(golden, cv2.COLOR_GRAY2BGR), cv2.cvtColor(current, cv2.COLOR_GRAY2BGR), overlay])
+
+
+def check_case(case: Dict, golden_dir: str = GOLDEN_DIR, diff_dir: str = DIFF_DIR, update: bool = False,
+               expected_hash: Optional[str] = None, font: str = GOLDEN_FONT) -> Dict:
+    """케이스 하나를 렌더링하여 골든과 비교(update면 골든 기록)하고 결과를 돌려줍니다. (워커에서 실행)"""
+    start = time.perf_counter()
+    rendered = render_case(case, font)
+    layer = ink_layer(rendered["page"], rendered["template_img"])
+    result = {"id": case["id"], "phash": phash(layer), "ink_pixels": int(np.count_nonzero(layer < 255))}
+    golden_path = os.path.join(golden_dir, f"{case['id']}.png")
+
+    if update:
+        os.makedirs(golden_dir, exist_ok=True)
+        cv2.imwrite(golden_path, layer, [cv2.IMWRITE_PNG_COMPRESSION, 9])
+        result["status"] = "updated"
+    else:
+        golden = cv2.imread(golden_path, cv2.IMREAD_GRAYSCALE) if os.path.exists(golden_path) else None
+        if golden is None:
+            result["status"] = "missing"
+        elif golden.shape != layer.shape:
+            result.update(status="fail", reason=f"크기 {golden.shape} → {layer.shape}")
+        else:
+            result.update(compare_layers(golden, layer))
+            result["hash_distance"] = hamming(expected_hash or phash(golden), result["phash"])
+            failed = [reason for reason, bad in (
+                (f"픽셀 {result['ratio']:.2%}", result["ratio"] > MAX_DIFF_RATIO),
+                (f"pHash 거리 {result['hash_distance']}", result["hash_distance"] > PHASH_TOL)) if bad]
+            result["status"] = "fail" if failed else "pass"
+            if failed:
+                result["reason"] = ", ".join(failed)
+                os.makedirs(diff_dir, exist_ok=True)
+                result["diff"] = os.path.join(diff_dir, f"{case['id']}.png")
+                cv2.imwrite(result["diff"], diff_image(golden, layer))
+
+    result["sec"] = time.perf_counter() - start
+    return result
+
+
+def _check_case_job(job):
+    return check_case(*job)
+
+
+def load_index(golden_dir: str = GOLDEN_DIR) -> Dict:
+    """골든 색인 {"fingerprint", "seed", "scale", "cases": {id: {"phash", "ink_pixels"}}} (없으면 빈 색인)"""
+    path = os.path.join(golden_dir, INDEX_FILE)
+    if not os.path.exists(path):
+        return {"cases": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def run_suite(template_paths: List[str] = None, golden_dir: str = GOLDEN_DIR, diff_dir: str = DIFF_DIR,
+              update: bool = False, workers: int = None, font: str = GOLDEN_FONT) -> Dict:
+    """전체(또는 지정 템플릿) 조합을 font로 렌더링하여 병렬로 검사하고 요약을 돌려줍니다.
+
+    Returns:
+        {"results": [...], "passed", "failed", "missing", "fingerprint_match", "sec"}
+    """
+    start = time.perf_counter()
+    cases = golden_cases(template_paths or default_template_paths(TEMPLATE_ROOT, TEMPLATE_DOC_TYPES))
+    if not os.path.exists(font):
+        raise FileNotFoundError(f"골든 렌더링 폰트가 없습니다: {font}")
+    index = load_index(golden_dir)
+    fingerprint = font_fingerprint(font)
+    if not update and index.get("scale", SCALE) != SCALE:
+        raise ValueError(f"골든 축소 배율({index.get('scale')})이 현재 설정({SCALE})과 다릅니다. --update로 다시 만드세요.")
+
+    jobs = [(case, golden_dir, diff_dir, update, index["cases"].get(case["id"], {}).get("phash"), font)
+            for case in cases]
+    if workers == 1:
+        results = [_check_case_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_check_case_job, jobs, chunksize=max(1, len(jobs) // (4 * (os.cpu_count() or 1)))))
+
+    if update:
+        # 일부 템플릿만 갱신해도 나머지 케이스 색인은 유지
+        index["cases"].update({r["id"]: {"phash": r["phash"], "ink_pixels": r["ink_pixels"]} for r in results})
+        index.update(fingerprint=fingerprint, seed=GOLDEN_SEED, scale=SCALE)
+        index = {"fingerprint": index["fingerprint"], "seed": index["seed"], "scale": index["scale"],
+                 "cases": dict(sorted(index["cases"].items()))}
+        os.makedirs(golden_dir, exist_ok=True)
+        with open(os.path.join(golden_dir, INDEX_FILE), "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+
+    return {
+        "results": results,
+        "passed": sum(1 for r in results if r["status"] in ("pass", "updated")),
+        "failed": [r for r in results if r["status"] == "fail"],
+        "missing": [r for r in results if r["status"] == "missing"],
+        "fingerprint_match": update or index.get("fingerprint") == fingerprint,
+        "sec": time.perf_counter() - start,
+    }
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="렌더링 골든 이미지 회귀 검사")
+    parser.add_argument("--templates", nargs="*", default=None, help="검사할 템플릿 이미지 (기본: assets/templates 전체)")
+    parser.add_argument("--update", action="store_true", help="현재 렌더링으로 골든을 다시 기록")
+    parser.add_argument("--golden-dir", default=GOLDEN_DIR, help="골든 디렉토리")
+    parser.add_argument("--diff-dir", default=DIFF_DIR, help="실패 시 차이 이미지 출력 디렉토리")
+    parser.add_argument("--workers", "-w", type=int, default=None, help="병렬 워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--font", default=GOLDEN_FONT, help=f"렌더링 폰트 파일 (기본: {GOLDEN_FONT})")
+    parser.add_argument("--build-font", default=None, metavar="SOURCE",
+                        help="골든 케이스가 그리는 글자만 SOURCE 폰트에서 잘라 --font 경로에 기록 (fontTools 필요)")
+
+    args = parser.parse_args()
+
+    print("=== 골든 이미지 회귀 검사 ===")
+    if args.build_font:
+        built = build_golden_font(args.build_font, args.font, args.templates, args.workers)
+        print(f"🔤 폰트 서브셋 기록: {args.font} (글자 {built['chars']}개, 글리프 {built['glyphs']}개, "
+              f"{built['bytes'] / 1024:.0f}KB)")
+        if built["missing"]:
+            print(f"  ⚠️ 원본 폰트에 없는 글자 {len(built['missing'])}개: {''.join(built['missing'][:20])}")
+    summary = run_suite(args.templates, args.golden_dir, args.diff_dir, args.update, args.workers, args.font)
+    total = len(summary["results"])
+
+    if args.update:
+        print(f"📁 골든 {total}개 기록: {args.golden_dir}/ ({summary['sec']:.1f}초)")
+        return
+
+    if not summary["fingerprint_match"]:
+        print("⚠️ 폰트 지문이 골든과 다릅니다 (폰트 파일·Pillow·FreeType·OpenCV 버전). "
+              "실패는 렌더러 회귀가 아니라 환경 차이일 수 있습니다.")
+    for result in summary["failed"]:
+        print(f"  ❌ {result['id']}: {result['reason']} → {result.get('diff', '')}")
+    for result in summary["missing"]:
+        print(f"  ⚠️ {result['id']}: 골든 없음 (--update로 생성)")
+    print(f"\n📊 통과 {summary['passed']}/{total}, 실패 {len(summary['failed'])}, 골든 없음 {len(summary['missing'])} "
+          f"({summary['sec']:.1f}초)")
+
+    if summary["failed"] or summary["missing"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
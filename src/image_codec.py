@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+이미지 출력 코덱 계층
+
+기능:
+- 모든 생성기 / 회전기가 공통으로 쓰는 인코딩·저장 창구
+- 이름 있는 프리셋(fast, training, archival, compact, raw)으로 화질·용량·CPU 조절
+- 이미지당 인코딩 시간과 바이트 수를 집계하여 디스크 ↔ CPU 트레이드오프 확인
+"""
+
+import io
+import os
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from lazy_import import lazy_module
+
+# OpenCV는 실제로 인코딩·디코딩할 때 로드 (lossless 회전처럼 픽셀을 다루지 않는 경로는 import하지 않음)
+cv2 = lazy_module("cv2")
+
+# cv2.IMREAD_* 와 같은 값 (cv2를 로드하지 않고 읽기 모드를 지정할 때 사용)
+IMREAD_GRAYSCALE = 0
+IMREAD_COLOR = 1
+
+# 코덱 프리셋
+# - training : 기존 cv2.imwrite 기본값과 동일 (JPEG q95, 4:2:0) → 기본값
+# - fast     : 대량 생성용, 인코딩 가장 빠른 JPEG (q85, 최적화 없음)
+# - archival : 무손실 PNG
+# - compact  : 디스크 최소화 WebP (CPU 비용 큼)
+# - raw      : 인코딩 없는 .npy (CPU 최소, 디스크 최대)
+CODEC_PRESETS = {
+    "fast": {"format": "jpg", "quality": 85, "subsampling": "420", "progressive": False, "optimize": False},
+    "training": {"format": "jpg", "quality": 95, "subsampling": "420", "progressive": False, "optimize": False},
+    "archival": {"format": "png", "compression": 6},
+    "compact": {"format": "webp", "quality": 90},
+    "raw": {"format": "npy"},
+}
+
+DEFAULT_PRESET = "training"
+
+SUPPORTED_FORMATS = ("jpg", "png", "webp", "npy")
+
+# 서브샘플링 → cv2 상수 이름 (cv2 로드 전에는 이름만 보관)
+_JPEG_SAMPLING = {
+    "411": "IMWRITE_JPEG_SAMPLING_FACTOR_411",
+    "420": "IMWRITE_JPEG_SAMPLING_FACTOR_420",
+    "422": "IMWRITE_JPEG_SAMPLING_FACTOR_422",
+    "440": "IMWRITE_JPEG_SAMPLING_FACTOR_440",
+    "444": "IMWRITE_JPEG_SAMPLING_FACTOR_444",
+}
+
+
+class ImageCodec:
+    """이미지 인코딩·저장 코덱 (프리셋 + 개별 옵션 덮어쓰기)"""
+
+    def __init__(self, preset: str = DEFAULT_PRESET, **overrides):
+        """
+        Args:
+            preset: CODEC_PRESETS 키 (fast, training, archival, compact, raw)
+            overrides: 프리셋 값을 덮어쓸 옵션 (quality, subsampling, progressive,
+                       optimize, compression, format)
+        """
+        if preset not in CODEC_PRESETS:
+            raise ValueError(f"지원하지 않는 코덱 프리셋입니다: {preset} (지원: {list(CODEC_PRESETS)})")
+
+        self.preset = preset
+        self.options = {**CODEC_PRESETS[preset], **overrides}
+        self.format = self.options["format"]
+
+        if self.format not in SUPPORTED_FORMATS:
+            raise ValueError(f"지원하지 않는 이미지 포맷입니다: {self.format} (지원: {SUPPORTED_FORMATS})")
+
+        subsampling = self.options.get("subsampling")
+        if self.format == "jpg" and subsampling and str(subsampling) not in _JPEG_SAMPLING:
+            raise ValueError(f"지원하지 않는 서브샘플링입니다: {subsampling} (지원: {list(_JPEG_SAMPLING)})")
+
+        self.extension = f".{self.format}"
+        self._params = None
+        self.stats = {"count": 0, "bytes": 0, "encode_sec": 0.0}
+
+    @property
+    def params(self) -> list:
+        """cv2.imencode 파라미터 (처음 인코딩할 때 한 번 생성)"""
+        if self._params is None:
+            self._params = self._build_params()
+        return self._params
+
+    def _build_params(self) -> list:
+        """cv2.imencode 파라미터 목록을 만듭니다."""
+        opts = self.options
+        if self.format == "jpg":
+            params = [cv2.IMWRITE_JPEG_QUALITY, int(opts.get("quality", 95))]
+            if opts.get("subsampling"):
+                params += [cv2.IMWRITE_JPEG_SAMPLING_FACTOR, getattr(cv2, _JPEG_SAMPLING[str(opts["subsampling"])])]
+            if opts.get("progressive"):
+                params += [cv2.IMWRITE_JPEG_PROGRESSIVE, 1]
+            if opts.get("optimize"):
+                params += [cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+            return params
+        if self.format == "png":
+            return [cv2.IMWRITE_PNG_COMPRESSION, int(opts.get("compression", 3))]
+        if self.format == "webp":
+            return [cv2.IMWRITE_WEBP_QUALITY, int(opts.get("quality", 90))]
+        return []
+
+    def encode(self, img: np.ndarray) -> bytes:
+        """이미지를 바이트로 인코딩하고 통계를 갱신합니다."""
+        start = time.perf_counter()
+
+        if self.format == "npy":
+            # .npy 헤더 + 원시 픽셀 (np.load로 바로 읽힘)
+            header = _npy_header(img)
+            data = header + np.ascontiguousarray(img).tobytes()
+        else:
+            ok, buf = cv2.imencode(self.extension, img, self.params)
+            if not ok:
+                raise ValueError(f"이미지 인코딩 실패 ({self.format})")
+            data = buf.tobytes()
+
+        self.stats["encode_sec"] += time.perf_counter() - start
+        self.stats["count"] += 1
+        self.stats["bytes"] += len(data)
+        return data
+
+    def write(self, filepath: str, img: np.ndarray) -> str:
+        """이미지를 인코딩하여 저장합니다. 확장자는 코덱 포맷에 맞게 바뀝니다."""
+        filepath = self.with_extension(filepath)
+        data = self.encode(img)
+        with open(filepath, "wb") as f:
+            f.write(data)
+        return filepath
+
+    def with_extension(self, filepath: str) -> str:
+        """파일 경로의 확장자를 코덱 포맷 확장자로 바꿉니다."""
+        root, _ = os.path.splitext(filepath)
+        return root + self.extension
+
+    def merge_stats(self, stats: Dict[str, float]):
+        """다른 프로세스/코덱에서 집계한 통계를 합칩니다."""
+        for key in self.stats:
+            self.stats[key] += stats.get(key, 0)
+
+    def summary(self) -> Dict[str, float]:
+        """이미지당 평균 인코딩 시간(ms)과 평균 크기(KB)를 반환합니다."""
+        count = self.stats["count"]
+        return {
+            "preset": self.preset,
+            "format": self.format,
+            "count": count,
+            "total_mb": self.stats["bytes"] / (1024 * 1024),
+            "avg_kb": self.stats["bytes"] / 1024 / count if count else 0.0,
+            "avg_encode_ms": self.stats["encode_sec"] * 1000 / count if count else 0.0,
+        }
+
+    def format_summary(self) -> str:
+        """출력용 코덱 통계 문자열"""
+        s = self.summary()
+        return (f"코덱 [{s['preset']}/{s['format']}] {s['count']}장 | "
+                f"평균 {s['avg_kb']:.1f}KB/장, 인코딩 {s['avg_encode_ms']:.1f}ms/장 | 총 {s['total_mb']:.1f}MB")
+
+
+def _npy_header(img: np.ndarray) -> bytes:
+    """np.save와 동일한 .npy 헤더를 만듭니다."""
+    buf = io.BytesIO()
+    np.lib.format.write_array_header_1_0(buf, np.lib.format.header_data_from_array_1_0(np.ascontiguousarray(img)))
+    return buf.getvalue()
+
+
+def read_image(filepath: str, flags: int = IMREAD_COLOR) -> Optional[np.ndarray]:
+    """코덱이 저장한 이미지를 읽습니다. (.npy 포함, 실패 시 None)"""
+    if filepath.endswith(".npy"):
+        try:
+            img = np.load(filepath)
+        except (OSError, ValueError):
+            return None
+        if flags == cv2.IMREAD_GRAYSCALE and img.ndim == 3:
+            return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        if flags == cv2.IMREAD_COLOR and img.ndim == 2:
+            return cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        return img
+    return cv2.imread(filepath, flags)
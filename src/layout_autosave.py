@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+레이아웃 추출기 백그라운드 자동 저장 (저널 + 원자적 스냅샷)
+
+기능:
+- UI 스레드는 바뀐 필드만 큐에 넣고 바로 반환 (디스크 I/O 없음)
+- 저장 스레드가 debounce_ms 동안 들어온 편집을 한 번에 모아 JSON-lines 저널에 추가
+- 저널이 compact_every 줄을 넘거나 종료할 때 전체 상태를 스냅샷(레이아웃 YAML)으로 원자적 기록
+  (임시 파일 → fsync → os.replace) 후 저널을 비움
+- 비정상 종료 후에는 스냅샷 + 저널 재생으로 복구 (타임스탬프 전체 YAML이 configs/에 쌓이지 않음)
+
+파일 (이미지마다 한 벌, configs/.autosave/):
+    {이미지명}.yaml      마지막 스냅샷 (field_boxes + meta, 추출기에서 그대로 불러올 수 있음)
+    {이미지명}.journal   스냅샷 이후 편집 {"op": "set", "name", "box"} / {"op": "del", "name"}
+
+사용:
+    saver = LayoutAutosaver("GA_template1_child0.jpg", field_order=config['fields'])
+    saver.start(field_boxes)        # 시작 상태를 스냅샷으로
+    saver.sync(field_boxes)         # 편집 후 호출 (바뀐 필드만 큐에 넣음)
+    saver.close()                   # 남은 편집 기록 + 최종 스냅샷
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from lazy_import import lazy_module
+
+yaml = lazy_module("yaml")
+
+AUTOSAVE_DIR = "configs/.autosave"
+
+# 편집을 모으는 시간 (마지막 편집 후 이만큼 조용하면 기록)
+DEBOUNCE_MS = 300
+# 편집이 계속 이어져도 이 시간 안에는 한 번 기록
+MAX_DELAY_MS = 2000
+# 저널이 이 줄 수를 넘으면 스냅샷으로 압축
+COMPACT_EVERY = 50
+
+
+def order_field_boxes(field_boxes: Dict[str, List[int]], field_order: List[str]) -> Dict[str, List[int]]:
+    """필드 정의 순서대로 정렬한 plain dict (정의되지 않은 필드는 뒤에 원래 순서대로)"""
+    ordered = {name: list(field_boxes[name]) for name in field_order if name in field_boxes}
+    ordered.update({name: list(box) for name, box in field_boxes.items() if name not in ordered})
+    return ordered
+
+
+def layout_document(field_boxes: Dict[str, List[int]], field_order: List[str], source_image: str,
+                    doc_type: str = 'UNKNOWN', **meta) -> Dict:
+    """레이아웃 YAML 문서 {'field_boxes', 'meta'} (추출기 저장 형식)"""
+    return {
+        'field_boxes': order_field_boxes(field_boxes, field_order),
+        'meta': {
+            'source_image': source_image,
+            'extraction_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'doc_type': doc_type,
+            **meta,
+            'field_count': len(field_boxes),
+        },
+    }
+
+
+def atomic_write_text(path: str, text: str):
+    """같은 디렉토리의 임시 파일에 쓰고 fsync 후 rename (중간에 죽어도 이전 파일 유지)"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def dump_layout(path: str, document: Dict):
+    """레이아웃 문서를 YAML로 원자적 기록"""
+    atomic_write_text(path, yaml.dump(document, allow_unicode=True, sort_keys=False, indent=4))
+
+
+def replay_journal(field_boxes: Dict[str, List[int]], journal_path: str) -> int:
+    """저널 편집을 field_boxes에 적용하고 적용한 줄 수를 돌려줍니다. (끝이 잘린 줄은 무시)"""
+    if not os.path.exists(journal_path):
+        return 0
+    applied = 0
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break  # 기록 도중 종료된 마지막 줄
+            if entry.get("op") == "set":
+                field_boxes[entry["name"]] = list(entry["box"])
+            elif entry.get("op") == "del":
+                field_boxes.pop(entry["name"], None)
+            applied += 1
+    return applied
+
+
+class LayoutAutosaver:
+    """이미지 하나의 레이아웃 자동 저장기 (저장 스레드 1개)"""
+
+    def __init__(self, image_path: str, field_order: List[str] = None, doc_type: str = 'UNKNOWN',
+                 autosave_dir: str = AUTOSAVE_DIR, debounce_ms: int = DEBOUNCE_MS,
+                 max_delay_ms: int = MAX_DELAY_MS, compact_every: int = COMPACT_EVERY):
+        self.source_image = os.path.basename(image_path)
+        base_name = os.path.splitext(self.source_image)[0]
+        self.snapshot_path = os.path.join(autosave_dir, f"{base_name}.yaml")
+        self.journal_path = os.path.join(autosave_dir, f"{base_name}.journal")
+        self.field_order = list(field_order or [])
+        self.doc_type = doc_type
+        self.debounce = debounce_ms / 1000
+        self.max_delay = max_delay_ms / 1000
+        self.compact_every = compact_every
+
+        # UI 스레드 쪽: 마지막으로 큐에 넣은 상태 (변경 비교용)
+        self._known: Dict[str, tuple] = {}
+        self._known_stamp = None
+
+        # 저장 스레드와 공유 (조건 변수로 보호)
+        self._cond = threading.Condition()
+        self._pending: List[Dict] = []
+        self._snapshot_requested = False
+        self._first_pending = 0.0
+        self._last_edit = 0.0
+        self._closing = False
+        self._idle = True
+
+        # 저장 스레드 전용: 스냅샷 기준 상태와 저널 줄 수
+        self._state: Dict[str, List[int]] = {}
+        self._journal_lines = 0
+        self._thread: Optional[threading.Thread] = None
+        self.error: Optional[Exception] = None
+        self.stats = {"edits": 0, "flushes": 0, "journal_bytes": 0, "snapshots": 0}
+
+    # --- 복구 ---
+    def has_recovery(self) -> bool:
+        """이전 세션이 남긴 스냅샷·저널이 있는지"""
+        return os.path.exists(self.snapshot_path) or os.path.exists(self.journal_path)
+
+    def recover(self) -> Optional[Dict[str, List[int]]]:
+        """스냅샷 + 저널 재생으로 이전 세션 상태를 복원합니다. (남은 것이 없으면 None)"""
+        if not self.has_recovery():
+            return None
+        field_boxes: Dict[str, List[int]] = {}
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                data = yaml.safe_load(f) or {}
+            field_boxes.update(data.get('field_boxes') or {})
+        replay_journal(field_boxes, self.journal_path)
+        return field_boxes
+
+    def discard(self):
+        """스냅샷·저널을 지웁니다. (최종 저장을 마쳤거나 다음 시작 때 복원하지 않기로 한 경우)"""
+        for path in (self.snapshot_path, self.journal_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    # --- UI 스레드 API ---
+    def start(self, field_boxes: Dict[str, List[int]]):
+        """저장 스레드를 시작하고 시작 상태를 스냅샷으로 기록하게 합니다."""
+        self._known = {name: tuple(int(v) for v in box) for name, box in field_boxes.items()}
+        self._known_stamp = (id(field_boxes), getattr(field_boxes, "version", None))
+        with self._cond:
+            self._state = {name: list(box) for name, box in field_boxes.items()}
+            self._pending = []
+            self._snapshot_requested = True
+            self._idle = False
+            self._first_pending = self._last_edit = time.monotonic()
+            self._cond.notify()
+        self._thread = threading.Thread(target=self._run, name="layout-autosave", daemon=True)
+        self._thread.start()
+
+    def sync(self, field_boxes: Dict[str, List[int]]) -> int:
+        """field_boxes에서 바뀐 필드만 큐에 넣고 바로 반환합니다. (큐에 넣은 편집 수)"""
+        stamp = (id(field_boxes), getattr(field_boxes, "version", None))
+        if stamp[1] is not None and stamp == self._known_stamp:
+            return 0
+
+        edits = []
+        for name in [n for n in self._known if n not in field_boxes]:
+            edits.append({"op": "del", "name": name})
+            del self._known[name]
+        for name, box in field_boxes.items():
+            box = tuple(int(v) for v in box)
+            if self._known.get(name) != box:
+                edits.append({"op": "set", "name": name, "box": list(box)})
+                self._known[name] = box
+        self._known_stamp = stamp
+
+        if edits:
+            now = time.monotonic()
+            with self._cond:
+                if not self._pending and not self._snapshot_requested:
+                    self._first_pending = now
+                self._pending.extend(edits)
+                self._last_edit = now
+                self._idle = False
+                self._cond.notify()
+            self.stats["edits"] += len(edits)
+        return len(edits)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """대기 중인 편집을 지금 기록하게 하고 끝날 때까지 기다립니다. (테스트·종료용)"""
+        with self._cond:
+            self._first_pending = self._last_edit = 0.0  # debounce 생략
+            self._cond.notify()
+            return self._cond.wait_for(lambda: self._idle or self._thread is None, timeout)
+
+    def close(self, compact: bool = True):
+        """남은 편집을 기록하고 (compact면 최종 스냅샷까지) 저장 스레드를 끝냅니다."""
+        if self._thread is None:
+            return
+        with self._cond:
+            self._closing = True
+            self._snapshot_requested = self._snapshot_requested or compact
+            self._cond.notify()
+        self._thread.join()
+        self._thread = None
+
+    # --- 저장 스레드 ---
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._snapshot_requested or self._closing)
+                # debounce: 마지막 편집 후 조용해지거나 최대 지연에 도달할 때까지 모음
+                while not self._closing:
+                    now = time.monotonic()
+                    quiet_at = self._last_edit + self.debounce
+                    deadline = self._first_pending + self.max_delay
+                    if now >= quiet_at or now >= deadline:
+                        break
+                    self._cond.wait(min(quiet_at, deadline) - now)
+                batch, self._pending = self._pending, []
+                snapshot, self._snapshot_requested = self._snapshot_requested, False
+                closing = self._closing
+
+            try:
+                self._write(batch, snapshot)
+            except Exception as e:  # 디스크 오류는 UI로 전파하지 않고 보관
+                self.error = e
+                print(f"[AUTO-SAVE ERROR] {e}")
+
+            with self._cond:
+                if not self._pending and not self._snapshot_requested:
+                    self._idle = True
+                self._cond.notify_all()
+            if closing:
+                return
+
+    def _write(self, batch: List[Dict], snapshot: bool):
+        """편집 묶음을 저널에 추가하고, 필요하면 스냅샷으로 압축합니다."""
+        for entry in batch:
+            if entry["op"] == "set":
+                self._state[entry["name"]] = entry["box"]
+            else:
+                self._state.pop(entry["name"], None)
+
+        if batch:
+            os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+            data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in batch)
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_lines += len(batch)
+            self.stats["journal_bytes"] += len(data.encode('utf-8'))
+            self.stats["flushes"] += 1
+
+        if snapshot or self._journal_lines >= self.compact_every:
+            # 저널에 모든 편집이 들어간 뒤 스냅샷을 원자적으로 바꾸고 저널을 비움
+            # (그 사이에 죽어도 새 스냅샷 위에 저널 전체를 재생하면 같은 상태)
+            document = layout_document(self._state, self.field_order, self.source_image,
+                                       self.doc_type, auto_save=True)
+            dump_layout(self.snapshot_path, document)
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self._journal_lines = 0
+            self.stats["snapshots"] += 1
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+레이아웃 번들 컴파일러 (YAML 레이아웃 → 바이너리 번들 1개)
+
+기능:
+- configs/*_layout.yaml 전체와 configs/field_definitions/*.yaml을 한 번만 파싱하여 번들 파일 하나로 컴파일
+  (필드 박스는 int16 배열, 필드 이름은 필드 ID 테이블, 나머지는 JSON 헤더)
+- 렌더러(BaseTemplate)는 번들을 np.memmap으로 열어 템플릿 생성 때 YAML 파싱 없이 박스를 읽음
+- 원본 YAML의 mtime·크기가 바뀌거나 레이아웃 파일이 추가/삭제되면 다음 조회 때 자동으로 다시 빌드
+- 빌드 전 검증: 필드 정의에 있는데 빠진 필드, 정의에 없는 필드, 이미지 밖 박스, 뒤집힌 박스, 겹치는 박스
+- 상속 레이아웃(layout_variants, extends)은 변형 자신의 박스만 기록하고 조회 때 기준 박스 위에 덮어씀
+  (기준 field_boxes는 한 번만 만들어 변형끼리 공유, 차이가 없는 변형은 기준 dict를 그대로 돌려줌)
+
+번들 형식 (.cache/layouts/{설정 디렉토리 해시}.bundle):
+    MAGIC(8바이트) | 헤더 길이(uint32 LE) | JSON 헤더 | 패딩(64바이트 정렬)
+    | boxes int16 (N, 4) | field_ids int16 (N,)
+    헤더: sources(파일별 mtime_ns·크기), field_names(필드 ID 테이블), definitions(필드 정의 원문),
+          layouts(템플릿명 → 시작 행·개수·기준·제거 필드·필드 정의 파일·그 밖의 키)
+
+사용:
+    python src/layout_bundle.py            # 검증 후 빌드 (오류가 있으면 종료 코드 1)
+    python src/layout_bundle.py --check    # 검증만
+    layout_data, field_def = load_layout("configs/GA_template1_child0_layout.yaml",
+                                         "configs/field_definitions/ga_fields.yaml")
+"""
+
+import argparse
+import copy
+import glob
+import hashlib
+import json
+import os
+import struct
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from lazy_import import lazy_module
+from layout_variants import (EXTENDS_KEY, INHERIT_KEYS, REMOVE_KEY, merge_field_boxes, read_documents,
+                             read_layout, resolve_documents)
+
+yaml = lazy_module("yaml")
+Image = lazy_module("PIL.Image")
+
+CONFIG_DIR = "configs"
+BUNDLE_DIR = ".cache/layouts"
+TEMPLATE_ROOT = "assets/templates"
+
+MAGIC = b"LAYOUTB1"
+FORMAT_VERSION = 2
+DATA_ALIGN = 64
+
+# 작은 박스 면적 대비 교집합이 이 비율 이상이면 겹침으로 보고 (인접 셀 경계 1~2px 공유는 제외)
+OVERLAP_RATIO = 0.1
+
+INT16_MIN, INT16_MAX = np.iinfo(np.int16).min, np.iinfo(np.int16).max
+
+# 프로세스 안 번들 메모 (설정 디렉토리 절대 경로 → LayoutBundle)
+_bundles: Dict[str, "LayoutBundle"] = {}
+
+
+def layout_sources(config_dir: str = CONFIG_DIR) -> Tuple[List[str], List[str]]:
+    """(레이아웃 YAML 목록, 필드 정의 YAML 목록)"""
+    layouts = sorted(glob.glob(os.path.join(config_dir, "*_layout.yaml")))
+    definitions = sorted(glob.glob(os.path.join(config_dir, "field_definitions", "*.yaml")))
+    return layouts, definitions
+
+
+def source_stamps(config_dir: str = CONFIG_DIR) -> Dict[str, List[int]]:
+    """설정 디렉토리 기준 상대 경로 → [mtime_ns, 크기]"""
+    layouts, definitions = layout_sources(config_dir)
+    stamps = {}
+    for path in layouts + definitions:
+        st = os.stat(path)
+        stamps[os.path.relpath(path, config_dir)] = [st.st_mtime_ns, st.st_size]
+    return stamps
+
+
+def bundle_path_for(config_dir: str = CONFIG_DIR, bundle_dir: str = None) -> str:
+    """설정 디렉토리별 번들 파일 경로 (기본: BUNDLE_DIR)"""
+    bundle_dir = bundle_dir or BUNDLE_DIR
+    digest = hashlib.sha1(os.path.abspath(config_dir).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(bundle_dir, f"layouts-{digest}.bundle")
+
+
+def template_name_of(layout_path: str) -> str:
+    """레이아웃 파일명에서 템플릿명 (GA_template1_child0_layout.yaml → GA_template1_child0)"""
+    return os.path.basename(layout_path)[:-len("_layout.yaml")]
+
+
+def _read_yaml(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
+
+
+def read_sources(config_dir: str = CONFIG_DIR) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+    """(템플릿명 → 레이아웃 문서 원문(상속을 풀지 않음), 상대 경로 → 필드 정의)"""
+    _, definition_paths = layout_sources(config_dir)
+    layouts = read_documents(config_dir)
+    definitions = {os.path.relpath(path, config_dir): _read_yaml(path) for path in definition_paths}
+    return layouts, definitions
+
+
+def definition_for(template_name: str, definitions: Dict[str, Dict]) -> Optional[str]:
+    """템플릿 폴더(템플릿명 접두어)가 같은 필드 정의 파일 (없으면 None)"""
+    folder = template_name.split('_', 1)[0]
+    for rel_path, definition in definitions.items():
+        if definition.get('template_folder') == folder:
+            return rel_path
+    return None
+
+
+# --- 검증 ---
+def _overlap_ratio(a: List[int], b: List[int]) -> float:
+    """작은 박스 면적 대비 교집합 비율"""
+    ix = max(0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[3], b[3]) - max(a[1], b[1]))
+    smaller = min((a[2] - a[0]) * (a[3] - a[1]), (b[2] - b[0]) * (b[3] - b[1]))
+    return ix * iy / smaller if smaller > 0 else 0.0
+
+
+def image_size(template_name: str, template_root: str = TEMPLATE_ROOT) -> Optional[Tuple[int, int]]:
+    """템플릿 이미지 (너비, 높이) - 헤더만 읽음 (이미지가 없으면 None)"""
+    path = os.path.join(template_root, template_name.split('_', 1)[0], f"{template_name}.jpg")
+    if not os.path.exists(path):
+        return None
+    with Image.open(path) as img:
+        return img.size
+
+
+def validate_layout(template_name: str, field_boxes: Dict[str, List[int]], field_order: List[str],
+                    size: Optional[Tuple[int, int]] = None) -> List[Dict]:
+    """레이아웃 하나를 검증하고 문제 목록 [{"template", "level", "kind", "field", "detail"}]을 돌려줍니다.
+
+    error: 박스 형식 오류, 뒤집힌 박스, 이미지 밖 박스, int16 범위 초과
+    warning: 정의에 없는 필드, 겹치는 박스
+    info: 정의에 있지만 레이아웃에 없는 필드 (자녀 수·세대 구성별 변형은 일부 필드만 가짐)
+    """
+    issues = []
+
+    def report(level, kind, field, detail=""):
+        issues.append({"template": template_name, "level": level, "kind": kind, "field": field, "detail": detail})
+
+    valid = {}
+    for name, box in field_boxes.items():
+        if not isinstance(box, (list, tuple)) or len(box) != 4 or not all(isinstance(v, int) for v in box):
+            report("error", "format", name, f"{box!r}")
+            continue
+        x1, y1, x2, y2 = box
+        if min(box) < INT16_MIN or max(box) > INT16_MAX:
+            report("error", "int16", name, f"{list(box)}")
+            continue
+        if x2 <= x1 or y2 <= y1:
+            report("error", "inverted", name, f"{list(box)}")
+            continue
+        if size is not None and (x1 < 0 or y1 < 0 or x2 > size[0] or y2 > size[1]):
+            report("error", "out_of_bounds", name, f"{list(box)} (이미지 {size[0]}x{size[1]})")
+        valid[name] = box
+
+    if field_order:
+        defined = set(field_order)
+        for name in field_boxes:
+            if name not in defined:
+                report("warning", "undefined", name)
+        missing = [name for name in field_order if name not in field_boxes]
+        if missing:
+            report("info", "missing", ", ".join(missing), f"{len(missing)}개")
+
+    names = list(valid)
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            ratio = _overlap_ratio(valid[a], valid[b])
+            if ratio >= OVERLAP_RATIO:
+                report("warning", "overlap", f"{a} / {b}", f"{ratio:.0%}")
+    return issues
+
+
+def validate_layouts(layouts: Dict[str, Dict], definitions: Dict[str, Dict],
+                     template_root: str = TEMPLATE_ROOT) -> List[Dict]:
+    """모든 레이아웃을 (상속을 푼 뒤) 필드 정의·템플릿 이미지 크기와 대조합니다."""
+    issues = []
+    for template_name, document in resolve_documents(layouts).items():
+        rel_path = definition_for(template_name, definitions)
+        if rel_path is None:
+            issues.append({"template": template_name, "level": "warning", "kind": "no_definition",
+                           "field": "", "detail": "템플릿 폴더에 맞는 필드 정의가 없음"})
+        field_order = definitions[rel_path].get('fields', []) if rel_path else []
+        issues += validate_layout(template_name, document.get('field_boxes') or {}, field_order,
+                                  image_size(template_name, template_root))
+    return issues
+
+
+# --- 빌드 ---
+def compile_bundle(layouts: Dict[str, Dict], definitions: Dict[str, Dict], stamps: Dict[str, List[int]],
+                   bundle_path: str) -> Dict:
+    """파싱된 레이아웃·필드 정의를 번들 파일로 기록합니다. (임시 파일 → os.replace) 헤더를 돌려줍니다.
+
+    상속하는 레이아웃은 자기 박스(차이)만 기록합니다. 없는 기준·순환 상속은 ValueError.
+    """
+    resolve_documents(layouts)  # 상속 오류를 빌드 때 확인
+    # 필드 ID 테이블: 필드 정의 순서 → 정의에 없는 필드는 처음 나온 순서대로 뒤에
+    field_names: List[str] = []
+    field_ids: Dict[str, int] = {}
+    for definition in definitions.values():
+        for name in definition.get('fields', []):
+            if name not in field_ids:
+                field_ids[name] = len(field_names)
+                field_names.append(name)
+
+    boxes: List[List[int]] = []
+    ids: List[int] = []
+    entries = {}
+    for template_name, document in layouts.items():
+        field_boxes = document.get('field_boxes') or {}
+        start = len(boxes)
+        for name, box in field_boxes.items():
+            if name not in field_ids:
+                field_ids[name] = len(field_names)
+                field_names.append(name)
+            if min(box) < INT16_MIN or max(box) > INT16_MAX:
+                raise ValueError(f"int16 범위를 벗어난 박스입니다: {template_name}.{name} {box}")
+            boxes.append([int(v) for v in box])
+            ids.append(field_ids[name])
+        entries[template_name] = {
+            "start": start,
+            "count": len(field_boxes),
+            "extends": document.get(EXTENDS_KEY),
+            "removed": document.get(REMOVE_KEY) or [],
+            "definition": definition_for(template_name, definitions),
+            "extra": {key: value for key, value in document.items()
+                      if key != 'field_boxes' and key not in INHERIT_KEYS},
+        }
+    if len(field_names) > INT16_MAX:
+        raise ValueError(f"필드 종류가 너무 많습니다: {len(field_names)}")
+
+    header = {
+        "version": FORMAT_VERSION,
+        "sources": stamps,
+        "field_names": field_names,
+        "definitions": definitions,
+        "layouts": entries,
+        "box_count": len(boxes),
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False, default=str).encode("utf-8")
+    data_offset = -(-(len(MAGIC) + 4 + len(header_bytes)) // DATA_ALIGN) * DATA_ALIGN
+    box_array = np.asarray(boxes, dtype=np.int16).reshape(-1, 4)
+    id_array = np.asarray(ids, dtype=np.int16)
+
+    directory = os.path.dirname(bundle_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{bundle_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes)
+        f.write(b"\0" * (data_offset - f.tell()))
+        f.write(box_array.tobytes())
+        f.write(id_array.tobytes())
+    os.replace(tmp_path, bundle_path)
+    return header
+
+
+def build_bundle(config_dir: str = CONFIG_DIR, bundle_path: str = None) -> str:
+    """설정 디렉토리의 YAML을 읽어 번들을 (다시) 빌드하고 번들 경로를 돌려줍니다. (검증 생략)"""
+    bundle_path = bundle_path or bundle_path_for(config_dir)
+    stamps = source_stamps(config_dir)
+    layouts, definitions = read_sources(config_dir)
+    compile_bundle(layouts, definitions, stamps, bundle_path)
+    return bundle_path
+
+
+# --- 조회 ---
+class LayoutBundle:
+    """읽기 전용 번들 (박스·필드 ID는 np.memmap, 헤더는 dict)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            magic = f.read(len(MAGIC))
+            if magic != MAGIC:
+                raise ValueError(f"레이아웃 번들 파일이 아닙니다: {path}")
+            (header_len,) = struct.unpack("<I", f.read(4))
+            self.header = json.loads(f.read(header_len).decode("utf-8"))
+        if self.header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"번들 형식 버전이 다릅니다: {self.header.get('version')}")
+
+        count = self.header["box_count"]
+        data_offset = -(-(len(MAGIC) + 4 + header_len) // DATA_ALIGN) * DATA_ALIGN
+        if count:
+            self.boxes = np.memmap(path, dtype=np.int16, mode="r", offset=data_offset, shape=(count, 4))
+            self.field_ids = np.memmap(path, dtype=np.int16, mode="r", offset=data_offset + count * 8, shape=(count,))
+        else:
+            self.boxes = np.zeros((0, 4), dtype=np.int16)
+            self.field_ids = np.zeros(0, dtype=np.int16)
+        self.field_names: List[str] = self.header["field_names"]
+        self.layouts: Dict[str, Dict] = self.header["layouts"]
+        # 템플릿명 → 상속을 푼 field_boxes (기준·변형이 공유하는 읽기 전용 dict)
+        self._resolved: Dict[str, Dict[str, List[int]]] = {}
+
+    def is_stale(self, config_dir: str = CONFIG_DIR) -> bool:
+        """원본 YAML이 바뀌었거나 추가/삭제되었는지 (stat만 사용)"""
+        try:
+            return source_stamps(config_dir) != self.header["sources"]
+        except OSError:
+            return True  # 목록과 stat 사이에 파일이 지워진 경우
+
+    def __contains__(self, template_name: str) -> bool:
+        return template_name in self.layouts
+
+    def own_field_boxes(self, template_name: str) -> Dict[str, List[int]]:
+        """레이아웃 파일에 직접 적힌 박스 (상속하는 변형은 차이만)"""
+        entry = self.layouts[template_name]
+        rows = slice(entry["start"], entry["start"] + entry["count"])
+        names = self.field_names
+        return {names[i]: box for i, box in zip(self.field_ids[rows].tolist(), self.boxes[rows].tolist())}
+
+    def field_boxes(self, template_name: str) -> Dict[str, List[int]]:
+        """상속을 푼 field_boxes (처음 한 번만 만들고 이후 같은 dict 공유 - 수정하지 말 것)"""
+        resolved = self._resolved.get(template_name)
+        if resolved is not None:
+            return resolved
+        entry = self.layouts[template_name]
+        if entry.get("extends"):
+            base = self.field_boxes(entry["extends"])
+            if entry["count"] or entry["removed"]:
+                resolved = merge_field_boxes(base, self.own_field_boxes(template_name), entry["removed"])
+            else:
+                resolved = base  # 차이 없는 변형은 기준과 같은 dict
+        else:
+            resolved = self.own_field_boxes(template_name)
+        self._resolved[template_name] = resolved
+        return resolved
+
+    def layout_data(self, template_name: str) -> Dict:
+        """상속을 푼 레이아웃 dict ({'field_boxes', 'meta', ...}, field_boxes는 공유)"""
+        data = {'field_boxes': self.field_boxes(template_name)}
+        data.update(copy.deepcopy(self.layouts[template_name]["extra"]))
+        return data
+
+    def definition(self, rel_path: str) -> Optional[Dict]:
+        """필드 정의 (설정 디렉토리 기준 상대 경로, 없으면 None)"""
+        definition = self.header["definitions"].get(rel_path)
+        return copy.deepcopy(definition) if definition is not None else None
+
+
+def load_bundle(config_dir: str = CONFIG_DIR, bundle_path: str = None) -> LayoutBundle:
+    """설정 디렉토리의 번들을 엽니다. 없거나 원본보다 오래되었으면 다시 빌드합니다. (프로세스 안에서 재사용)"""
+    key = os.path.abspath(config_dir)
+    bundle = _bundles.get(key)
+    if bundle is not None and not bundle.is_stale(config_dir):
+        return bundle
+
+    bundle_path = bundle_path or bundle_path_for(config_dir)
+    bundle = None
+    if os.path.exists(bundle_path):
+        try:
+            bundle = LayoutBundle(bundle_path)
+        except (OSError, ValueError, KeyError):
+            bundle = None  # 손상·이전 형식 번들은 다시 빌드
+    if bundle is None or bundle.is_stale(config_dir):
+        build_bundle(config_dir, bundle_path)
+        bundle = LayoutBundle(bundle_path)
+    _bundles[key] = bundle
+    return bundle
+
+
+def load_layout(layout_path: str, field_def_path: str) -> Tuple[Dict, Dict]:
+    """(레이아웃 데이터, 필드 정의) - 번들에서 읽고, 번들 밖 파일이거나 번들을 쓸 수 없으면 YAML 직접 파싱"""
+    config_dir = os.path.dirname(layout_path) or "."
+    rel_def = os.path.relpath(field_def_path, config_dir)
+    template_name = template_name_of(layout_path)
+    if layout_path.endswith("_layout.yaml") and not rel_def.startswith(os.pardir):
+        try:
+            bundle = load_bundle(config_dir)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 레이아웃 번들을 사용할 수 없어 YAML을 직접 읽습니다: {e}")
+        else:
+            definition = bundle.definition(rel_def)
+            if template_name in bundle and definition is not None:
+                return bundle.layout_data(template_name), definition
+    return read_layout(layout_path), _read_yaml(field_def_path)
+
+
+def print_issues(issues: List[Dict], verbose: bool = False):
+    """검증 결과 출력 (verbose가 아니면 경고는 템플릿·종류별 건수로 묶고 info는 생략)"""
+    icons = {"error": "❌", "warning": "⚠️", "info": "ℹ️"}
+    groups: Dict[Tuple[str, str, str], List[Dict]] = {}
+    for issue in issues:
+        if issue["level"] == "info" and not verbose:
+            continue
+        if verbose or issue["level"] == "error":
+            detail = f" ({issue['detail']})" if issue["detail"] else ""
+            print(f"  {icons[issue['level']]} {issue['template']} [{issue['kind']}] {issue['field']}{detail}")
+        else:
+            groups.setdefault((issue["level"], issue["template"], issue["kind"]), []).append(issue)
+    for (level, template_name, kind), group in groups.items():
+        more = f" 외 {len(group) - 1}건" if len(group) > 1 else ""
+        print(f"  {icons[level]} {template_name} [{kind}] {group[0]['field']}{more}")
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="레이아웃 YAML 검증 및 바이너리 번들 빌드")
+    parser.add_argument("--config-dir", default=CONFIG_DIR, help="레이아웃·필드 정의 디렉토리")
+    parser.add_argument("--output", "-o", default=None, help="번들 파일 경로 (기본: .cache/layouts/)")
+    parser.add_argument("--templates", default=TEMPLATE_ROOT, help="템플릿 이미지 루트 (이미지 밖 박스 검사용)")
+    parser.add_argument("--check", action="store_true", help="검증만 하고 번들은 만들지 않음")
+    parser.add_argument("--verbose", "-v", action="store_true", help="경고를 건별로, 누락 필드(info)까지 출력")
+
+    args = parser.parse_args()
+
+    stamps = source_stamps(args.config_dir)
+    layouts, definitions = read_sources(args.config_dir)
+    print("=== 레이아웃 번들 ===")
+    print(f"레이아웃 {len(layouts)}개 | 필드 정의 {len(definitions)}개")
+
+    issues = validate_layouts(layouts, definitions, args.templates)
+    print_issues(issues, args.verbose)
+    counts = {level: sum(1 for i in issues if i["level"] == level) for level in ("error", "warning", "info")}
+    print(f"📋 검증: 오류 {counts['error']}건, 경고 {counts['warning']}건, 정보 {counts['info']}건")
+
+    if not args.check:
+        bundle_path = args.output or bundle_path_for(args.config_dir)
+        header = compile_bundle(layouts, definitions, stamps, bundle_path)
+        print(f"📦 번들 기록: {bundle_path} (박스 {header['box_count']}개, 필드 ID {len(header['field_names'])}개, "
+              f"{os.path.getsize(bundle_path) / 1024:.1f}KB)")
+
+    if counts["error"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
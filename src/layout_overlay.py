@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+레이아웃 추출기 화면 합성 (정적 레이어 캐시)
+
+기능:
+- 정적 레이어: 원본(또는 샘플 겹침) 이미지 + 모든 필드 박스·이름표를 한 번만 그려 캐시
+- 필드 박스(FieldBoxes)가 바뀌거나 샘플/이름 숨김 토글이 바뀔 때만 정적 레이어를 다시 그림
+- 동적 레이어: 프레임마다 정적 레이어를 재사용 버퍼에 복사한 뒤 십자선·hover·드래그 박스·상태 표시만 그림
+  (프레임당 새 배열 할당 없음, 필드 수와 무관한 비용)
+
+사용:
+    compositor = LayerCompositor(original_img, sample_img)
+    frame = compositor.frame(field_boxes, show_sample=False, hide_names=False)
+    draw_field_box(frame, name, p, (255, 100, 255), (255, 255, 255), 3)   # hover 강조
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from lazy_import import lazy_module
+
+cv2 = lazy_module("cv2")
+
+Box = List[int]
+
+# 기본 박스·이름표 스타일 (정적 레이어)
+BOX_COLOR = (0, 255, 0)
+TEXT_COLOR = (0, 255, 0)
+BOX_THICKNESS = 2
+
+
+class FieldBoxes(dict):
+    """변경 버전을 세는 필드 박스 dict (필드명 → [x1, y1, x2, y2])
+
+    항목을 추가·수정·삭제할 때마다 version이 올라가므로 캐시는 버전만 비교하면 됩니다.
+    박스 리스트를 제자리에서 고치지 말고 항상 새 리스트를 대입해야 합니다.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def _changed(self):
+        self.version += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def pop(self, key, *default):
+        had = key in self
+        value = super().pop(key, *default)
+        if had:
+            self._changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+
+def draw_field_box(img: np.ndarray, name: str, p: Box, box_color, text_color, thickness: int,
+                   show_name: bool = True):
+    """필드 박스 하나와 이름표(검은 배경 + 이름)를 그립니다."""
+    cv2.rectangle(img, (p[0], p[1]), (p[2], p[3]), box_color, thickness)
+    if show_name:
+        text_size = cv2.getTextSize(name, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+        cv2.rectangle(img, (p[0], p[1] - 25), (p[0] + text_size[0] + 4, p[1] - 5), (0, 0, 0), -1)
+        cv2.putText(img, name, (p[0] + 2, p[1] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, text_color, 2)
+
+
+class LayerCompositor:
+    """정적 레이어를 캐시하고 프레임 버퍼를 재사용하는 화면 합성기"""
+
+    def __init__(self, base_img: np.ndarray, sample_img: Optional[np.ndarray] = None):
+        """
+        Args:
+            base_img: 작업 중인 원본 이미지
+            sample_img: 겹쳐 볼 샘플 이미지 (원본과 같은 크기, 없으면 None)
+        """
+        self.base_img = base_img
+        self.sample_img = sample_img
+        self._static: Optional[np.ndarray] = None
+        self._static_key: Optional[Tuple] = None
+        self._frame = np.empty_like(base_img)
+        self.stats = {"static_builds": 0, "frames": 0}
+
+    def _key(self, field_boxes: Dict[str, Box], show_sample: bool, hide_names: bool) -> Tuple:
+        """정적 레이어 캐시 키 (FieldBoxes면 버전, 일반 dict면 내용 자체)"""
+        if isinstance(field_boxes, FieldBoxes):
+            boxes_key = (id(field_boxes), field_boxes.version)
+        else:
+            boxes_key = tuple((name, tuple(p)) for name, p in field_boxes.items())
+        use_sample = bool(show_sample and self.sample_img is not None)
+        return boxes_key, use_sample, bool(hide_names)
+
+    def invalidate(self):
+        """다음 프레임에서 정적 레이어를 강제로 다시 그리게 합니다."""
+        self._static_key = None
+
+    def static_layer(self, field_boxes: Dict[str, Box], show_sample: bool = False,
+                     hide_names: bool = False) -> np.ndarray:
+        """이미지 + 모든 필드 박스·이름표 (바뀐 것이 없으면 캐시 그대로)"""
+        key = self._key(field_boxes, show_sample, hide_names)
+        if key == self._static_key:
+            return self._static
+
+        if key[1]:
+            static = cv2.addWeighted(self.base_img, 0.5, self.sample_img, 0.5, 0)
+        else:
+            static = self.base_img.copy()
+        for name, p in field_boxes.items():
+            draw_field_box(static, name, p, BOX_COLOR, TEXT_COLOR, BOX_THICKNESS, not hide_names)
+
+        self._static, self._static_key = static, key
+        self.stats["static_builds"] += 1
+        return static
+
+    def frame(self, field_boxes: Dict[str, Box], show_sample: bool = False,
+              hide_names: bool = False) -> np.ndarray:
+        """정적 레이어를 프레임 버퍼에 복사해 돌려줍니다. (동적 요소는 호출자가 이 위에 그림)
+
+        반환값은 재사용 버퍼이므로 다음 frame 호출 전까지만 유효합니다.
+        """
+        np.copyto(self._frame, self.static_layer(field_boxes, show_sample, hide_names))
+        self.stats["frames"] += 1
+        return self._frame
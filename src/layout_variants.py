@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+레이아웃 상속 (기준 레이아웃 + 변형별 차이)
+
+기능:
+- 변형 레이아웃은 기준 레이아웃을 상속하고 바뀐 박스만 기록
+    extends: GA_template1_child3        # 기준 템플릿명 (같은 디렉토리의 {이름}_layout.yaml)
+    remove_fields: [CHILD3_NAME, ...]   # 기준에서 뺄 필드 (선택)
+    field_boxes: {APPLICANT: [...]}     # 바뀌거나 추가된 필드만
+    meta: {...}                         # field_boxes 외의 키는 상속하지 않음 (변형 자신의 값)
+- 로드 시 상속을 풀어 평탄한 레이아웃(기존 형식)으로 만듦 (다단 상속 가능, 순환·없는 기준은 ValueError)
+  필드 순서: 기준 순서(제거 반영, 바뀐 박스는 제자리) → 추가 필드
+- diff: 두 레이아웃의 추가·제거·변경 필드 비교
+- compact: 계열(GA_template1, JU_template2, ...)마다 필드가 가장 많은 레이아웃을 기준으로 두고
+  나머지를 차이만 남긴 변형으로 다시 기록 (평탄하게 풀었을 때 원래와 같은 경우에만)
+
+사용:
+    python src/layout_variants.py diff GA_template1_child0 GA_template1_child3
+    python src/layout_variants.py compact --dry-run
+    layouts = read_layouts("configs")    # 템플릿명 → 평탄한 레이아웃
+"""
+
+import argparse
+import glob
+import os
+from typing import Dict, List, Optional, Tuple
+
+from lazy_import import lazy_module
+from layout_autosave import dump_layout
+
+yaml = lazy_module("yaml")
+
+CONFIG_DIR = "configs"
+LAYOUT_SUFFIX = "_layout.yaml"
+
+EXTENDS_KEY = "extends"
+REMOVE_KEY = "remove_fields"
+# 평탄한 레이아웃에는 남기지 않는 상속 전용 키
+INHERIT_KEYS = (EXTENDS_KEY, REMOVE_KEY)
+
+
+def layout_path(template_name: str, config_dir: str = CONFIG_DIR) -> str:
+    """템플릿명 → 레이아웃 파일 경로"""
+    return os.path.join(config_dir, f"{template_name}{LAYOUT_SUFFIX}")
+
+
+def template_family(template_name: str) -> str:
+    """템플릿 계열 이름 (GA_template1_child2 → GA_template1, JU_template3_TY01 → JU_template3)"""
+    return template_name.rsplit('_', 1)[0]
+
+
+def read_documents(config_dir: str = CONFIG_DIR) -> Dict[str, Dict]:
+    """설정 디렉토리의 레이아웃 문서 원문 (템플릿명 → 상속을 풀지 않은 dict)"""
+    documents = {}
+    for path in sorted(glob.glob(os.path.join(config_dir, f"*{LAYOUT_SUFFIX}"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            documents[os.path.basename(path)[:-len(LAYOUT_SUFFIX)]] = yaml.safe_load(f) or {}
+    return documents
+
+
+def merge_field_boxes(base: Dict[str, List[int]], overrides: Dict[str, List[int]],
+                      removed: List[str] = ()) -> Dict[str, List[int]]:
+    """기준 박스에 제거·덮어쓰기·추가를 적용한 새 dict (상속된 박스 리스트는 기준과 공유)"""
+    removed = set(removed)
+    field_boxes = {name: box for name, box in base.items() if name not in removed}
+    field_boxes.update(overrides)
+    return field_boxes
+
+
+def resolve_document(template_name: str, documents: Dict[str, Dict],
+                     _resolved: Optional[Dict[str, Dict]] = None, _chain: Tuple[str, ...] = ()) -> Dict:
+    """상속을 풀어 평탄한 레이아웃 문서를 만듭니다. (_resolved에 기준 결과를 메모)"""
+    if _resolved is not None and template_name in _resolved:
+        return _resolved[template_name]
+    if template_name in _chain:
+        raise ValueError(f"레이아웃 상속이 순환합니다: {' → '.join(_chain + (template_name,))}")
+    if template_name not in documents:
+        raise ValueError(f"기준 레이아웃이 없습니다: {template_name} ({_chain[-1]}의 extends)")
+
+    document = documents[template_name]
+    field_boxes = document.get('field_boxes') or {}
+    base_name = document.get(EXTENDS_KEY)
+    if base_name:
+        base = resolve_document(base_name, documents, _resolved, _chain + (template_name,))
+        field_boxes = merge_field_boxes(base['field_boxes'], field_boxes, document.get(REMOVE_KEY) or [])
+
+    resolved = {'field_boxes': field_boxes}
+    resolved.update({key: value for key, value in document.items()
+                     if key != 'field_boxes' and key not in INHERIT_KEYS})
+    if _resolved is not None:
+        _resolved[template_name] = resolved
+    return resolved
+
+
+def resolve_documents(documents: Dict[str, Dict]) -> Dict[str, Dict]:
+    """모든 레이아웃 문서의 상속을 풂 (기준은 한 번만 풀고 공유)"""
+    resolved: Dict[str, Dict] = {}
+    for template_name in documents:
+        resolve_document(template_name, documents, resolved)
+    return {name: resolved[name] for name in documents}
+
+
+def read_layouts(config_dir: str = CONFIG_DIR) -> Dict[str, Dict]:
+    """설정 디렉토리의 모든 레이아웃 (템플릿명 → 평탄한 레이아웃)"""
+    return resolve_documents(read_documents(config_dir))
+
+
+def read_layout(path: str) -> Dict:
+    """레이아웃 파일 하나를 읽고 상속을 풂 (기준은 같은 디렉토리에서 찾음)"""
+    config_dir = os.path.dirname(path) or "."
+    template_name = os.path.basename(path)[:-len(LAYOUT_SUFFIX)]
+    documents: Dict[str, Dict] = {}
+    name, current = template_name, path
+    while name and name not in documents:
+        with open(current, 'r', encoding='utf-8') as f:
+            documents[name] = yaml.safe_load(f) or {}
+        name = documents[name].get(EXTENDS_KEY)
+        current = layout_path(name, config_dir) if name else None
+        if current and not os.path.exists(current):
+            break  # resolve_document가 없는 기준으로 보고
+    return resolve_document(template_name, documents)
+
+
+def diff_field_boxes(base: Dict[str, List[int]],
+                     variant: Dict[str, List[int]]) -> Tuple[Dict[str, List[int]], List[str]]:
+    """(기준과 다르거나 새로 생긴 박스, 기준에만 있는 필드)"""
+    overrides = {name: list(box) for name, box in variant.items() if list(base.get(name) or []) != list(box)}
+    removed = [name for name in base if name not in variant]
+    return overrides, removed
+
+
+def variant_document(base_name: str, base_boxes: Dict[str, List[int]], document: Dict) -> Dict:
+    """평탄한 레이아웃 문서를 base_name을 상속하는 변형 문서로 바꿉니다. (field_boxes 외의 키는 그대로)"""
+    overrides, removed = diff_field_boxes(base_boxes, document.get('field_boxes') or {})
+    variant = {EXTENDS_KEY: base_name}
+    if removed:
+        variant[REMOVE_KEY] = removed
+    variant['field_boxes'] = overrides
+    variant.update({key: value for key, value in document.items()
+                    if key != 'field_boxes' and key not in INHERIT_KEYS})
+    return variant
+
+
+def choose_bases(layouts: Dict[str, Dict]) -> Dict[str, str]:
+    """계열 → 기준 템플릿명 (필드가 가장 많은 레이아웃, 같으면 이름순 첫 번째)"""
+    bases: Dict[str, str] = {}
+    for name in sorted(layouts):
+        family = template_family(name)
+        count = len(layouts[name].get('field_boxes') or {})
+        if family not in bases or count > len(layouts[bases[family]].get('field_boxes') or {}):
+            bases[family] = name
+    return bases
+
+
+def compact_documents(documents: Dict[str, Dict]) -> Dict[str, Dict]:
+    """계열별 기준 + 변형 형태로 바꿀 문서들 (템플릿명 → 새 문서, 바뀌는 것만)
+
+    이미 상속하는 문서와 기준 자신, 상속으로 줄지 않는 변형은 건드리지 않습니다.
+    """
+    layouts = resolve_documents(documents)
+    flat = {name: layout for name, layout in layouts.items() if not documents[name].get(EXTENDS_KEY)}
+    changes = {}
+    for family, base_name in choose_bases(flat).items():
+        base_boxes = flat[base_name]['field_boxes']
+        for name, layout in flat.items():
+            if name == base_name or template_family(name) != family:
+                continue
+            variant = variant_document(base_name, base_boxes, layout)
+            delta = len(variant['field_boxes']) + len(variant.get(REMOVE_KEY, []))
+            if delta >= len(layout['field_boxes']):
+                continue
+            # 풀었을 때 원래 박스와 같아야 함 (필드 순서는 기준 순서를 따름)
+            trial = resolve_document(name, {**documents, name: variant})
+            if trial['field_boxes'] != layout['field_boxes']:
+                continue
+            changes[name] = variant
+    return changes
+
+
+def print_diff(base_name: str, variant_name: str, layouts: Dict[str, Dict]):
+    """두 레이아웃의 필드 차이 출력"""
+    base = layouts[base_name]['field_boxes']
+    variant = layouts[variant_name]['field_boxes']
+    overrides, removed = diff_field_boxes(base, variant)
+    added = [name for name in overrides if name not in base]
+    changed = [name for name in overrides if name in base]
+    same = len(variant) - len(overrides)
+
+    print(f"=== {variant_name} ← {base_name} ===")
+    print(f"공통 {same}개 | 변경 {len(changed)}개 | 추가 {len(added)}개 | 제거 {len(removed)}개")
+    for name in changed:
+        delta = [b - a for a, b in zip(base[name], variant[name])]
+        print(f"  ~ {name}: {list(base[name])} → {list(variant[name])} (Δ {delta})")
+    for name in added:
+        print(f"  + {name}: {list(variant[name])}")
+    for name in removed:
+        print(f"  - {name}")
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="레이아웃 상속 (기준 + 변형) 도구")
+    parser.add_argument("--config-dir", default=CONFIG_DIR, help="레이아웃 디렉토리")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    diff_parser = commands.add_parser("diff", help="두 레이아웃의 필드 차이 출력")
+    diff_parser.add_argument("base", help="기준 템플릿명")
+    diff_parser.add_argument("variant", help="비교할 템플릿명")
+
+    compact_parser = commands.add_parser("compact", help="계열별 기준 + 차이만 남긴 변형으로 다시 기록")
+    compact_parser.add_argument("--dry-run", action="store_true", help="바꿀 내용만 출력")
+
+    args = parser.parse_args()
+    documents = read_documents(args.config_dir)
+
+    if args.command == "diff":
+        print_diff(args.base, args.variant, resolve_documents(documents))
+        return
+
+    changes = compact_documents(documents)
+    if not changes:
+        print("✓ 상속으로 줄일 변형 레이아웃이 없습니다.")
+        return
+    for name, variant in changes.items():
+        removed = len(variant.get(REMOVE_KEY, []))
+        print(f"  {'(dry-run) ' if args.dry_run else ''}{name} → extends {variant[EXTENDS_KEY]} "
+              f"(박스 {len(variant['field_boxes'])}개, 제거 {removed}개)")
+        if not args.dry_run:
+            dump_layout(layout_path(name, args.config_dir), variant)
+    print(f"📁 변형 {len(changes)}개{' (기록하지 않음)' if args.dry_run else ' 기록'}")
+
+
+if __name__ == "__main__":
+    main()
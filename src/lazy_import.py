@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+지연 import (무거운 모듈은 처음 사용할 때 로드)
+
+기능:
+- cv2, PIL, yaml 등 무거운 모듈을 모듈 객체 대신 프록시로 받아 두고 첫 속성 접근 때 import
+- CLI 시작·워커 프로세스 생성 시 실제로 쓰지 않는 모듈의 import 비용 제거
+- 한 번 로드되면 프록시에 모듈 속성을 복사하므로 이후 접근은 일반 모듈과 같은 속도
+
+사용:
+    cv2 = lazy_module("cv2")
+    Image = lazy_module("PIL.Image")   # 서브모듈도 그대로 지정
+
+주의:
+- 모듈 최상위에서 속성에 접근하면(상수 dict, 기본 인자, 타입 힌트 등) 그 자리에서 로드됨
+  → 타입 힌트는 문자열로, 상수는 함수 안에서 조회
+"""
+
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """첫 속성 접근 때 실제 모듈을 import하는 프록시"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_loaded"] = False
+
+    def _load(self) -> types.ModuleType:
+        """실제 모듈을 import하고 속성을 프록시에 복사합니다."""
+        module = importlib.import_module(self.__name__)
+        if not self.__dict__["_lazy_loaded"]:
+            self.__dict__.update(module.__dict__)
+            self.__dict__["_lazy_loaded"] = True
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_loaded"] else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_module(name: str) -> types.ModuleType:
+    """이미 로드된 모듈이면 그대로, 아니면 지연 로드 프록시를 돌려줍니다."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_loaded(name: str) -> bool:
+    """모듈이 실제로 import되었는지 확인합니다. (벤치마크·테스트용)"""
+    return name in sys.modules
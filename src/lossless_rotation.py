@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+무손실 JPEG 회전 (DCT 계수 영역 전치/반전)
+
+기능:
+- 이미 디스크에 있는 JPEG을 디코딩/재인코딩 없이 90/180/270도 회전
+- libjpeg(-turbo)의 jpegtran을 사용하여 DCT 계수 블록만 재배치 → 화질 손실 0
+- 여러 파일을 스레드 풀로 병렬 처리 (jpegtran은 별도 프로세스이므로 GIL 영향 없음)
+
+주의:
+- 무손실 회전은 이미지 크기가 MCU(4:2:0 컬러는 16px, 흑백·4:4:4는 8px)의 배수일 때만
+  완전(-perfect)합니다. 호출 측은 jpeg_geometry/is_perfect_rotation으로 SOF 헤더를 미리 확인해
+  불가능한 회전은 jpegtran을 실행하지 않고 픽셀 회전으로 보냅니다.
+  (GA 1591×1125 페이지는 모든 각도, JU 1448×1024 4:2:0 페이지는 -90·180도가 픽셀 경로)
+  그래도 실패하면(손상된 파일 등) False를 반환합니다.
+- jpegtran 경로는 PATH 또는 환경 변수 KDOCS_JPEGTRAN으로 지정합니다.
+"""
+
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+import struct
+from typing import Dict, List, Optional, Tuple
+
+# RotationProcessor 각도 규칙 → jpegtran 시계 방향 회전 각도
+# (90 = cv2.ROTATE_90_CLOCKWISE, -90 = cv2.ROTATE_90_COUNTERCLOCKWISE)
+JPEGTRAN_ROTATIONS = {
+    90: "90",
+    -90: "270",
+    180: "180",
+}
+
+JPEG_EXTS = (".jpg", ".jpeg")
+
+# -perfect 조건 (libjpeg jtransform_perfect_transform과 동일): 각도별로 MCU 배수여야 하는 변
+# 90(시계 방향)은 아래쪽 부분 블록이 왼쪽 가장자리로, -90은 오른쪽 부분 블록이 위쪽 가장자리로 감
+PERFECT_EDGES = {
+    90: ("height",),
+    -90: ("width",),
+    180: ("width", "height"),
+}
+
+# 길이 필드가 없는 마커 (TEM, RST0~7)
+_STANDALONE_MARKERS = {0x01} | set(range(0xD0, 0xD8))
+# 프레임 헤더(SOF) 마커 (DHT·JPG·DAC 제외)
+_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def find_jpegtran() -> Optional[str]:
+    """jpegtran 실행 파일 경로를 찾습니다. (없으면 None)"""
+    env_path = os.environ.get("KDOCS_JPEGTRAN")
+    if env_path and os.path.exists(env_path):
+        return env_path
+    return shutil.which("jpegtran")
+
+
+def is_jpeg(filepath: str) -> bool:
+    """무손실 회전 대상(JPEG) 파일인지 확인합니다."""
+    return filepath.lower().endswith(JPEG_EXTS)
+
+
+def jpeg_geometry(filepath: str) -> Optional[Dict[str, int]]:
+    """JPEG SOF 헤더의 크기와 MCU 크기를 읽습니다. (디코딩 없음, JPEG이 아니거나 헤더가 없으면 None)
+
+    Returns:
+        {"width", "height", "mcu_width", "mcu_height"}
+    """
+    with open(filepath, "rb") as f:
+        if f.read(2) != b"\xff\xd8":
+            return None
+        while True:
+            byte = f.read(1)
+            if not byte:
+                return None
+            if byte != b"\xff":
+                continue
+            marker = f.read(1)
+            while marker == b"\xff":  # 채움 바이트
+                marker = f.read(1)
+            if not marker:
+                return None
+            code = marker[0]
+            if code in _STANDALONE_MARKERS:
+                continue
+            if code == 0xDA:  # SOS: 프레임 헤더 없이 스캔 시작
+                return None
+            length_bytes = f.read(2)
+            if len(length_bytes) < 2:
+                return None
+            length = struct.unpack(">H", length_bytes)[0]
+            if code not in _SOF_MARKERS:
+                f.seek(length - 2, os.SEEK_CUR)
+                continue
+            segment = f.read(length - 2)
+            if len(segment) < 6:
+                return None
+            height, width, components = struct.unpack(">HHB", segment[1:6])
+            factors = [segment[7 + 3 * i] for i in range(components) if 8 + 3 * i <= len(segment)]
+            if components == 1 or not factors:
+                # 단일 성분은 샘플링 계수와 관계없이 MCU = 블록 하나
+                return {"width": width, "height": height, "mcu_width": 8, "mcu_height": 8}
+            return {"width": width, "height": height,
+                    "mcu_width": 8 * max(factor >> 4 for factor in factors),
+                    "mcu_height": 8 * max(factor & 0x0F for factor in factors)}
+
+
+def is_perfect_rotation(geometry: Dict[str, int], angle: int) -> bool:
+    """jpegtran -perfect로 angle 회전이 가능한 크기인지 확인합니다."""
+    return all(geometry[edge] % geometry[f"mcu_{edge}"] == 0 for edge in PERFECT_EDGES[angle])
+
+
+def jpegtran_rotate(src: str, dst: str, angle: int, jpegtran: str) -> bool:
+    """JPEG을 DCT 영역에서 무손실 회전합니다.
+
+    Args:
+        src: 원본 JPEG 경로
+        dst: 출력 JPEG 경로
+        angle: 90, -90, 180 (RotationProcessor 각도 규칙)
+        jpegtran: jpegtran 실행 파일 경로
+
+    Returns:
+        성공 여부 (-perfect 조건 불만족 등으로 실패하면 False, 출력 파일은 남기지 않음)
+    """
+    if angle not in JPEGTRAN_ROTATIONS:
+        raise ValueError(f"지원하지 않는 회전 각도입니다: {angle}")
+
+    cmd = [jpegtran, "-rotate", JPEGTRAN_ROTATIONS[angle], "-perfect", "-copy", "all", "-outfile", dst, src]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    if result.returncode != 0:
+        if os.path.exists(dst):
+            os.remove(dst)
+        return False
+    return True
+
+
+class LosslessRotationDriver:
+    """여러 JPEG 회전 작업을 스레드 풀로 병렬 실행하는 드라이버"""
+
+    def __init__(self, jpegtran: str = None, threads: int = None):
+        self.jpegtran = jpegtran or find_jpegtran()
+        if self.jpegtran is None:
+            raise FileNotFoundError("jpegtran을 찾을 수 없습니다. libjpeg-turbo를 설치하거나 KDOCS_JPEGTRAN을 지정하세요.")
+        self.threads = threads or min(32, (os.cpu_count() or 1) * 2)
+
+    def run(self, jobs: List[Tuple[str, str, int]]) -> Dict[str, list]:
+        """(src, dst, angle) 작업 목록을 실행합니다.
+
+        Returns:
+            {"ok": [작업...], "failed": [작업...]} - failed는 픽셀 회전으로 대체해야 하는 작업
+        """
+        results = {"ok": [], "failed": []}
+        if not jobs:
+            return results
+
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            outcomes = pool.map(lambda job: jpegtran_rotate(job[0], job[1], job[2], self.jpegtran), jobs)
+            for job, ok in zip(jobs, outcomes):
+                results["ok" if ok else "failed"].append(job)
+
+        elapsed = time.time() - start
+        rate = len(jobs) / elapsed if elapsed > 0 else 0.0
+        print(f"무손실 회전: {len(results['ok'])}/{len(jobs)}개 성공 ({rate:.1f}개/초, 스레드 {self.threads})")
+        return results
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+스트리밍 매니페스트 기록기
+
+기능:
+- 파일이 생성되는 즉시 매니페스트 행을 기록 (처리 후 디렉토리 재검색 불필요)
+- 실제 템플릿명·세대원/자녀 수·공개 여부·시드·회전 각도를 그대로 기록
+- append-only CSV (기본) 또는 Parquet (.parquet 확장자, pyarrow 필요)
+- 행을 버퍼에 모았다가 flush_every 행마다 한 번에 기록
+"""
+
+import csv
+import os
+from typing import Dict, Iterable, List, Optional
+
+# 생성/회전 매니페스트 공통 컬럼
+# (앞 6개는 기존 rotation_manifest.csv와 동일한 순서 → 기존 스크립트 호환)
+# source_filename: 회전본의 원본 파일 (매니페스트 디렉토리 기준 상대 경로, 같은 디렉토리면 파일명만)
+MANIFEST_COLUMNS = [
+    "filename", "doc_type", "doc_kind", "disclosure", "angle", "sequence",
+    "template_name", "members_count", "children_count", "seed", "source_filename", "reference_date",
+]
+
+# 생성 단계(0도) 매니페스트 파일명 - 회전 처리기가 원본 메타데이터를 찾는 데 사용
+GENERATION_MANIFEST = "generation_manifest.csv"
+ROTATION_MANIFEST = "rotation_manifest.csv"
+
+
+class ManifestWriter:
+    """append-only 매니페스트 기록기 (CSV / Parquet)"""
+
+    def __init__(self, path: str, columns: List[str] = None, append: bool = False, flush_every: int = 256):
+        """
+        Args:
+            path: 매니페스트 경로 (.csv 또는 .parquet)
+            columns: 컬럼 목록 (기본: MANIFEST_COLUMNS)
+            append: True면 기존 파일 뒤에 이어 쓰기, False면 새로 시작 (CSV 전용)
+            flush_every: 버퍼에 모을 최대 행 수
+        """
+        self.path = path
+        self.columns = columns or MANIFEST_COLUMNS
+        self.flush_every = flush_every
+        self.format = "parquet" if path.endswith(".parquet") else "csv"
+        self.rows_written = 0
+        self._buffer: List[Dict] = []
+        self._parquet_writer = None
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        if self.format == "csv":
+            need_header = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+            if not need_header:
+                self.columns = _existing_columns(path, self.columns)
+            self._file = open(path, "a" if append else "w", encoding="utf-8", newline="")
+            self._csv = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction="ignore")
+            if need_header:
+                self._csv.writeheader()
+        else:
+            if append:
+                raise ValueError("Parquet 매니페스트는 이어 쓰기를 지원하지 않습니다 (행 그룹 단위로 새로 기록).")
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError as e:
+                raise ImportError("Parquet 매니페스트에는 pyarrow가 필요합니다: pip install pyarrow") from e
+            self._file = None
+
+    def write_row(self, row: Dict):
+        """행 하나를 기록합니다. (없는 컬럼은 빈 값)"""
+        self._buffer.append(row)
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def write_rows(self, rows: Iterable[Dict]):
+        """여러 행을 기록합니다."""
+        for row in rows:
+            self.write_row(row)
+
+    def flush(self):
+        """버퍼의 행을 디스크에 기록합니다."""
+        if not self._buffer:
+            return
+
+        if self.format == "csv":
+            self._csv.writerows(self._buffer)
+            self._file.flush()
+        else:
+            self._write_parquet_batch(self._buffer)
+
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+
+    def _write_parquet_batch(self, rows: List[Dict]):
+        """버퍼를 Parquet 행 그룹 하나로 기록합니다. (모든 값은 문자열)"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table({col: [_to_str(row.get(col)) for row in rows] for col in self.columns})
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+        self._parquet_writer.write_table(table)
+
+    def close(self):
+        """남은 행을 기록하고 파일을 닫습니다."""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _existing_columns(path: str, columns: List[str]) -> List[str]:
+    """이어 쓸 CSV의 헤더를 그대로 사용합니다. (이전 버전 매니페스트에 없는 컬럼은 기록하지 않고 알림)"""
+    with open(path, encoding="utf-8", newline="") as f:
+        header = next(csv.reader(f), None)
+    if not header or header == columns:
+        return columns
+    missing = [col for col in columns if col not in header]
+    if missing:
+        print(f"⚠️  기존 매니페스트 헤더에 없는 컬럼은 기록하지 않습니다 ({path}): {', '.join(missing)}")
+    return header
+
+
+def _to_str(value) -> str:
+    """None은 빈 문자열, 나머지는 문자열로 변환합니다."""
+    return "" if value is None else str(value)
+
+
+def read_manifest(path: str) -> List[Dict[str, str]]:
+    """매니페스트를 행 목록(dict)으로 읽습니다. (CSV / Parquet)"""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return pq.read_table(path).to_pylist()
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def load_manifest_index(path: str, key: str = "filename") -> Optional[Dict[str, Dict[str, str]]]:
+    """매니페스트를 key 컬럼 기준 dict로 읽습니다. (파일이 없으면 None)
+    
+    append-only 파일이므로 같은 key가 여러 번 나오면 마지막 행(최신 생성)을 사용합니다.
+    """
+    if not os.path.exists(path):
+        return None
+    return {row[key]: row for row in read_manifest(path)}
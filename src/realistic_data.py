@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+실제 형식을 따르는 날짜·주민등록번호 합성 (data_mode="realistic")
+
+기능:
+- 존재하는 달력 날짜만 생성 (1900-01-01 ~ 기준일)
+- 관계(부/모/배우자/자녀)별로 본인 나이에 맞는 생년월일
+- 주민번호 앞 6자리·성별 자리가 생년월일·성별과 일치하고 검증 자리(check digit)가 맞는 번호
+- 배치 함수는 numpy로 N명분을 한 번에 생성, 단건 함수는 미리 만든 테이블을 O(1) 조회
+- 기준일(나이·날짜 상한)은 고정값 DEFAULT_REFERENCE_DATE → 실행일과 무관하게 같은 시드로 같은 데이터
+  (set_reference_date / 배치 생성기 --reference-date로 변경, 생성 매니페스트 reference_date 컬럼에 기록)
+
+주민번호 규칙:
+- 성별 자리: 1900년대 남 1 / 여 2, 2000년대 남 3 / 여 4
+- 검증 자리: 앞 12자리 × 가중치 [2,3,4,5,6,7,8,9,2,3,4,5] 합 S → (11 - S % 11) % 10
+"""
+
+from datetime import date
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from rng_context import RNGContext, resolve
+
+# 날짜 테이블 범위 (기준일 고정 - 실행일을 쓰면 같은 시드라도 날마다 나이·생년월일이 달라짐)
+DATE_TABLE_START = date(1900, 1, 1)
+DEFAULT_REFERENCE_DATE = date(2025, 1, 1)
+REFERENCE_DATE = DEFAULT_REFERENCE_DATE
+
+DAYS_PER_YEAR = 365.2425
+
+JUMIN_WEIGHTS = (2, 3, 4, 5, 6, 7, 8, 9, 2, 3, 4, 5)
+
+# 본인 나이 기준 관계별 나이 차이 (관계 나이 = 본인 나이 + 차이)
+RELATION_AGE_OFFSETS = {
+    "부": (20, 40),
+    "모": (18, 38),
+    "배우자": (-5, 5),
+    "자녀": (-40, -20),
+}
+
+# 관계로 성별이 정해지는 경우
+RELATION_GENDERS = {"부": "남", "모": "여"}
+
+# 세대원 중 관계가 정해지지 않은 사람(동거인 등)의 나이 범위
+DEFAULT_AGE_RANGE = (0, 80)
+
+# 세대주 전입·세대구성 일자는 성인이 된 이후
+ADULT_AGE = 18
+
+MAX_AGE = 100
+
+
+def set_reference_date(value: Union[date, str, None]) -> date:
+    """기준일을 바꾸고(None이면 기본값) 날짜 테이블을 다시 만들게 합니다.
+
+    Args:
+        value: date 또는 "YYYY-MM-DD" 문자열
+    Returns:
+        적용된 기준일
+    """
+    global REFERENCE_DATE
+    if value is None:
+        value = DEFAULT_REFERENCE_DATE
+    elif isinstance(value, str):
+        value = date.fromisoformat(value)
+    if value <= DATE_TABLE_START:
+        raise ValueError(f"기준일은 {DATE_TABLE_START} 이후여야 합니다: {value}")
+    if value != REFERENCE_DATE:
+        REFERENCE_DATE = value
+        date_tables.cache_clear()
+    return REFERENCE_DATE
+
+
+@lru_cache(maxsize=None)
+def date_tables() -> Dict[str, object]:
+    """기준일까지의 모든 날짜에 대한 조회 테이블을 한 번만 만듭니다. (numpy 벡터 연산)
+
+    Returns:
+        dot: "YYYY.MM.DD" 문자열 목록
+        dash: "YYYY-MM-DD" 문자열 목록
+        yymmdd: 주민번호 앞 6자리 문자열 목록
+        after_2000: 2000년 이후 출생 여부 (bool 배열)
+        front_sum: 앞 6자리 × 가중치 합 (int 배열)
+        yymmdd_codes: 앞 6자리 숫자 배열 (N, 6)
+    """
+    days = np.arange(np.datetime64(DATE_TABLE_START.isoformat()),
+                     np.datetime64(REFERENCE_DATE.isoformat()) + np.timedelta64(1, "D"), dtype="datetime64[D]")
+    years = days.astype("datetime64[Y]").astype(np.int64) + 1970
+    months = days.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    mdays = (days - days.astype("datetime64[M]")).astype(np.int64) + 1
+
+    yy = years % 100
+    digits = np.stack([yy // 10, yy % 10, months // 10, months % 10, mdays // 10, mdays % 10], axis=1)
+
+    dash = np.datetime_as_string(days, unit="D")
+    return {
+        "dot": np.char.replace(dash, "-", ".").tolist(),
+        "dash": dash.tolist(),
+        "yymmdd": _digits_to_strings(digits),
+        "after_2000": years >= 2000,
+        "front_sum": digits @ np.array(JUMIN_WEIGHTS[:6], dtype=np.int64),
+        "yymmdd_codes": digits,
+    }
+
+
+def _digits_to_strings(digits: np.ndarray) -> List[str]:
+    """(N, K) 숫자 배열을 길이 K 숫자 문자열 N개로 변환합니다."""
+    codes = np.ascontiguousarray(digits + ord("0"), dtype=np.uint32)
+    return codes.view(f"<U{codes.shape[1]}").ravel().tolist()
+
+
+def day_index(d: date) -> int:
+    """날짜 → 테이블 인덱스"""
+    return d.toordinal() - DATE_TABLE_START.toordinal()
+
+
+def parse_day(text: str) -> int:
+    """날짜 문자열(YYYY.MM.DD 또는 YYYY-MM-DD) → 테이블 인덱스"""
+    return day_index(date.fromisoformat(text.replace(".", "-")))
+
+
+def years_after(day: int, years: int) -> int:
+    """테이블 인덱스 기준 years년 뒤의 인덱스 (근사)"""
+    return day + int(years * DAYS_PER_YEAR)
+
+
+def _years_before(years: int) -> date:
+    """기준일로부터 years년 전 같은 날짜 (2월 29일은 2월 28일로)"""
+    try:
+        return REFERENCE_DATE.replace(year=REFERENCE_DATE.year - years)
+    except ValueError:
+        return REFERENCE_DATE.replace(year=REFERENCE_DATE.year - years, day=28)
+
+
+def age_to_day_range(min_age: int, max_age: int) -> Tuple[int, int]:
+    """나이 범위(만 나이) → 생년월일 테이블 인덱스 범위 (양 끝 포함, 테이블 범위로 자름)"""
+    min_age = max(0, min(min_age, MAX_AGE))
+    max_age = max(min_age, min(max_age, MAX_AGE))
+    lo = day_index(_years_before(max_age + 1)) + 1
+    hi = day_index(_years_before(min_age))
+    return max(0, lo), max(0, hi)
+
+
+def relative_age_range(relationship: str, main_age: int) -> Tuple[int, int]:
+    """본인 나이 기준 관계별 나이 범위"""
+    if relationship not in RELATION_AGE_OFFSETS:
+        return DEFAULT_AGE_RANGE
+    low, high = RELATION_AGE_OFFSETS[relationship]
+    return max(0, main_age + low), max(0, main_age + high)
+
+
+def age_from_birth(birth: str) -> int:
+    """생년월일 문자열(YYYY.MM.DD)로 기준일 나이를 계산합니다."""
+    year, month, day = (int(part) for part in birth.replace("-", ".").split("."))
+    return REFERENCE_DATE.year - year - ((REFERENCE_DATE.month, REFERENCE_DATE.day) < (month, day))
+
+
+def gender_digit(after_2000: bool, male: bool) -> int:
+    """출생 연대와 성별로 주민번호 성별 자리를 정합니다."""
+    return (3 if male else 4) if after_2000 else (1 if male else 2)
+
+
+def check_digit(weighted_sum: int) -> int:
+    """앞 12자리 가중치 합으로 검증 자리를 계산합니다."""
+    return (11 - weighted_sum % 11) % 10
+
+
+# --- 단건 생성 (테이블 조회) ---
+
+def sample_birth_day(min_age: int, max_age: int, rng: RNGContext = None) -> int:
+    """나이 범위 안의 생년월일 테이블 인덱스를 하나 뽑습니다."""
+    lo, hi = age_to_day_range(min_age, max_age)
+    return resolve(rng).randint(lo, hi)
+
+
+def sample_day_between(lo: int, hi: int = None, rng: RNGContext = None) -> int:
+    """두 테이블 인덱스 사이(양 끝 포함, hi 생략 시 기준일)의 날짜 인덱스를 하나 뽑습니다."""
+    last = day_index(REFERENCE_DATE)
+    hi = last if hi is None else min(hi, last)
+    lo = max(0, min(lo, hi))
+    return resolve(rng).randint(lo, hi)
+
+
+def make_jumin(day: int, gender: str, jumin_disclosure: str = "CLOSE", rng: RNGContext = None) -> str:
+    """생년월일 인덱스와 성별("남"/"여")로 유효한 주민번호를 만듭니다."""
+    tables = date_tables()
+    digit7 = gender_digit(bool(tables["after_2000"][day]), gender == "남")
+    front = f"{tables['yymmdd'][day]}-{digit7}"
+
+    if jumin_disclosure == "CLOSE":
+        return f"{front}******"
+
+    rng = resolve(rng)
+    serial = [rng.randint(0, 9) for _ in range(5)]
+    weighted = int(tables["front_sum"][day]) + digit7 * JUMIN_WEIGHTS[6]
+    weighted += sum(d * w for d, w in zip(serial, JUMIN_WEIGHTS[7:]))
+    return f"{front}{''.join(map(str, serial))}{check_digit(weighted)}"
+
+
+# --- 배치 생성 (numpy 벡터화) ---
+
+def generate_realistic_people(n: int, min_age: Union[int, Sequence[int]] = 0, max_age: Union[int, Sequence[int]] = 80,
+                              rng=None, jumin_disclosure: str = "CLOSE",
+                              genders: Sequence[Optional[str]] = None) -> Dict[str, List[str]]:
+    """N명분의 성별·생년월일·주민번호·발생일·신고일을 한 번에 생성합니다. (rng: RNGContext 또는 numpy Generator)
+
+    Args:
+        min_age, max_age: 공통 나이 범위 또는 사람별 나이 범위 목록 (길이 N)
+        genders: 사람별 고정 성별("남"/"여", None이면 무작위) 목록
+    Returns:
+        {"gender", "birth", "jumin", "event", "report"}
+        (birth·report는 YYYY.MM.DD, event는 YYYY-MM-DD - 발생일은 출생 이후, 신고일은 발생일 이후)
+    """
+    rng = rng if isinstance(rng, np.random.Generator) else resolve(rng).generator
+    tables = date_tables()
+
+    if np.ndim(min_age) == 0 and np.ndim(max_age) == 0:
+        lo, hi = age_to_day_range(min_age, max_age)
+    else:
+        ranges = [age_to_day_range(a, b) for a, b in zip(*np.broadcast_arrays(min_age, max_age))]
+        lo, hi = np.array(ranges, dtype=np.int64).reshape(-1, 2).T
+    days = rng.integers(lo, hi + 1, n)
+    male = rng.random(n) < 0.5
+    if genders is not None:
+        fixed = np.array([g or "" for g in genders])
+        male = np.where(fixed == "", male, fixed == "남")
+
+    last = day_index(REFERENCE_DATE)
+    event_days = rng.integers(days, last + 1)
+    report_days = rng.integers(event_days, last + 1)
+
+    after_2000 = tables["after_2000"][days]
+    digit7 = np.where(after_2000, np.where(male, 3, 4), np.where(male, 1, 2))
+
+    if jumin_disclosure == "CLOSE":
+        back = np.full((n, 6), ord("*") - ord("0"), dtype=np.int64)
+    else:
+        serial = rng.integers(0, 10, (n, 5))
+        weighted = tables["front_sum"][days] + digit7 * JUMIN_WEIGHTS[6] + serial @ np.array(JUMIN_WEIGHTS[7:])
+        back = np.concatenate([serial, ((11 - weighted % 11) % 10)[:, None]], axis=1)
+
+    dash = np.full((n, 1), ord("-") - ord("0"), dtype=np.int64)
+    digits = np.concatenate([tables["yymmdd_codes"][days], dash, digit7[:, None], back], axis=1)
+
+    dot, dash = tables["dot"], tables["dash"]
+    return {
+        "gender": np.where(male, "남", "여").tolist(),
+        "birth": [dot[d] for d in days.tolist()],
+        "jumin": _digits_to_strings(digits),
+        "event": [dash[d] for d in event_days.tolist()],
+        "report": [dot[d] for d in report_days.tolist()],
+    }
+
+
+def is_valid_jumin(jumin: str) -> bool:
+    """주민번호 형식·날짜·검증 자리가 올바른지 확인합니다. (전체 공개 번호 전용)"""
+    digits = jumin.replace("-", "")
+    if len(digits) != 13 or not digits.isdigit():
+        return False
+    century = {"1": 1900, "2": 1900, "3": 2000, "4": 2000}.get(digits[6])
+    if century is None:
+        return False
+    try:
+        date(century + int(digits[:2]), int(digits[2:4]), int(digits[4:6]))
+    except ValueError:
+        return False
+    weighted = sum(int(d) * w for d, w in zip(digits[:12], JUMIN_WEIGHTS))
+    return check_digit(weighted) == int(digits[12])
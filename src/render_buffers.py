@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+렌더링 버퍼 풀
+
+기능:
+- 페이지 버퍼: 템플릿 크기의 출력 버퍼를 미리 만들어 두고 문서마다 재사용 (render_into)
+- 크롭 버퍼: 필드 텍스트를 그릴 때 쓰는 작은 중간 배열(색 변환·블러)을 shape별로 재사용
+- 워커(스레드)마다 풀 하나 → 정상 상태에서는 문서당 새 페이지 할당이 없음
+
+주의:
+- 풀에서 받은 버퍼는 다음 get 호출(같은 shape)에서 다시 쓰이므로 결과를 오래 보관하려면 복사해야 함
+"""
+
+import threading
+from typing import Dict, Tuple
+
+import numpy as np
+
+_local = threading.local()
+
+
+class BufferPool:
+    """shape·dtype별 재사용 배열 풀"""
+
+    def __init__(self, max_buffers: int = 256):
+        """
+        Args:
+            max_buffers: 보관할 최대 버퍼 수 (넘으면 가장 오래된 것부터 버림)
+        """
+        self.max_buffers = max_buffers
+        self._buffers: Dict[Tuple[Tuple[int, ...], str, str], np.ndarray] = {}
+        self.stats = {"hits": 0, "misses": 0, "allocated_bytes": 0}
+
+    def get(self, shape: Tuple[int, ...], dtype=np.uint8, tag: str = "") -> np.ndarray:
+        """shape·dtype 배열을 돌려줍니다. (내용은 초기화하지 않음)
+
+        Args:
+            tag: 같은 shape을 동시에 두 개 써야 할 때 구분용 이름
+        """
+        key = (tuple(shape), np.dtype(dtype).str, tag)
+        buf = self._buffers.get(key)
+        if buf is not None:
+            self.stats["hits"] += 1
+            return buf
+
+        if len(self._buffers) >= self.max_buffers:
+            self._buffers.pop(next(iter(self._buffers)))
+        buf = np.empty(shape, dtype=dtype)
+        self._buffers[key] = buf
+        self.stats["misses"] += 1
+        self.stats["allocated_bytes"] += buf.nbytes
+        return buf
+
+    def page_for(self, template) -> np.ndarray:
+        """템플릿 이미지와 같은 크기의 페이지 버퍼 (template.render_into의 출력용)"""
+        img = template.template_img
+        return self.get(img.shape, img.dtype, tag="page")
+
+    def clear(self):
+        """보관 중인 버퍼를 모두 버립니다."""
+        self._buffers.clear()
+
+    @property
+    def nbytes(self) -> int:
+        """보관 중인 버퍼의 총 바이트 수"""
+        return sum(buf.nbytes for buf in self._buffers.values())
+
+
+def default_pool() -> BufferPool:
+    """현재 스레드(워커)의 기본 버퍼 풀"""
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = BufferPool()
+        _local.pool = pool
+    return pool
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+난수 컨텍스트 (numpy Generator + SeedSequence)
+
+기능:
+- 모듈 전역 random / Faker 대신 명시적으로 넘겨 쓰는 난수 컨텍스트
+- SeedSequence 자식 시드로 워커별·문서별 독립 스트림 생성 (실행 순서와 무관하게 재현 가능)
+- random 모듈과 같은 모양의 메서드(randint, choice, choices, shuffle, random) 제공
+- Faker는 프로세스(스레드)마다 하나만 만들고, 호출할 때마다 컨텍스트에서 뽑은 시드로 다시 시드
+
+시드 라벨:
+- "엔트로피/자식키..." 형식 (예: "12345/0/17") → 매니페스트 seed 컬럼에 기록하고
+  RNGContext.from_label로 문서 하나를 그대로 다시 만들 수 있음
+- 생성기는 문서 유형 스트림을 먼저 나눈 뒤 문서 번호로 자식을 만듦
+  (RNGContext(seed).child(DOC_TYPE_STREAM["GA"]).child(i) → "seed/0/i")
+  → 같은 시드로 GA·JU를 만들어도 i번째 문서끼리 난수열을 공유하지 않음
+"""
+
+import threading
+from itertools import accumulate
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# 스칼라 호출용으로 한 번에 뽑아 두는 균등 난수 개수
+UNIFORM_BLOCK = 64
+
+# 문서 유형별 첫 번째 자식 키 (생성기마다 독립 스트림)
+DOC_TYPE_STREAM = {"GA": 0, "JU": 1}
+
+_local = threading.local()
+
+
+def _shared_faker():
+    """스레드별 Faker("ko_KR") 인스턴스 (생성 비용이 커서 재사용)"""
+    faker = getattr(_local, "faker", None)
+    if faker is None:
+        from faker import Faker
+        faker = Faker("ko_KR")
+        _local.faker = faker
+    return faker
+
+
+class RNGContext:
+    """문서 생성용 난수 컨텍스트"""
+
+    def __init__(self, seed: Optional[int] = None, seed_seq: np.random.SeedSequence = None):
+        """
+        Args:
+            seed: 루트 시드 (None이면 OS 엔트로피)
+            seed_seq: 이미 만든 SeedSequence (자식 컨텍스트용, seed보다 우선)
+        """
+        self.seed_seq = seed_seq if seed_seq is not None else np.random.SeedSequence(seed)
+        self.generator = np.random.Generator(np.random.PCG64(self.seed_seq))
+        self._block = np.empty(0)
+        self._pos = 0
+
+    # --- 시드 관리 ---
+
+    @property
+    def seed_label(self) -> str:
+        """재현용 시드 라벨 ("엔트로피/자식키...")"""
+        return "/".join(str(part) for part in (self.seed_seq.entropy, *self.seed_seq.spawn_key))
+
+    @classmethod
+    def from_label(cls, label: str) -> "RNGContext":
+        """seed_label로 같은 컨텍스트를 다시 만듭니다."""
+        entropy, *spawn_key = (int(part) for part in str(label).split("/"))
+        return cls(seed_seq=np.random.SeedSequence(entropy, spawn_key=tuple(spawn_key)))
+
+    def child(self, index: int) -> "RNGContext":
+        """index번째 자식 컨텍스트 (SeedSequence.spawn과 같은 키, 호출 순서와 무관)"""
+        seq = self.seed_seq
+        return RNGContext(seed_seq=np.random.SeedSequence(seq.entropy, spawn_key=seq.spawn_key + (index,),
+                                                          pool_size=seq.pool_size))
+
+    def spawn(self, n: int) -> List["RNGContext"]:
+        """자식 컨텍스트 n개 (워커별 스트림 등)"""
+        return [RNGContext(seed_seq=child) for child in self.seed_seq.spawn(n)]
+
+    # --- random 모듈 호환 메서드 ---
+
+    def random(self) -> float:
+        """[0, 1) 균등 난수"""
+        if self._pos >= len(self._block):
+            self._block = self.generator.random(UNIFORM_BLOCK)
+            self._pos = 0
+        value = self._block[self._pos]
+        self._pos += 1
+        return float(value)
+
+    def randint(self, a: int, b: int) -> int:
+        """a 이상 b 이하 정수"""
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq: Sequence):
+        """시퀀스에서 하나를 고릅니다."""
+        return seq[int(self.random() * len(seq))]
+
+    def choices(self, population: Sequence, weights: Sequence[float] = None, k: int = 1) -> list:
+        """가중치에 따라 k개를 중복 허용으로 고릅니다."""
+        if weights is None:
+            return [self.choice(population) for _ in range(k)]
+        cum_weights = list(accumulate(weights))
+        total = cum_weights[-1]
+        picks = np.searchsorted(cum_weights, [self.random() * total for _ in range(k)], side="right")
+        return [population[min(i, len(population) - 1)] for i in picks]
+
+    def shuffle(self, items: list):
+        """리스트를 제자리에서 섞습니다."""
+        for i in range(len(items) - 1, 0, -1):
+            j = int(self.random() * (i + 1))
+            items[i], items[j] = items[j], items[i]
+
+    # --- Faker ---
+
+    def faker(self):
+        """이 컨텍스트에서 뽑은 시드로 다시 시드한 Faker (바로 사용해야 함)"""
+        faker = _shared_faker()
+        faker.seed_instance(int(self.generator.integers(0, 2**63)))
+        return faker
+
+
+_default_context: Optional[RNGContext] = None
+
+
+def default_context() -> RNGContext:
+    """컨텍스트를 넘기지 않은 호출이 쓰는 프로세스 기본 컨텍스트 (시드 없음 → 재현 불가)"""
+    global _default_context
+    if _default_context is None:
+        _default_context = RNGContext()
+    return _default_context
+
+
+def resolve(rng: Optional[RNGContext]) -> RNGContext:
+    """None이면 기본 컨텍스트를 돌려줍니다."""
+    return rng if rng is not None else default_context()
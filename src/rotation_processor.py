@@ -6,23 +6,102 @@
 - 0도 문서들을 L, R, 180도로 회전
 - OPEN/CLOSE/TEMP 문서 처리
 - 새로운 파일명 규칙 적용
+- 회전 백엔드: pixel(디코딩→회전→재인코딩) / lossless(jpegtran DCT 영역 무손실 회전, JPEG 코덱만 - 대체 픽셀 회전본도 .jpg)
+- --workers N: pixel 백엔드를 프로세스 풀로 병렬 처리 (순차·병렬 모두 진행률·처리 속도 출력, 결과 순서는 동일)
+- 회전 매니페스트를 처리 중에 스트리밍 기록 (원본 메타데이터는 generation_manifest.csv에서 가져옴)
+- 원본 필드 주석(annotations_*.json)이 있으면 회전 각도에 맞게 bbox를 변환하여 함께 기록
 """
 
-import cv2
 import numpy as np
 import os
 import glob
+import time
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple
 import argparse
+from image_codec import ImageCodec, CODEC_PRESETS, DEFAULT_PRESET, read_image, IMREAD_COLOR, IMREAD_GRAYSCALE
+from lossless_rotation import LosslessRotationDriver, find_jpegtran, is_jpeg, is_perfect_rotation, jpeg_geometry
+from manifest_writer import ManifestWriter, load_manifest_index, GENERATION_MANIFEST, ROTATION_MANIFEST
+from annotation_sink import AnnotationSink, load_annotation_index, rotate_entry, ROTATION_ANNOTATION_PREFIX
+from lazy_import import lazy_module
+
+# OpenCV는 pixel 백엔드가 실제로 회전할 때 로드 (lossless 백엔드·워커 시작 시에는 import하지 않음)
+cv2 = lazy_module("cv2")
+
+ROTATION_BACKENDS = ("pixel", "lossless")
+
+# 진행률 출력 간격 (파일 수)
+PROGRESS_EVERY = 50
+
+# 워커 프로세스별 회전 처리기 (_init_worker에서 한 번만 생성)
+_worker_processor = None
+
+
+def _init_worker(processor_kwargs: Dict):
+    """워커 프로세스 초기화: 회전 처리기를 한 번만 생성해 재사용합니다."""
+    global _worker_processor
+    _worker_processor = RotationProcessor(**processor_kwargs)
+
+
+def _process_in_worker(filepath: str) -> Tuple[str, List[str], Dict[str, float], str]:
+    """워커에서 파일 하나를 처리하고 (경로, 생성 파일, 코덱 통계 증분, 오류)를 돌려줍니다."""
+    codec_stats = _worker_processor.codec.stats
+    before = dict(codec_stats)
+    try:
+        generated_files = _worker_processor.process_single_file(filepath)
+        error = None
+    except Exception as e:
+        generated_files, error = [], str(e)
+    delta = {key: codec_stats[key] - before[key] for key in codec_stats}
+    return filepath, generated_files, delta, error
 
 class RotationProcessor:
     """문서 회전 처리기"""
     
-    def __init__(self, input_dir: str = "outputs/dataset", output_dir: str = "outputs/dataset"):
+    def __init__(self, input_dir: str = "outputs/dataset", output_dir: str = "outputs/dataset",
+                 color_mode: str = "BGR", codec: ImageCodec = None,
+                 backend: str = "pixel", threads: int = None, verbose: bool = True):
         self.input_dir = input_dir
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         
+        # 매니페스트 source_filename은 출력 디렉토리 기준 상대 경로 (같은 디렉토리면 파일명만)
+        relative = os.path.relpath(input_dir, output_dir)
+        self.source_prefix = "" if relative == "." else relative.replace(os.sep, "/") + "/"
+        
+        # GRAY 모드는 1채널로 디코딩하여 회전·인코딩 비용을 줄임
+        self.color_mode = color_mode
+        self.imread_flag = IMREAD_GRAYSCALE if color_mode == "GRAY" else IMREAD_COLOR
+        
+        # 출력 코덱 (기본: training 프리셋 = 기존 JPEG 설정)
+        self.codec = codec or ImageCodec()
+        
+        # 회전 백엔드 (lossless는 jpegtran이 없으면 pixel로 대체)
+        if backend not in ROTATION_BACKENDS:
+            raise ValueError(f"지원하지 않는 회전 백엔드입니다: {backend} (지원: {ROTATION_BACKENDS})")
+        if backend == "lossless" and self.codec.format != "jpg":
+            # 무손실 회전본은 .jpg → 픽셀 회전 대체분도 같은 확장자여야 한 디렉토리에 확장자가 섞이지 않음
+            raise ValueError(f"lossless 백엔드는 JPEG 코덱만 지원합니다: {self.codec.preset} ({self.codec.format})")
+        self.lossless_driver = None
+        if backend == "lossless":
+            if find_jpegtran():
+                self.lossless_driver = LosslessRotationDriver(threads=threads)
+            else:
+                print("⚠️ jpegtran을 찾을 수 없어 pixel 백엔드로 대체합니다.")
+                backend = "pixel"
+        self.backend = backend
+        
+        # 파일별 로그 출력 여부 (병렬 워커에서는 끄고 진행률만 출력)
+        self.verbose = verbose
+        
+        # 회전 매니페스트 기록기 (process_all_files에서 열고 create_rotation_manifest에서 닫음)
+        self.manifest = None
+        self.source_index = {}
+        
+        # 회전 주석 싱크 (원본 주석 샤드가 있을 때만 사용)
+        self.annotation_sink = None
+        self.annotation_index = {}
+        
         # 회전 설정 (0도 제외, 3방향만)
         self.rotation_config = {
             90: {"name": "L", "angle": 90},      # 왼쪽 90도
@@ -45,8 +124,8 @@ class RotationProcessor:
     
     def parse_filename(self, filename: str) -> Dict[str, str]:
         """새로운 파일명 규칙을 파싱합니다."""
-        # 예: GA-1-CLOSE-0-00001.jpg
-        parts = filename.replace('.jpg', '').split('-')
+        # 예: GA-1-CLOSE-0-00001.jpg (확장자는 코덱에 따라 .png/.webp/.npy 가능)
+        parts = os.path.splitext(filename)[0].split('-')
         
         if len(parts) >= 5:
             return {
@@ -59,12 +138,13 @@ class RotationProcessor:
         else:
             return None
     
-    def generate_rotated_filename(self, base_info: Dict[str, str], rotation_name: str) -> str:
-        """회전된 파일명을 생성합니다."""
-        return f"{base_info['doc_type']}-{base_info['doc_kind']}-{base_info['disclosure']}-{rotation_name}-{base_info['sequence']}.jpg"
+    def generate_rotated_filename(self, base_info: Dict[str, str], rotation_name: str, extension: str = None) -> str:
+        """회전된 파일명을 생성합니다. (extension 미지정 시 코덱 확장자)"""
+        extension = extension or self.codec.extension
+        return f"{base_info['doc_type']}-{base_info['doc_kind']}-{base_info['disclosure']}-{rotation_name}-{base_info['sequence']}{extension}"
     
-    def process_single_file(self, filepath: str) -> List[str]:
-        """단일 파일을 처리하여 회전된 버전들을 생성합니다."""
+    def process_single_file(self, filepath: str, angles: List[int] = None) -> List[str]:
+        """단일 파일을 처리하여 회전된 버전들을 생성합니다. (angles: 처리할 각도만 지정)"""
         generated_files = []
         
         # 파일명 파싱
@@ -80,18 +160,22 @@ class RotationProcessor:
             return []
         
         # 이미지 로드
-        image = cv2.imread(filepath)
+        image = read_image(filepath, self.imread_flag)
         if image is None:
             print(f"⚠️ 이미지 로드 실패: {filepath}")
             return []
         
-        print(f"처리 중: {filename}")
+        if self.verbose:
+            print(f"처리 중: {filename}")
         
         # 각 회전별로 처리
         for rotation_info in self.rotation_config.values():
             angle = rotation_info["angle"]
             rotation_name = rotation_info["name"]
             
+            if angles is not None and angle not in angles:
+                continue
+            
             # 회전 적용
             rotated_image = self.rotate_image(image, angle)
             
@@ -100,15 +184,16 @@ class RotationProcessor:
             new_filepath = os.path.join(self.output_dir, new_filename)
             
             # 저장
-            cv2.imwrite(new_filepath, rotated_image)
+            self.codec.write(new_filepath, rotated_image)
             generated_files.append(new_filepath)
             
-            print(f"  생성: {new_filename}")
+            if self.verbose:
+                print(f"  생성: {new_filename}")
         
         return generated_files
     
-    def process_all_files(self, pattern: str = "*-0-*.jpg") -> Dict[str, int]:
-        """모든 0도 파일들을 처리합니다."""
+    def process_all_files(self, pattern: str = "*-0-*.jpg", workers: int = 1) -> Dict[str, int]:
+        """모든 0도 파일들을 처리합니다. (workers > 1이면 pixel 백엔드를 프로세스 풀로 병렬 처리)"""
         stats = {
             "total_processed": 0,
             "total_generated": 0,
@@ -119,54 +204,223 @@ class RotationProcessor:
         
         # 0도 파일들 검색
         search_pattern = os.path.join(self.input_dir, pattern)
-        files = glob.glob(search_pattern)
+        files = sorted(glob.glob(search_pattern))
         
         print(f"=== 회전 처리 시작 ===")
         print(f"검색 패턴: {search_pattern}")
         print(f"발견된 파일: {len(files)}개")
+        print(f"회전 백엔드: {self.backend}")
         
-        for filepath in files:
+        # 원본(0도) 메타데이터 로드 후 회전 매니페스트 스트리밍 시작
+        self.source_index = load_manifest_index(os.path.join(self.input_dir, GENERATION_MANIFEST)) or {}
+        if self.manifest is not None:
+            self.manifest.close()
+        # 이어 쓰기 - 같은 출력 디렉토리에 패턴을 나눠 실행해도 이전 실행의 행 유지 (같은 파일명은 마지막 행 우선)
+        self.manifest = ManifestWriter(os.path.join(self.output_dir, ROTATION_MANIFEST), append=True)
+        
+        # 원본 필드 주석이 있으면 회전 좌표로 변환하여 함께 기록
+        self.annotation_index = load_annotation_index(self.input_dir) or {}
+        if self.annotation_sink is not None:
+            self.annotation_sink.close()
+        self.annotation_sink = None
+        if self.annotation_index:
+            self.annotation_sink = AnnotationSink(self.output_dir, prefix=ROTATION_ANNOTATION_PREFIX, append=True)
+        
+        if self.lossless_driver is not None:
+            return self._process_all_lossless(files, stats)
+        
+        if workers > 1 and len(files) > 1:
+            return self._process_all_parallel(files, stats, workers)
+        
+        start = time.time()
+        for done, filepath in enumerate(files, 1):
             try:
                 generated_files = self.process_single_file(filepath)
+                self._update_stats(stats, filepath, generated_files)
+            except Exception as e:
+                print(f"❌ 처리 실패 ({filepath}): {e}")
+                stats["errors"] += 1
+            
+            if done % PROGRESS_EVERY == 0 or done == len(files):
+                self._report_progress(done, len(files), start)
+        
+        return stats
+    
+    def _process_all_parallel(self, files: List[str], stats: Dict, workers: int) -> Dict[str, int]:
+        """프로세스 풀로 파일을 나눠 처리하고, 입력 순서대로 통계·매니페스트를 집계합니다.
+        
+        (워커 수와 관계없이 순차 처리와 같은 통계·매니페스트 행 순서가 나오도록 완료 순서가 아닌 제출 순서로 수집)
+        """
+        processor_kwargs = {
+            "input_dir": self.input_dir,
+            "output_dir": self.output_dir,
+            "color_mode": self.color_mode,
+            "codec": ImageCodec(self.codec.preset, **self.codec.options),
+            "verbose": False,
+        }
+        
+        print(f"병렬 처리: 워커 {workers}개")
+        start = time.time()
+        done = 0
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(processor_kwargs,)) as pool:
+            futures = [pool.submit(_process_in_worker, filepath) for filepath in files]
+            
+            for future in futures:
+                filepath, generated_files, codec_delta, error = future.result()
+                self.codec.merge_stats(codec_delta)
                 
-                if generated_files:
-                    stats["total_processed"] += 1
-                    stats["total_generated"] += len(generated_files)
-                    
-                    # 통계 업데이트
-                    filename = os.path.basename(filepath)
-                    file_info = self.parse_filename(filename)
-                    
-                    if file_info:
-                        doc_type = file_info["doc_type"]
-                        disclosure = file_info["disclosure"]
-                        
-                        stats["by_doc_type"][doc_type] = stats["by_doc_type"].get(doc_type, 0) + 1
-                        stats["by_disclosure"][disclosure] = stats["by_disclosure"].get(disclosure, 0) + 1
-                else:
+                if error:
+                    print(f"❌ 처리 실패 ({filepath}): {error}")
                     stats["errors"] += 1
-                    
+                else:
+                    self._update_stats(stats, filepath, generated_files)
+                
+                done += 1
+                if done % PROGRESS_EVERY == 0 or done == len(files):
+                    self._report_progress(done, len(files), start)
+        
+        return stats
+    
+    def _report_progress(self, done: int, total: int, start: float):
+        """진행률과 처리 속도를 출력합니다."""
+        elapsed = time.time() - start
+        rate = done / elapsed if elapsed > 0 else 0.0
+        remaining = (total - done) / rate if rate > 0 else 0.0
+        print(f"  진행: {done}/{total} ({done / total:.1%}) | {rate:.1f} 파일/초 | 남은 시간 약 {remaining:.0f}초")
+    
+    def _update_stats(self, stats: Dict, filepath: str, generated_files: List[str]):
+        """파일 하나의 처리 결과를 통계에 반영합니다."""
+        if generated_files:
+            stats["total_processed"] += 1
+            stats["total_generated"] += len(generated_files)
+            
+            # 통계 업데이트
+            filename = os.path.basename(filepath)
+            file_info = self.parse_filename(filename)
+            
+            if self.manifest is not None:
+                self._record_manifest_rows(filename, generated_files)
+            if self.annotation_sink is not None:
+                self._record_annotations(filename, generated_files)
+            
+            if file_info:
+                doc_type = file_info["doc_type"]
+                disclosure = file_info["disclosure"]
+                
+                stats["by_doc_type"][doc_type] = stats["by_doc_type"].get(doc_type, 0) + 1
+                stats["by_disclosure"][disclosure] = stats["by_disclosure"].get(disclosure, 0) + 1
+        else:
+            stats["errors"] += 1
+    
+    def _process_all_lossless(self, files: List[str], stats: Dict) -> Dict[str, int]:
+        """jpegtran으로 무손실 회전하고, 불완전 변환·비 JPEG 파일만 픽셀 회전으로 대체합니다.
+        
+        SOF 헤더로 크기·MCU를 먼저 확인하여 -perfect가 불가능한 회전은 jpegtran을 실행하지 않고
+        바로 픽셀 경로로 보냅니다. (실패할 jpegtran 프로세스를 띄운 뒤 다시 디코딩하지 않도록)
+        """
+        jobs = []
+        outputs = {filepath: [] for filepath in files}
+        pixel_only = set()
+        failed_angles = {}
+        
+        for filepath in files:
+            file_info = self.parse_filename(os.path.basename(filepath))
+            if not file_info or file_info["angle"] != "0" or not is_jpeg(filepath):
+                pixel_only.add(filepath)
+                continue
+            geometry = jpeg_geometry(filepath)
+            for rotation_info in self.rotation_config.values():
+                angle = rotation_info["angle"]
+                if geometry is None or not is_perfect_rotation(geometry, angle):
+                    failed_angles.setdefault(filepath, []).append(angle)
+                    continue
+                new_filename = self.generate_rotated_filename(file_info, rotation_info["name"])
+                jobs.append((filepath, os.path.join(self.output_dir, new_filename), angle))
+        
+        if failed_angles:
+            print(f"⚠️ MCU 배수가 아닌 크기 {len(failed_angles)}개 파일 → 해당 회전은 픽셀 회전으로 처리")
+        
+        results = self.lossless_driver.run(jobs)
+        for src, dst, _ in results["ok"]:
+            outputs[src].append(dst)
+        
+        # 헤더 확인을 통과했지만 jpegtran이 실패한 회전도 픽셀 경로로 대체
+        for src, _, angle in results["failed"]:
+            failed_angles.setdefault(src, []).append(angle)
+        if results["failed"]:
+            print(f"⚠️ 무손실 회전 실패 {len(results['failed'])}건 → 픽셀 회전으로 대체")
+        
+        for filepath in files:
+            try:
+                if filepath in pixel_only:
+                    outputs[filepath] = self.process_single_file(filepath)
+                elif filepath in failed_angles:
+                    outputs[filepath] += self.process_single_file(filepath, angles=failed_angles[filepath])
+                self._update_stats(stats, filepath, outputs[filepath])
             except Exception as e:
                 print(f"❌ 처리 실패 ({filepath}): {e}")
                 stats["errors"] += 1
         
         return stats
     
+    def _record_manifest_rows(self, source_filename: str, generated_files: List[str]):
+        """생성된 회전 파일들의 매니페스트 행을 기록합니다. (원본 메타데이터 상속)"""
+        source = self.source_index.get(source_filename, {})
+        for new_filepath in generated_files:
+            new_filename = os.path.basename(new_filepath)
+            file_info = self.parse_filename(new_filename) or {}
+            self.manifest.write_row({
+                **source,
+                **file_info,
+                "filename": new_filename,
+                "source_filename": self.source_prefix + source_filename,
+            })
+    
+    def _record_annotations(self, source_filename: str, generated_files: List[str]):
+        """원본 필드 주석을 회전된 파일 좌표로 변환하여 기록합니다."""
+        source = self.annotation_index.get(source_filename)
+        if source is None:
+            return
+        angle_by_name = {info["name"]: info["angle"] for info in self.rotation_config.values()}
+        for new_filepath in generated_files:
+            new_filename = os.path.basename(new_filepath)
+            file_info = self.parse_filename(new_filename)
+            if file_info and file_info["angle"] in angle_by_name:
+                self.annotation_sink.add_entry(rotate_entry(source, angle_by_name[file_info["angle"]], new_filename))
+    
     def create_rotation_manifest(self) -> str:
-        """회전된 파일들의 매니페스트를 생성합니다."""
-        manifest_path = os.path.join(self.output_dir, "rotation_manifest.csv")
+        """회전된 파일들의 매니페스트를 생성합니다.
         
-        with open(manifest_path, 'w', encoding='utf-8') as f:
-            f.write("filename,doc_type,doc_kind,disclosure,angle,sequence\n")
-            
-            # 모든 jpg 파일 검색 (0도 제외)
-            for filename in os.listdir(self.output_dir):
-                if filename.endswith('.jpg') and '-0-' not in filename:
+        process_all_files가 처리 중에 행을 기록했으므로 닫기만 합니다.
+        (기록된 행이 없을 때만 기존 방식대로 출력 디렉토리를 검색하여 매니페스트에 없는 파일만 이어 씀)
+        """
+        manifest_path = os.path.join(self.output_dir, ROTATION_MANIFEST)
+        
+        if self.annotation_sink is not None:
+            self.annotation_sink.close()
+            print(f"회전 주석 기록 완료: {self.annotation_sink.images_written}장 ({len(self.annotation_sink.shards)}개 샤드)")
+            self.annotation_sink = None
+        
+        if self.manifest is not None:
+            self.manifest.close()
+            rows_written = self.manifest.rows_written
+            self.manifest = None
+            if rows_written:
+                print(f"회전 매니페스트 생성 완료: {manifest_path} ({rows_written}행)")
+                return manifest_path
+        
+        known = load_manifest_index(manifest_path) or {}
+        with ManifestWriter(manifest_path, append=True) as writer:
+            # 회전된 파일 검색 (0도 제외)
+            for filename in sorted(os.listdir(self.output_dir)):
+                if filename.endswith(self.codec.extension) and '-0-' not in filename and filename not in known:
                     file_info = self.parse_filename(filename)
                     if file_info:
-                        f.write(f"{filename},{file_info['doc_type']},{file_info['doc_kind']},{file_info['disclosure']},{file_info['angle']},{file_info['sequence']}\n")
+                        writer.write_row({**file_info, "filename": filename})
         
-        print(f"회전 매니페스트 생성 완료: {manifest_path}")
+        print(f"회전 매니페스트 생성 완료: {manifest_path} (검색으로 {writer.rows_written}행 추가)")
         return manifest_path
 
 def main():
@@ -175,6 +429,12 @@ def main():
     parser.add_argument("--input", "-i", default="outputs/dataset", help="입력 디렉토리")
     parser.add_argument("--output", "-o", default="outputs/dataset", help="출력 디렉토리")
     parser.add_argument("--pattern", "-p", default="*-0-*.jpg", help="검색 패턴")
+    parser.add_argument("--grayscale", action="store_true", help="단일 채널 흑백(GRAY)으로 읽고 저장")
+    parser.add_argument("--codec", default=DEFAULT_PRESET, choices=list(CODEC_PRESETS), help="출력 코덱 프리셋")
+    parser.add_argument("--backend", default="pixel", choices=ROTATION_BACKENDS,
+                        help="회전 백엔드 (lossless: jpegtran 무손실 회전, JPEG 입력·JPEG 코덱 전용)")
+    parser.add_argument("--threads", type=int, default=None, help="lossless 백엔드 동시 jpegtran 실행 수")
+    parser.add_argument("--workers", "-w", type=int, default=1, help="pixel 백엔드 병렬 워커 프로세스 수 (기본 1 = 순차)")
     
     args = parser.parse_args()
     
@@ -183,17 +443,30 @@ def main():
     print(f"출력 디렉토리: {args.output}")
     print(f"검색 패턴: {args.pattern}")
     
+    if args.backend == "lossless" and CODEC_PRESETS[args.codec]["format"] != "jpg":
+        parser.error(f"--backend lossless는 JPEG 코덱만 지원합니다 (--codec {args.codec}: "
+                     f"{CODEC_PRESETS[args.codec]['format']}, 무손실 회전본과 확장자가 섞임)")
+    if args.backend == "lossless" and args.codec != DEFAULT_PRESET:
+        print(f"⚠️ lossless 백엔드의 무손실 회전본은 원본 JPEG 인코딩을 그대로 유지하므로 --codec {args.codec}이 "
+              f"적용되지 않습니다. (픽셀 회전으로 대체되는 파일에만 적용)")
+    
     # 회전 처리기 생성
-    processor = RotationProcessor(args.input, args.output)
+    processor = RotationProcessor(args.input, args.output, color_mode="GRAY" if args.grayscale else "BGR",
+                                  codec=ImageCodec(args.codec), backend=args.backend, threads=args.threads)
+    # jpegtran이 없어 pixel로 대체된 경우에는 --workers가 그대로 적용됨
+    if processor.backend == "lossless" and args.workers > 1:
+        print(f"⚠️ lossless 백엔드는 --workers를 사용하지 않습니다 (--workers {args.workers} 무시). "
+              f"동시 jpegtran 실행 수는 --threads로 지정하세요.")
     
     # 모든 파일 처리
-    stats = processor.process_all_files(args.pattern)
+    stats = processor.process_all_files(args.pattern, workers=args.workers)
     
     # 결과 출력
     print(f"\n=== 회전 처리 완료 ===")
     print(f"처리된 파일: {stats['total_processed']}개")
     print(f"생성된 파일: {stats['total_generated']}개")
     print(f"오류: {stats['errors']}개")
+    print(f"💾 {processor.codec.format_summary()}")
     
     print(f"\n📊 문서 종류별 통계:")
     for doc_type, count in stats["by_doc_type"].items():
@@ -1,15 +1,37 @@
-import cv2
 import numpy as np
 import os
 from typing import Dict, List, Tuple
+from lazy_import import lazy_module
 from templates_juga import create_template
-from data_factory import create_record
+from data_factory import create_document_record
+from image_codec import ImageCodec, read_image, IMREAD_COLOR, IMREAD_GRAYSCALE
+from manifest_writer import ManifestWriter, load_manifest_index
+from annotation_sink import AnnotationSink, rotate_entry, ANNOTATION_PREFIX
+from rng_context import DOC_TYPE_STREAM, RNGContext
+
+cv2 = lazy_module("cv2")
+
+# DocumentRotator 매니페스트 컬럼 (기존 manifest.csv 순서 + seed)
+ROTATOR_MANIFEST_COLUMNS = ["filename", "doc_type", "rotation", "children_count", "template_name", "seed"]
 
 class DocumentRotator:
     """문서 회전 및 대량 생성 클래스"""
     
-    def __init__(self, doc_type: str = "GA"):
+    def __init__(self, doc_type: str = "GA", color_mode: str = "BGR", codec: ImageCodec = None, seed: int = None):
         self.doc_type = doc_type
+        self.color_mode = color_mode
+        self.codec = codec or ImageCodec()
+        
+        # 출력 디렉토리별 스트리밍 매니페스트 기록기
+        self._manifests: Dict[str, ManifestWriter] = {}
+        self._annotation_sinks: Dict[str, AnnotationSink] = {}
+        self.last_children_count = None
+        self.last_annotations = None
+        
+        # GA 스트림 난수 컨텍스트 (문서마다 child(문서 순번)) - 매니페스트 seed 컬럼에 자식 시드 라벨 기록
+        self.rng = RNGContext(seed).child(DOC_TYPE_STREAM["GA"])
+        self.last_seed = None
+        
         self.rotation_config = {
             0: {"name": "0", "angle": 0, "prefix": f"{doc_type}-0"},
             90: {"name": "L", "angle": 90, "prefix": f"{doc_type}-L"},  # 왼쪽 90도
@@ -35,20 +57,23 @@ class DocumentRotator:
         """단일 문서를 생성합니다."""
         try:
             # 템플릿 생성
-            template = create_template("GA", template_name)
+            template = create_template("GA", template_name, color_mode=self.color_mode)
             
             # 문서 렌더링
             document = template.render(data)
+            self.last_children_count = getattr(template, "children_count", None)
+            self.last_annotations = {"width": document.shape[1], "height": document.shape[0],
+                                     "fields": template.annotations}
             
             # 출력 디렉토리 생성
             os.makedirs(output_dir, exist_ok=True)
             
             # 파일명 생성 (임시)
-            filename = f"temp_{template_name}.jpg"
+            filename = f"temp_{template_name}{self.codec.extension}"
             output_path = os.path.join(output_dir, filename)
             
             # 저장
-            cv2.imwrite(output_path, document)
+            self.codec.write(output_path, document)
             
             return output_path
             
@@ -67,7 +92,8 @@ class DocumentRotator:
             return []
         
         # 원본 이미지 로드
-        original_image = cv2.imread(original_path)
+        imread_flag = IMREAD_GRAYSCALE if self.color_mode == "GRAY" else IMREAD_COLOR
+        original_image = read_image(original_path, imread_flag)
         if original_image is None:
             print(f"원본 이미지 로드 실패: {original_path}")
             return []
@@ -81,13 +107,23 @@ class DocumentRotator:
             rotated_image = self.rotate_document(original_image, angle)
             
             # 파일명 생성 (GA-0-0001.jpg 형식)
-            filename = f"{prefix}-{index:04d}.jpg"
+            filename = f"{prefix}-{index:04d}{self.codec.extension}"
             output_path = os.path.join(output_dir, filename)
             
             # 저장
-            cv2.imwrite(output_path, rotated_image)
+            self.codec.write(output_path, rotated_image)
             generated_files.append(output_path)
             
+            # 매니페스트 행 즉시 기록 (파일명에서 추정하지 않음)
+            self._manifest_writer(output_dir).write_row({
+                "filename": filename, "doc_type": self.doc_type, "rotation": rotation_info["name"],
+                "children_count": self.last_children_count, "template_name": template_name,
+                "seed": self.last_seed,
+            })
+            
+            # 필드 주석도 회전 좌표로 변환하여 기록
+            self._annotation_sink(output_dir).add_entry(rotate_entry(self.last_annotations, angle, filename))
+            
             print(f"생성됨: {filename}")
         
         # 임시 파일 삭제
@@ -120,6 +156,7 @@ class DocumentRotator:
         total_generated = 0
         
         print("=== 가족관계증명서 데이터셋 생성 시작 ===")
+        print(f"시드: {self.rng.seed_label}")
         print(f"템플릿 수: {len(templates)}")
         print(f"템플릿당 샘플 수: {samples_per_template}")
         print(f"예상 총 생성 수: {len(templates) * samples_per_template * 4}장")
@@ -130,8 +167,10 @@ class DocumentRotator:
             
             for i in range(samples_per_template):
                 try:
-                    # 랜덤 데이터 생성
-                    data = create_record("GA", {"children_count": children_count})
+                    # 랜덤 데이터 생성 (문서 순번별 자식 난수 컨텍스트)
+                    doc_rng = self.rng.child(counters["GA-0"])
+                    self.last_seed = doc_rng.seed_label
+                    data = create_document_record("GA", {"children_count": children_count}, rng=doc_rng)
                     
                     # 4방향 회전 문서 생성
                     generated_files = self.generate_rotated_documents(
@@ -172,49 +211,66 @@ class DocumentRotator:
         
         return counters
     
+    def _manifest_writer(self, output_dir: str) -> ManifestWriter:
+        """출력 디렉토리별 매니페스트 기록기 (처음 사용할 때 열고, 이전 세션의 행 뒤에 이어 씀)
+        
+        append-only: 같은 파일명이 다시 생성되면 뒤의 행이 최신 (load_manifest_index와 같은 규칙)
+        """
+        if output_dir not in self._manifests:
+            self._manifests[output_dir] = ManifestWriter(os.path.join(output_dir, "manifest.csv"),
+                                                         columns=ROTATOR_MANIFEST_COLUMNS, append=True)
+        return self._manifests[output_dir]
+    
+    def _rebuild_manifest(self, output_dir: str, manifest_path: str) -> int:
+        """출력 디렉토리를 검색해 매니페스트를 다시 만듭니다. (기존 행이 있는 파일은 그 행을 유지, 중복 제거)"""
+        known = load_manifest_index(manifest_path) or {}
+        rows = []
+        if os.path.exists(output_dir):
+            for filename in sorted(os.listdir(output_dir)):
+                if not filename.endswith(self.codec.extension) or not filename.startswith(f"{self.doc_type}-"):
+                    continue
+                parts = os.path.splitext(filename)[0].split('-')
+                if len(parts) < 3:
+                    continue
+                # 검색으로만 찾은 파일은 파일명에 있는 값만 기록 (템플릿명·자녀 수는 추정하지 않음)
+                rows.append(known.get(filename) or {"filename": filename, "doc_type": parts[0], "rotation": parts[1]})
+        
+        with ManifestWriter(manifest_path, columns=ROTATOR_MANIFEST_COLUMNS) as writer:
+            writer.write_rows(rows)
+        return len(rows)
+    
+    def _annotation_sink(self, output_dir: str) -> AnnotationSink:
+        """출력 디렉토리별 필드 주석 싱크 (처음 사용할 때 새로 시작)"""
+        if output_dir not in self._annotation_sinks:
+            self._annotation_sinks[output_dir] = AnnotationSink(output_dir, prefix=f"{ANNOTATION_PREFIX}_{self.doc_type}")
+        return self._annotation_sinks[output_dir]
+    
     def create_manifest(self, output_dir: str = "outputs/dataset") -> str:
-        """생성된 데이터셋의 매니페스트 파일을 생성합니다."""
-        manifest_path = os.path.join(output_dir, "manifest.csv")
+        """생성된 데이터셋의 매니페스트 파일을 완성합니다.
         
-        manifest_data = []
-        manifest_data.append("filename,doc_type,rotation,children_count,template_name")
+        행은 generate_rotated_documents에서 파일 저장과 동시에 기록되므로
+        (실제 템플릿명·자녀 수) 여기서는 남은 버퍼만 기록하고 닫습니다.
+        이번 세션에 기록된 행이 없으면 기존 방식대로 출력 디렉토리를 검색해 다시 만듭니다.
+        (기존 매니페스트의 행은 유지 - 생성 없이 호출해도 매니페스트가 비지 않음)
+        """
+        manifest_path = os.path.join(output_dir, "manifest.csv")
+        writer = self._manifests.pop(output_dir, None)
+        rows_written = 0
+        if writer is not None:
+            writer.close()
+            rows_written = writer.rows_written
         
-        # 파일 목록 수집
-        if os.path.exists(output_dir):
-            for filename in os.listdir(output_dir):
-                if filename.endswith('.jpg') and filename.startswith('GA-'):
-                    # 파일명 파싱: GA-0-0001.jpg
-                    parts = filename.replace('.jpg', '').split('-')
-                    if len(parts) == 3:
-                        doc_type = parts[0]  # GA
-                        rotation = parts[1]  # 0, L, R, 180
-                        index = parts[2]     # 0001
-                        
-                        # 템플릿명 추정 (인덱스 기반)
-                        index_num = int(index)
-                        template_index = (index_num - 1) // 10  # 10개씩 그룹
-                        children_count = template_index % 4      # 0,1,2,3
-                        template_num = (template_index // 4) + 1 # 1,2
-                        
-                        # 실제 파일명에서 children_count 추출
-                        if "child0" in filename or index_num <= 20:
-                            children_count = 0
-                        elif "child1" in filename or (21 <= index_num <= 40):
-                            children_count = 1
-                        elif "child2" in filename or (41 <= index_num <= 60):
-                            children_count = 2
-                        elif "child3" in filename or (61 <= index_num <= 80):
-                            children_count = 3
-                        
-                        template_name = f"GA_template{template_num}_child{children_count}"
-                        
-                        manifest_data.append(f"{filename},{doc_type},{rotation},{children_count},{template_name}")
+        sink = self._annotation_sinks.pop(output_dir, None)
+        if sink is not None:
+            sink.close()
+            print(f"필드 주석 기록: {sink.images_written}장 ({len(sink.shards)}개 샤드)")
         
-        # 매니페스트 파일 저장
-        with open(manifest_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(manifest_data))
+        if rows_written == 0:
+            rows = self._rebuild_manifest(output_dir, manifest_path)
+            print(f"매니페스트 파일 생성 (디렉토리 검색): {manifest_path} ({rows}행)")
+            return manifest_path
         
-        print(f"매니페스트 파일 생성: {manifest_path}")
+        print(f"매니페스트 파일 생성: {manifest_path} ({rows_written}행 추가)")
         return manifest_path
 
     def save_rotations(self, image: np.ndarray, output_dir: str, 
@@ -242,18 +298,18 @@ class DocumentRotator:
             # 파일명 생성: GA-0-MASK-0001.jpg 형식
             if extra_suffix and isinstance(file_counter[suffix], dict):
                 index = file_counter[suffix][extra_suffix]
-                filename = f"{base_filename}-{suffix}-{extra_suffix}-{index:04d}.jpg"
+                filename = f"{base_filename}-{suffix}-{extra_suffix}-{index:04d}{self.codec.extension}"
                 file_counter[suffix][extra_suffix] += 1
             else:
                 index = file_counter[suffix] if isinstance(file_counter[suffix], int) else 1
-                filename = f"{base_filename}-{suffix}-{index:04d}.jpg"
+                filename = f"{base_filename}-{suffix}-{index:04d}{self.codec.extension}"
                 if isinstance(file_counter[suffix], int):
                     file_counter[suffix] += 1
                     
             output_path = os.path.join(output_dir, filename)
             
             # 저장
-            cv2.imwrite(output_path, rotated_image)
+            self.codec.write(output_path, rotated_image)
             generated_files.append(output_path)
             
         return generated_files
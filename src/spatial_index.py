@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+레이아웃 추출기 공간 인덱스 (hover·삭제·스냅 조회)
+
+기능:
+- 균일 격자(uniform grid): 필드 박스를 겹치는 셀마다 등록 → 점 조회 시 커서가 있는 셀의 박스만 검사
+- 정렬 좌표 목록: 박스 모서리·격자선 x/y 좌표를 정렬해 두고 bisect로 가장 가까운 좌표 탐색 (O(log n))
+- FieldBoxes 버전이 바뀐 경우에만 바뀐 박스만 다시 등록 (추가·삭제·수정 증분 갱신)
+
+사용:
+    index = LayoutIndex()
+    index.sync(layouts["field_boxes"])        # 변경이 없으면 바로 반환
+    name = index.hovered(x, y)                 # field_boxes 순서상 첫 번째 박스 (없으면 None)
+    x, y = index.snap(x, y, 15)                # 가장 가까운 모서리·격자선에 붙임
+"""
+
+import bisect
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+Box = Sequence[int]
+
+
+class SpatialGrid:
+    """균일 격자 사각형 인덱스 (키 → 박스)"""
+
+    def __init__(self, cell_size: int = 128):
+        """
+        Args:
+            cell_size: 격자 셀 한 변의 픽셀 수 (필드 박스 평균 크기 정도가 적당)
+        """
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], set] = {}
+        # 키 → (박스, 등록 순번, 등록된 셀 목록)
+        self._items: Dict[Hashable, Tuple[Tuple[int, ...], int, List[Tuple[int, int]]]] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key) -> bool:
+        return key in self._items
+
+    def _cell_range(self, box: Box) -> List[Tuple[int, int]]:
+        """박스가 걸치는 셀 좌표 목록"""
+        cs = self.cell_size
+        x1, x2 = sorted((int(box[0]), int(box[2])))
+        y1, y2 = sorted((int(box[1]), int(box[3])))
+        return [(cx, cy) for cx in range(x1 // cs, x2 // cs + 1) for cy in range(y1 // cs, y2 // cs + 1)]
+
+    def insert(self, key: Hashable, box: Box):
+        """박스를 등록합니다. 이미 있는 키면 등록 순번을 유지한 채 박스만 바꿉니다."""
+        seq = None
+        if key in self._items:
+            seq = self._items[key][1]
+            self.remove(key)
+        if seq is None:
+            seq = self._seq
+            self._seq += 1
+
+        cells = self._cell_range(box)
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(key)
+        self._items[key] = (tuple(box), seq, cells)
+
+    def remove(self, key: Hashable):
+        """박스를 지웁니다. (없는 키는 무시)"""
+        item = self._items.pop(key, None)
+        if item is None:
+            return
+        for cell in item[2]:
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._cells[cell]
+
+    def clear(self):
+        self._cells.clear()
+        self._items.clear()
+        self._seq = 0
+
+    def query_point(self, x: int, y: int) -> List[Hashable]:
+        """(x, y)를 포함하는 박스 키 목록 (경계 포함, 등록 순서)"""
+        cs = self.cell_size
+        bucket = self._cells.get((int(x) // cs, int(y) // cs))
+        if not bucket:
+            return []
+        hits = []
+        for key in bucket:
+            p, seq, _ = self._items[key]
+            if p[0] <= x <= p[2] and p[1] <= y <= p[3]:
+                hits.append((seq, key))
+        return [key for _, key in sorted(hits, key=lambda hit: hit[0])]
+
+
+class SortedCoords:
+    """정렬된 좌표 다중 집합 (가장 가까운 좌표 이분 탐색)"""
+
+    def __init__(self, values: Iterable[int] = ()):
+        self._values = sorted(values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def add(self, value: int):
+        bisect.insort(self._values, value)
+
+    def discard(self, value: int):
+        """값 하나를 지웁니다. (같은 값이 여러 개면 하나만)"""
+        i = bisect.bisect_left(self._values, value)
+        if i < len(self._values) and self._values[i] == value:
+            del self._values[i]
+
+    def nearest(self, value: int, max_dist: float) -> Optional[int]:
+        """거리가 max_dist 미만인 가장 가까운 좌표 (같은 거리면 작은 쪽, 없으면 None)"""
+        values = self._values
+        i = bisect.bisect_left(values, value)
+        best = None
+        for j in (i - 1, i):
+            if 0 <= j < len(values):
+                d = abs(values[j] - value)
+                if d < max_dist and (best is None or d < abs(best - value)):
+                    best = values[j]
+        return best
+
+
+class LayoutIndex:
+    """필드 박스·격자선 공간 인덱스 (LayoutExtractor용)"""
+
+    def __init__(self, cell_size: int = 128):
+        self.boxes = SpatialGrid(cell_size)
+        self.edge_x = SortedCoords()
+        self.edge_y = SortedCoords()
+        self.line_x = SortedCoords()
+        self.line_y = SortedCoords()
+        self._snapshot: Dict[str, Tuple[int, ...]] = {}
+        self._synced: Optional[Tuple] = None
+
+    # --- 필드 박스 ---
+    def _add(self, name: str, box: Tuple[int, ...]):
+        self.boxes.insert(name, box)
+        self.edge_x.add(box[0]); self.edge_x.add(box[2])
+        self.edge_y.add(box[1]); self.edge_y.add(box[3])
+        self._snapshot[name] = box
+
+    def _remove(self, name: str):
+        box = self._snapshot.pop(name)
+        self.edge_x.discard(box[0]); self.edge_x.discard(box[2])
+        self.edge_y.discard(box[1]); self.edge_y.discard(box[3])
+
+    def sync(self, field_boxes: Dict[str, Box]) -> bool:
+        """field_boxes와 인덱스를 맞춥니다. 바뀐 박스만 다시 등록하고, 갱신했으면 True.
+
+        FieldBoxes는 버전이 같으면 바로 반환하고, 일반 dict는 매번 내용을 비교합니다.
+        """
+        version = getattr(field_boxes, "version", None)
+        stamp = (id(field_boxes), version)
+        if version is not None and stamp == self._synced:
+            return False
+
+        current = {name: tuple(int(v) for v in p) for name, p in field_boxes.items()}
+        changed = False
+        for name in [n for n in self._snapshot if n not in current]:
+            self._remove(name)
+            self.boxes.remove(name)
+            changed = True
+        for name, box in current.items():
+            old = self._snapshot.get(name)
+            if old == box:
+                continue
+            if old is not None:
+                self._remove(name)
+            self._add(name, box)
+            changed = True
+
+        self._synced = stamp
+        return changed
+
+    def hovered_all(self, x: int, y: int) -> List[str]:
+        """(x, y) 위의 모든 필드 (field_boxes 순서)"""
+        return self.boxes.query_point(x, y)
+
+    def hovered(self, x: int, y: int) -> Optional[str]:
+        """(x, y) 위의 첫 번째 필드 (없으면 None)"""
+        hits = self.boxes.query_point(x, y)
+        return hits[0] if hits else None
+
+    # --- 격자선 ---
+    def set_grid_lines(self, detected_grid: Iterable[Tuple]):
+        """검출된 격자선 목록으로 교체합니다. (('horizontal', y, x1, x2) / ('vertical', x, y1, y2))"""
+        xs, ys = [], []
+        for kind, pos, *_ in detected_grid:
+            (ys if kind == 'horizontal' else xs).append(int(pos))
+        self.line_x = SortedCoords(xs)
+        self.line_y = SortedCoords(ys)
+
+    # --- 스냅 ---
+    @staticmethod
+    def _closest(value: int, max_dist: float, *coords: SortedCoords) -> int:
+        best = None
+        for sc in coords:
+            c = sc.nearest(value, max_dist)
+            if c is not None and (best is None or abs(c - value) < abs(best - value)):
+                best = c
+        return value if best is None else best
+
+    def snap(self, x: int, y: int, max_dist: float, use_lines: bool = True) -> Tuple[int, int]:
+        """x, y를 각각 가장 가까운 박스 모서리(와 격자선)에 붙입니다. (거리 max_dist 미만)"""
+        xs = (self.edge_x, self.line_x) if use_lines else (self.edge_x,)
+        ys = (self.edge_y, self.line_y) if use_lines else (self.edge_y,)
+        return self._closest(x, max_dist, *xs), self._closest(y, max_dist, *ys)
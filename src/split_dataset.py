@@ -11,24 +11,41 @@ split_dataset.py  (작성: 2025-08-01 15:02:17 KST)
         --dst  c:/workspace/kdocs_synth/dataset ^
         --train 0.7 --val 0.2 --test 0.1 ^
         --seed  42
+
+    # 디렉토리 검색 대신 생성·회전 매니페스트로 분할 (원본 문서 단위 그룹·층화, 인덱스 파일 기록)
+    python split_dataset.py --manifest outputs/ju/generation_manifest.csv ^
+        outputs/ju_rotated/rotation_manifest.csv --dst dataset
+
+    # 복사/이동은 스레드 풀로 병렬 처리 (file_transfer.py), 중단 후 다시 실행하면 남은 파일만 처리
+    python split_dataset.py --src ... --dst ... --threads 16 --dry-run
 """
-import argparse, random, shutil, sys, time
+import argparse, random, sys, time
 from pathlib import Path
 
+from file_transfer import TransferEngine
+
 IMG_EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff"}  # 허용 확장자
 
 # -------------------------------------------------------------- #
 def parse_args():
     p = argparse.ArgumentParser(description="이미지 폴더 train/val/test 분할 스크립트")
-    p.add_argument("--src", required=True, help="원본 이미지 루트 폴더")
+    p.add_argument("--src", help="원본 이미지 루트 폴더")
+    p.add_argument("--manifest", nargs="+",
+                   help="생성·회전 매니페스트 (지정하면 --src 대신 split_engine으로 분할)")
     p.add_argument("--dst", required=True, help="출력 루트 폴더(train/val/test)")
     p.add_argument("--train", type=float, default=0.7, help="train 비율 (기본 0.7)")
     p.add_argument("--val",   type=float, default=0.2, help="val   비율 (기본 0.2)")
     p.add_argument("--test",  type=float, default=0.1, help="test  비율 (기본 0.1)")
     p.add_argument("--seed",  type=int,   default=0,   help="랜덤 시드 고정 값")
     p.add_argument("--move",  action="store_true",
-                   help="복사 대신 이동(shutil.move) 수행")
-    return p.parse_args()
+                   help="복사 대신 이동 수행 (같은 파일 시스템이면 rename)")
+    p.add_argument("--threads", type=int, default=None, help="복사/이동 스레드 수 (기본: CPU 수 × 4)")
+    p.add_argument("--dry-run", action="store_true",
+                   help="파일을 복사/이동하지 않고 처리할 개수·용량만 출력 (매니페스트 인덱스 파일은 기록)")
+    args = p.parse_args()
+    if not args.src and not args.manifest:
+        p.error("--src 또는 --manifest 중 하나가 필요합니다.")
+    return args
 
 # -------------------------------------------------------------- #
 def get_class_dirs(src_root: Path):
@@ -43,21 +60,32 @@ def split_indices(n, ratios):
     te_n = n - tr_n - va_n  # 합이 n이 되도록 보정
     return tr_n, va_n, te_n
 
-def copy_items(file_list, dest_root, class_name, move=False):
-    """파일 리스트를 dest_root/class_name/ 경로로 복사/이동"""
+def copy_items(file_list, dest_root, class_name):
+    """파일 리스트 → dest_root/class_name/ 로의 (원본, 대상) 작업 목록 (실행은 TransferEngine)"""
     dest_class = dest_root / class_name
-    dest_class.mkdir(parents=True, exist_ok=True)
-    for src_path in file_list:
-        dest_path = dest_class / src_path.name
-        if move:
-            shutil.move(src_path, dest_path)
-        else:
-            shutil.copy2(src_path, dest_path)
+    return [(src_path, dest_class / src_path.name) for src_path in file_list]
+
+def split_from_manifests(manifest_paths, dst, ratios, seed):
+    """매니페스트로 분할(인덱스 파일은 dst에 기록)하고 분할/클래스 폴더로의 작업 목록 반환"""
+    from split_engine import SPLITS, read_index, split_manifests
+
+    result = split_manifests(manifest_paths, str(dst), ratios, seed)
+    jobs = []
+    for split in SPLITS:
+        class_files = {}
+        for path, cls_name in read_index(result["files"][split]):
+            class_files.setdefault(cls_name, []).append(Path(path))
+        for cls_name, files in sorted(class_files.items()):
+            jobs += copy_items(files, dst / split, cls_name)
+        print(f"{split:<5} | {sum(len(files) for files in class_files.values()):6d}개 "
+              f"(클래스 {len(class_files)}개)")
+    summary = result["summary"]
+    print(f"원본 문서 {summary['groups']}개, 층 {summary['strata']}개 → 인덱스 파일: {dst}/{{train,val,test}}.csv")
+    return jobs
 
 def main():
     args   = parse_args()
     random.seed(args.seed)
-    src    = Path(args.src).expanduser()
     dst    = Path(args.dst).expanduser()
     ratios = (args.train, args.val, args.test)
 
@@ -68,11 +96,21 @@ def main():
     if dst.exists() and any(dst.iterdir()):
         print(f"[WARN] {dst} 폴더가 이미 존재합니다. 기존 파일과 병합될 수 있습니다.", file=sys.stderr)
 
+    engine = TransferEngine(threads=args.threads, dry_run=args.dry_run)
+    if args.manifest:
+        start = time.time()
+        stats = engine.run(split_from_manifests(args.manifest, dst, ratios, args.seed), move=args.move)
+        print(f"\n✅ 완료! 경과시간: {time.time() - start:.1f}초")
+        return 1 if stats["failed"] else 0
+
+    src = Path(args.src).expanduser()
+
     class_dirs = get_class_dirs(src)
     if not class_dirs:
         sys.exit(f"[ERROR] {src} 하위에 클래스 폴더가 없습니다.")
 
     start = time.time()
+    jobs = []
     for cls_dir in sorted(class_dirs):
         cls_name  = cls_dir.name
         img_files = [p for p in cls_dir.glob("**/*") if p.suffix.lower() in IMG_EXTS]
@@ -87,17 +125,19 @@ def main():
         va_files = img_files[tr_n:tr_n + va_n]
         te_files = img_files[tr_n + va_n:]
 
-        # 복사/이동
-        copy_items(tr_files, dst / "train", cls_name, args.move)
-        copy_items(va_files, dst / "val",   cls_name, args.move)
-        copy_items(te_files, dst / "test",  cls_name, args.move)
+        # 복사/이동 작업 (모든 클래스를 모아 한 번에 병렬 처리)
+        jobs += copy_items(tr_files, dst / "train", cls_name)
+        jobs += copy_items(va_files, dst / "val",   cls_name)
+        jobs += copy_items(te_files, dst / "test",  cls_name)
 
         print(f"{cls_name:<10} | train {len(tr_files):4d}  val {len(va_files):4d}  "
               f"test {len(te_files):4d}  (총 {len(img_files)})")
 
+    stats   = engine.run(jobs, move=args.move)
     elapsed = time.time() - start
     print(f"\n✅ 완료! 경과시간: {elapsed:.1f}초  → {dst} 에 train/val/test 폴더가 생성되었습니다.")
+    return 1 if stats["failed"] else 0
 
 # -------------------------------------------------------------- #
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+매니페스트 기반 데이터셋 분할 엔진 (디렉토리 검색 없음)
+
+기능:
+- 생성·회전 매니페스트(generation_manifest.csv, rotation_manifest.csv)만 읽어 train/val/test 분할
+- 원본 문서 단위 그룹 분할: 0도 원본과 L/R/180 회전본(source_filename이 가리키는 원본이 같은 행)은 항상 같은 분할
+  (같은 문서의 회전본이 train과 test에 나뉘는 누수 방지, 원본은 매니페스트 디렉토리 기준 경로로 구분하므로
+  다른 디렉토리의 같은 파일명 데이터셋은 섞이지 않음)
+- 층화 키: 문서 종류(JU-1/2/3, GA-1/2) × 템플릿 변형 × 주민번호 공개(OPEN/CLOSE) × 그룹의 회전 구성
+  → 회전 클래스(0/L/R/180) 비율도 층마다 그대로 유지
+- 층마다 그룹을 섞고 무작위 오프셋을 둔 계통 배정으로 비율을 맞춤 (층별 오차 1그룹 이내,
+  그룹이 1~2개뿐인 층도 기대 비율대로 분배)
+- 전부 numpy 정렬·벡터 연산 (수백만 행도 수 초), 결과는 분할별 인덱스 파일로 기록
+
+인덱스 파일 ({출력}/{train,val,test}.csv):
+    path,class,group      # 파일 경로(매니페스트 디렉토리 기준), 회전 클래스(GA-0, JU-L, ...), 원본 문서 경로
+    + split_summary.json  # 시드·비율·분할별 행 수·클래스별 분포
+
+사용:
+    python src/split_engine.py --manifest outputs/ju/generation_manifest.csv outputs/ju_rotated/rotation_manifest.csv \\
+        --output dataset/splits --train 0.7 --val 0.2 --test 0.1 --seed 42
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from manifest_writer import read_manifest
+
+SPLITS = ("train", "val", "test")
+DEFAULT_RATIOS = (0.7, 0.2, 0.1)
+
+# 층화에 쓰는 매니페스트 컬럼 (문서 종류는 doc_type-doc_kind로 합침)
+STRATA_COLUMNS = ("doc_type", "doc_kind", "template_name", "disclosure")
+# 매니페스트에서 읽는 컬럼
+TABLE_COLUMNS = ("filename", "source_filename", "angle") + STRATA_COLUMNS
+
+
+def _manifest_columns(manifest_path: str) -> Dict[str, Sequence[str]]:
+    """매니페스트 → TABLE_COLUMNS별 값 목록 (없는 컬럼은 빈 문자열)"""
+    if manifest_path.endswith(".parquet"):
+        rows = read_manifest(manifest_path)
+        return {name: [row.get(name) or "" for row in rows] for name in TABLE_COLUMNS}
+    with open(manifest_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        # 행 단위 파이썬 루프 없이 열 단위로 전치 (수백만 행에서 파싱 시간의 대부분을 줄임)
+        columns = list(zip(*reader))
+    n_rows = len(columns[0]) if columns else 0
+    return {name: columns[header.index(name)] if name in header and header.index(name) < len(columns)
+            else [""] * n_rows for name in TABLE_COLUMNS}
+
+
+def _source_keys(directory: str, filenames: Sequence[str], sources: Sequence[str]) -> List[str]:
+    """행별 원본 문서 키 (매니페스트 디렉토리 기준 정규화 경로 - 회전본은 source_filename, 0도 원본은 자기 파일명)"""
+    base = os.path.normpath(directory or ".")
+    prefix = "" if base == "." else os.path.join(base, "")
+    keys = []
+    for filename, source in zip(filenames, sources):
+        name = source or filename
+        # 다른 디렉토리의 원본("../gen/GA-...jpg")만 정규화 (대부분의 행은 문자열 연결만)
+        keys.append(os.path.normpath(prefix + name) if "/" in name or os.sep in name else prefix + name)
+    return keys
+
+
+def load_manifest_table(paths: Sequence[str]) -> Dict[str, np.ndarray]:
+    """매니페스트들을 컬럼별 문자열 배열로 읽습니다. ("path"·"source" 컬럼 추가, 같은 경로는 마지막 행만 사용)"""
+    columns: Dict[str, List[str]] = {name: [] for name in TABLE_COLUMNS + ("path", "source")}
+    for manifest_path in paths:
+        values = _manifest_columns(manifest_path)
+        for name in TABLE_COLUMNS:
+            columns[name].extend(values[name])
+        prefix = os.path.join(os.path.dirname(manifest_path), "")
+        columns["path"].extend(prefix + filename for filename in values["filename"])
+        columns["source"].extend(_source_keys(os.path.dirname(manifest_path), values["filename"],
+                                              values["source_filename"]))
+
+    table = {name: np.array(values, dtype=str) for name, values in columns.items()}
+    # append-only 매니페스트: 같은 파일이 다시 기록되면 마지막 행이 최신
+    _, last = np.unique(table["path"][::-1], return_index=True)
+    if len(last) == len(table["path"]):
+        return table
+    keep = np.sort(len(table["path"]) - 1 - last)
+    return {name: column[keep] for name, column in table.items()}
+
+
+def _codes(*arrays: np.ndarray) -> np.ndarray:
+    """여러 문자열 컬럼 조합 → 정수 코드 (행마다)"""
+    codes = np.zeros(len(arrays[0]), dtype=np.int64)
+    for values in arrays:
+        uniques, inverse = np.unique(values, return_inverse=True)
+        codes = codes * len(uniques) + inverse.ravel()
+    return np.unique(codes, return_inverse=True)[1].ravel()
+
+
+def assign_groups(group_ids: np.ndarray, strata: np.ndarray, ratios: Sequence[float] = DEFAULT_RATIOS,
+                  seed: int = 42) -> np.ndarray:
+    """그룹마다 분할 번호(0=train, 1=val, 2=test)를 정합니다.
+
+    Args:
+        group_ids: 그룹 번호 0..G-1 (그룹마다 한 번씩)
+        strata: 그룹별 층 번호
+    Returns:
+        그룹별 분할 번호 (int8, 길이 G)
+    """
+    rng = np.random.default_rng(seed)
+    n_groups = len(group_ids)
+    # 층 안에서 무작위 순서: 무작위 키로 섞은 뒤 층 번호로 안정 정렬
+    order = rng.permutation(n_groups)
+    order = order[np.argsort(strata[order], kind="stable")]
+    sorted_strata = strata[order]
+
+    starts = np.flatnonzero(np.r_[True, sorted_strata[1:] != sorted_strata[:-1]])
+    sizes = np.diff(np.r_[starts, n_groups])
+    rank = np.arange(n_groups) - np.repeat(starts, sizes)
+
+    # 계통 배정: 층마다 무작위 오프셋 u, 위치 (rank + u) / n 을 누적 비율 구간에 대응
+    offsets = rng.random(len(starts))
+    position = (rank + np.repeat(offsets, sizes)) / np.repeat(sizes, sizes)
+    bounds = np.cumsum(ratios)[:-1] / np.sum(ratios)
+    splits = np.empty(n_groups, dtype=np.int8)
+    splits[order] = np.searchsorted(bounds, position, side="right")
+    return splits
+
+
+def split_table(table: Dict[str, np.ndarray], ratios: Sequence[float] = DEFAULT_RATIOS,
+                seed: int = 42) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """매니페스트 테이블의 행마다 분할 번호를 정합니다.
+
+    Returns:
+        (행별 분할 번호 int8, {"group": 행별 그룹 번호, "stratum": 행별 층 번호, "class": 행별 회전 클래스})
+    """
+    if abs(sum(ratios) - 1.0) > 1e-6:
+        raise ValueError(f"비율의 합이 1.0이어야 합니다. 현재: {sum(ratios)}")
+
+    # 그룹 = 원본 문서 (load_manifest_table의 "source" - 매니페스트 디렉토리 기준 원본 경로)
+    group_keys, row_group = np.unique(table["source"], return_inverse=True)
+    row_group = row_group.ravel()
+    n_groups = len(group_keys)
+
+    # 그룹의 회전 구성 (각도별 비트 OR) → 같은 구성끼리 층화
+    angle_values, angle_codes = np.unique(table["angle"], return_inverse=True)
+    group_angles = np.zeros(n_groups, dtype=np.int64)
+    np.bitwise_or.at(group_angles, row_group, np.left_shift(1, angle_codes.ravel().astype(np.int64)))
+
+    # 층 키는 그룹의 첫 행(회전본은 원본 메타데이터를 물려받음)에서 가져옴
+    first_row = np.full(n_groups, len(row_group), dtype=np.int64)
+    np.minimum.at(first_row, row_group, np.arange(len(row_group)))
+    doc_kind = np.char.add(np.char.add(table["doc_type"][first_row], "-"), table["doc_kind"][first_row])
+    group_strata = _codes(doc_kind, table["template_name"][first_row], table["disclosure"][first_row],
+                          group_angles.astype(str))
+
+    group_splits = assign_groups(np.arange(n_groups), group_strata, ratios, seed)
+    # 회전 클래스(GA-0, JU-L, ...)는 작은 조합표에서 인덱싱 (행마다 문자열을 잇지 않음)
+    type_values, type_codes = np.unique(table["doc_type"], return_inverse=True)
+    class_names = np.array([f"{doc_type}-{angle}" for doc_type in type_values for angle in angle_values])
+    row_class = class_names[type_codes.ravel() * len(angle_values) + angle_codes.ravel()]
+    return group_splits[row_group], {"group": row_group, "stratum": group_strata[row_group], "class": row_class}
+
+
+def split_summary(table: Dict[str, np.ndarray], row_splits: np.ndarray, info: Dict[str, np.ndarray]) -> Dict:
+    """분할별 행·그룹 수와 클래스별 분포"""
+    summary = {"rows": int(len(row_splits)), "groups": int(info["group"].max() + 1) if len(row_splits) else 0,
+               "strata": int(info["stratum"].max() + 1) if len(row_splits) else 0, "splits": {}}
+    classes, class_codes = np.unique(info["class"], return_inverse=True)
+    # 그룹은 한 분할에만 속하므로 그룹별 분할 번호로 셈
+    group_splits = np.zeros(summary["groups"], dtype=np.int8)
+    group_splits[info["group"]] = row_splits
+    group_counts = np.bincount(group_splits, minlength=len(SPLITS))
+    for index, name in enumerate(SPLITS):
+        mask = row_splits == index
+        counts = np.bincount(class_codes.ravel()[mask], minlength=len(classes))
+        summary["splits"][name] = {
+            "rows": int(mask.sum()),
+            "groups": int(group_counts[index]),
+            "classes": {str(cls): int(count) for cls, count in zip(classes, counts)},
+        }
+    return summary
+
+
+def write_index_files(table: Dict[str, np.ndarray], row_splits: np.ndarray, info: Dict[str, np.ndarray],
+                      output_dir: str, **meta) -> Dict[str, str]:
+    """분할별 인덱스 CSV(path,class,group)와 split_summary.json을 기록하고 경로를 돌려줍니다."""
+    os.makedirs(output_dir, exist_ok=True)
+    source = table["source"]
+    written = {}
+    for index, name in enumerate(SPLITS):
+        rows = np.flatnonzero(row_splits == index)
+        path = os.path.join(output_dir, f"{name}.csv")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["path", "class", "group"])
+            writer.writerows(zip(table["path"][rows].tolist(), info["class"][rows].tolist(), source[rows].tolist()))
+        os.replace(tmp_path, path)
+        written[name] = path
+
+    summary = {**meta, **split_summary(table, row_splits, info)}
+    written["summary"] = os.path.join(output_dir, "split_summary.json")
+    with open(written["summary"], "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return written
+
+
+def read_index(path: str) -> List[Tuple[str, str]]:
+    """인덱스 파일 → [(파일 경로, 클래스)]"""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return [(row["path"], row["class"]) for row in csv.DictReader(f)]
+
+
+def split_manifests(manifest_paths: Sequence[str], output_dir: str, ratios: Sequence[float] = DEFAULT_RATIOS,
+                    seed: int = 42) -> Dict:
+    """매니페스트를 읽어 분할하고 인덱스 파일을 기록합니다. {"files", "summary", "sec"}"""
+    start = time.perf_counter()
+    table = load_manifest_table(manifest_paths)
+    if not len(table["path"]):
+        raise ValueError(f"매니페스트에 행이 없습니다: {list(manifest_paths)}")
+    row_splits, info = split_table(table, ratios, seed)
+    files = write_index_files(table, row_splits, info, output_dir, seed=seed, ratios=list(ratios),
+                              manifests=list(manifest_paths))
+    with open(files["summary"], "r", encoding="utf-8") as f:
+        summary = json.load(f)
+    return {"files": files, "summary": summary, "sec": time.perf_counter() - start}
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="매니페스트 기반 층화·그룹 데이터셋 분할 (인덱스 파일 출력)")
+    parser.add_argument("--manifest", "-m", nargs="+", required=True,
+                        help="생성·회전 매니페스트 (generation_manifest.csv, rotation_manifest.csv)")
+    parser.add_argument("--output", "-o", required=True, help="인덱스 파일 출력 디렉토리")
+    parser.add_argument("--train", type=float, default=DEFAULT_RATIOS[0], help="train 비율 (기본값: 0.7)")
+    parser.add_argument("--val", type=float, default=DEFAULT_RATIOS[1], help="val 비율 (기본값: 0.2)")
+    parser.add_argument("--test", type=float, default=DEFAULT_RATIOS[2], help="test 비율 (기본값: 0.1)")
+    parser.add_argument("--seed", type=int, default=42, help="랜덤 시드 (기본값: 42)")
+
+    args = parser.parse_args()
+
+    print("=== 매니페스트 기반 데이터셋 분할 ===")
+    result = split_manifests(args.manifest, args.output, (args.train, args.val, args.test), args.seed)
+    summary = result["summary"]
+    print(f"행 {summary['rows']:,}개 | 원본 문서 {summary['groups']:,}개 | 층 {summary['strata']:,}개")
+    for name in SPLITS:
+        split = summary["splits"][name]
+        print(f"  {name:<5}: {split['rows']:,}행 ({split['rows'] / summary['rows']:.1%}), 문서 {split['groups']:,}개")
+    print(f"📁 인덱스 파일: {args.output}/ ({result['sec']:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
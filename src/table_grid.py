@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+표 격자 검출 엔진 (GUI 없이 사용)
+
+기능:
+- 격자선 검출 (기본): 투영 프로파일 - 방향별 1차원 침식 후 행/열 투영으로 선 띠를 찾고 구간 추출 (페이지당 수 ms)
+- 격자선 검출 (hough): 적응형 이진화 + 형태학 열기 + HoughLinesP (기존 레이아웃 추출기 방식, 조각·중복 많음)
+- 선분 병합: 같은 위치(허용 오차 이내)의 조각 선분을 하나의 선으로 합쳐 중복 제거
+- 셀 구성: 병합된 선을 마스크에 그리고 선으로 둘러싸인 영역(연결 요소)을 셀 박스로 추출
+  (병합 셀도 하나의 박스로 나옴)
+
+선 형식은 레이아웃 추출기 detected_grid와 같음:
+    ('horizontal', y, x1, x2) / ('vertical', x, y1, y2)
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from lazy_import import lazy_module
+
+cv2 = lazy_module("cv2")
+
+Line = Tuple[str, int, int, int]
+Box = List[int]
+
+
+def binarize(img: np.ndarray, gaussian: bool = True) -> np.ndarray:
+    """선·글자가 255인 이진 영상 (적응형 스레시홀드, 조명 변화에 강함)
+
+    gaussian=False면 평균 적응형 (박스 필터라 2배 이상 빠르고 선 검출 결과는 거의 같음)
+    """
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    method = cv2.ADAPTIVE_THRESH_GAUSSIAN_C if gaussian else cv2.ADAPTIVE_THRESH_MEAN_C
+    return cv2.adaptiveThreshold(gray, 255, method, cv2.THRESH_BINARY_INV, 11, 2)
+
+
+def detect_segments_hough(img: np.ndarray, kernel_len: int = 40, min_length: int = 50) -> List[Line]:
+    """형태학 열기 + HoughLinesP로 수평/수직 선분을 검출합니다. (조각·중복 포함)"""
+    thresh = binarize(img)
+    segments: List[Line] = []
+
+    horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (kernel_len, 1))
+    detect_horizontal = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, horizontal_kernel, iterations=2)
+    h_lines = cv2.HoughLinesP(detect_horizontal, 1, np.pi / 180, 50, minLineLength=min_length, maxLineGap=10)
+    if h_lines is not None:
+        for x1, y1, x2, y2 in h_lines.reshape(-1, 4):
+            segments.append(('horizontal', int(round((y1 + y2) / 2)), int(min(x1, x2)), int(max(x1, x2))))
+
+    vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, kernel_len))
+    detect_vertical = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, vertical_kernel, iterations=2)
+    v_lines = cv2.HoughLinesP(detect_vertical, 1, np.pi / 180, 50, minLineLength=min_length, maxLineGap=10)
+    if v_lines is not None:
+        for x1, y1, x2, y2 in v_lines.reshape(-1, 4):
+            segments.append(('vertical', int(round((x1 + x2) / 2)), int(min(y1, y2)), int(max(y1, y2))))
+
+    return segments
+
+
+def merge_lines(lines: Sequence[Line], pos_tol: int = 4, gap_tol: int = 10) -> List[Line]:
+    """같은 방향·위치(pos_tol 이내)에서 겹치거나 gap_tol 이내로 떨어진 선분을 하나로 합칩니다."""
+    merged: List[Line] = []
+    for kind in ('horizontal', 'vertical'):
+        group = sorted((l for l in lines if l[0] == kind), key=lambda l: l[1])
+
+        # 1) 위치가 가까운 선분끼리 묶음
+        clusters: List[List[Line]] = []
+        for line in group:
+            if clusters and line[1] - clusters[-1][-1][1] <= pos_tol:
+                clusters[-1].append(line)
+            else:
+                clusters.append([line])
+
+        # 2) 묶음 안에서 구간을 합침 (위치는 길이 가중 평균)
+        for cluster in clusters:
+            spans = sorted(cluster, key=lambda l: l[2])
+            cur = [spans[0][2], spans[0][3], [spans[0]]]
+            for line in spans[1:]:
+                if line[2] <= cur[1] + gap_tol:
+                    cur[1] = max(cur[1], line[3])
+                    cur[2].append(line)
+                else:
+                    merged.append(_merged_line(kind, cur))
+                    cur = [line[2], line[3], [line]]
+            merged.append(_merged_line(kind, cur))
+    return merged
+
+
+def _merged_line(kind: str, span) -> Line:
+    start, end, parts = span
+    weights = np.array([max(p[3] - p[2], 1) for p in parts], dtype=np.float64)
+    pos = float(np.dot([p[1] for p in parts], weights) / weights.sum())
+    return (kind, int(round(pos)), int(start), int(end))
+
+
+def line_mask(shape: Tuple[int, int], lines: Sequence[Line], thickness: int = 3, extend: int = 6) -> np.ndarray:
+    """선을 그린 마스크 (끝점을 extend만큼 늘려 모서리 틈을 막음)"""
+    h, w = shape[:2]
+    mask = np.zeros((h, w), dtype=np.uint8)
+    for kind, pos, a, b in lines:
+        if kind == 'horizontal':
+            cv2.line(mask, (max(a - extend, 0), pos), (min(b + extend, w - 1), pos), 255, thickness)
+        else:
+            cv2.line(mask, (pos, max(a - extend, 0)), (pos, min(b + extend, h - 1)), 255, thickness)
+    return mask
+
+
+def build_cells(shape: Tuple[int, int], lines: Sequence[Line], min_w: int = 20, min_h: int = 15,
+                max_area_ratio: float = 0.25) -> List[Box]:
+    """선으로 둘러싸인 영역을 셀 박스 [x1, y1, x2, y2]로 추출합니다. (읽기 순서: 위→아래, 왼→오)
+
+    선 밖 배경(이미지 가장자리에 닿는 영역)과 너무 작거나 큰 영역은 제외합니다.
+    """
+    h, w = shape[:2]
+    mask = line_mask(shape, lines)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(cv2.bitwise_not(mask), connectivity=4)
+
+    cells: List[Box] = []
+    for x, y, bw, bh, _area in stats[1:count]:
+        if x == 0 or y == 0 or x + bw >= w or y + bh >= h:
+            continue
+        if bw < min_w or bh < min_h or bw * bh > max_area_ratio * w * h:
+            continue
+        # 연결 요소 bbox는 선 안쪽 → 선 두께의 절반만큼 넓혀 선 중심 좌표로 맞춤
+        cells.append([int(x) - 1, int(y) - 1, int(x + bw), int(y + bh)])
+
+    return sort_reading_order(cells)
+
+
+def sort_reading_order(boxes: List[Box], row_tol: int = 10) -> List[Box]:
+    """박스를 행(윗변이 row_tol 이내) 단위로 묶어 위→아래, 왼→오 순서로 정렬합니다."""
+    rows: List[List[Box]] = []
+    for box in sorted(boxes, key=lambda b: b[1]):
+        if rows and box[1] - rows[-1][0][1] <= row_tol:
+            rows[-1].append(box)
+        else:
+            rows.append([box])
+    return [box for row in rows for box in sorted(row, key=lambda b: b[0])]
+
+
+def iou(a: Sequence[int], b: Sequence[int]) -> float:
+    """두 박스의 IoU"""
+    ix = max(0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+
+
+def _runs(mask_1d: np.ndarray) -> np.ndarray:
+    """0/1 배열에서 연속 구간 [(시작, 끝(포함))] 배열"""
+    padded = np.concatenate(([0], mask_1d.astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(padded))
+    return edges.reshape(-1, 2) - [0, 1]
+
+
+def _profile_lines(binary: np.ndarray, kind: str, min_length: int, max_thickness: int) -> List[Line]:
+    """한 방향의 선 검출: 1차원 침식 → 투영 프로파일 → 선 띠 → 띠마다 구간 추출"""
+    horizontal = kind == 'horizontal'
+    # 길이 min_length 이상 연속된 전경만 남김 (글자 획은 여기서 제거됨)
+    # anchor=(0,0) → 남은 구간은 끝쪽이 min_length-1만큼 짧아지므로 구간 추출 때 되돌림
+    kernel = np.ones((1, min_length) if horizontal else (min_length, 1), dtype=np.uint8)
+    runs = cv2.erode(binary, kernel, anchor=(0, 0), borderType=cv2.BORDER_CONSTANT, borderValue=0)
+    profile = cv2.reduce(runs, 1 if horizontal else 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
+
+    lines: List[Line] = []
+    for first, last in _runs(profile > 0):
+        if last - first + 1 > max_thickness:
+            continue  # 굵은 띠(채워진 영역)는 선이 아님
+        band = runs[first:last + 1].max(axis=0) if horizontal else runs[:, first:last + 1].max(axis=1)
+        for start, end in _runs(band > 0):
+            lines.append((kind, int((first + last + 1) // 2), int(start), int(end + min_length - 1)))
+    return lines
+
+
+def detect_lines(img: np.ndarray, min_length: int = 50, max_thickness: int = 8,
+                 pos_tol: int = 4, gap_tol: int = 10) -> List[Line]:
+    """투영 프로파일 기반 표 선 검출 (중복 없이 병합된 선 목록)
+
+    이진화 → 방향별 1차원 침식으로 min_length 이상 연속된 획만 남김 →
+    행/열 투영으로 선이 있는 띠를 찾고 띠마다 구간 추출 → merge_lines로 겹치는 조각·이중선 병합.
+    형태학 열기 반복과 HoughLinesP가 없어 페이지당 수 ms.
+    """
+    binary = binarize(img, gaussian=False)
+    lines = _profile_lines(binary, 'horizontal', min_length, max_thickness)
+    lines += _profile_lines(binary, 'vertical', min_length, max_thickness)
+    return merge_lines(lines, pos_tol=pos_tol, gap_tol=gap_tol)
+
+
+DETECT_METHODS = ("profile", "hough")
+
+
+def detect_grid(img: np.ndarray, method: str = "profile") -> Dict:
+    """이미지 한 장의 격자선·셀 검출 결과 {"lines", "cells", "segments"}
+
+    Args:
+        method: "profile"(투영 프로파일, 기본) / "hough"(형태학 열기 + HoughLinesP, 기존 GUI 방식)
+    """
+    if method not in DETECT_METHODS:
+        raise ValueError(f"지원하지 않는 검출 방식입니다: {method} (지원: {DETECT_METHODS})")
+    if method == "hough":
+        segments = detect_segments_hough(img)
+        lines = merge_lines(segments)
+    else:
+        lines = detect_lines(img)
+        segments = lines
+    return {"segments": len(segments), "lines": lines, "cells": build_cells(img.shape, lines)}
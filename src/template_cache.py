@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+템플릿 픽셀 공유 저장소 (워커 웜 스타트)
+
+기능:
+- 부모 프로세스가 템플릿 JPEG을 한 번만 디코딩하여 multiprocessing.shared_memory에 올림
+- 워커는 이름만 받아 공유 메모리에 붙고, 읽기 전용 numpy 뷰를 등록 (복사 없음)
+- create_template / BaseTemplate는 등록된 뷰가 있으면 디코딩 없이 사용
+  (render는 _new_canvas에서 자기 출력 버퍼로만 복사하므로 공유 픽셀은 바뀌지 않음)
+- 워커별 템플릿 사본(BGR 기준 장당 약 5.4MB × 20장)이 없어지므로 노드당 워커 수를 늘릴 수 있음
+- 디스크 캐시: 디코딩한 픽셀을 .cache/templates/*.npy로 저장하고 np.load(mmap_mode="r")로 읽음
+  (JPEG 디코딩 생략, 파일명에 원본 내용 해시 → 원본 JPEG이 바뀌면 자동으로 다시 생성)
+
+조회 순서: 공유 메모리 뷰 → 디스크 캐시(.npy mmap) → JPEG 디코딩
+
+사용:
+    with SharedTemplateStore.from_assets(color_modes=("BGR",)) as store:
+        with store.executor(max_workers=8) as pool:
+            pool.map(render_job, jobs)   # 워커 안의 create_template은 공유 뷰 사용
+"""
+
+import glob
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from lazy_import import lazy_module
+
+cv2 = lazy_module("cv2")
+
+TEMPLATE_ROOT = "assets/templates"
+TEMPLATE_DOC_TYPES = ("GA", "JU")
+
+# 디코딩된 템플릿 캐시 디렉토리 (None이면 디스크 캐시 사용 안 함)
+CACHE_DIR = ".cache/templates"
+
+# 워커 시작 시 forkserver가 미리 import해 둘 모듈 (워커는 import 비용 없이 시작)
+FORKSERVER_PRELOAD = ["numpy", "cv2", "template_cache", "templates_juga", "data_factory"]
+
+# 프로세스별 등록된 템플릿 뷰: (절대 경로, 색상 모드) → 읽기 전용 배열
+_registry: Dict[Tuple[str, str], np.ndarray] = {}
+# 뷰가 살아 있는 동안 공유 메모리 핸들도 유지
+_attached: List[shared_memory.SharedMemory] = []
+# 원본 해시 메모: 절대 경로 → ((mtime_ns, size), 해시) - 같은 파일을 매번 다시 읽지 않도록
+_source_hashes: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_cache_dir: Optional[str] = CACHE_DIR
+
+
+def template_key(path: str, color_mode: str) -> Tuple[str, str]:
+    """등록 키 (절대 경로, 색상 모드)"""
+    return os.path.abspath(path), color_mode
+
+
+def decode_template(path: str, color_mode: str) -> Optional[np.ndarray]:
+    """템플릿 JPEG을 디코딩합니다. (GRAY 모드는 1채널, 실패 시 None)"""
+    flag = cv2.IMREAD_GRAYSCALE if color_mode == "GRAY" else cv2.IMREAD_COLOR
+    return cv2.imread(path, flag)
+
+
+def set_cache_dir(directory: Optional[str]):
+    """디스크 캐시 디렉토리를 바꿉니다. (None이면 디스크 캐시 끔)"""
+    global _cache_dir
+    _cache_dir = directory
+
+
+def source_hash(path: str) -> str:
+    """템플릿 원본 파일 내용의 SHA-1 (mtime·크기가 같으면 이전 결과 재사용)"""
+    abspath = os.path.abspath(path)
+    st = os.stat(abspath)
+    stamp = (st.st_mtime_ns, st.st_size)
+    memo = _source_hashes.get(abspath)
+    if memo is not None and memo[0] == stamp:
+        return memo[1]
+
+    with open(abspath, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    _source_hashes[abspath] = (stamp, digest)
+    return digest
+
+
+def cache_path(path: str, color_mode: str, cache_dir: str = None) -> str:
+    """디스크 캐시 파일 경로 ({템플릿명}-{색상 모드}-{원본 해시 16자}.npy)"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir or _cache_dir, f"{stem}-{color_mode}-{source_hash(path)[:16]}.npy")
+
+
+def load_cached_template(path: str, color_mode: str) -> Optional[np.ndarray]:
+    """디스크 캐시에서 템플릿을 읽기 전용 mmap으로 읽습니다. 없거나 원본이 바뀌었으면 디코딩 후 캐시를 다시 만듭니다.
+
+    캐시를 쓸 수 없는 경우(읽기 전용 디렉토리 등)에는 디코딩 결과를 그대로 돌려줍니다.
+    """
+    target = cache_path(path, color_mode)
+    if not os.path.exists(target):
+        pixels = decode_template(path, color_mode)
+        if pixels is None:
+            return None
+        try:
+            _write_cache(target, pixels)
+        except OSError as e:
+            print(f"⚠️ 템플릿 캐시 기록 실패 ({target}): {e}")
+            return pixels
+
+    try:
+        return np.load(target, mmap_mode="r").view(np.ndarray)
+    except (OSError, ValueError):
+        # 손상된 캐시는 지우고 디코딩 결과 사용 (다음 호출에서 다시 생성)
+        os.remove(target)
+        return decode_template(path, color_mode)
+
+
+def _write_cache(target: str, pixels: np.ndarray):
+    """캐시 파일을 원자적으로 기록하고, 같은 템플릿·색상 모드의 이전 해시 캐시를 지웁니다."""
+    directory = os.path.dirname(target)
+    os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.ascontiguousarray(pixels))
+    os.replace(tmp_path, target)
+
+    prefix = os.path.basename(target).rsplit("-", 1)[0]
+    for old in glob.glob(os.path.join(directory, f"{glob.escape(prefix)}-*.npy")):
+        if old != target:
+            os.remove(old)
+
+
+def load_template_image(path: str, color_mode: str) -> Optional[np.ndarray]:
+    """템플릿 픽셀을 가져옵니다.
+
+    공유 뷰가 등록되어 있으면 그 뷰, 디스크 캐시가 켜져 있으면 .npy mmap (둘 다 읽기 전용),
+    아니면 JPEG 디코딩 결과를 돌려줍니다.
+    """
+    view = _registry.get(template_key(path, color_mode))
+    if view is not None:
+        return view
+    if _cache_dir is not None and os.path.exists(path):
+        return load_cached_template(path, color_mode)
+    return decode_template(path, color_mode)
+
+
+def register_template(path: str, color_mode: str, pixels: np.ndarray):
+    """이 프로세스에서 쓸 템플릿 픽셀을 등록합니다. (읽기 전용으로 표시)"""
+    pixels.flags.writeable = False
+    _registry[template_key(path, color_mode)] = pixels
+
+
+def registered_templates() -> List[Tuple[str, str]]:
+    """등록된 (경로, 색상 모드) 목록"""
+    return list(_registry)
+
+
+def default_template_paths(root: str = TEMPLATE_ROOT, doc_types: Iterable[str] = TEMPLATE_DOC_TYPES) -> List[str]:
+    """assets/templates/{GA,JU}/*.jpg 템플릿 경로 목록"""
+    paths = []
+    for doc_type in doc_types:
+        paths += sorted(glob.glob(os.path.join(root, doc_type, "*.jpg")))
+    return paths
+
+
+def _open_shared(name: str) -> shared_memory.SharedMemory:
+    """기존 공유 메모리에 붙습니다. (워커 종료 시 resource_tracker가 지우지 않도록 추적 해제)"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python 3.12 이하
+        shm = shared_memory.SharedMemory(name=name)
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def attach_shared_templates(descriptors: List[Dict]):
+    """부모가 만든 공유 메모리 템플릿에 붙어 읽기 전용 뷰를 등록합니다. (워커 initializer)
+
+    Args:
+        descriptors: SharedTemplateStore.descriptors ({"path", "color_mode", "shm", "shape", "dtype"})
+    """
+    for desc in descriptors:
+        shm = _open_shared(desc["shm"])
+        _attached.append(shm)
+        view = np.ndarray(tuple(desc["shape"]), dtype=np.dtype(desc["dtype"]), buffer=shm.buf)
+        register_template(desc["path"], desc["color_mode"], view)
+
+
+class SharedTemplateStore:
+    """부모 프로세스가 소유하는 템플릿 공유 메모리 저장소"""
+
+    def __init__(self, template_paths: Iterable[str], color_modes: Iterable[str] = ("BGR",),
+                 register_in_parent: bool = True):
+        """
+        Args:
+            template_paths: 공유할 템플릿 JPEG 경로 목록
+            color_modes: 색상 모드별로 한 벌씩 디코딩 ("BGR", "GRAY")
+            register_in_parent: 부모 프로세스의 create_template도 공유 뷰를 쓰도록 등록
+        """
+        self.descriptors: List[Dict] = []
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.total_bytes = 0
+
+        try:
+            for color_mode in color_modes:
+                for path in template_paths:
+                    self._publish(path, color_mode, register_in_parent)
+        except Exception:
+            self.close()
+            raise
+
+    @classmethod
+    def from_assets(cls, color_modes: Iterable[str] = ("BGR",), root: str = TEMPLATE_ROOT,
+                    doc_types: Iterable[str] = TEMPLATE_DOC_TYPES, **kwargs) -> "SharedTemplateStore":
+        """assets/templates의 모든 템플릿으로 저장소를 만듭니다."""
+        return cls(default_template_paths(root, doc_types), color_modes, **kwargs)
+
+    def _publish(self, path: str, color_mode: str, register_in_parent: bool):
+        """템플릿 하나를 디코딩하여 공유 메모리로 복사합니다."""
+        pixels = load_template_image(path, color_mode)
+        if pixels is None:
+            raise ValueError(f"템플릿 이미지를 로드할 수 없습니다: {path}")
+
+        shm = shared_memory.SharedMemory(create=True, size=max(pixels.nbytes, 1))
+        self._blocks.append(shm)
+        shared = np.ndarray(pixels.shape, dtype=pixels.dtype, buffer=shm.buf)
+        shared[...] = pixels
+
+        self.descriptors.append({
+            "path": os.path.abspath(path),
+            "color_mode": color_mode,
+            "shm": shm.name,
+            "shape": list(pixels.shape),
+            "dtype": pixels.dtype.str,
+        })
+        self.total_bytes += pixels.nbytes
+
+        if register_in_parent:
+            register_template(path, color_mode, shared)
+
+    def executor(self, max_workers: int = None, preload: bool = True) -> ProcessPoolExecutor:
+        """공유 템플릿에 붙는 워커 풀 (가능하면 forkserver, 주요 모듈은 미리 import)"""
+        import multiprocessing
+
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            if preload:
+                context.set_forkserver_preload(FORKSERVER_PRELOAD)
+        else:
+            context = multiprocessing.get_context()
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                                   initializer=attach_shared_templates, initargs=(self.descriptors,))
+
+    def close(self):
+        """부모의 등록을 지우고 공유 메모리를 해제합니다. (워커 풀을 먼저 종료해야 함)"""
+        for desc in self.descriptors:
+            _registry.pop((desc["path"], desc["color_mode"]), None)
+        for shm in self._blocks:
+            try:
+                shm.close()
+            except BufferError:
+                pass  # 아직 뷰를 잡고 있는 템플릿 객체가 있으면 그 객체가 사라질 때 해제됨
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks = []
+        self.descriptors = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,38 +1,52 @@
-import cv2
 import numpy as np
-import yaml
 import os
-from PIL import Image, ImageDraw, ImageFont
 from typing import Dict, List, Tuple, Optional
 import math
-import random
+import re
+from lazy_import import lazy_module
+from template_cache import load_template_image
+from layout_bundle import load_layout
+from render_buffers import default_pool
+
+# 무거운 모듈은 처음 사용할 때 로드 (import만 하는 CLI·워커의 시작 시간 단축)
+cv2 = lazy_module("cv2")
+Image = lazy_module("PIL.Image")
+ImageDraw = lazy_module("PIL.ImageDraw")
+ImageFont = lazy_module("PIL.ImageFont")
+
+# 렌더링 색상 모드: BGR(3채널, 기본) / GRAY(1채널 흑백 - 메모리·인코딩·파일 크기 약 1/3)
+COLOR_MODES = ("BGR", "GRAY")
+
+# 렌더링 폰트 (환경 변수 KDOCS_FONT로 다른 폰트 파일 지정 - 골든 회귀 검사는 저장소의 tests/golden_font.ttf)
+FONT_ENV, DEFAULT_FONT_PATH = "KDOCS_FONT", "assets/fonts/KoPubWorld Batang Medium.ttf"
 
 class BaseTemplate:
     """템플릿 클래스의 기본 클래스"""
     
-    def __init__(self, template_path: str, layout_path: str, field_def_path: str):
+    def __init__(self, template_path: str, layout_path: str, field_def_path: str, color_mode: str = "BGR"):
         """
         Args:
             template_path: 템플릿 이미지 경로
             layout_path: 레이아웃 YAML 파일 경로
             field_def_path: 필드 정의 YAML 파일 경로
+            color_mode: "BGR"(기본) 또는 "GRAY"(단일 채널 흑백 렌더링)
         """
+        if color_mode not in COLOR_MODES:
+            raise ValueError(f"지원하지 않는 색상 모드입니다: {color_mode} (지원: {COLOR_MODES})")
+        
         self.template_path = template_path
         self.layout_path = layout_path
         self.field_def_path = field_def_path
+        self.color_mode = color_mode
         
-        # 템플릿 이미지 로드
-        self.template_img = cv2.imread(template_path)
+        # 템플릿 이미지 로드 (GRAY 모드는 처음부터 1채널로 디코딩)
+        # 워커 풀에서는 부모가 공유 메모리에 올린 읽기 전용 뷰를 그대로 사용 (template_cache)
+        self.template_img = load_template_image(template_path, color_mode)
         if self.template_img is None:
             raise ValueError(f"템플릿 이미지를 로드할 수 없습니다: {template_path}")
         
-        # 레이아웃 데이터 로드
-        with open(layout_path, 'r', encoding='utf-8') as f:
-            self.layout_data = yaml.safe_load(f)
-        
-        # 필드 정의 로드
-        with open(field_def_path, 'r', encoding='utf-8') as f:
-            self.field_def = yaml.safe_load(f)
+        # 레이아웃 데이터·필드 정의 로드 (컴파일된 레이아웃 번들 mmap, 원본 YAML이 바뀌면 자동 재빌드)
+        self.layout_data, self.field_def = load_layout(layout_path, field_def_path)
         
         # 폰트 로드
         self.fonts = self._load_fonts()
@@ -40,21 +54,28 @@ class BaseTemplate:
         # 필드 박스 정보
         self.field_boxes = self.layout_data.get('field_boxes', {})
         
-    def _load_fonts(self) -> Dict[str, ImageFont.FreeTypeFont]:
-        """KoPub World 폰트를 로드합니다."""
+        # 마지막 render에서 실제로 그린 텍스트 주석 (필드명, 문자열, 잉크 bbox)
+        self.annotations: List[Dict] = []
+        
+        # render_into가 지정한 출력 버퍼 (None이면 render마다 새 페이지)
+        self._render_target: Optional[np.ndarray] = None
+        # 영역 단위 렌더링 중 그린 영역 기록 (dirty_region.DirtyRegionRenderer가 설정, 복원도 그쪽에서 담당)
+        self._dirty_rects: Optional[List[Tuple[int, int, int, int]]] = None
+        
+    def _load_fonts(self) -> Dict[str, "ImageFont.FreeTypeFont"]:
+        """렌더링 폰트(기본 KoPub World, KDOCS_FONT로 변경)를 로드합니다."""
         fonts = {}
-        font_dir = "assets/fonts"
-        font_path = os.path.join(font_dir, 'KoPubWorld Batang Medium.ttf')
+        font_path = os.environ.get(FONT_ENV) or DEFAULT_FONT_PATH
         
         if os.path.exists(font_path):
             try:
                 # 기본 크기로 로드 (나중에 조정)
                 fonts['ko'] = ImageFont.truetype(font_path, 20)
-                print(f"KoPub World 폰트 로드 성공: {font_path}")
+                print(f"폰트 로드 성공: {font_path}")
             except Exception as e:
-                print(f"KoPub World 폰트 로드 실패 {font_path}: {e}")
+                print(f"폰트 로드 실패 {font_path}: {e}")
         else:
-            print(f"KoPub World 폰트 파일이 없습니다: {font_path}")
+            print(f"폰트 파일이 없습니다: {font_path}")
         
         return fonts
     
@@ -108,97 +129,151 @@ class BaseTemplate:
         # 최소 크기 보장
         return max(best_size, 8)
     
-    def _draw_text_on_image(self, img: np.ndarray, text: str, box_coords: List[int], 
-                           font_type: str = 'ko', color: Tuple[int, int, int] = (50, 50, 50), 
-                           base_font_size: int = None, align: str = 'center', letter_spacing: int = 0) -> np.ndarray:
-        """이미지에 텍스트를 그립니다. (무조건 KoPub World 폰트 사용)"""
-        if not text or not box_coords or len(box_coords) != 4:
-            return img
+    def _text_region(self, img: np.ndarray, box_coords: List[int], rects: List[Tuple]) -> Tuple[int, int, int, int]:
+        """필드 박스와 글자 bbox들을 모두 덮는 영역 (여백 2픽셀, 이미지 범위로 자름)"""
+        height, width = img.shape[:2]
+        rects = [tuple(box_coords)] + rects
+        x1 = max(0, math.floor(min(r[0] for r in rects)) - 2)
+        y1 = max(0, math.floor(min(r[1] for r in rects)) - 2)
+        x2 = min(width, math.ceil(max(r[2] for r in rects)) + 2)
+        y2 = min(height, math.ceil(max(r[3] for r in rects)) + 2)
+        return x1, y1, x2, y2
+    
+    def _draw_glyphs(self, img: np.ndarray, region: Tuple[int, int, int, int], glyphs: List[Tuple],
+                     text_y: int, font, fill):
+        """영역만 잘라 PIL로 글자를 그리고 img에 제자리로 되돌립니다. (페이지 전체 색 변환·복사 없음)
         
-        x1, y1, x2, y2 = box_coords
-        box_width = x2 - x1
-        box_height = y2 - y1
+        BGR↔RGB 변환은 채널 순서만 바꾸므로 페이지 전체를 변환하던 방식과 픽셀이 같습니다.
+        """
+        rx1, ry1, rx2, ry2 = region
+        if rx2 <= rx1 or ry2 <= ry1:
+            return
+        self._mark_dirty(region)
+        crop = img[ry1:ry2, rx1:rx2]
+        if img.ndim == 2:
+            pil_crop = Image.fromarray(crop)
+        else:
+            rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB, dst=default_pool().get(crop.shape, tag="rgb"))
+            pil_crop = Image.fromarray(rgb)
         
-        # 폰트 크기 계산 (무조건 'ko' 폰트 사용)
-        font_size = self._get_font_size(text, box_width, box_height, 'ko', base_font_size=base_font_size)
+        draw = ImageDraw.Draw(pil_crop)
+        for glyph_x, chars, _ in glyphs:
+            draw.text((glyph_x - rx1, text_y - ry1), chars, font=font, fill=fill)
         
-        if 'ko' not in self.fonts:
-            # 기본 폰트 사용
-            cv2.putText(img, text, (x1 + 2, y1 + box_height//2 + 5), 
-                       cv2.FONT_HERSHEY_SIMPLEX, font_size/30, color, 1)
-            return img
+        drawn = np.asarray(pil_crop)
+        if img.ndim == 2:
+            crop[...] = drawn
+        else:
+            converted = cv2.cvtColor(drawn, cv2.COLOR_RGB2BGR, dst=crop)
+            if converted is not crop:  # OpenCV가 ROI에 바로 쓰지 못한 경우
+                crop[...] = converted
+    
+    def _pil_fill(self, color: Tuple[int, int, int], img: np.ndarray):
+        """BGR 색상을 이미지 모드에 맞는 PIL fill 값으로 변환합니다."""
+        if img.ndim == 2:
+            # cv2.COLOR_BGR2GRAY와 같은 가중치
+            return int(round(0.114 * color[0] + 0.587 * color[1] + 0.299 * color[2]))
+        return (color[2], color[1], color[0])  # BGR을 RGB로 변환
+    
+    def _group_numbers(self, prefix: str) -> Dict[str, int]:
+        """필드명 → 그룹 번호 (MEMBER3_NAME → 3, CHILD1_BIRTH → 1)
         
-        # PIL을 사용한 고품질 텍스트 렌더링 (무조건 KoPub World 폰트 사용)
-        pil_img = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
-        draw = ImageDraw.Draw(pil_img)
+        레이아웃의 필드명을 초기화 때 한 번만 파싱해 두어 render에서 정규식을 쓰지 않습니다.
+        """
+        pattern = re.compile(rf'{prefix}(\d+)_')
+        groups = {}
+        for field_name in self.field_boxes:
+            match = pattern.match(field_name)
+            if match:
+                groups[field_name] = int(match.group(1))
+        return groups
+    
+    def _iter_render_items(self, data, groups: Dict[str, int], limit: int):
+        """렌더링할 (필드명, 값)을 순회합니다. (그룹 번호가 limit 이하인 필드만)
         
+        data는 평탄화 dict 또는 DocumentRecord(iter_items 제공) 모두 가능합니다.
+        """
+        items = data.iter_items() if hasattr(data, "iter_items") else data.items()
+        for field_name, field_value in items:
+            group = groups.get(field_name)
+            if group is None or group <= limit:
+                yield field_name, field_value
+    
+    def _new_canvas(self) -> np.ndarray:
+        """렌더링용 템플릿 복사본을 만들고 주석 목록을 초기화합니다. (render_into 중에는 출력 버퍼에 복사)"""
+        self.annotations = []
+        if self._render_target is not None:
+            if self._dirty_rects is None:
+                np.copyto(self._render_target, self.template_img)
+            return self._render_target
+        return self.template_img.copy()
+    
+    def _mark_dirty(self, region: Tuple[int, int, int, int]):
+        """영역 단위 렌더링 중이면 픽셀을 바꾼 영역을 기록합니다."""
+        if self._dirty_rects is not None:
+            self._dirty_rects.append(tuple(region))
+    
+    def render_into(self, out: np.ndarray, data) -> np.ndarray:
+        """미리 만든 페이지 버퍼(out)에 렌더링하고 out을 돌려줍니다. (render와 픽셀 동일)
+        
+        out은 템플릿과 같은 shape·dtype이며 문서마다 재사용 가능 (render_buffers.BufferPool.page_for),
+        텍스트는 필드 영역만 잘라서 그리므로 정상 상태에서는 문서당 페이지 크기 할당이 없습니다.
+        """
+        if out.shape != self.template_img.shape or out.dtype != self.template_img.dtype:
+            raise ValueError(f"출력 버퍼 형식이 템플릿과 다릅니다: {out.shape}/{out.dtype} "
+                             f"(필요: {self.template_img.shape}/{self.template_img.dtype})")
+        self._render_target = out
         try:
-            font = ImageFont.truetype(self.fonts['ko'].path, font_size)
-            bbox = font.getbbox(text)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            
-            # 텍스트 정렬 (중앙, 왼쪽, 오른쪽, 정교한 중앙)
-            if align == 'left':
-                text_x = x1 + 8  # 왼쪽 여백 8픽셀
-            elif align == 'right':
-                # 자간을 고려한 실제 텍스트 폭 계산
-                if letter_spacing > 0:
-                    total_text_width = text_width + (len(text) - 1) * letter_spacing
-                    text_x = x2 - total_text_width - 8  # 오른쪽 여백 8픽셀
-                else:
-                    text_x = x2 - text_width - 8  # 오른쪽 여백 8픽셀
-            elif align == 'center_precise':
-                # 정교한 가운데 정렬 (박스 정중앙에 배치)
-                text_x = x1 + (box_width - text_width) // 2
-                # 약간의 오프셋 조정으로 시각적으로 더 정확한 중앙 배치
-                if text_width < box_width * 0.3:  # 매우 짧은 텍스트
-                    text_x = x1 + box_width // 2 - text_width // 2
-            else:  # center
-                text_x = x1 + (box_width - text_width) // 2
-            
-            # 세로 중앙 정렬도 더 정교하게
-            if align == 'center_precise':
-                text_y = y1 + box_height // 2 - text_height // 2
-            else:
-                text_y = y1 + (box_height - text_height) // 2
-            
-            # 색상 변환 (BGR -> RGB)
-            rgb_color = (color[2], color[1], color[0])  # BGR을 RGB로 변환
-            
-            # 자간 조정이 필요한 경우 글자를 하나씩 그리기
-            if letter_spacing > 0:
-                current_x = text_x
-                for char in text:
-                    draw.text((current_x, text_y), char, font=font, fill=rgb_color)
-                    char_bbox = font.getbbox(char)
-                    char_width = char_bbox[2] - char_bbox[0]
-                    current_x += char_width + letter_spacing
-            else:
-                draw.text((text_x, text_y), text, font=font, fill=rgb_color)
-            
-            # OpenCV 형식으로 변환
-            result_img = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
-            
-            # 합성된 텍스트만 살짝 블러 처리 (스캔 문서 느낌)
-            # 텍스트 영역만 추출해서 블러 적용
-            text_region = result_img[y1:y2, x1:x2]
-            blurred_text = cv2.GaussianBlur(text_region, (3, 3), 0.7)
-            result_img[y1:y2, x1:x2] = blurred_text
-            
-            return result_img
-            
-        except Exception as e:
-            print(f"텍스트 렌더링 실패: {e}")
-            # 폴백: OpenCV 기본 폰트 사용
-            cv2.putText(img, text, (x1 + 2, y1 + box_height//2 + 5), 
-                       cv2.FONT_HERSHEY_SIMPLEX, font_size/30, color, 1)
-            return img
+            return self.render(data)
+        finally:
+            self._render_target = None
+    
+    def _record_annotation(self, img: np.ndarray, field_name: str, text: str, bbox: Tuple[int, int, int, int]):
+        """실제로 그린 텍스트의 bbox(이미지 범위로 자름)를 주석으로 기록합니다."""
+        if field_name is None:
+            return
+        height, width = img.shape[:2]
+        x1, y1, x2, y2 = bbox
+        x1, x2 = max(0, min(int(x1), width)), max(0, min(int(x2), width))
+        y1, y2 = max(0, min(int(y1), height)), max(0, min(int(y2), height))
+        if x2 > x1 and y2 > y1:
+            self.annotations.append({"field": field_name, "text": text, "bbox": [x1, y1, x2, y2]})
+    
+    def _draw_text_on_image(self, img: np.ndarray, text: str, box_coords: List[int], 
+                           font_type: str = 'ko', color: Tuple[int, int, int] = (50, 50, 50), 
+                           base_font_size: int = None, align: str = 'center', letter_spacing: int = 0,
+                           field_name: str = None) -> np.ndarray:
+        """이미지에 텍스트를 그립니다. (무조건 KoPub World 폰트 사용)"""
+        return self._render_text(img, text, box_coords, color, base_font_size, align, letter_spacing, True, field_name)
     
     def _draw_text_on_image_no_blur(self, img: np.ndarray, text: str, box_coords: List[int],
                                     font_type: str = 'ko', color: Tuple[int, int, int] = (50, 50, 50),
-                                    base_font_size: int = None, align: str = 'center', letter_spacing: int = 0) -> np.ndarray:
+                                    base_font_size: int = None, align: str = 'center', letter_spacing: int = 0,
+                                    field_name: str = None) -> np.ndarray:
         """이미지에 텍스트를 그립니다. (블러 효과 없음 - 선명하게)"""
+        return self._render_text(img, text, box_coords, color, base_font_size, align, letter_spacing, False, field_name)
+    
+    def _draw_fallback_text(self, img: np.ndarray, text: str, box_coords: List[int], font_size: int,
+                            color: Tuple[int, int, int], field_name: str = None) -> np.ndarray:
+        """폰트가 없을 때 OpenCV 기본 폰트로 그립니다."""
+        x1, y1, x2, y2 = box_coords
+        origin = (x1 + 2, y1 + (y2 - y1)//2 + 5)
+        scale = font_size/30
+        cv2.putText(img, text, origin, cv2.FONT_HERSHEY_SIMPLEX, scale, color, 1)
+        (text_w, text_h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, 1)
+        self._mark_dirty(self._text_region(img, box_coords, [(origin[0] - 4, origin[1] - text_h - 4,
+                                                              origin[0] + text_w + 4, origin[1] + baseline + 4)]))
+        self._record_annotation(img, field_name, text,
+                                (origin[0], origin[1] - text_h, origin[0] + text_w, origin[1] + baseline))
+        return img
+    
+    def _render_text(self, img: np.ndarray, text: str, box_coords: List[int],
+                     color: Tuple[int, int, int], base_font_size: int, align: str,
+                     letter_spacing: int, blur: bool, field_name: str = None) -> np.ndarray:
+        """텍스트 렌더링 공통 로직 (BGR 3채널, GRAY 1채널 모두 지원)
+        
+        field_name이 주어지면 실제로 그린 텍스트 bbox를 self.annotations에 기록합니다.
+        """
         if not text or not box_coords or len(box_coords) != 4:
             return img
         
@@ -211,14 +286,9 @@ class BaseTemplate:
         
         if 'ko' not in self.fonts:
             # 기본 폰트 사용
-            cv2.putText(img, text, (x1 + 2, y1 + box_height//2 + 5), 
-                       cv2.FONT_HERSHEY_SIMPLEX, font_size/30, color, 1)
-            return img
-        
-        # PIL을 사용한 고품질 텍스트 렌더링 (무조건 KoPub World 폰트 사용, 블러 없음)
-        pil_img = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
-        draw = ImageDraw.Draw(pil_img)
+            return self._draw_fallback_text(img, text, box_coords, font_size, color, field_name)
         
+        # PIL을 사용한 고품질 텍스트 렌더링 (무조건 KoPub World 폰트 사용)
         try:
             font = ImageFont.truetype(self.fonts['ko'].path, font_size)
             bbox = font.getbbox(text)
@@ -250,49 +320,67 @@ class BaseTemplate:
             else:
                 text_y = y1 + (box_height - text_height) // 2
             
-            # 색상 변환 (BGR -> RGB)
-            rgb_color = (color[2], color[1], color[0])  # BGR을 RGB로 변환
+            # 색상 변환 (BGR -> RGB 또는 GRAY 밝기값)
+            fill = self._pil_fill(color, img)
             
-            # 자간 조정이 필요한 경우 글자를 하나씩 그리기
+            # 자간 조정이 필요한 경우 글자를 하나씩 그리기 (글자 위치, 문자열, bbox)
             if letter_spacing > 0:
+                glyphs = []
                 current_x = text_x
+                ink_x2 = text_x + bbox[2]
                 for char in text:
-                    draw.text((current_x, text_y), char, font=font, fill=rgb_color)
                     char_bbox = font.getbbox(char)
+                    glyphs.append((current_x, char, char_bbox))
                     char_width = char_bbox[2] - char_bbox[0]
+                    ink_x2 = current_x + char_bbox[2]
                     current_x += char_width + letter_spacing
+                ink_bbox = (text_x + bbox[0], text_y + bbox[1], ink_x2, text_y + bbox[3])
             else:
-                draw.text((text_x, text_y), text, font=font, fill=rgb_color)
+                glyphs = [(text_x, text, bbox)]
+                ink_bbox = (text_x + bbox[0], text_y + bbox[1], text_x + bbox[2], text_y + bbox[3])
+            
+            # 실제 잉크 bbox 기록 (정렬·x 시프트 반영 후 좌표)
+            self._record_annotation(img, field_name, text, ink_bbox)
             
-            # OpenCV 형식으로 변환 (블러 효과 없음)
-            result_img = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
+            # 박스와 글자 영역만 잘라서 그림 (결과는 img에 제자리 기록)
+            rects = [(gx + b[0], text_y + b[1], gx + b[2], text_y + b[3]) for gx, _, b in glyphs]
+            self._draw_glyphs(img, self._text_region(img, box_coords, rects), glyphs, text_y, font, fill)
             
-            return result_img
+            if blur:
+                # 합성된 텍스트만 살짝 블러 처리 (스캔 문서 느낌)
+                # 텍스트 영역만 추출해서 블러 적용
+                text_region = img[y1:y2, x1:x2]
+                text_region[...] = cv2.GaussianBlur(text_region, (3, 3), 0.7,
+                                                    dst=default_pool().get(text_region.shape, tag="blur"))
+            
+            return img
             
         except Exception as e:
             print(f"텍스트 렌더링 실패: {e}")
             # 폴백: OpenCV 기본 폰트 사용
-            cv2.putText(img, text, (x1 + 2, y1 + box_height//2 + 5), 
-                       cv2.FONT_HERSHEY_SIMPLEX, font_size/30, color, 1)
-            return img
+            return self._draw_fallback_text(img, text, box_coords, font_size, color, field_name)
     
     def render(self, data: Dict[str, str]) -> np.ndarray:
-        """데이터를 사용하여 템플릿을 렌더링합니다."""
+        """데이터를 사용하여 템플릿을 렌더링합니다. (평탄화 dict 또는 DocumentRecord)"""
         # 템플릿 이미지 복사
-        result_img = self.template_img.copy()
+        result_img = self._new_canvas()
         
         # 각 필드에 텍스트 렌더링 (모든 텍스트에 KoPub World 사용)
-        for field_name, field_value in data.items():
+        items = data.iter_items() if hasattr(data, "iter_items") else data.items()
+        for field_name, field_value in items:
             if field_name in self.field_boxes and field_value:
                 box_coords = self.field_boxes[field_name]
-                result_img = self._draw_text_on_image(result_img, field_value, box_coords, 'ko')
+                result_img = self._draw_text_on_image(result_img, field_value, box_coords, 'ko', field_name=field_name)
         
         return result_img
     
-    def save(self, output_path: str, data: Dict[str, str]):
-        """렌더링된 이미지를 저장합니다."""
+    def save(self, output_path: str, data: Dict[str, str], codec=None):
+        """렌더링된 이미지를 저장합니다. (codec: image_codec.ImageCodec, 없으면 cv2 기본 설정)"""
         result_img = self.render(data)
-        cv2.imwrite(output_path, result_img)
+        if codec is not None:
+            output_path = codec.write(output_path, result_img)
+        else:
+            cv2.imwrite(output_path, result_img)
         print(f"이미지 저장됨: {output_path}")
     
     def draw_field_boxes(self, output_path: str = None, box_color: tuple = (0, 255, 0), 
@@ -331,33 +419,23 @@ class BaseTemplate:
 class GACertificateTemplate(BaseTemplate):
     """가족관계증명서 템플릿 클래스"""
     
-    def __init__(self, template_path: str, layout_path: str, field_def_path: str):
-        super().__init__(template_path, layout_path, field_def_path)
+    def __init__(self, template_path: str, layout_path: str, field_def_path: str, color_mode: str = "BGR"):
+        super().__init__(template_path, layout_path, field_def_path, color_mode)
+        
+        # 자녀 필드별 번호 (CHILD1_NAME -> 1)
+        self.child_groups = self._group_numbers('CHILD')
         
         # 자녀 수 계산
         self.children_count = self._calculate_children_count()
         
     def _calculate_children_count(self) -> int:
         """템플릿에서 자녀 필드 수를 계산합니다."""
-        children_count = 0
-        for field_name in self.field_boxes.keys():
-            if field_name.startswith('CHILD') and field_name.endswith('_NAME'):
-                child_num = int(field_name[5])  # CHILD1_NAME -> 1
-                children_count = max(children_count, child_num)
-        return children_count
+        return max((num for name, num in self.child_groups.items() if name.endswith('_NAME')), default=0)
     
     def render(self, data: Dict[str, str]) -> np.ndarray:
         """가족관계증명서 특화 렌더링 (템플릿의 본인 박스 크기 기준으로 폰트 크기 통일)"""
-        # 자녀 수에 맞는 데이터만 필터링
-        filtered_data = {}
-        
-        for field_name, field_value in data.items():
-            if field_name.startswith('CHILD'):
-                child_num = int(field_name[5])  # CHILD1_NAME -> 1
-                if child_num <= self.children_count:
-                    filtered_data[field_name] = field_value
-            else:
-                filtered_data[field_name] = field_value
+        # 자녀 수에 맞는 데이터만 필터링 (이름 → 한자명 조회가 필요하므로 dict로 모음)
+        filtered_data = dict(self._iter_render_items(data, self.child_groups, self.children_count))
         
         # 템플릿의 "본인" 박스 크기를 기준으로 폰트 크기 계산 (실제로는 "본인" 텍스트 렌더링 안함)
         base_font_size = 20  # 기본값
@@ -371,7 +449,7 @@ class GACertificateTemplate(BaseTemplate):
             print(f"템플릿 '본인' 박스 기준 폰트 크기: {base_font_size}")
         
         # 템플릿 이미지 복사
-        result_img = self.template_img.copy()
+        result_img = self._new_canvas()
         
         # 각 필드에 텍스트 렌더링 (본인 관계만 제외, 나머지는 통일된 폰트 크기 사용)
         for field_name, field_value in filtered_data.items():
@@ -434,7 +512,8 @@ class GACertificateTemplate(BaseTemplate):
                 # 모든 텍스트를 적당히 진한 색으로 통일 (선명하지만 두껍지 않게)
                 color = (40, 40, 40)
                 
-                result_img = self._draw_text_on_image(result_img, field_value, box_coords, 'ko', color, adjusted_font_size, align)
+                result_img = self._draw_text_on_image(result_img, field_value, box_coords, 'ko', color, adjusted_font_size, align,
+                                                      field_name=field_name)
         
         return result_img
 
@@ -442,59 +521,41 @@ class GACertificateTemplate(BaseTemplate):
 class JUCertificateTemplate(BaseTemplate):
     """주민등록등본 템플릿 클래스"""
     
-    def __init__(self, template_path: str, layout_path: str, field_def_path: str, max_members: int = None, mask_jumin: bool = True):
-        super().__init__(template_path, layout_path, field_def_path)
+    def __init__(self, template_path: str, layout_path: str, field_def_path: str, max_members: int = None, mask_jumin: bool = True,
+                 color_mode: str = "BGR"):
+        super().__init__(template_path, layout_path, field_def_path, color_mode)
+        
+        # 세대원 필드별 번호 (MEMBER10_NAME -> 10)
+        self.member_groups = self._group_numbers('MEMBER')
         
         # 세대원 수 계산
         self.max_members_from_template = self._calculate_members_count()
         
         # 최대 세대원 수 설정 (외부에서 제한 가능)
-        if max_members is not None:
-            self.members_count = min(max_members, self.max_members_from_template)
-        else:
-            self.members_count = self.max_members_from_template
+        self.limit_members(max_members)
         
         # 주민번호 마스킹 여부 설정
         self.mask_jumin = mask_jumin
         
+    def limit_members(self, max_members: int = None):
+        """그릴 세대원 수를 제한합니다. (None이면 템플릿 최대, 템플릿을 다시 만들지 않고 변경 가능)"""
+        limit = self.max_members_from_template
+        self.members_count = limit if max_members is None else min(max_members, limit)
+    
     def _calculate_members_count(self) -> int:
         """템플릿에서 세대원 필드 수를 계산합니다."""
-        import re
-        members_count = 0
-        for field_name in self.field_boxes.keys():
-            if field_name.startswith('MEMBER') and field_name.endswith('_NAME'):
-                # MEMBER1_NAME -> 1, MEMBER10_NAME -> 10
-                match = re.match(r'MEMBER(\d+)_NAME$', field_name)
-                if match:
-                    member_num = int(match.group(1))
-                members_count = max(members_count, member_num)
-        return members_count
+        return max((num for name, num in self.member_groups.items() if name.endswith('_NAME')), default=0)
     
     def render(self, data: Dict[str, str]) -> np.ndarray:
         """주민등록등본 특화 렌더링 (실제 주민등록등본 형식에 맞게 개선)"""
-        # 세대원 수에 맞는 데이터만 필터링
-        filtered_data = {}
-        
-        for field_name, field_value in data.items():
-            if field_name.startswith('MEMBER'):
-                # MEMBER1_NAME -> 1, MEMBER10_NAME -> 10
-                import re
-                match = re.match(r'MEMBER(\d+)', field_name)
-                if match:
-                    member_num = int(match.group(1))
-                if member_num <= self.members_count:
-                    filtered_data[field_name] = field_value
-            else:
-                filtered_data[field_name] = field_value
-        
         # 기본 폰트 크기
         base_font_size = 16
         
         # 템플릿 이미지 복사
-        result_img = self.template_img.copy()
+        result_img = self._new_canvas()
         
-        # 각 필드에 텍스트 렌더링 (주민등록등본 특화)
-        for field_name, field_value in filtered_data.items():
+        # 각 필드에 텍스트 렌더링 (주민등록등본 특화) - 세대원 수에 맞는 필드만
+        for field_name, field_value in self._iter_render_items(data, self.member_groups, self.members_count):
             if field_name in self.field_boxes:
 
                 
@@ -651,18 +712,22 @@ class JUCertificateTemplate(BaseTemplate):
                 
                 # APPLICANT와 APPLICANT_BIRTH 필드는 블러 없이 선명하게
                 if field_name in ['APPLICANT', 'APPLICANT_BIRTH']:
-                    result_img = self._draw_text_on_image_no_blur(result_img, field_value, box_coords, 'ko', color, adjusted_font_size, align, letter_spacing)
+                    result_img = self._draw_text_on_image_no_blur(result_img, field_value, box_coords, 'ko', color, adjusted_font_size, align, letter_spacing, field_name)
                 elif field_name in ['ISSUER_TOP', 'ISSUER_BOTTOM']:
                     # 발급기관도 블러 없이 선명하게
-                    result_img = self._draw_text_on_image_no_blur(result_img, field_value, box_coords, 'ko', color, adjusted_font_size, align, letter_spacing)
+                    result_img = self._draw_text_on_image_no_blur(result_img, field_value, box_coords, 'ko', color, adjusted_font_size, align, letter_spacing, field_name)
                 else:
-                    result_img = self._draw_text_on_image(result_img, field_value, box_coords, 'ko', color, adjusted_font_size, align, letter_spacing)
+                    result_img = self._draw_text_on_image(result_img, field_value, box_coords, 'ko', color, adjusted_font_size, align, letter_spacing, field_name)
         
         return result_img
 
 
-def create_template(doc_type: str, template_name: str, max_members: int = None, mask_jumin: bool = True) -> BaseTemplate:
-    """문서 타입에 따라 적절한 템플릿 객체를 생성합니다."""
+def create_template(doc_type: str, template_name: str, max_members: int = None, mask_jumin: bool = True,
+                    color_mode: str = "BGR") -> BaseTemplate:
+    """문서 타입에 따라 적절한 템플릿 객체를 생성합니다.
+    
+    color_mode="GRAY"이면 템플릿을 1채널로 로드하고 텍스트도 'L' 모드로 그립니다.
+    """
     
     # 템플릿 경로 구성
     template_path = f"assets/templates/{doc_type}/{template_name}.jpg"
@@ -679,9 +744,9 @@ def create_template(doc_type: str, template_name: str, max_members: int = None,
     
     # 문서 타입에 따라 템플릿 생성
     if doc_type == "GA":
-        return GACertificateTemplate(template_path, layout_path, field_def_path)
+        return GACertificateTemplate(template_path, layout_path, field_def_path, color_mode)
     elif doc_type == "JU":
-        return JUCertificateTemplate(template_path, layout_path, field_def_path, max_members, mask_jumin)
+        return JUCertificateTemplate(template_path, layout_path, field_def_path, max_members, mask_jumin, color_mode)
     else:
         raise ValueError(f"지원하지 않는 문서 타입입니다: {doc_type}")
 
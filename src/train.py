@@ -6,11 +6,13 @@ train.py   (최초 작성: 2025-08-01 16:08:32 KST)
 • dataset/train · val 하위 폴더를 읽어 EfficientNet-B0 8-class 분류 학습
 • class_weights.json → 불균형 보정
 • AMP + CosineWarmup 스케줄러 적용
+• --grayscale : 1채널 흑백 입력 (GRAY 모드 데이터셋, in_chans=1)
 """
 
 import json, math, time, argparse, pathlib, torch, timm, torch.nn as nn
 from torch.utils.data import DataLoader, WeightedRandomSampler
 from torchvision import datasets, transforms
+from PIL import Image
 from torch.cuda.amp import autocast, GradScaler
 from torch.optim.lr_scheduler import CosineAnnealingLR
 from sklearn.metrics import confusion_matrix, classification_report
@@ -25,22 +27,32 @@ def parse_args():
     p.add_argument("--wd",       type=float, default=1e-2)
     p.add_argument("--weights",  type=str, default="class_weights.json")
     p.add_argument("--ckpt",     type=str, default="best_b0.pt")
+    p.add_argument("--grayscale", action="store_true", help="1채널 흑백 입력으로 학습")
     return p.parse_args()
 
 # --------- 데이터 변환 ---------
-train_tf = transforms.Compose([
-    transforms.Resize((224,224)),
-    transforms.RandomRotation(10, fill=255),
-    transforms.ColorJitter(0.2,0.2,0,0),
-    transforms.GaussianBlur(3),
-    transforms.ToTensor(),
-    transforms.Normalize([0.5]*3, [0.5]*3)
-])
-val_tf = transforms.Compose([
-    transforms.Resize((224,224)),
-    transforms.ToTensor(),
-    transforms.Normalize([0.5]*3, [0.5]*3)
-])
+def gray_loader(path):
+    """흑백 이미지를 RGB 확장 없이 'L' 모드로 로드 (워커 pickle 가능하도록 모듈 함수)"""
+    with open(path, "rb") as f:
+        return Image.open(f).convert("L")
+
+def build_transforms(grayscale=False):
+    """(train_tf, val_tf) 반환. grayscale이면 1채널 정규화"""
+    ch = 1 if grayscale else 3
+    train_tf = transforms.Compose([
+        transforms.Resize((224,224)),
+        transforms.RandomRotation(10, fill=255),
+        transforms.ColorJitter(0.2,0.2,0,0),
+        transforms.GaussianBlur(3),
+        transforms.ToTensor(),
+        transforms.Normalize([0.5]*ch, [0.5]*ch)
+    ])
+    val_tf = transforms.Compose([
+        transforms.Resize((224,224)),
+        transforms.ToTensor(),
+        transforms.Normalize([0.5]*ch, [0.5]*ch)
+    ])
+    return train_tf, val_tf
 
 # --------- 메인 ---------
 def main():
@@ -48,8 +60,10 @@ def main():
     root = pathlib.Path(args.data_dir)
 
 # ---------- ① 데이터셋 & 샘플러 ----------  # 2025-08-01 18:07 KST
-    train_ds = datasets.ImageFolder(root/"train", transform=train_tf)
-    val_ds   = datasets.ImageFolder(root/"val",   transform=val_tf)
+    train_tf, val_tf = build_transforms(args.grayscale)
+    loader_kw = {"loader": gray_loader} if args.grayscale else {}
+    train_ds = datasets.ImageFolder(root/"train", transform=train_tf, **loader_kw)
+    val_ds   = datasets.ImageFolder(root/"val",   transform=val_tf,   **loader_kw)
 
     # 클래스 가중치 로드 (2025-08-01 21:15 KST - 이중 보정 제거)
     weights_dict = json.load(open(args.weights))
@@ -64,7 +78,9 @@ def main():
                               shuffle=False, num_workers=4, pin_memory=True)
 
     # ── 모델 & 옵티마이저 ───────────────────────────────────────────────
-    model = timm.create_model("efficientnet_b0", pretrained=True)
+    # 흑백 입력이면 timm이 첫 conv 가중치를 1채널로 합산해 줌
+    model = timm.create_model("efficientnet_b0", pretrained=True,
+                              in_chans=1 if args.grayscale else 3)
     model.classifier = nn.Sequential(
         nn.Dropout(0.3), nn.Linear(model.classifier.in_features, 8)
     )
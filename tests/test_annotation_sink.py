@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append('src')
+
+import cv2
+import numpy as np
+from data_factory import create_record
+from templates_juga import create_template
+from annotation_sink import AnnotationSink, rotate_bbox, load_annotation_index
+
+ROTATE_CODES = {
+    90: cv2.ROTATE_90_CLOCKWISE,
+    -90: cv2.ROTATE_90_COUNTERCLOCKWISE,
+    180: cv2.ROTATE_180,
+}
+
+def test_rotate_bbox_matches_cv2():
+    """rotate_bbox가 cv2.rotate와 같은 픽셀 영역을 가리키는지 확인합니다."""
+    height, width = 60, 100
+    img = np.zeros((height, width), dtype=np.uint8)
+    bbox = [10, 5, 40, 20]
+    img[bbox[1]:bbox[3], bbox[0]:bbox[2]] = 255
+
+    for angle, code in ROTATE_CODES.items():
+        rotated = cv2.rotate(img, code)
+        x1, y1, x2, y2 = rotate_bbox(bbox, angle, width, height)
+        ys, xs = np.nonzero(rotated)
+        assert [xs.min(), ys.min(), xs.max() + 1, ys.max() + 1] == [x1, y1, x2, y2], f"{angle}도 bbox 불일치"
+        print(f"  ✓ {angle}도: {[x1, y1, x2, y2]}")
+
+def test_render_annotations():
+    """렌더링된 필드 주석이 이미지 안에 있고 샤드로 다시 읽히는지 확인합니다."""
+
+    print("=== 필드 주석 테스트 ===\n")
+
+    output_dir = "outputs/test_annotations"
+    record = create_record("JU", {"members_count": 2})
+    template = create_template("JU", "JU_template1_TY11", max_members=2)
+    img = template.render(record)
+
+    assert template.annotations, "기록된 주석이 없습니다"
+    height, width = img.shape[:2]
+    for ann in template.annotations:
+        x1, y1, x2, y2 = ann["bbox"]
+        assert 0 <= x1 < x2 <= width and 0 <= y1 < y2 <= height
+        assert ann["text"]
+
+    fields = {ann["field"]: ann for ann in template.annotations}
+    print(f"  ✓ {len(fields)}개 필드 주석 (예: MEMBER1_NAME={fields.get('MEMBER1_NAME', {}).get('bbox')})")
+
+    with AnnotationSink(output_dir, prefix="annotations_JU", shard_size=1) as sink:
+        sink.add("JU-1-CLOSE-0-00001.jpg", img.shape, template.annotations)
+        sink.add("JU-1-CLOSE-0-00002.jpg", img.shape, template.annotations)
+    assert len(sink.shards) == 2
+
+    index = load_annotation_index(output_dir)
+    entry = index["JU-1-CLOSE-0-00001.jpg"]
+    assert entry["fields"] == template.annotations
+    print(f"  ✓ 샤드 {len(sink.shards)}개 기록 및 재로드")
+
+    print(f"\n=== 테스트 완료 ===")
+
+if __name__ == "__main__":
+    test_rotate_bbox_matches_cv2()
+    test_render_annotations()
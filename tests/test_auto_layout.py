@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+sys.path.append('src')
+
+import cv2
+import numpy as np
+import yaml
+from table_grid import DETECT_METHODS, detect_grid, detect_lines, merge_lines
+from auto_layout import (expected_fields, load_field_definitions, load_reference_layouts, process_template,
+                         propose_field_boxes, run_batch)
+from layout_variants import read_layouts
+
+# 3행 × 4열 표 (열 경계 x, 행 경계 y)
+COLS = [100, 300, 450, 700, 900]
+ROWS = [200, 260, 320, 380]
+
+def _table_image():
+    img = np.full((800, 1000, 3), 255, dtype=np.uint8)
+    for x in COLS:
+        cv2.line(img, (x, ROWS[0]), (x, ROWS[-1]), (0, 0, 0), 2)
+    for y in ROWS:
+        cv2.line(img, (COLS[0], y), (COLS[-1], y), (0, 0, 0), 2)
+    cv2.putText(img, "NAME", (120, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
+    return img
+
+def test_detect_cells():
+    """합성 표에서 격자선이 중복 없이 합쳐지고 셀이 읽기 순서로 나오는지 확인합니다. (검출 방식별)"""
+    for method in DETECT_METHODS:
+        _check_grid(detect_grid(_table_image(), method))
+        print(f"    ({method})")
+
+    merged = merge_lines([('horizontal', 100, 0, 50), ('horizontal', 102, 55, 120), ('horizontal', 101, 300, 400)])
+    assert merged == [('horizontal', 101, 0, 120), ('horizontal', 101, 300, 400)], merged
+    print("  ✓ 조각 선분 병합")
+
+def test_profile_lines():
+    """투영 프로파일 검출이 이중선·끊긴 선은 합치고 글자는 선으로 보지 않는지 확인합니다."""
+    img = np.full((600, 800, 3), 255, dtype=np.uint8)
+    cv2.line(img, (50, 100), (750, 100), (0, 0, 0), 2)
+    cv2.line(img, (50, 103), (750, 103), (0, 0, 0), 1)        # 이중선
+    cv2.line(img, (50, 300), (380, 300), (0, 0, 0), 2)
+    cv2.line(img, (386, 300), (750, 300), (0, 0, 0), 2)       # 6px 끊김
+    cv2.line(img, (400, 50), (400, 550), (60, 60, 60), 3)     # 회색 굵은 세로선
+    cv2.putText(img, "HORIZONTAL TEXT", (60, 200), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+
+    lines = detect_lines(img)
+    horizontal = [l for l in lines if l[0] == 'horizontal']
+    vertical = [l for l in lines if l[0] == 'vertical']
+    assert len(horizontal) == 2, horizontal
+    assert abs(horizontal[0][1] - 101) <= 2 and abs(horizontal[0][2] - 50) <= 2 and abs(horizontal[0][3] - 750) <= 2
+    assert abs(horizontal[1][1] - 300) <= 1 and horizontal[1][3] - horizontal[1][2] >= 690
+    assert len(vertical) == 1 and abs(vertical[0][1] - 400) <= 1, vertical
+    print(f"  ✓ 투영 프로파일 선 {len(lines)}개 (이중선·끊김 병합, 글자 제외)")
+
+def _check_grid(grid):
+    horizontal = sorted(pos for kind, pos, _, _ in grid["lines"] if kind == 'horizontal')
+    vertical = sorted(pos for kind, pos, _, _ in grid["lines"] if kind == 'vertical')
+    assert len(horizontal) == len(ROWS) and len(vertical) == len(COLS), grid["lines"]
+    assert all(abs(a - b) <= 2 for a, b in zip(horizontal, ROWS))
+    assert all(abs(a - b) <= 2 for a, b in zip(vertical, COLS))
+
+    cells = grid["cells"]
+    assert len(cells) == 12, cells
+    for i, cell in enumerate(cells):
+        row, col = divmod(i, 4)
+        assert abs(cell[0] - COLS[col]) <= 3 and abs(cell[2] - COLS[col + 1]) <= 3, (i, cell)
+        assert abs(cell[1] - ROWS[row]) <= 3 and abs(cell[3] - ROWS[row + 1]) <= 3, (i, cell)
+    print(f"  ✓ 선 {len(grid['lines'])}개 (조각 {grid['segments']}개 병합), 셀 {len(cells)}개")
+
+def test_propose_and_write():
+    """참조 레이아웃 박스가 검출 셀로 맞춰지고 필드 정의 순서로 기록되는지 확인합니다."""
+    cells = detect_grid(_table_image())["cells"]
+    reference = {"B": [455, 265, 695, 315], "A": [105, 205, 295, 255], "OUTSIDE": [10, 10, 60, 40]}
+    boxes, info = propose_field_boxes(cells, ["A", "B", "C"], reference)
+    assert list(boxes) == ["A", "B", "OUTSIDE"]
+    assert boxes["A"] == cells[0] and boxes["B"] == cells[6]
+    assert boxes["OUTSIDE"] == reference["OUTSIDE"] and info["unmatched"] == ["OUTSIDE"]
+
+    boxes, info = propose_field_boxes(cells, ["A", "B", "C"])
+    assert boxes == {"A": cells[0], "B": cells[1], "C": cells[2]} and info["method"] == "reading_order"
+    print("  ✓ 참조 매칭 / 읽기 순서 배정")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        image_path = os.path.join(tmp, "XX_template9_v0.jpg")
+        cv2.imwrite(image_path, _table_image())
+        definition = {"doc_type": "TEST", "fields": ["A", "B"]}
+        result = process_template(image_path, definition, {"XX_template9_v1": reference}, tmp)
+        with open(result["output"], encoding="utf-8") as f:
+            layout = yaml.safe_load(f)
+        assert list(layout["field_boxes"])[:2] == ["A", "B"]
+        assert layout["meta"]["auto_layout"]["reference"] == "XX_template9_v1"
+        assert result["matched"] == 2
+    print("  ✓ 후보 레이아웃 YAML 기록")
+
+def test_variant_fields():
+    """GA 후보의 필드 목록이 참조가 아니라 템플릿 자신의 자녀 수를 따르고, JU는 복사본을 쓰지 않고 건너뛰는지 확인합니다."""
+    definitions = load_field_definitions()
+    layouts = read_layouts("configs")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ["GA_template1_child0", "GA_template1_child3"]:
+            result = process_template(f"assets/templates/GA/{name}.jpg", definitions["GA"],
+                                      load_reference_layouts("GA"), tmp)
+            with open(result["output"], encoding="utf-8") as f:
+                fields = list(yaml.safe_load(f)["field_boxes"])
+            assert sorted(fields) == sorted(layouts[name]["field_boxes"]), (name, fields)
+            assert fields == expected_fields(name, definitions["GA"]["fields"])
+            assert not result["comparison"]["missing"] and not result["comparison"]["extra"]
+        # child3은 CHILD3_* 박스를 CHILD1·CHILD2 간격으로 추정해 셀에 맞춤
+        assert result["estimated"] == 6 and result["agreement"] > 0.8
+        print(f"  ✓ GA child0 {len(expected_fields('GA_template1_child0', definitions['GA']['fields']))}개 / "
+              f"child3 {len(fields)}개 필드 (CHILD3 추정 {result['estimated']}개)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run_batch(["assets/templates/JU/JU_template1_TY00.jpg"], tmp, workers=1)
+        assert results == [] and os.listdir(tmp) == []
+        print("  ✓ JU 템플릿 건너뜀 (후보 레이아웃 기록 없음)")
+
+if __name__ == "__main__":
+    test_detect_cells()
+    test_profile_lines()
+    test_propose_and_write()
+    test_variant_fields()
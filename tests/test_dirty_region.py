@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+sys.path.append('src')
+
+import numpy as np
+from PIL import ImageFont
+from data_factory import create_record
+from templates_juga import create_template
+from dirty_region import DirtyRegionRenderer, summarize_traffic
+from rng_context import RNGContext
+
+def _default_font():
+    """PIL 기본 TrueType 폰트 (KoPub 폰트가 없어도 PIL 경로를 검사)"""
+    font_path = os.path.join(tempfile.gettempdir(), "pil_default_font.ttf")
+    with open(font_path, "wb") as f:
+        f.write(ImageFont.load_default(20).font_bytes)
+    return ImageFont.truetype(font_path, 20)
+
+def test_dirty_region_matches_render():
+    """영역 단위 렌더링이 문서가 바뀌어도 render와 같은 픽셀을 만드는지 확인합니다."""
+    cases = [("JU", "JU_template1_TY11", {"max_members": 5}, "members_count"),
+             ("GA", "GA_template1_child3", {}, "children_count")]
+    for doc_type, name, kwargs, count_key in cases:
+        for color_mode in ("BGR", "GRAY"):
+            for use_font in (False, True):
+                template = create_template(doc_type, name, color_mode=color_mode, **kwargs)
+                if use_font:
+                    template.fonts['ko'] = _default_font()
+                renderer = DirtyRegionRenderer(template)
+                for i in range(4):
+                    # 세대원/자녀 수를 바꿔 가며 이전 문서 영역이 남지 않는지 확인
+                    record = create_record(doc_type, {count_key: 3 - i % 3}, rng=RNGContext(5).child(i))
+                    expected = template.render(record)
+                    result = renderer.render(record)
+                    assert np.array_equal(result, expected), f"{doc_type}/{color_mode}/{use_font}: {i}번째 문서 픽셀 불일치"
+                summary = renderer.traffic_summary()
+                assert summary["ratio"] < 0.2, summary
+                print(f"  ✓ {doc_type} {color_mode} 폰트={use_font}: 문서당 복원 "
+                      f"{summary['avg_restored_kb']:.0f}KB / 페이지 {summary['page_kb']:.0f}KB")
+
+def test_limit_members_reuses_renderer():
+    """배치 생성기처럼 템플릿 하나의 세대원 수만 바꿔 가며 렌더링해도 세대원 수별 새 템플릿과 픽셀이 같은지 확인합니다."""
+    template = create_template("JU", "JU_template1_TY00", mask_jumin=False)
+    renderer = DirtyRegionRenderer(template)
+    for i, members_count in enumerate([5, 1, 3, 2, 5]):
+        record = create_record("JU", {"members_count": members_count, "jumin_disclosure": "OPEN"}, rng=RNGContext(9).child(i))
+        expected = create_template("JU", "JU_template1_TY00", max_members=members_count, mask_jumin=False).render(record)
+        template.limit_members(members_count)
+        assert np.array_equal(renderer.render(record), expected), f"세대원 {members_count}명: 픽셀 불일치"
+
+    summary = summarize_traffic([renderer.stats, renderer.stats])
+    assert summary["renderers"] == 2 and summary["documents"] == 10
+    assert abs(summary["ratio"] - renderer.traffic_summary()["ratio"]) < 1e-9
+    print(f"  ✓ 세대원 수 변경 재사용: 문서당 복원 {summary['ratio']:.1%}")
+
+if __name__ == "__main__":
+    test_dirty_region_matches_render()
+    test_limit_members_reuses_renderer()
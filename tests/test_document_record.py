@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+sys.path.append('src')
+
+import numpy as np
+from data_factory import create_document_record
+from templates_juga import create_template
+from rng_context import RNGContext
+
+def test_record_flat_dict():
+    """DocumentRecord 평탄화 결과가 기존 키 형식과 같은지 확인합니다."""
+    record = create_document_record("JU", {"members_count": 3})
+    flat = record.to_flat_dict()
+
+    assert flat["MEMBER1_NUMBER"] == "1" and flat["MEMBER1_RELATION"] == "본인"
+    assert flat["MEMBER3_JUMIN"] == record.person("MEMBER3").jumin
+    assert "MEMBER4_NAME" not in flat
+    assert not hasattr(record.person("MEMBER1"), "__dict__"), "Person은 __slots__ 객체여야 합니다"
+
+    ga = create_document_record("GA", {"children_count": 0}).to_flat_dict()
+    assert list(ga)[0] == "MAIN_RELATION" and "SPOUSE_NAME" not in ga and "MAIN_NUMBER" not in ga
+    print(f"  ✓ JU {len(flat)}개 키, GA {len(ga)}개 키")
+
+def test_render_record_matches_dict():
+    """템플릿이 DocumentRecord와 평탄화 dict를 똑같이 렌더링하는지 확인합니다."""
+    record = create_document_record("JU", {"members_count": 5}, rng=RNGContext(0))
+
+    template = create_template("JU", "JU_template1_TY11", max_members=2)
+    img_record = template.render(record)
+    annotations = template.annotations
+    img_dict = template.render(record.to_flat_dict())
+
+    assert np.array_equal(img_record, img_dict)
+    assert annotations == template.annotations
+    assert not any(a["field"].startswith("MEMBER3") for a in annotations), "세대원 수 제한이 적용되지 않았습니다"
+    print(f"  ✓ 레코드/dict 렌더링 동일 ({len(annotations)}개 필드)")
+
+if __name__ == "__main__":
+    test_record_flat_dict()
+    test_render_record_matches_dict()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+sys.path.append('src')
+
+from file_transfer import TransferEngine, copy_file, is_transferred
+
+def _make_files(root, count=20, size=50_000):
+    os.makedirs(root, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = os.path.join(root, f"JU-1-OPEN-0-{i:05d}.jpg")
+        with open(path, "wb") as f:
+            f.write(os.urandom(size + i))
+        paths.append(path)
+    return paths
+
+def _jobs(paths, dst_root):
+    return [(path, os.path.join(dst_root, "train" if i % 3 else "val", "JU-0", os.path.basename(path)))
+            for i, path in enumerate(paths)]
+
+def test_copy_and_resume():
+    """병렬 복사 결과가 원본과 같고(mtime 포함) 다시 실행하면 모두 건너뛰는지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = _jobs(_make_files(os.path.join(tmp, "src")), os.path.join(tmp, "dst"))
+        engine = TransferEngine(threads=4, progress_interval=0)
+        stats = engine.run(jobs)
+        assert stats["copied"] == len(jobs) and not stats["failed"] and stats["dirs"] == 2
+        for src, dst in jobs:
+            with open(src, "rb") as a, open(dst, "rb") as b:
+                assert a.read() == b.read()
+            assert is_transferred(src, dst) and not os.path.exists(dst + ".part")
+
+        # 일부만 남기고 지운 뒤 다시 실행 → 지운 파일만 복사
+        os.remove(jobs[0][1])
+        with open(jobs[1][1], "wb") as f:
+            f.write(b"partial")
+        stats = engine.run(jobs)
+        assert stats["copied"] == 2 and stats["skipped"] == len(jobs) - 2
+        print(f"  ✓ 복사 {len(jobs)}개, 이어 하기 시 {stats['skipped']}개 건너뜀")
+
+def test_move_and_dry_run():
+    """dry-run은 아무것도 기록하지 않고, 이동은 원본을 남기지 않으며 대상이 겹치면 마지막 원본만 처리하는지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _make_files(os.path.join(tmp, "src"), count=10)
+        dst_root = os.path.join(tmp, "dst")
+        jobs = _jobs(paths, dst_root)
+
+        stats = TransferEngine(dry_run=True, progress_interval=0).run(jobs, move=True)
+        assert stats["planned"] == len(jobs) and stats["bytes"] == sum(os.path.getsize(p) for p in paths)
+        assert not os.path.exists(dst_root) and all(os.path.exists(p) for p in paths)
+
+        extra = _make_files(os.path.join(tmp, "rot"), count=1, size=123)[0]
+        duplicate = (extra, jobs[0][1])   # 다른 원본이 같은 대상으로
+        stats = TransferEngine(threads=3, progress_interval=0).run(jobs + [duplicate], move=True)
+        assert stats["moved"] == len(jobs) and stats["duplicates"] == 1
+        assert not os.path.exists(extra) and os.path.exists(paths[0]) and os.path.getsize(jobs[0][1]) == 123
+
+        # 이동 후 다시 실행 → 원본이 없고 대상이 있으면 완료로 봄
+        assert TransferEngine(progress_interval=0).run(jobs[1:], move=True)["skipped"] == len(jobs) - 1
+        print(f"  ✓ dry-run 무기록, 이동 {stats['moved']}개, 대상 중복 {stats['duplicates']}개 제외")
+
+def test_empty_file():
+    """빈 파일도 복사되는지 확인합니다. (커널 복사 경로를 타지 않음)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, "a.jpg"), os.path.join(tmp, "b.jpg")
+        open(src, "wb").close()
+        assert copy_file(src, dst) == 0 and os.path.getsize(dst) == 0
+        print("  ✓ 빈 파일 복사")
+
+if __name__ == "__main__":
+    test_copy_and_resume()
+    test_move_and_dry_run()
+    test_empty_file()
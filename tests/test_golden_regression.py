@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+sys.path.append('src')
+
+import cv2
+import numpy as np
+import pytest
+from PIL import ImageFont
+from golden_regression import GOLDEN_DIR, GOLDEN_FONT, font_fingerprint, golden_cases, golden_text, load_index, run_suite
+
+def test_goldens():
+    """전체 템플릿 조합의 렌더링이 저장된 골든과 같은지 확인합니다. (폰트 지문이 다르면 건너뜀)"""
+    recorded = load_index().get("fingerprint")
+    if recorded != font_fingerprint():
+        pytest.skip(f"폰트 지문이 골든과 다릅니다 ({GOLDEN_DIR}/index.json: {recorded} ↔ {font_fingerprint()})")
+    summary = run_suite()
+    failed = [(r["id"], r["reason"]) for r in summary["failed"]]
+    assert not failed and not summary["missing"], (failed, [r["id"] for r in summary["missing"]])
+    print(f"  ✓ 골든 {summary['passed']}개 일치 ({summary['sec']:.1f}초)")
+
+def test_shift_detected():
+    """글자가 1px 밀리면 실패로 잡히고 차이 이미지가 기록되는지 확인합니다."""
+    template = ["assets/templates/GA/GA_template1_child1.jpg"]
+    with tempfile.TemporaryDirectory() as tmp:
+        golden_dir, diff_dir = os.path.join(tmp, "goldens"), os.path.join(tmp, "diff")
+        summary = run_suite(template, golden_dir, diff_dir, update=True, workers=1)
+        assert summary["passed"] == len(golden_cases(template)) == 2
+        assert set(load_index(golden_dir)["cases"]) == {r["id"] for r in summary["results"]}
+
+        # 케이스 하나의 골든을 1px 밀어 렌더러가 글자를 옮긴 것처럼 만듦
+        shifted = os.path.join(golden_dir, "GA_template1_child1-OPEN-1.png")
+        cv2.imwrite(shifted, np.roll(cv2.imread(shifted, cv2.IMREAD_GRAYSCALE), 1, axis=1))
+        summary = run_suite(template, golden_dir, diff_dir, workers=1)
+        assert [r["id"] for r in summary["failed"]] == ["GA_template1_child1-OPEN-1"] and summary["passed"] == 1
+        assert os.path.exists(summary["failed"][0]["diff"])
+        print(f"  ✓ 1px 밀림 검출 ({summary['failed'][0]['reason']}), 차이 이미지 기록")
+
+def test_golden_font():
+    """골든은 저장소의 폰트(FreeType 경로)로 렌더링되고, 골든 레코드의 글자가 .notdef가 아닌 실제 글리프인지 확인합니다."""
+    assert all(load_index()["fingerprint"]["fonts"].values())
+    font = ImageFont.truetype(GOLDEN_FONT, 20)
+    notdef = bytes(font.getmask("\ue000"))  # 사용자 정의 영역 - 서브셋에 없는 글자
+    text = golden_text(["assets/templates/GA/GA_template1_child1.jpg", "assets/templates/JU/JU_template1_TY00.jpg"],
+                       workers=1).replace(" ", "")
+    missing = [char for char in text if bytes(font.getmask(char)) == notdef]
+    assert text and not missing, missing
+    print(f"  ✓ 골든 폰트 {load_index()['fingerprint']['fonts']} (글자 {len(text)}개 모두 글리프 있음)")
+
+if __name__ == "__main__":
+    try:
+        test_goldens()
+    except pytest.skip.Exception as e:
+        print(f"  ⚠️ 건너뜀: {e}")
+    test_shift_detected()
+    test_golden_font()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append('src')
+
+from data_factory import create_record
+from templates_juga import create_template
+import cv2
+
+def test_grayscale_render():
+    """GRAY 모드가 1채널로 렌더링·저장되는지 테스트합니다."""
+
+    print("=== GRAY 단일 채널 렌더링 테스트 ===\n")
+
+    output_dir = "outputs/test_grayscale"
+    os.makedirs(output_dir, exist_ok=True)
+
+    record = create_record("JU", {"members_count": 3})
+
+    for color_mode in ["BGR", "GRAY"]:
+        template = create_template("JU", "JU_template1_TY11", max_members=3, color_mode=color_mode)
+        img = template.render(record)
+
+        expected_ndim = 2 if color_mode == "GRAY" else 3
+        assert img.ndim == expected_ndim, f"{color_mode}: 채널 수 오류 {img.shape}"
+
+        filepath = os.path.join(output_dir, f"JU_{color_mode}.jpg")
+        cv2.imwrite(filepath, img)
+
+        # 저장된 JPEG도 흑백으로 다시 읽히는지 확인
+        reloaded = cv2.imread(filepath, cv2.IMREAD_UNCHANGED)
+        assert reloaded.ndim == expected_ndim
+
+        print(f"  ✓ {color_mode}: shape={img.shape}, 파일 크기={os.path.getsize(filepath)} bytes")
+
+    print(f"\n=== 테스트 완료 ===")
+
+def test_invalid_color_mode():
+    """지원하지 않는 색상 모드는 ValueError"""
+    try:
+        create_template("GA", "GA_template1_child0", color_mode="RGBA")
+    except ValueError as e:
+        print(f"  ✓ 예상된 오류: {e}")
+    else:
+        raise AssertionError("RGBA 모드가 거부되지 않았습니다")
+
+if __name__ == "__main__":
+    test_grayscale_render()
+    test_invalid_color_mode()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append('src')
+
+import cv2
+from image_codec import ImageCodec, CODEC_PRESETS, read_image
+
+def test_codec_presets():
+    """프리셋별 인코딩 결과와 통계를 확인합니다."""
+
+    print("=== 코덱 프리셋 테스트 ===\n")
+
+    output_dir = "outputs/test_codec"
+    os.makedirs(output_dir, exist_ok=True)
+
+    img = cv2.imread("assets/templates/GA/GA_template1_child0.jpg")
+
+    for preset in CODEC_PRESETS:
+        codec = ImageCodec(preset)
+        filepath = codec.write(os.path.join(output_dir, f"GA-1-CLOSE-0-{preset}.jpg"), img)
+
+        # 확장자가 코덱 포맷에 맞게 바뀌었는지 확인
+        assert filepath.endswith(codec.extension)
+
+        reloaded = read_image(filepath)
+        assert reloaded is not None and reloaded.shape == img.shape
+
+        # 무손실 포맷은 픽셀 단위로 동일해야 함
+        if codec.format in ("png", "npy"):
+            assert (reloaded == img).all(), f"{preset}: 무손실 포맷인데 픽셀이 다릅니다"
+
+        summary = codec.summary()
+        assert summary["count"] == 1 and summary["avg_kb"] > 0
+        print(f"  ✓ {codec.format_summary()}")
+
+    print(f"\n=== 테스트 완료 ===")
+
+def test_codec_overrides():
+    """프리셋 값 덮어쓰기와 잘못된 프리셋 처리"""
+    codec = ImageCodec("training", quality=70, subsampling="444")
+    assert codec.options["quality"] == 70
+
+    try:
+        ImageCodec("unknown")
+    except ValueError as e:
+        print(f"  ✓ 예상된 오류: {e}")
+    else:
+        raise AssertionError("알 수 없는 프리셋이 거부되지 않았습니다")
+
+if __name__ == "__main__":
+    test_codec_presets()
+    test_codec_overrides()
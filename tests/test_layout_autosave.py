@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import builtins
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+sys.path.append('src')
+
+import yaml
+from extract_layout import LayoutExtractor
+from layout_overlay import FieldBoxes
+from layout_autosave import LayoutAutosaver
+
+def _edit(boxes, saver, i):
+    boxes[f"F{i % 7}"] = [i, i, i + 10, i + 10]
+    if i % 5 == 4:
+        del boxes[f"F{i % 7}"]
+    saver.sync(boxes)
+
+def test_debounce_and_recovery():
+    """편집이 debounce로 묶여 기록되고, 스냅샷 없이 종료해도 저널 재생으로 복구되는지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        boxes = FieldBoxes(BASE=[1, 2, 3, 4])
+        saver = LayoutAutosaver("GA_test.jpg", ["F0", "BASE"], autosave_dir=tmp, debounce_ms=50, compact_every=1000)
+        saver.start(boxes)
+
+        start = time.perf_counter()
+        for i in range(40):
+            _edit(boxes, saver, i)
+        ui_ms = (time.perf_counter() - start) * 1000
+        assert saver.flush()
+        assert saver.stats["snapshots"] == 1 and saver.stats["flushes"] <= 3, saver.stats
+        print(f"  ✓ 편집 {saver.stats['edits']}건 → 저널 기록 {saver.stats['flushes']}회 (UI 스레드 {ui_ms:.1f}ms)")
+
+        # 스냅샷 없이 종료 (비정상 종료와 같은 상태)
+        saver.close(compact=False)
+        with open(saver.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "set", "name": "BROKEN", "bo')   # 기록 도중 끊긴 마지막 줄
+        recovered = LayoutAutosaver("GA_test.jpg", autosave_dir=tmp).recover()
+        assert recovered == dict(boxes), (recovered, dict(boxes))
+        print(f"  ✓ 스냅샷 + 저널 재생 복구 ({len(recovered)}개 필드)")
+
+def test_compaction():
+    """저널이 길어지면 스냅샷으로 압축되고 스냅샷은 필드 정의 순서의 레이아웃 YAML인지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        boxes = FieldBoxes()
+        saver = LayoutAutosaver("JU_test.jpg", ["F3", "F1"], doc_type="TEST", autosave_dir=tmp,
+                                debounce_ms=0, compact_every=10)
+        saver.start(boxes)
+        for i in range(30):
+            _edit(boxes, saver, i)
+            saver.flush()
+        assert saver.stats["snapshots"] >= 3, saver.stats
+        saver.close()
+        assert not os.path.exists(saver.journal_path)
+
+        with open(saver.snapshot_path, encoding="utf-8") as f:
+            layout = yaml.safe_load(f)
+        assert layout["field_boxes"] == dict(boxes)
+        defined = [name for name in ["F3", "F1"] if name in boxes]
+        assert list(layout["field_boxes"])[:len(defined)] == defined and layout["meta"]["auto_save"] is True
+        assert saver.recover() == dict(boxes)
+
+        saver.discard()
+        assert not saver.has_recovery() and os.listdir(tmp) == []
+        print(f"  ✓ 스냅샷 압축 {saver.stats['snapshots']}회, 정상 종료 후 정리")
+
+def test_exit_without_save_keeps_autosave():
+    """Ctrl+Q(저장 없이 종료)는 자동 저장을 지우지 않고, 다음 시작 때 복원(y)·폐기(n)를 고를 수 있는지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        boxes = FieldBoxes(BASE=[1, 2, 3, 4])
+        saver = LayoutAutosaver("GA_test.jpg", ["BASE"], autosave_dir=tmp, debounce_ms=0)
+        saver.start(boxes)
+        boxes["NEW"] = [5, 6, 7, 8]
+        saver.sync(boxes)
+        app = SimpleNamespace(autosaver=saver, exit_without_save=True)
+        LayoutExtractor._finish_session(app)
+        assert saver.recover() == {"BASE": [1, 2, 3, 4], "NEW": [5, 6, 7, 8]}
+
+        original_input = builtins.input
+        try:
+            for answer, expected in [("y", dict(boxes)), ("n", {"BASE": [1, 2, 3, 4]})]:
+                builtins.input = lambda prompt: answer
+                app = SimpleNamespace(autosaver=saver, layouts={"field_boxes": FieldBoxes(BASE=[1, 2, 3, 4])},
+                                      _show_feedback=lambda *args: None)
+                LayoutExtractor._recover_autosave(app)
+                assert dict(app.layouts["field_boxes"]) == expected, answer
+        finally:
+            builtins.input = original_input
+        assert not saver.has_recovery()
+        print("  ✓ 저장 없이 종료 → 자동 저장 유지, 다음 시작 때 복원/폐기 선택")
+
+if __name__ == "__main__":
+    test_debounce_and_recovery()
+    test_compaction()
+    test_exit_without_save_keeps_autosave()
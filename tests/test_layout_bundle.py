@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import sys
+import tempfile
+sys.path.append('src')
+
+import numpy as np
+import yaml
+import layout_bundle
+from layout_bundle import LayoutBundle, build_bundle, load_bundle, load_layout, validate_layout
+from layout_variants import read_layout
+
+def _write_yaml(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        yaml.dump(data, f, allow_unicode=True, sort_keys=False)
+
+def test_bundle_matches_yaml():
+    """번들에서 읽은 레이아웃·필드 정의가 YAML 파싱 결과와 (필드 순서까지) 같은지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = LayoutBundle(build_bundle("configs", os.path.join(tmp, "layouts.bundle")))
+        assert isinstance(bundle.boxes, np.memmap) and bundle.boxes.dtype == np.int16
+        for name in ["GA_template1_child3", "JU_template3_TY00"]:
+            with open(f"configs/{name}_layout.yaml", encoding="utf-8") as f:
+                expected = yaml.safe_load(f)
+            data = bundle.layout_data(name)
+            assert data == expected and list(data["field_boxes"]) == list(expected["field_boxes"])
+        # 상속 레이아웃은 YAML 해석 결과와 같음
+        assert bundle.layout_data("GA_template1_child2") == read_layout("configs/GA_template1_child2_layout.yaml")
+        with open("configs/field_definitions/ga_fields.yaml", encoding="utf-8") as f:
+            assert bundle.definition(os.path.join("field_definitions", "ga_fields.yaml")) == yaml.safe_load(f)
+        print(f"  ✓ 레이아웃 {len(bundle.layouts)}개, 박스 {len(bundle.boxes)}개 (YAML과 동일)")
+
+def test_auto_rebuild():
+    """원본 YAML이 바뀌거나 추가되면 다음 조회 때 번들이 다시 빌드되는지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        config_dir = os.path.join(tmp, "configs")
+        os.makedirs(os.path.join(config_dir, "field_definitions"))
+        def_path = os.path.join(config_dir, "field_definitions", "xx_fields.yaml")
+        layout_path = os.path.join(config_dir, "XX_template1_v0_layout.yaml")
+        _write_yaml(def_path, {"doc_type": "TEST", "template_folder": "XX", "fields": ["A", "B"]})
+        _write_yaml(layout_path, {"field_boxes": {"B": [5, 5, 20, 20], "A": [30, 5, 60, 20]}, "meta": {"doc_type": "TEST"}})
+
+        layout_bundle.BUNDLE_DIR = os.path.join(tmp, "cache")
+        try:
+            layout_data, field_def = load_layout(layout_path, def_path)
+            assert layout_data["field_boxes"] == {"B": [5, 5, 20, 20], "A": [30, 5, 60, 20]}
+            assert field_def["fields"] == ["A", "B"]
+            first = load_bundle(config_dir)
+            assert load_bundle(config_dir) is first
+
+            _write_yaml(layout_path, {"field_boxes": {"A": [31, 6, 61, 21]}, "meta": {}})
+            os.utime(layout_path, ns=(0, 10 ** 9))  # mtime 해상도가 낮은 파일 시스템에서도 변경이 보이도록
+            _write_yaml(os.path.join(config_dir, "XX_template1_v1_layout.yaml"), {"field_boxes": {"A": [1, 1, 9, 9]}})
+            bundle = load_bundle(config_dir)
+            assert bundle is not first and "XX_template1_v1" in bundle
+            assert load_layout(layout_path, def_path)[0]["field_boxes"] == {"A": [31, 6, 61, 21]}
+        finally:
+            layout_bundle.BUNDLE_DIR = ".cache/layouts"
+        print("  ✓ 원본 변경·추가 시 자동 재빌드")
+
+def test_validate_layout():
+    """누락·정의 외·이미지 밖·뒤집힌·겹치는 박스가 보고되는지 확인합니다."""
+    boxes = {"A": [0, 0, 50, 50], "B": [10, 10, 40, 40], "C": [90, 0, 120, 20], "D": [5, 30, 2, 40], "Z": [60, 60, 70, 70]}
+    issues = validate_layout("XX_t", boxes, ["A", "B", "C", "D", "E"], size=(100, 100))
+    kinds = {(i["kind"], i["field"]) for i in issues}
+    assert ("overlap", "A / B") in kinds and ("out_of_bounds", "C") in kinds and ("inverted", "D") in kinds
+    assert ("undefined", "Z") in kinds and ("missing", "E") in kinds
+    assert not [i for i in issues if i["kind"] == "overlap" and "Z" in i["field"]]
+    print(f"  ✓ 검증 문제 {len(issues)}건 보고")
+
+if __name__ == "__main__":
+    test_bundle_matches_yaml()
+    test_auto_rebuild()
+    test_validate_layout()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+sys.path.append('src')
+
+import cv2
+import numpy as np
+from layout_overlay import FieldBoxes, LayerCompositor
+
+def _reference(img, field_boxes, hide_names=False):
+    """기존 _draw_ui처럼 매 프레임 처음부터 그린 박스·이름표"""
+    out = img.copy()
+    for name, p in field_boxes.items():
+        cv2.rectangle(out, (p[0], p[1]), (p[2], p[3]), (0, 255, 0), 2)
+        if not hide_names:
+            text_size = cv2.getTextSize(name, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+            cv2.rectangle(out, (p[0], p[1] - 25), (p[0] + text_size[0] + 4, p[1] - 5), (0, 0, 0), -1)
+            cv2.putText(out, name, (p[0] + 2, p[1] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+    return out
+
+def test_static_layer_cache():
+    """정적 레이어가 필드 박스·토글이 바뀔 때만 다시 그려지고 기존 그림과 픽셀이 같은지 확인합니다."""
+    img = np.random.default_rng(0).integers(0, 255, (400, 600, 3), dtype=np.uint8)
+    boxes = FieldBoxes({f"F{i}": [20 + i * 50, 60, 60 + i * 50, 90] for i in range(10)})
+    compositor = LayerCompositor(img)
+
+    for _ in range(5):
+        frame = compositor.frame(boxes)
+    assert compositor.stats["static_builds"] == 1
+    assert np.array_equal(frame, _reference(img, boxes))
+
+    # 프레임에 그린 동적 요소가 정적 레이어에 남지 않아야 함
+    cv2.line(frame, (0, 0), (599, 399), (255, 0, 255), 2)
+    assert np.array_equal(compositor.frame(boxes), _reference(img, boxes))
+    print("  ✓ 변경이 없으면 정적 레이어 재사용")
+
+    boxes["NEW"] = [100, 200, 300, 260]
+    del boxes["F0"]
+    boxes["F1"] = [10, 150, 90, 190]
+    frame = compositor.frame(boxes)
+    assert compositor.stats["static_builds"] == 2
+    assert np.array_equal(frame, _reference(img, boxes))
+
+    frame = compositor.frame(boxes, hide_names=True)
+    assert compositor.stats["static_builds"] == 3
+    assert np.array_equal(frame, _reference(img, boxes, hide_names=True))
+    print("  ✓ 박스 추가·삭제·수정, 이름 숨김 시에만 다시 그림")
+
+def test_field_boxes_version():
+    """FieldBoxes의 모든 변경 경로에서 버전이 올라가는지 확인합니다."""
+    boxes = FieldBoxes(A=[0, 0, 1, 1])
+    versions = [boxes.version]
+    boxes["B"] = [1, 1, 2, 2]; versions.append(boxes.version)
+    boxes.pop("A"); versions.append(boxes.version)
+    boxes.pop("missing", None); assert boxes.version == versions[-1]
+    boxes.update(C=[2, 2, 3, 3]); versions.append(boxes.version)
+    boxes["C"] = boxes.pop("B"); versions.append(boxes.version)
+    boxes.clear(); versions.append(boxes.version)
+    assert versions == sorted(set(versions)), versions
+    print("  ✓ FieldBoxes 버전 증가")
+
+if __name__ == "__main__":
+    test_static_layer_cache()
+    test_field_boxes_version()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+sys.path.append('src')
+
+import yaml
+from layout_bundle import LayoutBundle, compile_bundle
+from layout_variants import compact_documents, read_layout, resolve_documents
+
+BASE = {"field_boxes": {"A": [0, 0, 10, 10], "B": [20, 0, 30, 10], "C": [40, 0, 50, 10]}, "meta": {"n": 3}}
+
+def _documents():
+    return {
+        "XX_t1_v0": BASE,
+        "XX_t1_v1": {"extends": "XX_t1_v0", "remove_fields": ["C"], "field_boxes": {"B": [21, 1, 31, 11], "D": [1, 1, 2, 2]},
+                     "meta": {"n": 3}},
+        "XX_t1_v2": {"extends": "XX_t1_v1", "field_boxes": {}},
+    }
+
+def test_resolve():
+    """변형이 기준 박스를 상속하고 제거·덮어쓰기·추가가 순서대로 적용되는지 확인합니다. (다단 상속 포함)"""
+    layouts = resolve_documents(_documents())
+    v1 = layouts["XX_t1_v1"]
+    assert v1["field_boxes"] == {"A": [0, 0, 10, 10], "B": [21, 1, 31, 11], "D": [1, 1, 2, 2]}
+    assert list(v1["field_boxes"]) == ["A", "B", "D"] and "extends" not in v1
+    assert v1["field_boxes"]["A"] is layouts["XX_t1_v0"]["field_boxes"]["A"]   # 상속 박스는 공유
+    assert layouts["XX_t1_v2"]["field_boxes"] == v1["field_boxes"] and "meta" not in layouts["XX_t1_v2"]
+
+    for broken in ({"a": {"extends": "b"}, "b": {"extends": "a"}}, {"a": {"extends": "missing"}}):
+        try:
+            resolve_documents(broken)
+        except ValueError as e:
+            print(f"  ✓ 예상된 오류: {e}")
+        else:
+            raise AssertionError("잘못된 상속이 거부되지 않았습니다")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, document in _documents().items():
+            with open(os.path.join(tmp, f"{name}_layout.yaml"), "w", encoding="utf-8") as f:
+                yaml.dump(document, f)
+        assert read_layout(os.path.join(tmp, "XX_t1_v2_layout.yaml")) == layouts["XX_t1_v2"]
+    print("  ✓ 상속 해석 (제거·덮어쓰기·추가, 다단, 순환 오류)")
+
+def test_compact_and_bundle():
+    """평탄한 변형이 차이만 남긴 문서로 바뀌고, 번들에서는 기준 dict를 공유하는지 확인합니다."""
+    flat = {
+        "XX_t1_v0": {"field_boxes": {"A": [0, 0, 10, 10], "B": [20, 0, 30, 10]}, "meta": {"n": 2}},
+        "XX_t1_v1": BASE,
+        "XX_t1_v2": {"field_boxes": dict(BASE["field_boxes"]), "meta": {"n": 3}},
+    }
+    changes = compact_documents(flat)
+    assert set(changes) == {"XX_t1_v0", "XX_t1_v2"}
+    assert changes["XX_t1_v0"] == {"extends": "XX_t1_v1", "remove_fields": ["C"], "field_boxes": {}, "meta": {"n": 2}}
+    compacted = {**flat, **changes}
+    assert resolve_documents(compacted) == flat
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "layouts.bundle")
+        header = compile_bundle(compacted, {}, {}, path)
+        assert header["box_count"] == 3   # 기준 박스만 기록
+        bundle = LayoutBundle(path)
+        assert bundle.field_boxes("XX_t1_v2") is bundle.field_boxes("XX_t1_v1")
+        assert bundle.layout_data("XX_t1_v0") == flat["XX_t1_v0"]
+    print(f"  ✓ 변형 {len(changes)}개 압축, 번들 박스 {header['box_count']}개 (기준 공유)")
+
+if __name__ == "__main__":
+    test_resolve()
+    test_compact_and_bundle()
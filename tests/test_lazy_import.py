@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import subprocess
+import sys
+sys.path.append('src')
+
+from lazy_import import LazyModule, lazy_module
+
+def test_lazy_module_loads_on_access():
+    """프록시가 첫 속성 접근 때 실제 모듈을 로드하는지 확인합니다."""
+    proxy = LazyModule("colorsys")
+    assert "not loaded" in repr(proxy)
+    assert proxy.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert "not loaded" not in repr(proxy)
+    assert lazy_module("sys") is sys, "이미 로드된 모듈은 그대로 돌려줘야 합니다"
+    print("  ✓ 첫 접근 시 로드")
+
+def test_cli_modules_skip_heavy_imports():
+    """생성기·회전기 모듈 import만으로는 cv2, PIL, yaml, faker가 로드되지 않는지 확인합니다."""
+    code = ("import sys; sys.path.insert(0, 'src'); "
+            "import batch_generator, batch_generator_ga, rotation_processor, rotator; "
+            "print(','.join(m for m in ('cv2', 'PIL', 'yaml', 'faker') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    loaded = result.stdout.strip()
+    assert loaded == "", f"import 시점에 로드된 무거운 모듈: {loaded}"
+    print("  ✓ import 시점에 무거운 모듈 없음")
+
+if __name__ == "__main__":
+    test_lazy_module_loads_on_access()
+    test_cli_modules_skip_heavy_imports()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+sys.path.append('src')
+
+import cv2
+import numpy as np
+import pytest
+from lossless_rotation import find_jpegtran, is_perfect_rotation, jpeg_geometry
+from image_codec import ImageCodec
+from rotation_processor import RotationProcessor
+
+def _write_page(directory, size, grayscale=False):
+    """텍스트 비슷한 무늬가 있는 0도 페이지 JPEG (size = (너비, 높이))"""
+    width, height = size
+    image = np.full((height, width) if grayscale else (height, width, 3), 255, np.uint8)
+    cv2.putText(image, "JU-1 TEST", (4, height // 2), cv2.FONT_HERSHEY_SIMPLEX, 0.6, 0, 2)
+    path = os.path.join(directory, "JU-1-OPEN-0-00001.jpg")
+    cv2.imwrite(path, image)
+    return path
+
+class _RecordingDriver:
+    """jpegtran에 넘겨진 작업만 기록 (실행하지 않음)"""
+    def __init__(self):
+        self.jobs = []
+
+    def run(self, jobs):
+        self.jobs += jobs
+        return {"ok": [], "failed": list(jobs)}
+
+def test_jpeg_geometry():
+    """SOF 헤더에서 크기·MCU를 읽고 실제 페이지 크기(GA 1591×1125, JU 1448×1024)는 -perfect 불가로 판정하는지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        geometry = jpeg_geometry(_write_page(tmp, (64, 48)))
+        assert geometry == {"width": 64, "height": 48, "mcu_width": 16, "mcu_height": 16}
+        assert is_perfect_rotation(geometry, 180) and is_perfect_rotation(geometry, 90)
+
+        assert jpeg_geometry(_write_page(tmp, (1591, 1125), grayscale=True))["mcu_width"] == 8
+        for size in [(1591, 1125), (1448, 1024)]:
+            geometry = jpeg_geometry(_write_page(tmp, size))
+            assert not is_perfect_rotation(geometry, 180), size
+        # JU 1448×1024 4:2:0: 높이는 16의 배수 → 시계 방향 90도만 가능
+        assert is_perfect_rotation(geometry, 90) and not is_perfect_rotation(geometry, -90)
+
+        png = os.path.join(tmp, "a.png")
+        cv2.imwrite(png, np.zeros((8, 8), np.uint8))
+        assert jpeg_geometry(png) is None
+        print("  ✓ SOF 크기·MCU 판정")
+
+def test_non_aligned_skips_jpegtran():
+    """MCU 배수가 아닌 페이지는 jpegtran을 실행하지 않고 픽셀 회전으로 처리하는지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_page(tmp, (100, 75))
+        processor = RotationProcessor(tmp, os.path.join(tmp, "out"), verbose=False)
+        processor.lossless_driver = driver = _RecordingDriver()
+        stats = processor.process_all_files()
+        processor.create_rotation_manifest()
+        assert driver.jobs == [] and stats["total_generated"] == 3 and stats["errors"] == 0
+        print("  ✓ 비정렬 페이지 → jpegtran 없이 픽셀 회전")
+
+def test_lossless_single_extension():
+    """lossless 백엔드는 JPEG 코덱만 받고, jpegtran 작업과 픽셀 대체 회전본이 같은 확장자를 쓰는지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            RotationProcessor(tmp, os.path.join(tmp, "out"), codec=ImageCodec("archival"), backend="lossless")
+        except ValueError as e:
+            print(f"  ✓ 비 JPEG 코덱 거부: {e}")
+        else:
+            raise AssertionError("lossless 백엔드가 PNG 코덱을 받았습니다")
+
+        _write_page(tmp, (128, 96))
+        processor = RotationProcessor(tmp, os.path.join(tmp, "out"), codec=ImageCodec("fast"), verbose=False)
+        processor.lossless_driver = driver = _RecordingDriver()   # 모든 jpegtran 작업 실패 → 픽셀 대체
+        stats = processor.process_all_files()
+        processor.create_rotation_manifest()
+        files = sorted(os.listdir(os.path.join(tmp, "out")))
+        assert len(driver.jobs) == 3 and all(dst.endswith(".jpg") for _, dst, _ in driver.jobs)
+        assert stats["total_generated"] == 3 and [name for name in files if not name.endswith(".csv")] == [
+            os.path.basename(dst) for _, dst, _ in sorted(driver.jobs, key=lambda job: job[1])]
+        print(f"  ✓ jpegtran 작업·픽셀 대체 모두 .jpg ({', '.join(files)})")
+
+def _run_lossless(tmp):
+    processor = RotationProcessor(tmp, os.path.join(tmp, "out"), backend="lossless", verbose=False)
+    stats = processor.process_all_files()
+    processor.create_rotation_manifest()
+    return stats, sorted(os.listdir(os.path.join(tmp, "out")))
+
+def test_lossless_aligned():
+    """MCU 배수 크기 JPEG은 jpegtran 무손실 회전 결과가 픽셀 회전과 같은지 확인합니다."""
+    if not find_jpegtran():
+        pytest.skip("jpegtran이 없습니다")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = _write_page(tmp, (128, 96), grayscale=True)
+        stats, files = _run_lossless(tmp)
+        assert stats["total_generated"] == 3 and stats["errors"] == 0
+        original = cv2.imread(source, cv2.IMREAD_GRAYSCALE)
+        rotated = cv2.imread(os.path.join(tmp, "out", "JU-1-OPEN-180-00001.jpg"), cv2.IMREAD_GRAYSCALE)
+        # 무손실 회전은 DCT 계수만 재배치 → 디코딩 결과가 원본을 정확히 회전한 것과 같음
+        # (흑백: 크로마 업샘플링 차이 없이 비교)
+        assert np.array_equal(rotated, cv2.rotate(original, cv2.ROTATE_180))
+        print(f"  ✓ 무손실 회전 {stats['total_generated']}개 ({', '.join(files)})")
+
+def test_lossless_fallback():
+    """MCU 배수가 아닌 JPEG은 lossless 백엔드에서도 픽셀 회전으로 모든 각도가 생성되는지 확인합니다."""
+    if not find_jpegtran():
+        pytest.skip("jpegtran이 없습니다")
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_page(tmp, (100, 75))
+        stats, files = _run_lossless(tmp)
+        assert stats["total_generated"] == 3 and stats["errors"] == 0
+        assert [name for name in files if name.endswith(".jpg")] == [
+            "JU-1-OPEN-180-00001.jpg", "JU-1-OPEN-L-00001.jpg", "JU-1-OPEN-R-00001.jpg"]
+        print("  ✓ 비정렬 JPEG 픽셀 회전 대체")
+
+if __name__ == "__main__":
+    test_jpeg_geometry()
+    test_non_aligned_skips_jpegtran()
+    test_lossless_single_extension()
+    if find_jpegtran():
+        test_lossless_aligned()
+        test_lossless_fallback()
+    else:
+        print("  - jpegtran이 없어 무손실 회전 테스트를 건너뜁니다")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import importlib.util
+import os
+import sys
+import tempfile
+sys.path.append('src')
+
+import pytest
+from manifest_writer import ManifestWriter, load_manifest_index, read_manifest
+from rotator import DocumentRotator, ROTATOR_MANIFEST_COLUMNS
+
+def _rows(start, count):
+    return [{"filename": f"GA-1-OPEN-0-{i:05d}.jpg", "doc_type": "GA", "sequence": i, "seed": None}
+            for i in range(start, start + count)]
+
+def test_csv_flush_and_append():
+    """flush_every 행마다 디스크에 기록되고, append=True는 헤더 없이 이어 쓰는지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sub", "manifest.csv")
+        writer = ManifestWriter(path, flush_every=3)
+        writer.write_rows(_rows(1, 4))
+        assert writer.rows_written == 3 and len(read_manifest(path)) == 3   # 4번째 행은 아직 버퍼
+        writer.close()
+        assert writer.rows_written == 4
+
+        with ManifestWriter(path, append=True) as writer:
+            writer.write_rows(_rows(4, 2))   # 4번은 다시 기록 → 뒤의 행이 최신
+        rows = read_manifest(path)
+        assert len(rows) == 6 and rows[0]["seed"] == "" and rows[-1]["sequence"] == "5"
+        assert len(load_manifest_index(path)) == 5
+
+        with ManifestWriter(path) as writer:   # append=False는 새로 시작
+            writer.write_rows(_rows(1, 1))
+        assert len(read_manifest(path)) == 1
+        assert load_manifest_index(os.path.join(tmp, "missing.csv")) is None
+        print("  ✓ CSV flush_every·이어 쓰기·새로 시작")
+
+def test_append_keeps_existing_header():
+    """컬럼이 적은 이전 버전 CSV에 이어 쓰면 기존 헤더를 그대로 써서 열이 어긋나지 않는지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "manifest.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("filename,doc_type,seed\nGA-1-OPEN-0-00001.jpg,GA,1\n")
+        with ManifestWriter(path, append=True) as writer:
+            writer.write_row({"filename": "JU-1-OPEN-0-00001.jpg", "doc_type": "JU", "seed": "2",
+                              "reference_date": "2025-01-01"})
+        rows = read_manifest(path)
+        assert list(rows[1]) == ["filename", "doc_type", "seed"] and rows[1]["seed"] == "2"
+        print("  ✓ 이전 헤더에 이어 쓰기")
+
+def test_parquet():
+    """Parquet 매니페스트를 행 그룹 단위로 기록하고 읽는지 확인합니다. (이어 쓰기는 거부)"""
+    if importlib.util.find_spec("pyarrow") is None:
+        pytest.skip("pyarrow가 없습니다")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "manifest.parquet")
+        with ManifestWriter(path, flush_every=2) as writer:
+            writer.write_rows(_rows(1, 5))
+        rows = read_manifest(path)
+        assert len(rows) == 5 and rows[2]["sequence"] == "3" and rows[0]["seed"] == ""
+        try:
+            ManifestWriter(path, append=True)
+        except ValueError as e:
+            print(f"  ✓ 예상된 오류: {e}")
+        else:
+            raise AssertionError("Parquet 이어 쓰기가 거부되지 않았습니다")
+        print("  ✓ Parquet 기록·읽기")
+
+def test_rotator_manifest_without_generation():
+    """생성 없이 create_manifest를 호출해도 기존 행을 지우지 않고 디렉토리 검색으로 보완하는지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "manifest.csv")
+        with ManifestWriter(path, columns=ROTATOR_MANIFEST_COLUMNS) as writer:
+            writer.write_row({"filename": "GA-0-0001.jpg", "doc_type": "GA", "rotation": "0",
+                              "children_count": 2, "template_name": "GA_template1_child2", "seed": "7/1"})
+        for filename in ["GA-0-0001.jpg", "GA-L-0001.jpg", "notes.txt"]:
+            open(os.path.join(tmp, filename), "wb").close()
+
+        DocumentRotator().create_manifest(tmp)
+        rows = read_manifest(path)
+        assert [row["filename"] for row in rows] == ["GA-0-0001.jpg", "GA-L-0001.jpg"]
+        assert rows[0]["template_name"] == "GA_template1_child2" and rows[1]["rotation"] == "L"
+        print("  ✓ 생성 없는 create_manifest: 기존 행 유지 + 검색 보완")
+
+if __name__ == "__main__":
+    test_csv_flush_and_append()
+    test_append_keeps_existing_header()
+    if importlib.util.find_spec("pyarrow") is not None:
+        test_parquet()
+    test_rotator_manifest_without_generation()
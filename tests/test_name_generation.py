@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+sys.path.append('src')
+
+import numpy as np
+import data_factory
+from rng_context import RNGContext
+from data_factory import (create_document_record, generate_names, generate_names_with_hanja, generate_hanja_names,
+                          SURNAME_SYLLABLES, NAME_SYLLABLES, HANJA_CHARS, HANJA_SURNAMES)
+
+def test_batch_names():
+    """배치 이름 생성 결과가 음절 테이블과 성씨 한자 매핑을 따르는지 확인합니다."""
+    rng = np.random.default_rng(42)
+    names, hanja_names = generate_names_with_hanja(1000, rng)
+
+    assert len(names) == len(hanja_names) == 1000
+    for name, hanja in zip(names, hanja_names):
+        assert len(name) == 3 and len(hanja) == 3
+        assert name[0] in SURNAME_SYLLABLES and name[1] in NAME_SYLLABLES and name[2] in NAME_SYLLABLES
+        assert hanja[0] == HANJA_SURNAMES.get(name[0], '金')
+        assert hanja[1] in HANJA_CHARS and hanja[2] in HANJA_CHARS
+
+    # 같은 시드는 같은 결과
+    assert generate_names(10, np.random.default_rng(7)) == generate_names(10, np.random.default_rng(7))
+    print(f"  ✓ 1000명 배치 생성 (예: {names[0]} / {hanja_names[0]})")
+
+def test_hanja_names_for_given_names():
+    """복성·외자 이름도 한자 이름으로 변환되는지 확인합니다."""
+    result = generate_hanja_names(["남궁민수", "김철", "이"], np.random.default_rng(0))
+    assert result[0].startswith('南宮') and len(result[0]) == 4
+    assert result[1].startswith('金') and len(result[1]) == 2
+    assert result[2].startswith('李') and len(result[2]) == 2  # 이름이 없으면 1글자 보장
+    print(f"  ✓ {result}")
+
+def test_record_uses_batch_names():
+    """문서 레코드의 모든 이름·한자 이름이 배치 API 한 번의 호출에서 나오는지 확인합니다."""
+    calls = []
+    def recording(n, rng=None):
+        calls.append(generate_names_with_hanja(n, rng))
+        return calls[-1]
+
+    data_factory.generate_names_with_hanja = recording
+    try:
+        for doc_type, options, count in [("GA", {"children_count": 2}, 6), ("GA", {"children_count": 0}, 3),
+                                         ("JU", {"members_count": 4}, 4)]:
+            calls.clear()
+            doc = create_document_record(doc_type, options, rng=RNGContext(11))
+            assert len(calls) == 1 and len(calls[0][0]) == count, doc_type
+            assert [p.name for _, p in doc.persons] == calls[0][0], doc_type
+            assert [p.name_cn for _, p in doc.persons] == calls[0][1], doc_type
+    finally:
+        data_factory.generate_names_with_hanja = generate_names_with_hanja
+    print("  ✓ GA·JU 레코드 이름 = 배치 생성 1회 결과")
+
+if __name__ == "__main__":
+    test_batch_names()
+    test_hanja_names_for_given_names()
+    test_record_uses_batch_names()
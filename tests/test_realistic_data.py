@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+sys.path.append('src')
+
+import numpy as np
+import realistic_data
+from data_factory import create_document_record
+from realistic_data import (DEFAULT_REFERENCE_DATE, generate_realistic_people, is_valid_jumin, age_from_birth,
+                            set_reference_date)
+from rng_context import RNGContext
+
+def _check_person(person):
+    """생년월일·성별과 주민번호 앞자리·성별 자리가 일치하는지 확인합니다."""
+    year, month, day = person.birth.split('.')
+    front, back = person.jumin.split('-')
+    assert front == f"{year[2:]}{month}{day}", f"{person.birth} ↔ {person.jumin}"
+    male = back[0] in "13"
+    assert male == (person.gender == "남")
+    assert back[0] in ("34" if int(year) >= 2000 else "12")
+
+def test_realistic_record():
+    """realistic 모드 레코드의 날짜·주민번호·관계별 나이를 확인합니다."""
+    for _ in range(20):
+        record = create_document_record("GA", {"children_count": 3, "data_mode": "realistic", "jumin_disclosure": "OPEN"})
+        main_age = age_from_birth(record.person("MAIN").birth)
+
+        for prefix, person in record.persons:
+            _check_person(person)
+            assert is_valid_jumin(person.jumin), f"검증 자리 오류: {person.jumin}"
+
+        # 부모는 본인보다 나이가 많고, 자녀는 본인보다 적어도 20살 어림
+        assert age_from_birth(record.person("PARENT1").birth) > main_age
+        assert record.person("PARENT1").gender == "남" and record.person("PARENT2").gender == "여"
+        assert age_from_birth(record.person("CHILD1").birth) <= max(0, main_age - 20)
+
+    ju = create_document_record("JU", {"members_count": 5, "data_mode": "realistic"})
+    for _, person in ju.persons:
+        _check_person(person)
+        assert person.jumin.endswith("******")
+    assert ju.fields["HOUSEHOLD_DATE"].count('-') == 2
+    print(f"  ✓ realistic 레코드 (예: {ju.person('MEMBER1').birth} / {ju.person('MEMBER1').jumin})")
+
+def test_realistic_batch():
+    """배치 생성 결과가 모두 유효한 주민번호인지 확인합니다."""
+    people = generate_realistic_people(10000, 0, 90, rng=np.random.default_rng(0), jumin_disclosure="OPEN")
+    assert all(is_valid_jumin(j) for j in people["jumin"])
+    assert is_valid_jumin("900101-1234568") and not is_valid_jumin("900101-1234560")
+    print(f"  ✓ 10000명 배치 (예: {people['birth'][0]} / {people['jumin'][0]})")
+
+def test_batch_per_person_ranges():
+    """사람별 나이 범위·고정 성별을 따르고 발생일·신고일이 출생일 이후 순서인지 확인합니다."""
+    people = generate_realistic_people(3, [60, 0, 30], [70, 5, 30], rng=np.random.default_rng(1),
+                                       genders=["남", None, "여"])
+    ages = [age_from_birth(birth) for birth in people["birth"]]
+    assert 60 <= ages[0] <= 70 and 0 <= ages[1] <= 5 and ages[2] == 30
+    assert people["gender"][0] == "남" and people["gender"][2] == "여"
+    for birth, event, report in zip(people["birth"], people["event"], people["report"]):
+        assert birth <= event.replace("-", ".") <= report <= DEFAULT_REFERENCE_DATE.strftime("%Y.%m.%d")
+    print(f"  ✓ 사람별 나이 범위 {ages}")
+
+def test_reference_date():
+    """기준일이 고정값이라 같은 시드는 같은 레코드이고, 바꾸면 나이 기준이 따라 바뀌는지 확인합니다."""
+    options = {"children_count": 2, "data_mode": "realistic", "jumin_disclosure": "OPEN"}
+    first = create_document_record("GA", options, rng=RNGContext(5)).to_flat_dict()
+    assert create_document_record("GA", options, rng=RNGContext(5)).to_flat_dict() == first
+    try:
+        assert set_reference_date("2000-06-30").isoformat() == "2000-06-30"
+        record = create_document_record("GA", options, rng=RNGContext(5))
+        assert all(person.birth <= "2000.06.30" for _, person in record.persons)
+        assert age_from_birth("1990.07.01") == 9
+    finally:
+        set_reference_date(None)
+    assert realistic_data.REFERENCE_DATE == DEFAULT_REFERENCE_DATE
+    assert create_document_record("GA", options, rng=RNGContext(5)).to_flat_dict() == first
+    print(f"  ✓ 고정 기준일 {DEFAULT_REFERENCE_DATE}, 변경·복원")
+
+def test_invalid_data_mode():
+    """지원하지 않는 데이터 모드는 ValueError"""
+    try:
+        create_document_record("JU", {"data_mode": "strict"})
+    except ValueError as e:
+        print(f"  ✓ 예상된 오류: {e}")
+    else:
+        raise AssertionError("알 수 없는 데이터 모드가 거부되지 않았습니다")
+
+if __name__ == "__main__":
+    test_realistic_record()
+    test_realistic_batch()
+    test_batch_per_person_ranges()
+    test_reference_date()
+    test_invalid_data_mode()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+sys.path.append('src')
+
+import numpy as np
+from PIL import ImageFont
+from data_factory import create_record
+from templates_juga import create_template
+from render_buffers import BufferPool
+from rng_context import RNGContext
+
+def _template_with_font(doc_type, name, **kwargs):
+    """PIL 기본 TrueType 폰트를 끼운 템플릿 (KoPub 폰트가 없어도 PIL 경로를 검사)"""
+    template = create_template(doc_type, name, **kwargs)
+    font_path = os.path.join(tempfile.gettempdir(), "pil_default_font.ttf")
+    with open(font_path, "wb") as f:
+        f.write(ImageFont.load_default(20).font_bytes)
+    template.fonts['ko'] = ImageFont.truetype(font_path, 20)
+    return template
+
+def test_render_into_matches_render():
+    """render_into가 재사용 버퍼에 render와 같은 픽셀·주석을 만드는지 확인합니다."""
+    pool = BufferPool()
+    for color_mode in ("BGR", "GRAY"):
+        template = _template_with_font("JU", "JU_template1_TY11", max_members=5, color_mode=color_mode)
+        page = pool.page_for(template)
+        for i in range(3):
+            record = create_record("JU", {"members_count": 5}, rng=RNGContext(3).child(i))
+            expected = template.render(record)
+            annotations = template.annotations
+            result = template.render_into(page, record)
+            assert result is page and pool.page_for(template) is page
+            assert np.array_equal(result, expected), f"{color_mode}: render_into 픽셀이 다릅니다"
+            assert template.annotations == annotations
+    print(f"  ✓ render_into == render (풀 {pool.stats})")
+
+def test_render_into_rejects_wrong_buffer():
+    """템플릿과 다른 형식의 버퍼는 거부하는지 확인합니다."""
+    template = create_template("GA", "GA_template1_child0")
+    try:
+        template.render_into(np.empty((10, 10, 3), dtype=np.uint8), create_record("GA", {"children_count": 0}))
+    except ValueError as e:
+        print(f"  ✓ 잘못된 버퍼 거부: {e}")
+    else:
+        raise AssertionError("형식이 다른 버퍼를 받아들였습니다")
+
+if __name__ == "__main__":
+    test_render_into_matches_render()
+    test_render_into_rejects_wrong_buffer()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+sys.path.append('src')
+
+from data_factory import create_record, generate_names
+from rng_context import DOC_TYPE_STREAM, RNGContext
+
+def test_same_seed_same_record():
+    """같은 시드 라벨이면 같은 레코드가, 다른 자식 컨텍스트면 다른 레코드가 나오는지 확인합니다."""
+    root = RNGContext(1234)
+    for doc_type, options in [("JU", {"members_count": 5, "jumin_disclosure": "OPEN"}),
+                              ("GA", {"children_count": 2, "data_mode": "realistic"})]:
+        first = create_record(doc_type, options, rng=root.child(7))
+        again = create_record(doc_type, options, rng=RNGContext(1234).child(7))
+        other = create_record(doc_type, options, rng=root.child(8))
+        assert first == again, f"{doc_type}: 같은 시드인데 레코드가 다릅니다"
+        assert first != other, f"{doc_type}: 다른 자식 컨텍스트인데 레코드가 같습니다"
+    print("  ✓ 같은 시드 → 같은 레코드, 다른 자식 → 다른 레코드")
+
+def test_seed_label_roundtrip():
+    """매니페스트에 기록하는 시드 라벨로 문서 하나를 그대로 다시 만들 수 있는지 확인합니다."""
+    doc_rng = RNGContext(42).child(3).child(11)
+    label = doc_rng.seed_label
+    assert label == "42/3/11"
+
+    record = create_record("JU", {"members_count": 3}, rng=RNGContext(42).child(3).child(11))
+    assert create_record("JU", {"members_count": 3}, rng=RNGContext.from_label(label)) == record
+
+    # 자식 컨텍스트는 다른 자식을 먼저 썼는지와 무관
+    root = RNGContext(42)
+    root.child(0).random()
+    assert generate_names(5, root.child(1)) == generate_names(5, RNGContext(42).child(1))
+    print(f"  ✓ 시드 라벨 {label} 재현")
+
+def test_doc_type_streams_differ():
+    """같은 시드·같은 문서 번호라도 GA와 JU 생성기의 난수열이 겹치지 않는지 확인합니다."""
+    ga = RNGContext(42).child(DOC_TYPE_STREAM["GA"]).child(3)
+    ju = RNGContext(42).child(DOC_TYPE_STREAM["JU"]).child(3)
+    assert ga.seed_label == "42/0/3" and ju.seed_label == "42/1/3"
+    assert generate_names(5, ga) != generate_names(5, ju)
+    assert generate_names(5, RNGContext.from_label(ga.seed_label)) == generate_names(5, RNGContext(42).child(0).child(3))
+    print(f"  ✓ 문서 유형별 스트림 분리 ({ga.seed_label} / {ju.seed_label})")
+
+if __name__ == "__main__":
+    test_same_seed_same_record()
+    test_seed_label_roundtrip()
+    test_doc_type_streams_differ()
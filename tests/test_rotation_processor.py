@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import sys
+import tempfile
+sys.path.append('src')
+
+import cv2
+import numpy as np
+from annotation_sink import ROTATION_ANNOTATION_PREFIX, AnnotationSink, load_annotation_index
+from manifest_writer import GENERATION_MANIFEST, ManifestWriter, load_manifest_index, read_manifest
+from rotation_processor import RotationProcessor
+
+def _write_inputs(directory, count=6):
+    """0도 페이지 count개 + 생성 매니페스트"""
+    rng = np.random.default_rng(0)
+    with ManifestWriter(os.path.join(directory, GENERATION_MANIFEST)) as manifest:
+        for i in range(1, count + 1):
+            doc_type = "GA" if i % 2 else "JU"
+            filename = f"{doc_type}-1-{'OPEN' if i % 3 else 'CLOSE'}-0-{i:05d}.jpg"
+            image = rng.integers(0, 255, (60, 90, 3), dtype=np.uint8)
+            cv2.imwrite(os.path.join(directory, filename), image)
+            manifest.write_row({"filename": filename, "doc_type": doc_type, "doc_kind": "1", "angle": "0",
+                                "template_name": f"{doc_type}_template1_v0", "seed": i})
+
+def _run(input_dir, output_dir, workers):
+    processor = RotationProcessor(input_dir, output_dir, verbose=False)
+    stats = processor.process_all_files(workers=workers)
+    manifest_path = processor.create_rotation_manifest()
+    digests = {}
+    for name in sorted(os.listdir(output_dir)):
+        if name.endswith(".jpg"):
+            with open(os.path.join(output_dir, name), "rb") as f:
+                digests[name] = hashlib.md5(f.read()).hexdigest()
+    return stats, digests, read_manifest(manifest_path)
+
+def test_parallel_matches_sequential():
+    """workers=1과 workers=2의 통계·출력 파일·매니페스트 행이 같은지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        sequential = _run(tmp, os.path.join(tmp, "seq"), workers=1)
+        parallel = _run(tmp, os.path.join(tmp, "par"), workers=2)
+
+        stats, digests, rows = sequential
+        assert stats["total_processed"] == 6 and stats["total_generated"] == 18 and stats["errors"] == 0
+        assert parallel[0] == stats
+        assert parallel[1] == digests
+        assert parallel[2] == rows
+        assert rows[0]["template_name"] == "GA_template1_v0" and rows[0]["source_filename"] == "../GA-1-CLOSE-0-00003.jpg"
+        print(f"  ✓ 순차·병렬 결과 동일 (파일 {len(digests)}개, 매니페스트 {len(rows)}행)")
+
+def test_split_runs_keep_earlier_rows():
+    """같은 출력 디렉토리에 패턴을 나눠 두 번 실행해도 첫 실행의 매니페스트 행·주석 샤드가 남는지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        with AnnotationSink(tmp) as sink:
+            for name in sorted(os.listdir(tmp)):
+                if name.endswith(".jpg"):
+                    sink.add(name, (60, 90, 3), [{"field": "NAME", "text": "홍길동", "bbox": [10, 10, 40, 20]}])
+
+        output_dir = os.path.join(tmp, "rot")
+        for pattern in ("GA-*-0-*.jpg", "JU-*-0-*.jpg"):
+            processor = RotationProcessor(tmp, output_dir, verbose=False)
+            processor.process_all_files(pattern)
+            manifest_path = processor.create_rotation_manifest()
+
+        rows = load_manifest_index(manifest_path)
+        annotations = load_annotation_index(output_dir, prefix=ROTATION_ANNOTATION_PREFIX)
+        assert len(rows) == 18 and {r["doc_type"] for r in rows.values()} == {"GA", "JU"}
+        assert set(annotations) == set(rows)
+        print(f"  ✓ 분할 실행 후 매니페스트 {len(rows)}행, 주석 {len(annotations)}개 유지")
+
+if __name__ == "__main__":
+    test_parallel_matches_sequential()
+    test_split_runs_keep_earlier_rows()
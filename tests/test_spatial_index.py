@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+sys.path.append('src')
+
+import numpy as np
+from layout_overlay import FieldBoxes
+from spatial_index import LayoutIndex
+
+def _brute_hovered(field_boxes, x, y):
+    """기존 _get_hovered_field (전체 박스 순회)"""
+    for name, p in field_boxes.items():
+        if p[0] <= x <= p[2] and p[1] <= y <= p[3]:
+            return name
+    return None
+
+def _brute_snap(field_boxes, x, y, dist):
+    """기존 _snap_to_grid (전체 박스 모서리 순회)"""
+    snap_x, snap_y, min_x, min_y = x, y, dist, dist
+    for p in field_boxes.values():
+        for px in [p[0], p[2]]:
+            if abs(x - px) < min_x:
+                min_x, snap_x = abs(x - px), px
+        for py in [p[1], p[3]]:
+            if abs(y - py) < min_y:
+                min_y, snap_y = abs(y - py), py
+    return snap_x, snap_y
+
+def _random_boxes(rng, n):
+    boxes = FieldBoxes()
+    for i in range(n):
+        x, y = int(rng.integers(0, 2400)), int(rng.integers(0, 3300))
+        boxes[f"F{i}"] = [x, y, x + int(rng.integers(20, 400)), y + int(rng.integers(15, 120))]
+    return boxes
+
+def _check(index, boxes, rng, points=500):
+    index.sync(boxes)
+    for _ in range(points):
+        x, y = int(rng.integers(0, 2600)), int(rng.integers(0, 3500))
+        assert index.hovered(x, y) == _brute_hovered(boxes, x, y), (x, y)
+        sx, sy = index.snap(x, y, 15, use_lines=False)
+        bx, by = _brute_snap(boxes, x, y, 15)
+        # 같은 거리의 모서리가 양쪽에 있으면 어느 쪽이든 허용
+        assert abs(sx - x) == abs(bx - x) and abs(sy - y) == abs(by - y), ((x, y), (sx, sy), (bx, by))
+
+def test_index_matches_brute_force():
+    """공간 인덱스 hover·스냅 결과가 전체 순회와 같은지 추가·수정·삭제·이름 변경 후에도 확인합니다."""
+    rng = np.random.default_rng(0)
+    boxes = _random_boxes(rng, 120)
+    index = LayoutIndex()
+    _check(index, boxes, rng)
+    assert not index.sync(boxes), "변경이 없으면 다시 등록하지 않아야 함"
+    print("  ✓ 초기 등록 결과가 전체 순회와 같음")
+
+    for i in range(0, 120, 3):
+        boxes[f"F{i}"] = [b + 7 for b in boxes[f"F{i}"]]   # 수정
+    for i in range(1, 120, 5):
+        del boxes[f"F{i}"]                                   # 삭제
+    boxes["F2_NEW"] = boxes.pop("F2")                        # 이름 변경 (순서가 맨 뒤로)
+    boxes["ADDED"] = [100, 100, 2000, 3000]                  # 큰 박스 추가
+    _check(index, boxes, rng)
+    print("  ✓ 증분 갱신 후에도 결과가 같음")
+
+def test_grid_line_snap():
+    """격자선 좌표에도 스냅되는지 확인합니다."""
+    index = LayoutIndex()
+    index.sync(FieldBoxes(A=[100, 100, 200, 150]))
+    index.set_grid_lines([('horizontal', 300, 0, 1000), ('vertical', 505, 0, 1000)])
+    assert index.snap(510, 296, 15) == (505, 300)
+    assert index.snap(510, 296, 15, use_lines=False) == (510, 296)
+    assert index.snap(204, 146, 15) == (200, 150)
+    print("  ✓ 격자선 스냅")
+
+if __name__ == "__main__":
+    test_index_matches_brute_force()
+    test_grid_line_snap()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+import os
+import sys
+import tempfile
+sys.path.append('src')
+
+import numpy as np
+from manifest_writer import ManifestWriter
+from split_engine import SPLITS, assign_groups, load_manifest_table, read_index, split_manifests, split_table
+
+ANGLES = ("L", "R", "180")
+
+def _write_manifests(root, n_docs=400):
+    """0도 원본 n_docs개의 생성 매니페스트 + 문서마다 L/R/180 회전본의 회전 매니페스트
+    (RotationProcessor와 같은 형태 - 회전 매니페스트에는 0도 행이 없고 source_filename은 rot/ 기준 상대 경로)"""
+    gen_path = os.path.join(root, "gen", "generation_manifest.csv")
+    rot_path = os.path.join(root, "rot", "rotation_manifest.csv")
+    rng = np.random.default_rng(0)
+    with ManifestWriter(gen_path) as gen, ManifestWriter(rot_path) as rot:
+        for i in range(n_docs):
+            doc_type = "JU" if i % 5 < 3 else "GA"
+            kind = str(i % 3 + 1) if doc_type == "JU" else str(i % 2 + 1)
+            disclosure = "OPEN" if rng.random() < 0.5 else "CLOSE"
+            row = {"doc_type": doc_type, "doc_kind": kind, "disclosure": disclosure, "sequence": i,
+                   "template_name": f"{doc_type}_template{kind}_v{i % 2}", "seed": i}
+            source = f"{doc_type}-{kind}-{disclosure}-0-{i:05d}.jpg"
+            gen.write_row({**row, "filename": source, "angle": "0"})
+            for angle in ANGLES:
+                rot.write_row({**row, "filename": source.replace("-0-", f"-{angle}-"), "angle": angle,
+                               "source_filename": f"../gen/{source}"})
+    return [gen_path, rot_path]
+
+def test_no_group_leakage():
+    """같은 원본 문서의 회전본이 모두 같은 분할에 들어가고 비율·클래스 분포가 맞는지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        manifests = _write_manifests(tmp)
+        table = load_manifest_table(manifests)
+        assert len(table["path"]) == 400 * 4   # 생성 매니페스트의 0도 + 회전 매니페스트의 L/R/180
+        # 같은 매니페스트를 두 번 넘기거나 이어 쓰기로 행이 겹쳐도 경로당 한 행
+        assert len(load_manifest_table(manifests + manifests[:1])["path"]) == 400 * 4
+        row_splits, info = split_table(table, seed=7)
+
+        for group in np.unique(info["group"]):
+            assert len(np.unique(row_splits[info["group"] == group])) == 1
+        counts = np.bincount(row_splits, minlength=3) / len(row_splits)
+        assert np.allclose(counts, (0.7, 0.2, 0.1), atol=0.03), counts
+        # 회전 클래스 비율은 분할마다 같음 (각 그룹이 모든 각도를 가지므로)
+        for index in range(3):
+            classes = np.unique(info["class"][row_splits == index])
+            assert {cls.split("-")[1] for cls in classes} == {"0", "L", "R", "180"}
+        print(f"  ✓ 그룹 {info['group'].max() + 1}개 누수 없음, 비율 {np.round(counts, 3).tolist()}")
+
+def test_stratified_assignment():
+    """작은 층에서도 층마다 기대 비율에서 1그룹 이상 벗어나지 않는지 확인합니다."""
+    strata = np.repeat(np.arange(6), [1, 2, 5, 10, 33, 100])
+    splits = assign_groups(np.arange(len(strata)), strata, (0.7, 0.2, 0.1), seed=3)
+    for stratum in range(6):
+        members = splits[strata == stratum]
+        expected = np.array((0.7, 0.2, 0.1)) * len(members)
+        assert np.all(np.abs(np.bincount(members, minlength=3) - expected) < 1 + 1e-9)
+    assert np.array_equal(splits, assign_groups(np.arange(len(strata)), strata, (0.7, 0.2, 0.1), seed=3))
+    print("  ✓ 층별 오차 1그룹 이내, 같은 시드는 같은 결과")
+
+def test_index_files():
+    """인덱스 파일과 요약이 기록되고 같은 시드면 같은 분할이 나오는지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        manifests = _write_manifests(tmp, n_docs=100)
+        first = split_manifests(manifests, os.path.join(tmp, "a"), seed=11)
+        second = split_manifests(manifests, os.path.join(tmp, "b"), seed=11)
+        for name in SPLITS:
+            assert read_index(first["files"][name]) == read_index(second["files"][name])
+        entries = [entry for name in SPLITS for entry in read_index(first["files"][name])]
+        assert len(entries) == 400
+        assert all(os.path.dirname(path) in (os.path.join(tmp, "gen"), os.path.join(tmp, "rot")) for path, _ in entries)
+
+        with open(first["files"]["train"], newline="", encoding="utf-8") as f:
+            assert next(csv.reader(f)) == ["path", "class", "group"]
+        with open(first["files"]["summary"], encoding="utf-8") as f:
+            summary = json.load(f)
+        assert summary["seed"] == 11 and summary["groups"] == 100
+        assert sum(summary["splits"][name]["rows"] for name in SPLITS) == 400
+        print(f"  ✓ 인덱스 파일 {len(SPLITS)}개 + 요약 기록 ({first['sec'] * 1000:.0f}ms)")
+
+def test_groups_keep_dataset_dirs():
+    """파일명이 같은 두 데이터셋 디렉토리의 문서가 한 그룹으로 합쳐지지 않는지 확인합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        manifests = _write_manifests(os.path.join(tmp, "a"), n_docs=50) + _write_manifests(os.path.join(tmp, "b"), n_docs=50)
+        table = load_manifest_table(manifests)
+        row_splits, info = split_table(table, seed=5)
+        assert len(table["path"]) == 2 * 50 * 4 and info["group"].max() + 1 == 100
+        # 그룹마다 0도 원본 1행 + 회전본 3행, 모두 같은 데이터셋 디렉토리
+        for group in np.unique(info["group"]):
+            paths = table["path"][info["group"] == group]
+            assert len(paths) == 4 and len({path.split(os.sep)[-3] for path in paths}) == 1, paths
+        print(f"  ✓ 같은 파일명 데이터셋 2개 → 그룹 {info['group'].max() + 1}개 (디렉토리별 분리)")
+
+if __name__ == "__main__":
+    test_no_group_leakage()
+    test_groups_keep_dataset_dirs()
+    test_stratified_assignment()
+    test_index_files()
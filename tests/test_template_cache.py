@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import sys
+import tempfile
+sys.path.append('src')
+
+import cv2
+
+import numpy as np
+from data_factory import create_record
+from templates_juga import create_template
+import template_cache
+from template_cache import (SharedTemplateStore, cache_path, decode_template, load_template_image,
+                            registered_templates, template_key)
+
+TEMPLATE_PATHS = ["assets/templates/JU/JU_template1_TY11.jpg", "assets/templates/GA/GA_template1_child1.jpg"]
+
+def test_parent_uses_shared_view():
+    """부모 프로세스의 템플릿이 공유 뷰를 쓰고, 렌더링이 공유 픽셀을 바꾸지 않는지 확인합니다."""
+    decoded = decode_template(TEMPLATE_PATHS[0], "BGR")
+    with SharedTemplateStore(TEMPLATE_PATHS, color_modes=("BGR",)) as store:
+        template = create_template("JU", "JU_template1_TY11", max_members=2)
+        assert not template.template_img.flags.writeable and not template.template_img.flags.owndata
+        assert np.array_equal(template.template_img, decoded)
+
+        img = template.render(create_record("JU", {"members_count": 2}))
+        assert img.flags.writeable and not np.array_equal(img, decoded)
+        assert np.array_equal(template.template_img, decoded), "렌더링이 공유 템플릿을 변경했습니다"
+        print(f"  ✓ 공유 뷰 사용 ({store.total_bytes / 1e6:.1f}MB 공유)")
+        del template
+
+    assert template_key(TEMPLATE_PATHS[0], "BGR") not in registered_templates()
+
+def test_workers_attach_shared_templates():
+    """워커가 디코딩 없이 공유 메모리 템플릿에 붙는지 확인합니다."""
+    with SharedTemplateStore(TEMPLATE_PATHS, color_modes=("BGR", "GRAY"), register_in_parent=False) as store:
+        with store.executor(max_workers=2) as pool:
+            keys = pool.submit(registered_templates).result()
+            pixels = pool.submit(load_template_image, TEMPLATE_PATHS[1], "GRAY").result()
+
+    assert sorted(keys) == sorted(template_key(p, m) for m in ("BGR", "GRAY") for p in TEMPLATE_PATHS)
+    assert np.array_equal(pixels, decode_template(TEMPLATE_PATHS[1], "GRAY"))
+    print(f"  ✓ 워커에 {len(keys)}개 템플릿 등록")
+
+def test_disk_cache_rebuilds_on_source_change():
+    """디스크 캐시가 mmap으로 읽히고, 원본 JPEG이 바뀌면 새 해시로 다시 만들어지는지 확인합니다."""
+    workdir = tempfile.mkdtemp()
+    source = os.path.join(workdir, "JU_template1_TY11.jpg")
+    shutil.copy(TEMPLATE_PATHS[0], source)
+    template_cache.set_cache_dir(os.path.join(workdir, "cache"))
+    try:
+        first = load_template_image(source, "BGR")
+        cached = cache_path(source, "BGR")
+        assert os.path.exists(cached)
+        again = load_template_image(source, "BGR")
+        assert not again.flags.writeable and not again.flags.owndata, "캐시는 읽기 전용 mmap이어야 합니다"
+        assert np.array_equal(first, decode_template(source, "BGR")) and np.array_equal(again, first)
+
+        # 원본 교체 → 해시가 바뀌어 캐시 재생성, 이전 캐시 삭제
+        cv2.imwrite(source, 255 - decode_template(TEMPLATE_PATHS[0], "BGR"))
+        os.utime(source, ns=(0, 0))
+        rebuilt = load_template_image(source, "BGR")
+        assert cache_path(source, "BGR") != cached and not os.path.exists(cached)
+        assert np.array_equal(rebuilt, decode_template(source, "BGR"))
+        print(f"  ✓ 캐시 재생성: {os.path.basename(cache_path(source, 'BGR'))}")
+    finally:
+        template_cache.set_cache_dir(template_cache.CACHE_DIR)
+        shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    test_parent_uses_shared_view()
+    test_workers_attach_shared_templates()
+    test_disk_cache_rebuilds_on_source_change()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+시작 시간(import 비용) 벤치마크
+- 생성기·회전기 CLI 모듈을 새 인터프리터에서 `python -X importtime`으로 import하여 누적 import 시간 측정
+- 무거운 모듈(cv2, PIL, yaml, faker)이 실제로 로드되었는지 표시 (지연 import 확인)
+- 결과를 JSON으로 저장하고 이전 결과(--baseline)와 비교하여 회귀 시 종료 코드 1
+
+사용:
+    python tools/bench_startup.py
+    python tools/bench_startup.py --repeat 10 --top 5 --json outputs/bench/startup.json
+    python tools/bench_startup.py --baseline outputs/bench/startup.json --max-regression 20
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 측정 대상 (모듈명 - src/ 와 저장소 루트를 sys.path에 추가하고 import)
+DEFAULT_TARGETS = [
+    "data_factory",
+    "templates_juga",
+    "image_codec",
+    "rotation_processor",
+    "rotator",
+    "batch_generator",
+    "batch_generator_ga",
+    "check_dataset",
+]
+
+# 지연 로드 여부를 확인할 무거운 모듈
+HEAVY_MODULES = ("cv2", "PIL", "yaml", "faker")
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """-X importtime 출력 → [(모듈명, 자체 us, 누적 us, 깊이)]"""
+    rows = []
+    for line in stderr.splitlines():
+        m = _IMPORTTIME_LINE.match(line)
+        if m:
+            self_us, cumulative_us, indent, name = m.groups()
+            rows.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def measure_once(target: str) -> Dict:
+    """새 인터프리터에서 target을 한 번 import하고 측정합니다."""
+    code = (f"import sys; sys.path[:0] = [{os.path.join(ROOT, 'src')!r}, {ROOT!r}]; "
+            f"import {target}")
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    if proc.returncode != 0:
+        message = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "알 수 없는 오류"
+        raise RuntimeError(f"{target} import 실패: {message}")
+
+    rows = parse_importtime(proc.stderr)
+    target_us = next((cum for name, _, cum, depth in rows if name == target and depth == 0), 0)
+    loaded = {name for name, _, _, _ in rows}
+    return {
+        "import_ms": target_us / 1000,
+        "wall_ms": wall_ms,
+        "heavy": [mod for mod in HEAVY_MODULES if mod in loaded],
+        "top_level": [(name, cum / 1000) for name, _, cum, depth in rows if depth == 1],
+    }
+
+
+def measure(target: str, repeat: int, top: int) -> Dict:
+    """repeat번 측정한 중앙값과 가장 느린 직접 import 목록"""
+    runs = [measure_once(target) for _ in range(repeat)]
+    slowest = sorted(runs[-1]["top_level"], key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "import_ms": statistics.median(r["import_ms"] for r in runs),
+        "wall_ms": statistics.median(r["wall_ms"] for r in runs),
+        "heavy": runs[-1]["heavy"],
+        "slowest": [{"module": name, "ms": round(ms, 2)} for name, ms in slowest],
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], max_regression: float) -> List[str]:
+    """기준 결과 대비 import 시간이 max_regression% 이상 늘어난 대상 목록"""
+    regressions = []
+    for target, result in results.items():
+        if target not in baseline:
+            continue
+        before = baseline[target]["import_ms"]
+        after = result["import_ms"]
+        change = (after - before) / before * 100 if before else 0.0
+        marker = "❌" if change > max_regression else "✓"
+        print(f"  {marker} {target:<20} {before:8.1f}ms → {after:8.1f}ms ({change:+.1f}%)")
+        if change > max_regression:
+            regressions.append(target)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI 모듈 시작 시간(import 비용) 벤치마크")
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS, help="측정할 모듈명 (기본: 생성기·회전기 모듈)")
+    parser.add_argument("--repeat", type=int, default=5, help="대상별 반복 측정 횟수 (중앙값 사용)")
+    parser.add_argument("--top", type=int, default=3, help="대상별로 표시할 가장 느린 직접 import 수")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 경로")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="허용하는 import 시간 증가율 (%%)")
+    args = parser.parse_args()
+
+    print(f"=== 시작 시간 벤치마크 (python -X importtime, {args.repeat}회 중앙값) ===")
+    results = {}
+    for target in args.targets:
+        result = measure(target, args.repeat, args.top)
+        results[target] = result
+        heavy = ", ".join(result["heavy"]) or "-"
+        slowest = ", ".join(f"{item['module']} {item['ms']:.1f}ms" for item in result["slowest"])
+        print(f"  {target:<20} import {result['import_ms']:8.1f}ms | 프로세스 {result['wall_ms']:8.1f}ms | "
+              f"무거운 모듈: {heavy} | 느린 import: {slowest}")
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "repeat": args.repeat, "results": results},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        print(f"\n📊 기준 결과 비교 ({args.baseline}, 허용 +{args.max_regression:.0f}%)")
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print(f"❌ import 시간 회귀: {', '.join(regressions)}")
+            sys.exit(1)
+        print("✅ 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,27 +4,41 @@
 - outputs/dataset의 이미지들을 train/val/test로 분할
 - 7:2:1 비율 (train 70%, val 20%, test 10%)
 - 클래스별 균등 분할 보장
+- --manifest: 디렉토리 검색 대신 생성·회전 매니페스트로 분할 (src/split_engine.py)
+  원본 문서 단위 그룹·층화 분할, 인덱스 파일(train/val/test.csv)도 대상 디렉토리에 기록
+- 복사/이동은 src/file_transfer.py의 TransferEngine으로 모든 클래스를 모아 스레드 풀 병렬 처리
+  (--threads, --dry-run, 중단 후 다시 실행하면 크기·mtime이 같은 파일은 건너뜀)
 """
 
 import os
-import shutil
+import sys
 import random
 import argparse
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import glob
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from file_transfer import TransferEngine
+
 class DatasetSplitter:
     """데이터셋 분할기"""
     
     def __init__(self, src_dir: str, dst_dir: str, train_ratio: float = 0.7, 
-                 val_ratio: float = 0.2, test_ratio: float = 0.1, seed: int = 42):
-        self.src_dir = Path(src_dir)
+                 val_ratio: float = 0.2, test_ratio: float = 0.1, seed: int = 42,
+                 manifest_paths: Optional[Sequence[str]] = None, threads: Optional[int] = None,
+                 dry_run: bool = False):
+        self.src_dir = Path(src_dir or ".")
+        self.manifest_paths = list(manifest_paths or [])
         self.dst_dir = Path(dst_dir)
         self.train_ratio = train_ratio
         self.val_ratio = val_ratio
         self.test_ratio = test_ratio
         self.seed = seed
+        self.dry_run = dry_run
+        self.engine = TransferEngine(threads=threads, dry_run=dry_run)
+        self.jobs: List[Tuple[Path, Path]] = []
+        self.transfer_stats: Dict = {}
         
         # 비율 검증
         total_ratio = train_ratio + val_ratio + test_ratio
@@ -34,11 +48,10 @@ class DatasetSplitter:
         # 랜덤 시드 설정
         random.seed(seed)
         
-        # 출력 디렉토리 생성
-        self.dst_dir.mkdir(parents=True, exist_ok=True)
-        (self.dst_dir / "train").mkdir(exist_ok=True)
-        (self.dst_dir / "val").mkdir(exist_ok=True)
-        (self.dst_dir / "test").mkdir(exist_ok=True)
+        # 출력 디렉토리 생성 (클래스 디렉토리는 TransferEngine이 작업 전에 한 번에 생성)
+        if not dry_run:
+            for split_name in ("train", "val", "test"):
+                (self.dst_dir / split_name).mkdir(parents=True, exist_ok=True)
     
     def get_class_files(self) -> Dict[str, List[Path]]:
         """클래스별 파일 목록을 가져옵니다."""
@@ -66,6 +79,22 @@ class DatasetSplitter:
         
         return class_files
     
+    def get_manifest_splits(self) -> Dict[str, Dict[str, List[Path]]]:
+        """매니페스트로 분할하고 인덱스 파일을 기록합니다. {분할: {클래스: 파일 목록}}"""
+        from split_engine import SPLITS, read_index, split_manifests
+
+        result = split_manifests(self.manifest_paths, str(self.dst_dir),
+                                 (self.train_ratio, self.val_ratio, self.test_ratio), self.seed)
+        summary = result["summary"]
+        print(f"매니페스트 {len(self.manifest_paths)}개: 행 {summary['rows']}개, "
+              f"원본 문서 {summary['groups']}개, 층 {summary['strata']}개 ({result['sec']:.1f}초)")
+
+        split_files = {name: {} for name in SPLITS}
+        for name in SPLITS:
+            for path, class_name in read_index(result["files"][name]):
+                split_files[name].setdefault(class_name, []).append(Path(path))
+        return split_files
+
     def split_class_files(self, files: List[Path]) -> Tuple[List[Path], List[Path], List[Path]]:
         """클래스별 파일들을 분할합니다."""
         # 파일 순서 섞기
@@ -82,23 +111,15 @@ class DatasetSplitter:
         
         return train_files, val_files, test_files
     
-    def copy_files(self, files: List[Path], split_name: str, class_name: str):
-        """파일들을 지정된 분할 디렉토리로 복사합니다."""
+    def add_files(self, files: List[Path], split_name: str, class_name: str):
+        """파일들을 지정된 분할 디렉토리로 옮기는 작업을 추가합니다. (run_transfers에서 한 번에 처리)"""
         split_dir = self.dst_dir / split_name / class_name
-        split_dir.mkdir(parents=True, exist_ok=True)
-        
-        for file_path in files:
-            dst_path = split_dir / file_path.name
-            shutil.copy2(file_path, dst_path)
+        self.jobs.extend((file_path, split_dir / file_path.name) for file_path in files)
     
-    def move_files(self, files: List[Path], split_name: str, class_name: str):
-        """파일들을 지정된 분할 디렉토리로 이동합니다."""
-        split_dir = self.dst_dir / split_name / class_name
-        split_dir.mkdir(parents=True, exist_ok=True)
-        
-        for file_path in files:
-            dst_path = split_dir / file_path.name
-            shutil.move(str(file_path), str(dst_path))
+    def run_transfers(self, move: bool = False) -> Dict:
+        """모아 둔 작업을 병렬로 복사/이동합니다. (TransferEngine 통계 반환)"""
+        jobs, self.jobs = self.jobs, []
+        return self.engine.run(jobs, move=move)
     
     def split_dataset(self, move: bool = False) -> Dict[str, Dict[str, int]]:
         """전체 데이터셋을 분할합니다."""
@@ -107,7 +128,11 @@ class DatasetSplitter:
         print(f"대상 디렉토리: {self.dst_dir}")
         print(f"분할 비율: train {self.train_ratio:.1%}, val {self.val_ratio:.1%}, test {self.test_ratio:.1%}")
         print(f"랜덤 시드: {self.seed}")
-        print(f"모드: {'이동' if move else '복사'}")
+        print(f"모드: {'이동' if move else '복사'}{' (dry-run)' if self.dry_run else ''}, "
+              f"스레드 {self.engine.threads}")
+        
+        if self.manifest_paths:
+            return self._transfer_splits(self.get_manifest_splits(), move)
         
         # 클래스별 파일 목록 가져오기
         class_files = self.get_class_files()
@@ -132,15 +157,10 @@ class DatasetSplitter:
             
             train_files, val_files, test_files = self.split_class_files(files)
             
-            # 파일 복사/이동
-            if move:
-                self.move_files(train_files, "train", class_name)
-                self.move_files(val_files, "val", class_name)
-                self.move_files(test_files, "test", class_name)
-            else:
-                self.copy_files(train_files, "train", class_name)
-                self.copy_files(val_files, "val", class_name)
-                self.copy_files(test_files, "test", class_name)
+            # 파일 복사/이동 작업 추가
+            self.add_files(train_files, "train", class_name)
+            self.add_files(val_files, "val", class_name)
+            self.add_files(test_files, "test", class_name)
             
             # 통계 저장
             stats["train"][class_name] = len(train_files)
@@ -151,6 +171,24 @@ class DatasetSplitter:
             print(f"  val:   {len(val_files)}개")
             print(f"  test:  {len(test_files)}개")
         
+        print(f"\n--- 파일 {'이동' if move else '복사'} ---")
+        self.transfer_stats = self.run_transfers(move)
+        return stats
+    
+    def _transfer_splits(self, split_files: Dict[str, Dict[str, List[Path]]],
+                         move: bool) -> Dict[str, Dict[str, int]]:
+        """분할별·클래스별 파일 목록을 복사/이동하고 통계를 돌려줍니다."""
+        stats = {name: {} for name in split_files}
+        for split_name, class_files in split_files.items():
+            for class_name, files in sorted(class_files.items()):
+                self.add_files(files, split_name, class_name)
+                stats[split_name][class_name] = len(files)
+            print(f"  {split_name}: {sum(stats[split_name].values())}개")
+        self.transfer_stats = self.run_transfers(move)
+        # 어떤 분할에 없는 클래스도 통계에 0으로 표시
+        for class_name in {name for counts in stats.values() for name in counts}:
+            for counts in stats.values():
+                counts.setdefault(class_name, 0)
         return stats
     
     def print_final_stats(self, stats: Dict[str, Dict[str, int]]):
@@ -179,15 +217,22 @@ class DatasetSplitter:
 def main():
     """메인 실행 함수"""
     parser = argparse.ArgumentParser(description="데이터셋 분할 스크립트")
-    parser.add_argument("--src", "-s", required=True, help="소스 디렉토리 (outputs/dataset)")
+    parser.add_argument("--src", "-s", help="소스 디렉토리 (outputs/dataset)")
+    parser.add_argument("--manifest", "-m", nargs="+",
+                        help="생성·회전 매니페스트로 분할 (지정하면 --src 대신 사용)")
     parser.add_argument("--dst", "-d", required=True, help="대상 디렉토리 (dataset)")
     parser.add_argument("--train", type=float, default=0.7, help="train 비율 (기본값: 0.7)")
     parser.add_argument("--val", type=float, default=0.2, help="val 비율 (기본값: 0.2)")
     parser.add_argument("--test", type=float, default=0.1, help="test 비율 (기본값: 0.1)")
     parser.add_argument("--seed", type=int, default=42, help="랜덤 시드 (기본값: 42)")
     parser.add_argument("--move", action="store_true", help="복사 대신 이동 (원본 파일 삭제)")
+    parser.add_argument("--threads", type=int, default=None, help="복사/이동 스레드 수 (기본: CPU 수 × 4)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="파일을 복사/이동하지 않고 처리할 개수·용량만 출력 (매니페스트 인덱스 파일은 기록)")
     
     args = parser.parse_args()
+    if not args.src and not args.manifest:
+        parser.error("--src 또는 --manifest 중 하나가 필요합니다.")
     
     try:
         # 분할기 생성
@@ -197,7 +242,10 @@ def main():
             train_ratio=args.train,
             val_ratio=args.val,
             test_ratio=args.test,
-            seed=args.seed
+            seed=args.seed,
+            manifest_paths=args.manifest,
+            threads=args.threads,
+            dry_run=args.dry_run
         )
         
         # 데이터셋 분할
@@ -207,6 +255,9 @@ def main():
         splitter.print_final_stats(stats)
         
         print(f"\n📁 저장 위치: {args.dst}/")
+        if splitter.transfer_stats.get("failed"):
+            print(f"❌ {len(splitter.transfer_stats['failed'])}개 파일을 처리하지 못했습니다. 다시 실행하면 남은 파일만 처리합니다.")
+            return 1
         print(f"✅ 분할 완료!")
         
     except Exception as e: